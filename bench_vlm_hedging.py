@@ -0,0 +1,165 @@
+"""Measure VLM tail latency with and without hedging, against fake providers.
+
+No network or API keys: the async SDK clients of two providers are
+replaced by fakes whose latency is log-normal with an occasional slow
+tail.  The same request stream is sent to the primary provider alone
+and through a hedging :class:`VlmRouter`, and latency percentiles of
+both runs are printed.
+
+    python bench_vlm_hedging.py [--requests 600] [--tail 0.05]
+"""
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+import types
+
+sys.path.insert(0, "src")
+
+from medina import vlm_client, vlm_routing
+from medina.vlm_client import VlmClient
+from medina.vlm_routing import VlmRouter
+
+
+class FakeProvider:
+    """Latency model: log-normal around *median*, times *tail_factor*
+    with probability *tail*, failing with probability *errors*."""
+
+    def __init__(self, median, tail, tail_factor, errors, seed):
+        self.median = median
+        self.tail = tail
+        self.tail_factor = tail_factor
+        self.errors = errors
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.cancelled = 0
+
+    async def respond(self):
+        self.calls += 1
+        delay = self.median * self.rng.lognormvariate(0, 0.25)
+        if self.rng.random() < self.tail:
+            delay *= self.tail_factor
+        failed = self.rng.random() < self.errors
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if failed:
+            raise RuntimeError("fake provider error")
+
+
+class FakeAnthropic:
+    def __init__(self, provider):
+        async def create(**kwargs):
+            await provider.respond()
+            return types.SimpleNamespace(
+                usage=types.SimpleNamespace(input_tokens=1000, output_tokens=200),
+                content=[types.SimpleNamespace(text="{}")],
+            )
+        self.messages = types.SimpleNamespace(create=create)
+
+
+class FakeOpenAI:
+    def __init__(self, provider):
+        async def create(**kwargs):
+            await provider.respond()
+            message = types.SimpleNamespace(content="{}")
+            return types.SimpleNamespace(
+                usage=types.SimpleNamespace(prompt_tokens=1000, completion_tokens=200),
+                choices=[types.SimpleNamespace(message=message)],
+            )
+        self.chat = types.SimpleNamespace(
+            completions=types.SimpleNamespace(create=create),
+        )
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+async def run_stream(client, n, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                await client.request([], "count fixtures", timeout=60)
+            except Exception:
+                return
+            latencies.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*(one() for _ in range(n)))
+    return latencies
+
+
+def report(name, latencies, n):
+    print(
+        f"{name:<14} ok={len(latencies):>4}/{n}  "
+        f"p50={percentile(latencies, 50) * 1000:7.1f}ms  "
+        f"p95={percentile(latencies, 95) * 1000:7.1f}ms  "
+        f"p99={percentile(latencies, 99) * 1000:7.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--median", type=float, default=0.05, help="seconds")
+    parser.add_argument("--tail", type=float, default=0.03)
+    parser.add_argument("--tail-factor", type=float, default=10.0)
+    parser.add_argument("--errors", type=float, default=0.01)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    primary = FakeProvider(args.median, args.tail, args.tail_factor, args.errors, 1)
+    secondary = FakeProvider(args.median * 1.2, args.tail, args.tail_factor, args.errors, 2)
+
+    async def install():
+        vlm_client._sdk_clients[("anthropic", "fake", None)] = FakeAnthropic(primary)
+        vlm_client._sdk_clients[("openrouter", "fake", "fake://")] = FakeOpenAI(secondary)
+
+    a = VlmClient("anthropic", "fake", "fake-a", timeout=60)
+    b = VlmClient("openrouter", "fake", "fake-b", base_url="fake://", timeout=60)
+    # Fake latencies are milliseconds, so drop the production 1s hedge floor
+    router = VlmRouter([a, b], hedge=True, min_hedge_delay=0.0)
+    run = vlm_client.run_sync
+
+    run(install())
+    # Warm up the rolling stats so the router has a p95 to hedge on
+    run(run_stream(a, vlm_routing.WINDOW, args.concurrency))
+    run(run_stream(b, vlm_routing.WINDOW, args.concurrency))
+
+    primary.calls = secondary.calls = 0
+    single = run(run_stream(a, args.requests, args.concurrency))
+    report("primary only", single, args.requests)
+    base_calls = primary.calls
+
+    primary.calls = secondary.calls = 0
+    hedged = run(run_stream(router, args.requests, args.concurrency))
+    report("hedged", hedged, args.requests)
+
+    extra = primary.calls + secondary.calls - args.requests
+    print(
+        f"extra requests: {extra} ({extra / args.requests:.1%}), "
+        f"cancelled losers: {primary.cancelled + secondary.cancelled}, "
+        f"baseline calls: {base_calls}"
+    )
+    print(
+        f"p99 improvement: "
+        f"{1 - percentile(hedged, 99) / percentile(single, 99):.0%}"
+    )
+    for key, snap in vlm_routing.stats_snapshot().items():
+        print(f"  {key}: {snap}")
+
+    vlm_client.close_vlm_clients()
+
+
+if __name__ == "__main__":
+    main()
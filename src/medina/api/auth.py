@@ -3,7 +3,10 @@ from __future__ import annotations
 
 import logging
 import secrets
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
@@ -12,7 +15,7 @@ from fastapi import HTTPException, Request
 from pydantic import BaseModel
 
 from medina.config import get_config
-from medina.db.engine import get_conn
+from medina.db.engine import connection
 
 logger = logging.getLogger(__name__)
 
@@ -56,14 +59,17 @@ class TokenPayload(BaseModel):
     sub: str  # user_id
     tenant_id: str
     exp: float
+    iat: float = 0.0  # issue time (absent on tokens minted before caching)
 
 
 def create_access_token(user: User) -> str:
     cfg = get_config()
-    expire = datetime.now(timezone.utc) + timedelta(hours=cfg.jwt_expiry_hours)
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(hours=cfg.jwt_expiry_hours)
     payload = {
         "sub": user.id,
         "tenant_id": user.tenant_id,
+        "iat": now,
         "exp": expire,
     }
     return jwt.encode(payload, _get_secret(), algorithm=ALGORITHM)
@@ -95,12 +101,12 @@ class User(BaseModel):
 # DB helpers
 # ---------------------------------------------------------------------------
 def _load_user_by_id(user_id: str) -> User | None:
-    conn = get_conn()
-    row = conn.execute(
-        "SELECT u.id, u.email, u.name, u.tenant_id, t.name AS tenant_name, u.created_at "
-        "FROM users u JOIN tenants t ON u.tenant_id = t.id WHERE u.id = ?",
-        (user_id,),
-    ).fetchone()
+    with connection() as conn:
+        row = conn.execute(
+            "SELECT u.id, u.email, u.name, u.tenant_id, t.name AS tenant_name, u.created_at "
+            "FROM users u JOIN tenants t ON u.tenant_id = t.id WHERE u.id = ?",
+            (user_id,),
+        ).fetchone()
     if not row:
         return None
     return User(
@@ -115,13 +121,13 @@ def _load_user_by_id(user_id: str) -> User | None:
 
 def _load_user_by_email(email: str) -> tuple[User, str] | None:
     """Return (User, hashed_password) or None."""
-    conn = get_conn()
-    row = conn.execute(
-        "SELECT u.id, u.email, u.name, u.hashed_password, u.tenant_id, "
-        "t.name AS tenant_name, u.created_at "
-        "FROM users u JOIN tenants t ON u.tenant_id = t.id WHERE u.email = ?",
-        (email.lower().strip(),),
-    ).fetchone()
+    with connection() as conn:
+        row = conn.execute(
+            "SELECT u.id, u.email, u.name, u.hashed_password, u.tenant_id, "
+            "t.name AS tenant_name, u.created_at "
+            "FROM users u JOIN tenants t ON u.tenant_id = t.id WHERE u.email = ?",
+            (email.lower().strip(),),
+        ).fetchone()
     if not row:
         return None
     user = User(
@@ -135,15 +141,79 @@ def _load_user_by_email(email: str) -> tuple[User, str] | None:
     return user, row["hashed_password"]
 
 
+# ---------------------------------------------------------------------------
+# Resolved-user cache
+# ---------------------------------------------------------------------------
+# Keyed by (token sub, token iat) so every request carrying the same token
+# skips the users/tenants join.  Entries expire after _USER_CACHE_TTL and
+# are dropped on logout.  Nothing updates or deletes users or tenants
+# yet; code that does must call invalidate_user_cache afterwards.
+_USER_CACHE_TTL = 60.0  # seconds
+_USER_CACHE_MAX = 1024
+_user_cache: OrderedDict[tuple[str, float], tuple[float, User]] = OrderedDict()
+_user_cache_lock = threading.Lock()
+
+
+def get_cached_user(payload: TokenPayload) -> User | None:
+    """Return the cached user for a decoded token, or None on a miss."""
+    key = (payload.sub, payload.iat)
+    with _user_cache_lock:
+        entry = _user_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            del _user_cache[key]
+            return None
+        _user_cache.move_to_end(key)
+        return user
+
+
+def cache_user(payload: TokenPayload, user: User) -> None:
+    """Remember the user resolved for a decoded token."""
+    key = (payload.sub, payload.iat)
+    with _user_cache_lock:
+        _user_cache[key] = (time.monotonic() + _USER_CACHE_TTL, user)
+        _user_cache.move_to_end(key)
+        while len(_user_cache) > _USER_CACHE_MAX:
+            _user_cache.popitem(last=False)
+
+
+def invalidate_user_cache(user_id: str | None = None, tenant_id: str | None = None) -> None:
+    """Drop cached users by id or tenant; with no arguments, drop everything.
+
+    Call after changing a user or tenant row so the next request reloads it.
+    """
+    with _user_cache_lock:
+        if user_id is None and tenant_id is None:
+            _user_cache.clear()
+            return
+        stale = [
+            key for key, (_, user) in _user_cache.items()
+            if user.id == user_id or user.tenant_id == tenant_id
+        ]
+        for key in stale:
+            del _user_cache[key]
+
+
+def resolve_user(payload: TokenPayload) -> User | None:
+    """Resolve a decoded token to a User, using the cache when possible."""
+    user = get_cached_user(payload)
+    if user is None:
+        user = _load_user_by_id(payload.sub)
+        if user is not None:
+            cache_user(payload, user)
+    return user
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 def register_user(email: str, password: str, name: str, company_name: str) -> User:
     """Create a new tenant + user. Raises HTTPException on duplicate email."""
     email = email.lower().strip()
-    conn = get_conn()
-
-    existing = conn.execute("SELECT 1 FROM users WHERE email = ?", (email,)).fetchone()
+    with connection() as conn:
+        existing = conn.execute("SELECT 1 FROM users WHERE email = ?", (email,)).fetchone()
     if existing:
         raise HTTPException(status_code=409, detail="Email already registered")
 
@@ -152,16 +222,16 @@ def register_user(email: str, password: str, name: str, company_name: str) -> Us
     hashed = hash_password(password)
     now = datetime.now(timezone.utc).isoformat()
 
-    conn.execute(
-        "INSERT INTO tenants (id, name, created_at) VALUES (?, ?, ?)",
-        (tenant_id, company_name.strip(), now),
-    )
-    conn.execute(
-        "INSERT INTO users (id, email, name, hashed_password, tenant_id, created_at) "
-        "VALUES (?, ?, ?, ?, ?, ?)",
-        (user_id, email, name.strip(), hashed, tenant_id, now),
-    )
-    conn.commit()
+    with connection() as conn:
+        conn.execute(
+            "INSERT INTO tenants (id, name, created_at) VALUES (?, ?, ?)",
+            (tenant_id, company_name.strip(), now),
+        )
+        conn.execute(
+            "INSERT INTO users (id, email, name, hashed_password, tenant_id, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (user_id, email, name.strip(), hashed, tenant_id, now),
+        )
 
     return User(
         id=user_id,
@@ -190,7 +260,9 @@ async def get_current_user(request: Request) -> User:
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
     payload = decode_access_token(token)
-    user = _load_user_by_id(payload.sub)
+    user = getattr(request.state, "user", None)
+    if user is None or user.id != payload.sub:
+        user = resolve_user(payload)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     return user
@@ -16,6 +16,7 @@ from pydantic import BaseModel, Field
 from medina.api.feedback import CorrectionReason, TARGET_ALL
 from medina.api.fix_it import FixItAction, FixItInterpretation, _build_context
 from medina.config import get_config
+from medina.vlm_payload import ImagePayload
 
 logger = logging.getLogger(__name__)
 
@@ -167,7 +168,7 @@ def _render_referenced_pages(
 
     Returns list of Anthropic image content blocks.
     """
-    from medina.pdf.renderer import render_page_to_image
+    from medina.pdf.renderer import render_page_payload
 
     image_blocks: list[dict] = []
     for ref in refs[:max_pages]:
@@ -176,8 +177,7 @@ def _render_referenced_pages(
         if not source_path:
             continue
         try:
-            png_bytes = render_page_to_image(source_path, pdf_page_index, dpi=dpi)
-            b64 = base64.standard_b64encode(png_bytes).decode("ascii")
+            png_bytes = render_page_payload(source_path, pdf_page_index, "chat", dpi=dpi)
             page_label = ref.get("sheet_code") or f"page {ref.get('page_number', '?')}"
             image_blocks.append({
                 "type": "text",
@@ -187,8 +187,8 @@ def _render_referenced_pages(
                 "type": "image",
                 "source": {
                     "type": "base64",
-                    "media_type": "image/png",
-                    "data": b64,
+                    "media_type": png_bytes.media_type,
+                    "data": png_bytes.b64,
                 },
             })
             logger.info("Rendered %s for chat VLM (%d KB)", page_label, len(png_bytes) // 1024)
@@ -523,8 +523,8 @@ async def process_chat_message(
 
     # Save to ChromaDB for future retrieval
     try:
-        from medina.db.vector_store import add_document, QA_INTERACTIONS_COLLECTION
-        add_document(
+        from medina.db.vector_store import enqueue_document, QA_INTERACTIONS_COLLECTION
+        enqueue_document(
             QA_INTERACTIONS_COLLECTION,
             f"chat_{project_id}_{len(chat_history)}",
             user_text,
@@ -548,17 +548,17 @@ async def process_chat_message(
     # Detect page references — if the user mentions a page, render it
     # so the LLM can actually see what's on it.
     page_refs = _extract_page_references(user_text, project_data)
-    image_blocks_bytes: list[bytes] = []
+    image_blocks_bytes: list[ImagePayload] = []
     image_labels: list[str] = []
     if page_refs and intent in ("correction", "general"):
-        from medina.pdf.renderer import render_page_to_image
+        from medina.pdf.renderer import render_page_payload
         for ref in page_refs[:2]:
             source_path = ref.get("source_path", "")
             pdf_page_index = ref.get("pdf_page_index", 0)
             if not source_path:
                 continue
             try:
-                png_bytes = render_page_to_image(source_path, pdf_page_index, dpi=150)
+                png_bytes = render_page_payload(source_path, pdf_page_index, "chat", dpi=150)
                 image_blocks_bytes.append(png_bytes)
                 page_label = ref.get("sheet_code") or f"page {ref.get('page_number', '?')}"
                 image_labels.append(page_label)
@@ -584,7 +584,7 @@ async def process_chat_message(
         from medina.vlm_client import get_vlm_client
         vlm = get_vlm_client(config)
 
-        text = vlm.vision_query(
+        text = await vlm.avision_query(
             images=image_blocks_bytes,
             prompt=full_prompt,
             max_tokens=1024,
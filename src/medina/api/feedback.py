@@ -1,4 +1,11 @@
-"""Feedback models and persistence for human-in-the-loop learning."""
+"""Feedback models and persistence for human-in-the-loop learning.
+
+Corrections are stored as an append-only journal (the ``corrections``
+table, sequenced by row id).  Saves append only the corrections added
+since the feedback was loaded, and the ``derive_hints`` output is kept
+materialized per project and folded forward with new journal rows, so
+neither saving nor reading hints replays the full history.
+"""
 from __future__ import annotations
 
 import json
@@ -8,7 +15,7 @@ from enum import Enum
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 logger = logging.getLogger(__name__)
 
@@ -81,6 +88,12 @@ class ProjectFeedback(BaseModel):
     corrections: list[FixtureFeedback] = Field(default_factory=list)
     created_at: str = ""
     updated_at: str = ""
+    # Journal sequence numbers of corrections[:len(_journal_seqs)]; the
+    # rest are new since load and get appended on save.
+    _journal_seqs: list[int] = PrivateAttr(default_factory=list)
+    # Journal rows removed while the DB was unavailable (tombstones);
+    # deleted from the journal on the next save.
+    _removed_seqs: list[int] = PrivateAttr(default_factory=list)
 
 
 class FeedbackHints(BaseModel):
@@ -109,72 +122,208 @@ class FeedbackHints(BaseModel):
     viewport_splits: dict[str, list[dict[str, Any]]] = Field(default_factory=dict)
 
 
+def _row_to_feedback(row: dict) -> FixtureFeedback:
+    """Build a FixtureFeedback from a trusted journal row without re-validation."""
+    try:
+        reason = CorrectionReason(row.get("reason", "other"))
+    except ValueError:
+        reason = CorrectionReason.OTHER
+    return FixtureFeedback.model_construct(
+        action=row["action"],
+        fixture_code=row["fixture_code"],
+        reason=reason,
+        reason_detail=row.get("reason_detail", ""),
+        fixture_data=row.get("fixture_data", {}),
+        spec_patches=row.get("spec_patches", {}),
+    )
+
+
+def _correction_row(corr: FixtureFeedback) -> dict[str, Any]:
+    return {
+        "action": corr.action,
+        "fixture_code": corr.fixture_code,
+        "reason": corr.reason.value if isinstance(corr.reason, Enum) else corr.reason,
+        "reason_detail": corr.reason_detail,
+        "fixture_data": corr.fixture_data,
+        "spec_patches": corr.spec_patches,
+    }
+
+
 def load_project_feedback(project_id: str) -> ProjectFeedback | None:
-    """Load feedback for a project — DB first, then file fallback."""
+    """Load feedback for a project — DB first, then file fallback.
+
+    A file written during a DB outage carries journal state and holds
+    changes the journal lacks; it is replayed into the DB on first load.
+    """
+    path = FEEDBACK_DIR / f"{project_id}.json"
+    pending = _read_feedback_file(path) if path.exists() else None
+    if pending is not None and pending[1]:
+        feedback = pending[0]
+        save_project_feedback(feedback)
+        return feedback
+
     # Try DB
     try:
         from medina.db import repositories as repo
         rows = repo.get_corrections(project_id)
         if rows:
-            corrections = [
-                FixtureFeedback(
-                    action=r["action"],
-                    fixture_code=r["fixture_code"],
-                    reason=r.get("reason", "other"),
-                    reason_detail=r.get("reason_detail", ""),
-                    fixture_data=r.get("fixture_data", {}),
-                    spec_patches=r.get("spec_patches", {}),
-                )
-                for r in rows
-            ]
-            return ProjectFeedback(
+            feedback = ProjectFeedback(
                 project_id=project_id,
-                corrections=corrections,
+                corrections=[_row_to_feedback(r) for r in rows],
             )
+            feedback._journal_seqs = [r["id"] for r in rows]
+            return feedback
     except Exception as e:
         logger.debug("DB feedback load failed, trying file: %s", e)
 
     # Fallback to file
-    path = FEEDBACK_DIR / f"{project_id}.json"
-    if not path.exists():
-        return None
+    return pending[0] if pending is not None else None
+
+
+def _read_feedback_file(path: Path) -> tuple[ProjectFeedback, bool]:
+    """Load a feedback file; the flag is True if it carries journal state."""
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
-    return ProjectFeedback.model_validate(data)
+    feedback = ProjectFeedback.model_validate(data)
+    has_journal = "journal_seqs" in data
+    if has_journal:
+        feedback._journal_seqs = list(data["journal_seqs"])
+        feedback._removed_seqs = list(data.get("removed_seqs", []))
+    return feedback, has_journal
+
+
+def _write_feedback_file(feedback: ProjectFeedback) -> None:
+    FEEDBACK_DIR.mkdir(parents=True, exist_ok=True)
+    path = FEEDBACK_DIR / f"{feedback.project_id}.json"
+    data = feedback.model_dump()
+    data["journal_seqs"] = feedback._journal_seqs
+    data["removed_seqs"] = feedback._removed_seqs
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
 
 
 def save_project_feedback(feedback: ProjectFeedback) -> None:
-    """Save feedback for a project — DB primary, file backup."""
-    # Save to DB
+    """Save feedback for a project.
+
+    Only corrections added since load are appended to the DB journal,
+    and rows removed during a DB outage are deleted, together with the
+    hints snapshot update, in one transaction.  The JSON file (with the
+    journal state) is written only when the DB is unavailable; a file
+    is removed once its contents are in the DB.
+    """
     saved_to_db = False
+    appended = 0
     try:
         from medina.db import repositories as repo
-        from medina.api.learnings import _source_key
-        source_path = Path(feedback.source_path) if feedback.source_path else None
-        src_key = _source_key(source_path) if source_path else ""
-        for corr in feedback.corrections:
-            repo.add_correction(
-                project_id=feedback.project_id,
-                source_key=src_key,
-                action=corr.action,
-                fixture_code=corr.fixture_code,
-                reason=corr.reason.value if isinstance(corr.reason, Enum) else corr.reason,
-                reason_detail=corr.reason_detail,
-                fixture_data=corr.fixture_data,
-                spec_patches=corr.spec_patches,
-                origin="user",
-            )
+        from medina.db.engine import transaction
+        new = feedback.corrections[len(feedback._journal_seqs):]
+        removed = list(feedback._removed_seqs)
+        if new or removed:
+            from medina.api.learnings import _source_key
+            source_path = Path(feedback.source_path) if feedback.source_path else None
+            src_key = _source_key(source_path) if source_path else ""
+            with transaction():
+                for seq in removed:
+                    repo.delete_correction(seq)
+                seqs = repo.append_corrections(
+                    feedback.project_id, src_key,
+                    [_correction_row(c) for c in new], origin="user",
+                )
+                _sync_hints_snapshot(feedback.project_id)
+            feedback._removed_seqs = []
+            feedback._journal_seqs.extend(seqs)
+            appended = len(seqs)
         saved_to_db = True
     except Exception as e:
         logger.debug("DB feedback save failed, falling back to file: %s", e)
 
-    # Always save to file too (backward compat)
-    FEEDBACK_DIR.mkdir(parents=True, exist_ok=True)
     path = FEEDBACK_DIR / f"{feedback.project_id}.json"
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(feedback.model_dump(), f, indent=2)
-    logger.info("Saved feedback for project %s (%d corrections, db=%s)",
-                feedback.project_id, len(feedback.corrections), saved_to_db)
+    if not saved_to_db:
+        _write_feedback_file(feedback)
+    elif path.exists():
+        path.unlink()
+    logger.info("Saved feedback for project %s (%d corrections, %d appended, db=%s)",
+                feedback.project_id, len(feedback.corrections), appended, saved_to_db)
+
+
+def remove_project_correction(feedback: ProjectFeedback, index: int) -> FixtureFeedback:
+    """Remove one correction by index and persist the removal.
+
+    Removing history invalidates the incremental hints, so the snapshot
+    is rebuilt here — the one write path that replays the journal.
+    """
+    removed = feedback.corrections.pop(index)
+    if index >= len(feedback._journal_seqs):
+        return removed  # Never persisted — nothing to delete
+
+    seq = feedback._journal_seqs.pop(index)
+    try:
+        from medina.db import repositories as repo
+        from medina.db.engine import transaction
+        with transaction():
+            repo.delete_correction(seq)
+            _sync_hints_snapshot(feedback.project_id)
+    except Exception as e:
+        # Keep the other rows' sequence numbers so nothing is re-appended
+        # later; the tombstone deletes this row once the DB is back.
+        logger.debug("DB correction delete failed, falling back to file: %s", e)
+        feedback._removed_seqs.append(seq)
+        _write_feedback_file(feedback)
+    return removed
+
+
+def _sync_hints_snapshot(project_id: str) -> FeedbackHints:
+    """Bring the materialized hints for *project_id* up to date.
+
+    Journal rows after the snapshot's ``last_seq`` are folded in with
+    :func:`extend_hints`.  If rows were deleted (counts disagree) the
+    snapshot is rebuilt from the whole journal.  Call inside
+    ``transaction()`` when paired with journal writes.
+    """
+    from medina.db import repositories as repo
+
+    count, last_seq = repo.get_correction_journal_state(project_id)
+    snap = repo.get_hints_snapshot(project_id)
+    if snap and snap["last_seq"] == last_seq and snap["n_corrections"] == count:
+        return FeedbackHints.model_validate_json(snap["hints_json"])
+
+    hints: FeedbackHints | None = None
+    if snap and snap["last_seq"] <= last_seq:
+        tail = repo.get_corrections(project_id, after_seq=snap["last_seq"])
+        if snap["n_corrections"] + len(tail) == count:
+            hints = extend_hints(
+                FeedbackHints.model_validate_json(snap["hints_json"]),
+                [_row_to_feedback(r) for r in tail],
+            )
+    if hints is None:
+        rows = repo.get_corrections(project_id)
+        hints = extend_hints(FeedbackHints(), [_row_to_feedback(r) for r in rows])
+
+    repo.save_hints_snapshot(project_id, last_seq, count, hints.model_dump_json())
+    return hints
+
+
+def load_project_hints(project_id: str) -> FeedbackHints | None:
+    """Return ``derive_hints`` output for a project's feedback.
+
+    Served from the materialized snapshot; falls back to deriving from
+    :func:`load_project_feedback` when the DB has no journal for the
+    project (file-only feedback) or is unavailable.
+    """
+    try:
+        from medina.db import repositories as repo
+        from medina.db.engine import transaction
+        count, _ = repo.get_correction_journal_state(project_id)
+        if count:
+            with transaction():
+                return _sync_hints_snapshot(project_id)
+    except Exception as e:
+        logger.debug("Hints snapshot unavailable, deriving from feedback: %s", e)
+
+    feedback = load_project_feedback(project_id)
+    if feedback is None or not feedback.corrections:
+        return None
+    return derive_hints(feedback)
 
 
 def clear_project_feedback(project_id: str) -> None:
@@ -189,22 +338,34 @@ def clear_project_feedback(project_id: str) -> None:
         fb_path.unlink()
 
 
-def derive_hints(feedback: ProjectFeedback) -> FeedbackHints:
-    """Convert user feedback corrections into pipeline hints.
+class _HintsBuilder:
+    """Incremental form of :func:`derive_hints`.
 
-    Processes corrections in order. Last action wins for conflicts.
+    ``FeedbackHints`` itself holds all the state the derivation needs
+    (added/removed codes and keynotes in insertion order), so a builder
+    can resume from a previously materialized snapshot.
     """
-    hints = FeedbackHints()
 
-    # Track final state per code
-    added_codes: dict[str, dict] = {}
-    removed_codes: set[str] = set()
+    def __init__(self, hints: FeedbackHints | None = None) -> None:
+        self.hints = hints.model_copy(deep=True) if hints else FeedbackHints()
+        # Track final state per code
+        self.added_codes: dict[str, dict] = {
+            f["code"]: f for f in self.hints.extra_fixtures
+        }
+        self.removed_codes: set[str] = set(self.hints.removed_codes)
+        # Track keynote add/remove
+        self.added_keynotes: dict[str, dict] = {  # keynote_number → data
+            k["keynote_number"]: k for k in self.hints.extra_keynotes
+        }
+        self.removed_keynote_nums: set[str] = set(self.hints.removed_keynote_numbers)
+
+    def apply(self, correction: FixtureFeedback) -> None:
+        hints = self.hints
+        added_codes = self.added_codes
+        removed_codes = self.removed_codes
+        added_keynotes = self.added_keynotes
+        removed_keynote_nums = self.removed_keynote_nums
 
-    # Track keynote add/remove
-    added_keynotes: dict[str, dict] = {}  # keynote_number → data
-    removed_keynote_nums: set[str] = set()
-
-    for correction in feedback.corrections:
         code = correction.fixture_code
         if correction.action == "add":
             # Build fixture data dict from the correction
@@ -294,7 +455,7 @@ def derive_hints(feedback: ProjectFeedback) -> FeedbackHints:
                 hints.page_overrides[code] = page_type
         elif correction.action == "split_page":
             if not code:
-                continue
+                return
             viewports = correction.fixture_data.get("viewports", [])
             if viewports:
                 hints.viewport_splits[code] = viewports
@@ -303,9 +464,33 @@ def derive_hints(feedback: ProjectFeedback) -> FeedbackHints:
             if code not in hints.page_overrides:
                 hints.page_overrides[code] = "lighting_plan"
 
-    hints.extra_fixtures = list(added_codes.values())
-    hints.removed_codes = sorted(removed_codes)
-    hints.extra_keynotes = list(added_keynotes.values())
-    hints.removed_keynote_numbers = sorted(removed_keynote_nums)
+    def build(self) -> FeedbackHints:
+        hints = self.hints
+        hints.extra_fixtures = list(self.added_codes.values())
+        hints.removed_codes = sorted(self.removed_codes)
+        hints.extra_keynotes = list(self.added_keynotes.values())
+        hints.removed_keynote_numbers = sorted(self.removed_keynote_nums)
+        return hints
 
-    return hints
+
+def extend_hints(
+    hints: FeedbackHints,
+    corrections: list[FixtureFeedback],
+) -> FeedbackHints:
+    """Fold further corrections into previously derived hints.
+
+    ``extend_hints(derive_hints(a), b)`` equals ``derive_hints(a + b)``;
+    *hints* itself is not modified.
+    """
+    builder = _HintsBuilder(hints)
+    for correction in corrections:
+        builder.apply(correction)
+    return builder.build()
+
+
+def derive_hints(feedback: ProjectFeedback) -> FeedbackHints:
+    """Convert user feedback corrections into pipeline hints.
+
+    Processes corrections in order. Last action wins for conflicts.
+    """
+    return extend_hints(FeedbackHints(), feedback.corrections)
@@ -163,7 +163,7 @@ async def interpret_fix_it(
         Structured interpretation with actions, explanation, and optional
         clarification question.
     """
-    import anthropic
+    from medina.vlm_client import VlmClient
 
     config = get_config()
     if not config.anthropic_api_key:
@@ -174,30 +174,21 @@ async def interpret_fix_it(
 
     context = _build_context(project_data)
 
-    client = anthropic.Anthropic(api_key=config.anthropic_api_key)
+    client = VlmClient(
+        "anthropic", config.anthropic_api_key, "claude-sonnet-4-20250514",
+    )
 
     try:
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
+        text = await client.avision_query(
+            [],
+            (
+                f"Current inventory context:\n{context}\n\n"
+                f"User correction:\n{user_text}"
+            ),
             max_tokens=1024,
             system=SYSTEM_PROMPT,
-            messages=[
-                {
-                    "role": "user",
-                    "content": (
-                        f"Current inventory context:\n{context}\n\n"
-                        f"User correction:\n{user_text}"
-                    ),
-                },
-            ],
         )
 
-        # Extract text content
-        text = ""
-        for block in response.content:
-            if hasattr(block, "text"):
-                text += block.text
-
         # Parse JSON from response — handle markdown code fences
         text = text.strip()
         if text.startswith("```"):
@@ -1,7 +1,7 @@
 """Global learning store for human-in-the-loop corrections.
 
 Corrections from user feedback are promoted to a persistent learning store
-indexed by source file identity (filename).  On every pipeline run, the
+indexed by source file identity (name plus a content hash).  On every pipeline run, the
 system checks for existing learnings and automatically applies them as hints
 — so corrections made once are never forgotten.
 
@@ -12,6 +12,7 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -23,13 +24,24 @@ from medina.api.feedback import FeedbackHints, FixtureFeedback, derive_hints, Pr
 logger = logging.getLogger(__name__)
 
 LEARNINGS_DIR = Path(__file__).resolve().parents[3] / "output" / "learnings"
+# Per-source plan review files, keyed like learnings
+REVIEWS_DIR = Path(__file__).resolve().parents[3] / "output" / "reviews"
+
+# (resolved path, content key) pairs already moved off the path-hash key
+_migrated: set[tuple[str, str]] = set()
+_migrated_lock = threading.Lock()
 
 
 def _source_key(source_path: Path) -> str:
-    """Derive a stable key from a source path.
+    """Derive a stable key from a source.
 
     Uses the filename (for files) or folder name (for directories),
-    sanitized for filesystem safety.
+    sanitized for filesystem safety.  Files are identified by a hash of
+    their content, so a drawing set keeps its learnings when it is
+    re-uploaded or moved; folders fall back to a hash of their path.
+
+    Every reader derives keys here, so data stored under a file's old
+    path-hash key is migrated to its content key on first use.
     """
     if source_path.is_file():
         name = source_path.stem
@@ -37,11 +49,79 @@ def _source_key(source_path: Path) -> str:
         name = source_path.name
     # Sanitize: replace non-alphanumeric chars with underscores, keep short
     safe = "".join(c if c.isalnum() or c in "-_ " else "_" for c in name)
+    if source_path.is_file():
+        from medina.api.uploads import file_digest
+        key = f"{safe}_{file_digest(source_path)[:12]}"
+        _migrate_legacy_key(source_path, key)
+        return key
+    return _legacy_source_key(source_path)
+
+
+def _legacy_source_key(source_path: Path) -> str:
+    """Path-hash key used before learnings were keyed by content."""
+    name = source_path.stem if source_path.is_file() else source_path.name
+    safe = "".join(c if c.isalnum() or c in "-_ " else "_" for c in name)
     # Add a short hash of full path to avoid collisions for same-named files
     path_hash = hashlib.md5(str(source_path.resolve()).encode()).hexdigest()[:8]
     return f"{safe}_{path_hash}"
 
 
+def _migrate_legacy_key(source_path: Path, key: str) -> None:
+    """Move learnings, params, reviews and pattern counts stored under
+    *source_path*'s path-hash key to its content *key*, then drop the old
+    key.  Runs once per process per file; retried while the DB is down.
+    """
+    marker = (str(source_path.resolve()), key)
+    with _migrated_lock:
+        if marker in _migrated:
+            return
+    legacy = _legacy_source_key(source_path)
+    moved = _move_keyed_file(LEARNINGS_DIR, legacy, key, _merge_learning_files)
+    moved += _move_keyed_file(REVIEWS_DIR, legacy, key, lambda old, new: {**old, **new})
+    try:
+        from medina.db import repositories as repo
+        from medina.db.engine import transaction
+        with transaction():
+            moved += repo.rekey_source(legacy, key)
+    except Exception as e:
+        logger.debug("Source key migration %s -> %s deferred: %s", legacy, key, e)
+        return
+    with _migrated_lock:
+        _migrated.add(marker)
+    if moved:
+        logger.info("Migrated %d records from source key %s to %s", moved, legacy, key)
+
+
+def _merge_learning_files(old: dict, new: dict) -> dict:
+    kept = new.get("corrections", [])
+    new["corrections"] = [c for c in old.get("corrections", []) if c not in kept] + kept
+    new["times_applied"] = max(old.get("times_applied", 0), new.get("times_applied", 0))
+    return new
+
+
+def _move_keyed_file(directory: Path, legacy: str, key: str, merge) -> int:
+    """Rename ``<legacy>.json`` to ``<key>.json``, merging into an existing one."""
+    old_path = directory / f"{legacy}.json"
+    if not old_path.exists():
+        return 0
+    new_path = directory / f"{key}.json"
+    try:
+        with open(old_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if new_path.exists():
+            with open(new_path, "r", encoding="utf-8") as f:
+                data = merge(data, json.load(f))
+        if "source_key" in data:
+            data["source_key"] = key
+        with open(new_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        old_path.unlink()
+    except Exception as e:
+        logger.warning("Failed to migrate %s to %s: %s", old_path.name, new_path.name, e)
+        return 0
+    return 1
+
+
 class LearningEntry(BaseModel):
     """Persistent learnings for a specific source file."""
     source_key: str
@@ -164,20 +244,18 @@ def save_learnings(source_path: Path, corrections: list[FixtureFeedback]) -> Non
         len(merged), name, key, saved_to_db,
     )
 
-    # Store in ChromaDB for semantic search
+    # Queue for ChromaDB semantic search (batched, off-thread)
     try:
-        from medina.db.vector_store import add_document, CORRECTIONS_COLLECTION
-        for i, corr in enumerate(corrections):
-            text = (
-                f"{corr.action} fixture {corr.fixture_code}: "
-                f"{corr.reason_detail or corr.reason}"
-            )
-            add_document(
-                CORRECTIONS_COLLECTION,
+        from medina.db.vector_store import enqueue_documents, CORRECTIONS_COLLECTION
+        enqueue_documents(CORRECTIONS_COLLECTION, [
+            (
                 f"{key}_{i}_{now}",
-                text,
+                f"{corr.action} fixture {corr.fixture_code}: "
+                f"{corr.reason_detail or corr.reason}",
                 {"source_key": key, "action": corr.action, "fixture_code": corr.fixture_code},
             )
+            for i, corr in enumerate(corrections)
+        ])
     except Exception:
         pass  # ChromaDB is optional
 
@@ -2,13 +2,24 @@
 from __future__ import annotations
 
 import logging
+import secrets
 from pathlib import Path
 
 from fastapi import FastAPI, Request, Response
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from medina.api.auth import COOKIE_NAME, decode_access_token, _load_user_by_id
+from medina import metrics
+from medina.api.auth import (
+    COOKIE_NAME,
+    _load_user_by_id,
+    cache_user,
+    decode_access_token,
+    get_cached_user,
+)
 from medina.api.routes import (
     auth,
     chat,
@@ -56,37 +67,64 @@ _PUBLIC_API_PREFIXES = (
 )
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
+def _unauthorized(detail: str) -> Response:
+    return Response(content=f'{{"detail":"{detail}"}}', status_code=401,
+                    media_type="application/json")
+
+
+class AuthMiddleware:
+    """Pure-ASGI auth check.
+
+    Unlike BaseHTTPMiddleware this never wraps the response, so SSE and
+    large file responses stream straight through.  Resolved users are
+    cached per token, so most requests skip the DB entirely.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
 
         # Skip auth for non-API routes, public endpoints, and OPTIONS (CORS preflight)
         if (
-            request.method == "OPTIONS"
+            scope["method"] == "OPTIONS"
             or not path.startswith("/api/")
             or path in _PUBLIC_API_PATHS
             or any(path.startswith(p) for p in _PUBLIC_API_PREFIXES)
         ):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
-        token = request.cookies.get(COOKIE_NAME)
+        token = HTTPConnection(scope).cookies.get(COOKIE_NAME)
         if not token:
-            return Response(content='{"detail":"Not authenticated"}', status_code=401,
-                            media_type="application/json")
+            await _unauthorized("Not authenticated")(scope, receive, send)
+            return
         try:
             payload = decode_access_token(token)
-            user = _load_user_by_id(payload.sub)
-            if not user:
-                return Response(content='{"detail":"User not found"}', status_code=401,
-                                media_type="application/json")
-            # Stash user + tenant_id on request state for downstream routes
-            request.state.user = user
-            request.state.tenant_id = user.tenant_id
+            user = get_cached_user(payload)
+            if user is None:
+                # Cache miss — keep the DB lookup off the event loop.
+                user = await run_in_threadpool(_load_user_by_id, payload.sub)
+                if user is not None:
+                    cache_user(payload, user)
         except Exception:
-            return Response(content='{"detail":"Invalid token"}', status_code=401,
-                            media_type="application/json")
+            await _unauthorized("Invalid token")(scope, receive, send)
+            return
+        if not user:
+            await _unauthorized("User not found")(scope, receive, send)
+            return
 
-        return await call_next(request)
+        # Stash user + tenant_id on request state for downstream routes
+        state = scope.setdefault("state", {})
+        state["user"] = user
+        state["tenant_id"] = user.tenant_id
+
+        await self.app(scope, receive, send)
 
 
 # CORS for frontend dev server
@@ -157,8 +195,10 @@ async def startup_event():
 async def shutdown_event():
     from medina.db.engine import close_db
     from medina.db.vector_store import close_vector_store
+    from medina.vlm_client import close_vlm_clients
     close_db()
     close_vector_store()
+    close_vlm_clients()
 
 
 @app.get("/")
@@ -169,3 +209,60 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+# ---------------------------------------------------------------------------
+# Metrics — Prometheus text format, outside /api/ so scrapers need no auth
+# ---------------------------------------------------------------------------
+metrics.install()
+
+
+def _collect_api_state() -> None:
+    from medina.api.projects import list_projects
+    from medina.db.engine import pool_stats
+    from medina.db.vector_store import get_write_metrics
+
+    metrics.ACTIVE_PROJECTS.clear()
+    events_pending = 0
+    for project in list_projects():
+        metrics.ACTIVE_PROJECTS.inc(status=project.status, tenant=project.tenant_id)
+        events_pending += project.event_queue.qsize()
+    metrics.QUEUE_DEPTH.set(events_pending, queue="sse_events")
+    metrics.QUEUE_DEPTH.set(get_write_metrics().get("queue_depth", 0), queue="vector_writes")
+
+    try:
+        stats = pool_stats()
+    except Exception:
+        return
+    metrics.DB_POOL.set(stats["size"] - stats["idle"], state="in_use")
+    metrics.DB_POOL.set(stats["idle"], state="idle")
+
+
+metrics.register_collector(_collect_api_state)
+
+
+def _metrics_scrape_allowed(request: Request) -> bool:
+    """Bearer ``metrics_token``, or a peer in ``metrics_allowed_ips``."""
+    from medina.config import get_config
+
+    cfg = get_config()
+    if cfg.metrics_token:
+        auth = request.headers.get("authorization", "")
+        scheme, _, token = auth.partition(" ")
+        if scheme.lower() == "bearer" and secrets.compare_digest(
+            token.strip().encode(), cfg.metrics_token.encode(),
+        ):
+            return True
+    client = request.client
+    return client is not None and client.host in cfg.metrics_allowed_ips
+
+
+# Outside AuthMiddleware (not under /api/) for Prometheus, but the series
+# are labelled by tenant, so scrapes are restricted
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics(request: Request):
+    if not _metrics_scrape_allowed(request):
+        return PlainTextResponse("Forbidden", status_code=403)
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
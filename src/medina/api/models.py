@@ -7,6 +7,9 @@ from pydantic import BaseModel
 class ProjectCreateResponse(BaseModel):
     project_id: str
     source: str
+    content_hash: str = ""
+    deduplicated: bool = False  # Same bytes were already in the upload store
+    has_prior_result: bool = False  # Results from an earlier run were attached
 
 
 class ProjectStatusResponse(BaseModel):
@@ -7,6 +7,11 @@ Now also includes:
   - **Planning**: Pre-execution reasoning before each agent
   - **COVE**: Chain of Verification after each agent
   - **Runtime params**: Passes source_key and project_id for param lookup
+
+DB writes made during a run (agent plans, COVE results) are collected
+in a UnitOfWork and committed in one transaction when the run ends.
+Feedback promotion writes files too, so it runs after that commit,
+outside the transaction.
 """
 from __future__ import annotations
 
@@ -17,6 +22,7 @@ import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+from medina import metrics, tracing
 from medina.api.projects import ProjectState
 
 logger = logging.getLogger(__name__)
@@ -50,6 +56,56 @@ def _get_source_key(source_path: Path) -> str:
         return ""
 
 
+def _db_write(uow, func, *args, **kwargs) -> None:
+    """Record a repository write in *uow*, or run it now if there is none."""
+    if uow is not None:
+        uow.add(func, *args, **kwargs)
+    else:
+        func(*args, **kwargs)
+
+
+def _commit_run_writes(uow) -> None:
+    """Commit a run's deferred DB writes; failures are logged, not raised."""
+    try:
+        n = uow.commit()
+        if n:
+            logger.debug("Committed %d deferred DB writes", n)
+    except Exception as e:
+        logger.warning("Failed to persist run DB writes: %s", e)
+
+
+def _promote_feedback(project: ProjectState, project_name: str) -> None:
+    """Promote project feedback to global learnings and clear it."""
+    from medina.api.feedback import load_project_feedback, clear_project_feedback
+    from medina.api.learnings import save_learnings
+    fb = load_project_feedback(project.project_id)
+    if fb and fb.corrections:
+        save_learnings(project.source_path, fb.corrections)
+        logger.info(
+            "Promoted %d corrections to learnings for %s",
+            len(fb.corrections), project_name,
+        )
+        # Check for new global patterns crossing threshold
+        from medina.api.patterns import record_correction_pattern
+        from medina.api.learnings import _source_key
+        src_key = _source_key(project.source_path)
+        new_patterns = record_correction_pattern(
+            src_key, fb.corrections, source_name=project_name,
+        )
+        if new_patterns:
+            logger.info(
+                "[PIPELINE] %d new global patterns detected",
+                len(new_patterns),
+            )
+            for p in new_patterns:
+                logger.info(
+                    "  Pattern: %s (%d sources)",
+                    p.description, p.source_count,
+                )
+    # Clear project feedback (use new helper that cleans both DB and file)
+    clear_project_feedback(project.project_id)
+
+
 # ── Planning helpers ──────────────────────────────────────────────────
 
 def _run_plan(
@@ -58,21 +114,26 @@ def _run_plan(
     agent_name: str,
     plan_func,
     plan_args: tuple,
-    source_key: str,
+    planning_ctx,
+    uow=None,
 ) -> dict | None:
-    """Run planning for an agent and emit SSE events."""
+    """Run planning for an agent and emit SSE events.
+
+    *planning_ctx* is the run's RunPlanningContext; memory is fetched once
+    per run and each planner receives its own slice.
+    """
     try:
         _emit(project, "planning", {"agent_id": agent_id, "agent_name": agent_name})
 
-        from medina.planning.memory_retrieval import get_planning_context
-        context = get_planning_context(agent_name.lower(), source_key, project.project_id)
+        context = planning_ctx.for_agent(agent_name.split()[0].lower())
 
         plan = plan_func(*plan_args, context)
 
-        # Save plan to DB
+        # Save plan to DB (deferred to the run's unit of work)
         try:
             from medina.db import repositories as repo
-            repo.save_agent_plan(
+            _db_write(
+                uow, repo.save_agent_plan,
                 project_id=project.project_id,
                 agent_id=agent_id,
                 agent_name=agent_name,
@@ -104,6 +165,7 @@ def _run_cove(
     agent_name: str,
     verify_func,
     verify_args: tuple,
+    uow=None,
 ) -> dict | None:
     """Run COVE verification for an agent and emit SSE events."""
     try:
@@ -111,10 +173,11 @@ def _run_cove(
 
         result = verify_func(*verify_args)
 
-        # Save to DB
+        # Save to DB (deferred to the run's unit of work)
         try:
             from medina.db import repositories as repo
-            repo.save_cove_result(
+            _db_write(
+                uow, repo.save_cove_result,
                 project_id=project.project_id,
                 agent_id=agent_id,
                 agent_name=agent_name,
@@ -127,17 +190,18 @@ def _run_cove(
         except Exception:
             pass
 
-        # Save to ChromaDB for pattern detection
+        # Queue for ChromaDB (pattern detection) — embedded off-thread
         try:
-            from medina.db.vector_store import add_document, COVE_FINDINGS_COLLECTION
+            from medina.db.vector_store import enqueue_documents, COVE_FINDINGS_COLLECTION
             if result.issues:
-                for i, issue in enumerate(result.issues):
-                    add_document(
-                        COVE_FINDINGS_COLLECTION,
+                enqueue_documents(COVE_FINDINGS_COLLECTION, [
+                    (
                         f"cove_{project.project_id}_{agent_id}_{i}",
                         f"{agent_name}: {issue.message}",
                         {"agent_id": agent_id, "severity": issue.severity},
                     )
+                    for i, issue in enumerate(result.issues)
+                ])
         except Exception:
             pass
 
@@ -199,7 +263,17 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
        "Re-run All" flow.  Passed explicitly via *hints*.
 
     Both are merged (feedback overrides learnings for conflicts).
+
+    The run is traced as ``api.pipeline`` and its metrics are labeled
+    with the project's tenant.
     """
+    with metrics.tenant_scope(project.tenant_id), tracing.trace_run(
+        "api.pipeline", project_id=project.project_id, reprocess=is_reprocess,
+    ):
+        return _run_pipeline(project, use_vision, hints, is_reprocess, target)
+
+
+def _run_pipeline(project: ProjectState, use_vision: bool, hints, is_reprocess: bool, target: frozenset[int] | None) -> dict:
     from medina.team.run_search import run as run_search
     from medina.team.run_schedule import run as run_schedule
     from medina.team.run_count import run as run_count
@@ -221,10 +295,14 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
     output_path = project.output_path or f"output/inventory_{project.project_id}"
     source_key = _get_source_key(project.source_path)
     project_id = project.project_id
+    tracing.current_span().set(source=source)
 
     project.status = "running"
     t0 = time.time()
 
+    from medina.db.engine import UnitOfWork
+    uow = UnitOfWork()
+
     # --- Auto-load global patterns + learnings from past corrections ---
     from medina.api.patterns import get_global_hints
     global_hints = get_global_hints()
@@ -250,10 +328,12 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
     merged_base = merge_hints(global_hints, learned_hints)
     hints = merge_hints(merged_base, hints)
 
-    # Check runtime param for vision counting
+    # Snapshot runtime params once — every planner and agent in this run
+    # reads the same values, and the DB is not queried again.
+    rt_params: dict | None = None
     try:
-        from medina.runtime_params import get_effective_params
-        rt_params = get_effective_params(source_key, project_id)
+        from medina.runtime_params import snapshot_params
+        rt_params = snapshot_params(source_key, project_id)
         if rt_params.get("use_vision_counting", False):
             use_vision = True
     except Exception:
@@ -272,6 +352,8 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
 
     try:
         from medina.planning.planner import plan_search, plan_schedule, plan_count, plan_keynote, plan_qa
+        from medina.planning.memory_retrieval import RunPlanningContext
+        planning_ctx = RunPlanningContext(source_key, project_id, rt_params)
         planning_available = True
     except ImportError:
         planning_available = False
@@ -299,7 +381,7 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
         else:
             # Planning
             if planning_available:
-                _run_plan(project, 1, "Search Agent", plan_search, (source,), source_key)
+                _run_plan(project, 1, "Search Agent", plan_search, (source,), planning_ctx, uow)
 
             _emit(project, "running", {"agent_id": 1, "agent_name": "Search Agent", "status": "running"})
             project.current_agent = 1
@@ -323,7 +405,7 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
             # COVE verification for search
             if cove_available:
                 cove_result = _run_cove(project, 1, "Search Agent",
-                                        verify_search, (search_result,))
+                                        verify_search, (search_result,), uow)
                 if cove_result and cove_result.get("should_retry"):
                     logger.info("COVE flagged search agent for retry")
                     _emit(project, "cove_retry", {"agent_id": 1, "agent_name": "Search Agent", "retry_number": 1, "reason": "COVE confidence < 0.7"})
@@ -357,12 +439,12 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
             })
         else:
             if planning_available:
-                _run_plan(project, 2, "Schedule Agent", plan_schedule, (search_result,), source_key)
+                _run_plan(project, 2, "Schedule Agent", plan_schedule, (search_result,), planning_ctx, uow)
 
             _emit(project, "running", {"agent_id": 2, "agent_name": "Schedule Agent", "status": "running"})
             project.current_agent = 2
             t2 = time.time()
-            schedule_result = run_schedule(source, work_dir, hints=hints, source_key=source_key, project_id=project_id)
+            schedule_result = run_schedule(source, work_dir, hints=hints, source_key=source_key, project_id=project_id, params=rt_params)
             t_schedule = time.time() - t2
             _emit(project, "completed", {
                 "agent_id": 2, "agent_name": "Schedule Agent", "status": "completed",
@@ -376,12 +458,12 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
             # COVE for schedule
             if cove_available:
                 cove_result = _run_cove(project, 2, "Schedule Agent",
-                                        verify_schedule, (schedule_result, search_result))
+                                        verify_schedule, (schedule_result, search_result), uow)
                 if cove_result and cove_result.get("should_retry"):
                     logger.info("COVE flagged schedule agent for retry")
                     _emit(project, "cove_retry", {"agent_id": 2, "agent_name": "Schedule Agent", "retry_number": 1, "reason": "COVE confidence < 0.7"})
                     t2 = time.time()
-                    schedule_result = run_schedule(source, work_dir, hints=hints, source_key=source_key, project_id=project_id)
+                    schedule_result = run_schedule(source, work_dir, hints=hints, source_key=source_key, project_id=project_id, params=rt_params)
                     t_schedule = time.time() - t2
                     _emit(project, "completed", {
                         "agent_id": 2, "agent_name": "Schedule Agent", "status": "completed",
@@ -421,9 +503,9 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
         if run_count_agent or run_keynote_agent:
             # Planning for agents that will run
             if planning_available and run_count_agent:
-                _run_plan(project, 3, "Count Agent", plan_count, (search_result, schedule_result), source_key)
+                _run_plan(project, 3, "Count Agent", plan_count, (search_result, schedule_result), planning_ctx, uow)
             if planning_available and run_keynote_agent:
-                _run_plan(project, 4, "Keynote Agent", plan_keynote, (search_result,), source_key)
+                _run_plan(project, 4, "Keynote Agent", plan_keynote, (search_result,), planning_ctx, uow)
 
             # Emit running for agents that will execute
             if run_count_agent:
@@ -439,8 +521,8 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
             if run_count_agent and run_keynote_agent:
                 # Both need to run — parallel
                 with ThreadPoolExecutor(max_workers=2) as executor:
-                    count_future = executor.submit(run_count, source, work_dir, count_vision, hints, source_key=source_key, project_id=project_id)
-                    keynote_future = executor.submit(run_keynote, source, work_dir, source_key=source_key, project_id=project_id, hints=hints)
+                    count_future = executor.submit(tracing.wrap(run_count), source, work_dir, count_vision, hints, source_key=source_key, project_id=project_id, params=rt_params)
+                    keynote_future = executor.submit(tracing.wrap(run_keynote), source, work_dir, source_key=source_key, project_id=project_id, hints=hints, params=rt_params)
                     for future in as_completed([count_future, keynote_future]):
                         result = future.result()
                         elapsed = time.time() - t3
@@ -465,7 +547,7 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
                             })
             elif run_count_agent:
                 # Only count runs, keynote cached
-                count_result = run_count(source, work_dir, count_vision, hints, source_key=source_key, project_id=project_id)
+                count_result = run_count(source, work_dir, count_vision, hints, source_key=source_key, project_id=project_id, params=rt_params)
                 elapsed = time.time() - t3
                 _emit(project, "completed", {
                     "agent_id": 3, "agent_name": "Count Agent", "status": "completed",
@@ -477,7 +559,7 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
                 })
             else:
                 # Only keynote runs, count cached
-                keynote_result = run_keynote(source, work_dir, source_key=source_key, project_id=project_id, hints=hints)
+                keynote_result = run_keynote(source, work_dir, source_key=source_key, project_id=project_id, hints=hints, params=rt_params)
                 elapsed = time.time() - t3
                 _emit(project, "completed", {
                     "agent_id": 4, "agent_name": "Keynote Agent", "status": "completed",
@@ -490,10 +572,10 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
             # COVE for agents that ran
             if cove_available and run_count_agent and count_result:
                 _run_cove(project, 3, "Count Agent",
-                          verify_counts, (count_result, schedule_result))
+                          verify_counts, (count_result, schedule_result), uow)
             if cove_available and run_keynote_agent and keynote_result:
                 _run_cove(project, 4, "Keynote Agent",
-                          verify_keynotes, (keynote_result,))
+                          verify_keynotes, (keynote_result,), uow)
 
         # Emit skipped events for agents that used cache
         if not run_count_agent:
@@ -519,7 +601,7 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
 
         # --- Agent 5: QA ---
         if planning_available:
-            _run_plan(project, 5, "QA Agent", plan_qa, (), source_key)
+            _run_plan(project, 5, "QA Agent", plan_qa, (), planning_ctx, uow)
 
         _emit(project, "running", {"agent_id": 5, "agent_name": "QA Agent", "status": "running"})
         project.current_agent = 5
@@ -537,42 +619,31 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
 
         total_time = time.time() - t0
 
-        # Load the generated JSON result
-        json_path = Path(f"{output_path}.json")
-        if json_path.exists():
-            with open(json_path) as f:
-                project.result_data = json.load(f)
+        # Load the generated result (binary pack, JSON fallback)
+        from medina.output.result_pack import load_result
+        result_data = load_result(output_path)
+        if result_data is not None:
+            project.result_data = result_data
 
         project.output_path = output_path
         project.status = "completed"
-
-        # Promote feedback to global learnings and clear project feedback.
-        from medina.api.feedback import FEEDBACK_DIR, load_project_feedback, clear_project_feedback
-        from medina.api.learnings import save_learnings
-        fb = load_project_feedback(project.project_id)
-        if fb and fb.corrections:
-            save_learnings(project.source_path, fb.corrections)
-            logger.info(
-                "Promoted %d corrections to learnings for %s",
-                len(fb.corrections), project_name,
+        try:
+            from medina.api.uploads import record_result
+            record_result(project.source_path, project.tenant_id, output_path)
+        except Exception as e:
+            logger.debug("Failed to record upload result: %s", e)
+
+        # Plans and COVE results commit in one transaction.  Feedback
+        # promotion (learnings, patterns, cleared corrections) also
+        # writes files, which a rollback cannot undo, so it runs after
+        # the commit and its failure does not fail the run.
+        _commit_run_writes(uow)
+        try:
+            _promote_feedback(project, project_name)
+        except Exception as e:
+            logger.warning(
+                "Failed to promote feedback for %s: %s", project_name, e,
             )
-            # Check for new global patterns crossing threshold
-            from medina.api.patterns import record_correction_pattern
-            from medina.api.learnings import _source_key
-            src_key = _source_key(project.source_path)
-            new_patterns = record_correction_pattern(src_key, fb.corrections)
-            if new_patterns:
-                logger.info(
-                    "[PIPELINE] %d new global patterns detected",
-                    len(new_patterns),
-                )
-                for p in new_patterns:
-                    logger.info(
-                        "  Pattern: %s (%d sources)",
-                        p.description, p.source_count,
-                    )
-        # Clear project feedback (use new helper that cleans both DB and file)
-        clear_project_feedback(project.project_id)
 
         _emit(project, "pipeline_complete", {
             "total_time": round(total_time, 1),
@@ -586,6 +657,7 @@ def run_pipeline(project: ProjectState, use_vision: bool = False, hints=None, is
 
     except Exception as e:
         logger.exception("Pipeline failed: %s", e)
+        _commit_run_writes(uow)
         project.status = "error"
         project.error = str(e)
         _emit(project, "pipeline_error", {
@@ -4,12 +4,18 @@ Analyzes corrections across all source files to detect recurring patterns.
 When a pattern is observed across enough unique sources (PROMOTION_THRESHOLD),
 it is promoted to a global pattern that applies to ALL future pipeline runs.
 
+Per-(category, fixture_code) source counts are maintained incrementally in
+the ``pattern_aggregates`` table as corrections are promoted, so detection
+cost does not grow with the learnings history.  A full rescan is only used
+to backfill the aggregates and when the DB is unavailable.
+
 Storage: SQLite DB (primary), output/learnings/_global_patterns.json (fallback).
 """
 from __future__ import annotations
 
 import json
 import logging
+import threading
 from collections import defaultdict
 from enum import Enum
 from pathlib import Path
@@ -23,8 +29,14 @@ from medina.api.learnings import LEARNINGS_DIR, LearningEntry
 logger = logging.getLogger(__name__)
 
 PROMOTION_THRESHOLD = 3  # Unique sources before global promotion
+MAX_PATTERN_EXAMPLES = 5  # Examples kept per (category, fixture_code)
 GLOBAL_PATTERNS_FILE = LEARNINGS_DIR / "_global_patterns.json"
 
+# Cached global hints: (global_patterns_version, hints).  Rebuilt only when
+# the DB version moves or _save_global_patterns runs.
+_hints_cache: tuple[int, FeedbackHints | None] | None = None
+_hints_lock = threading.Lock()
+
 
 class PatternCategory(str, Enum):
     SYSTEMATIC_OVERCOUNT = "systematic_overcount"
@@ -185,6 +197,7 @@ def _save_global_patterns(patterns: list[CorrectionPattern]) -> None:
     with open(GLOBAL_PATTERNS_FILE, "w", encoding="utf-8") as f:
         json.dump([p.model_dump() for p in patterns], f, indent=2)
     logger.info("Saved %d global patterns", len(patterns))
+    _invalidate_global_hints()
 
 
 def scan_all_learnings() -> list[CorrectionPattern]:
@@ -202,34 +215,78 @@ def scan_all_learnings() -> list[CorrectionPattern]:
             category = categorize_correction(correction)
             key = (category.value, correction.fixture_code)
             groups[key]["source_keys"].add(source_key)
-            if len(groups[key]["examples"]) < 5:
-                groups[key]["examples"].append({
-                    "source_key": source_key,
-                    "source_name": entry.source_name,
-                    "action": correction.action,
-                    "fixture_code": correction.fixture_code,
-                    "reason": correction.reason,
-                    "fixture_data": correction.fixture_data,
-                })
+            if len(groups[key]["examples"]) < MAX_PATTERN_EXAMPLES:
+                groups[key]["examples"].append(
+                    _pattern_example(source_key, entry.source_name, correction)
+                )
 
     patterns: list[CorrectionPattern] = []
     for (category, fixture_code), group_data in groups.items():
         source_keys = group_data["source_keys"]
         if len(source_keys) >= PROMOTION_THRESHOLD:
-            desc = _describe_pattern(category, fixture_code, len(source_keys))
-            hint = _build_global_hint(category, fixture_code, group_data["examples"])
-            patterns.append(CorrectionPattern(
-                pattern_type=category,
-                description=desc,
-                source_count=len(source_keys),
-                examples=group_data["examples"],
-                global_hint=hint,
-                source_keys=sorted(source_keys),
+            patterns.append(_make_pattern(
+                category, fixture_code, group_data["examples"], sorted(source_keys),
             ))
 
     return patterns
 
 
+def _pattern_example(
+    source_key: str,
+    source_name: str,
+    correction: FixtureFeedback,
+) -> dict[str, Any]:
+    return {
+        "source_key": source_key,
+        "source_name": source_name,
+        "action": correction.action,
+        "fixture_code": correction.fixture_code,
+        "reason": correction.reason,
+        "fixture_data": correction.fixture_data,
+    }
+
+
+def _make_pattern(
+    category: str,
+    fixture_code: str,
+    examples: list[dict[str, Any]],
+    source_keys: list[str],
+) -> CorrectionPattern:
+    return CorrectionPattern(
+        pattern_type=category,
+        description=_describe_pattern(category, fixture_code, len(source_keys)),
+        source_count=len(source_keys),
+        examples=examples,
+        global_hint=_build_global_hint(category, fixture_code, examples),
+        source_keys=source_keys,
+    )
+
+
+def rebuild_pattern_aggregates() -> int:
+    """Recompute the pattern_aggregates table from every stored learning.
+
+    Only needed once to backfill aggregates for learnings recorded before
+    incremental aggregation existed.  Returns the number of observations.
+    """
+    from medina.db import repositories as repo
+
+    observations: list[tuple[str, str, str, dict | None]] = []
+    for source_key, entry in _load_all_learnings():
+        for correction in entry.corrections:
+            category = categorize_correction(correction).value
+            observations.append((
+                category,
+                correction.fixture_code,
+                source_key,
+                _pattern_example(source_key, entry.source_name, correction),
+            ))
+    repo.clear_pattern_aggregates()
+    if observations:
+        repo.add_pattern_observations(observations, max_examples=MAX_PATTERN_EXAMPLES)
+    logger.info("Rebuilt pattern aggregates from %d observations", len(observations))
+    return len(observations)
+
+
 def _describe_pattern(category: str, fixture_code: str, count: int) -> str:
     descs = {
         PatternCategory.SYSTEMATIC_OVERCOUNT.value:
@@ -281,7 +338,37 @@ def _build_global_hint(
     return hint
 
 
+def _invalidate_global_hints() -> None:
+    global _hints_cache
+    with _hints_lock:
+        _hints_cache = None
+
+
 def get_global_hints() -> FeedbackHints | None:
+    """Return FeedbackHints from promoted global patterns (cached).
+
+    The hints object is rebuilt only when the global patterns change; the
+    caller always receives its own copy.
+    """
+    global _hints_cache
+    try:
+        from medina.db import repositories as repo
+        version = repo.get_global_patterns_version()
+    except Exception:
+        version = -1
+
+    with _hints_lock:
+        cached = _hints_cache
+    if cached is None or cached[0] != version:
+        cached = (version, _build_global_hints())
+        with _hints_lock:
+            _hints_cache = cached
+
+    hints = cached[1]
+    return hints.model_copy(deep=True) if hints is not None else None
+
+
+def _build_global_hints() -> FeedbackHints | None:
     """Build FeedbackHints from promoted global patterns."""
     patterns = _load_global_patterns()
     if not patterns:
@@ -322,13 +409,24 @@ def get_global_hints() -> FeedbackHints | None:
 def record_correction_pattern(
     source_key: str,
     corrections: list[FixtureFeedback],
+    source_name: str = "",
 ) -> list[CorrectionPattern]:
-    """After learning promotion, check if any patterns cross threshold."""
+    """After learning promotion, check if any patterns cross threshold.
+
+    Folds *corrections* into the pattern aggregates (O(len(corrections)))
+    and promotes any (category, fixture_code) that reaches
+    PROMOTION_THRESHOLD unique sources.  Falls back to a full rescan of
+    the learnings when the DB is unavailable.
+    """
     if not corrections:
         return []
 
-    all_patterns = scan_all_learnings()
-    if not all_patterns:
+    try:
+        candidates = _update_pattern_aggregates(source_key, corrections, source_name)
+    except Exception as e:
+        logger.debug("Incremental pattern update failed, rescanning: %s", e)
+        candidates = scan_all_learnings()
+    if not candidates:
         return []
 
     existing = _load_global_patterns()
@@ -338,7 +436,7 @@ def record_correction_pattern(
     }
 
     new_patterns: list[CorrectionPattern] = []
-    for pattern in all_patterns:
+    for pattern in candidates:
         key = (pattern.pattern_type, pattern.global_hint.get("fixture_code", ""))
         if key not in existing_keys:
             new_patterns.append(pattern)
@@ -348,3 +446,42 @@ def record_correction_pattern(
         _save_global_patterns(merged)
 
     return new_patterns
+
+
+def _update_pattern_aggregates(
+    source_key: str,
+    corrections: list[FixtureFeedback],
+    source_name: str = "",
+) -> list[CorrectionPattern]:
+    """Fold new corrections into the aggregates; return promoted patterns."""
+    from medina.db import repositories as repo
+
+    if repo.count_pattern_aggregates() == 0:
+        # First run against an existing learnings history — backfill once.
+        # The just-saved corrections are already part of the learnings.
+        rebuild_pattern_aggregates()
+        return scan_all_learnings()
+
+    observations = [
+        (
+            categorize_correction(c).value,
+            c.fixture_code,
+            source_key,
+            _pattern_example(source_key, source_name, c),
+        )
+        for c in corrections
+    ]
+    counts = repo.add_pattern_observations(
+        observations, max_examples=MAX_PATTERN_EXAMPLES,
+    )
+    touched = sorted(k for k, n in counts.items() if n >= PROMOTION_THRESHOLD)
+
+    promoted: list[CorrectionPattern] = []
+    for category, fixture_code in touched:
+        agg = repo.get_pattern_aggregate(category, fixture_code)
+        if agg is None or agg.get("source_count", 0) < PROMOTION_THRESHOLD:
+            continue
+        promoted.append(_make_pattern(
+            category, fixture_code, agg.get("examples", []), agg.get("source_keys", []),
+        ))
+    return promoted
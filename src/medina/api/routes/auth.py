@@ -1,7 +1,7 @@
 """Authentication API endpoints: register, login, logout, me."""
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, Request, Response
 from pydantic import BaseModel, EmailStr
 
 from medina.api.auth import (
@@ -10,6 +10,7 @@ from medina.api.auth import (
     authenticate_user,
     create_access_token,
     get_current_user,
+    invalidate_user_cache,
     register_user,
 )
 from medina.config import get_config
@@ -94,8 +95,11 @@ async def login(body: LoginRequest, response: Response):
 
 
 @router.post("/logout")
-async def logout(response: Response):
-    """Clear the JWT cookie."""
+async def logout(request: Request, response: Response):
+    """Clear the JWT cookie and forget the cached user."""
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        invalidate_user_cache(user_id=user.id)
     response.delete_cookie(key=COOKIE_NAME, path="/")
     return {"ok": True}
 
@@ -20,9 +20,9 @@ from medina.api.feedback import (
     FixtureFeedback,
     ProjectFeedback,
     TARGET_ALL,
-    derive_hints,
     derive_target,
     load_project_feedback,
+    load_project_hints,
     save_project_feedback,
 )
 from medina.api.fix_it import FixItAction
@@ -145,7 +145,7 @@ async def confirm_chat_actions(
         save_project_feedback(feedback)
 
     # Derive hints and trigger reprocess
-    hints = derive_hints(feedback) if feedback.corrections else None
+    hints = load_project_hints(project_id) if feedback.corrections else None
 
     # Extract target: explicit from shortcut, or derive from action types
     explicit_target: frozenset[int] | None = None
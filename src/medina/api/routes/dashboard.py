@@ -10,6 +10,7 @@ from typing import Any
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
 
 from medina.api.feedback import (
     FixtureFeedback,
@@ -245,9 +246,6 @@ async def get_dashboard_project(dashboard_id: str, request: Request):
 async def export_dashboard_excel(dashboard_id: str, request: Request):
     """Download the Excel file for a dashboard project."""
     tenant_id = getattr(request.state, "tenant_id", "default")
-    xlsx_path = DASHBOARD_DIR / f"{dashboard_id}.xlsx"
-    if not xlsx_path.exists():
-        raise HTTPException(status_code=404, detail="Excel file not found")
 
     # Find project name for filename and verify ownership
     index = _read_index()
@@ -259,6 +257,21 @@ async def export_dashboard_excel(dashboard_id: str, request: Request):
             name = entry["name"]
             break
 
+    # The workbook generated at approval time is served as-is; only
+    # regenerate (once, into the same file) if it has gone missing.
+    xlsx_path = DASHBOARD_DIR / f"{dashboard_id}.xlsx"
+    if not xlsx_path.exists():
+        from medina.output.result_pack import load_result
+        project_data = load_result(DASHBOARD_DIR / dashboard_id)
+        if project_data is None:
+            raise HTTPException(status_code=404, detail="Excel file not found")
+        try:
+            extraction_result = _json_to_extraction_result(project_data)
+            await run_in_threadpool(write_excel, extraction_result, xlsx_path)
+        except Exception as e:
+            logger.warning("Failed to regenerate dashboard Excel %s: %s", dashboard_id, e)
+            raise HTTPException(status_code=404, detail="Excel file not found")
+
     filename = f"{name}_inventory.xlsx"
     return FileResponse(
         path=str(xlsx_path),
@@ -283,10 +296,8 @@ async def approve_project(project_id: str, request: Request, body: ApproveReques
     if not project.result_data:
         # Try loading from disk
         if project.output_path:
-            json_path = Path(f"{project.output_path}.json")
-            if json_path.exists():
-                with open(json_path) as f:
-                    project.result_data = json.load(f)
+            from medina.output.result_pack import load_result
+            project.result_data = load_result(project.output_path)
 
     if not project.result_data:
         raise HTTPException(status_code=400, detail="Project has no results to approve")
@@ -362,6 +373,11 @@ async def approve_project(project_id: str, request: Request, body: ApproveReques
     project_json_path = DASHBOARD_DIR / f"{dashboard_id}.json"
     with open(project_json_path, "w") as f:
         json.dump(save_data, f, indent=2)
+    try:
+        from medina.output.result_pack import write_result_pack
+        write_result_pack(save_data, DASHBOARD_DIR / f"{dashboard_id}.mdr")
+    except Exception as e:
+        logger.warning("Failed to write dashboard result pack %s: %s", dashboard_id, e)
 
     # Generate Excel from (possibly corrected) data
     xlsx_path = DASHBOARD_DIR / f"{dashboard_id}.xlsx"
@@ -383,14 +399,15 @@ async def approve_project(project_id: str, request: Request, body: ApproveReques
     qa = save_data.get("qa_report")
     now = datetime.now(timezone.utc).isoformat()
 
-    # Copy positions file to dashboard if available
+    # Copy positions files (JSON + binary pack) to dashboard if available
     if project.output_path:
-        src_positions = Path(f"{project.output_path}_positions.json")
-        if src_positions.exists():
-            import shutil
-            dst_positions = DASHBOARD_DIR / f"{dashboard_id}_positions.json"
-            shutil.copy2(src_positions, dst_positions)
-            logger.info("Copied positions file to dashboard: %s", dst_positions)
+        import shutil
+        for ext in (".json", ".mdr"):
+            src_positions = Path(f"{project.output_path}_positions{ext}")
+            if src_positions.exists():
+                dst_positions = DASHBOARD_DIR / f"{dashboard_id}_positions{ext}"
+                shutil.copy2(src_positions, dst_positions)
+                logger.info("Copied positions file to dashboard: %s", dst_positions)
 
     entry = {
         "id": dashboard_id,
@@ -429,15 +446,16 @@ async def delete_dashboard_project(dashboard_id: str, request: Request):
     _write_index(new_index)
 
     # Remove files
-    for ext in (".json", ".xlsx"):
+    for ext in (".json", ".mdr", ".xlsx"):
         file_path = DASHBOARD_DIR / f"{dashboard_id}{ext}"
         if file_path.exists():
             file_path.unlink()
 
-    # Also remove positions file
-    pos_path = DASHBOARD_DIR / f"{dashboard_id}_positions.json"
-    if pos_path.exists():
-        pos_path.unlink()
+    # Also remove positions files
+    for ext in (".json", ".mdr"):
+        pos_path = DASHBOARD_DIR / f"{dashboard_id}_positions{ext}"
+        if pos_path.exists():
+            pos_path.unlink()
 
     return {"deleted": dashboard_id}
 
@@ -482,7 +500,11 @@ def _resolve_source_pdf(entry: dict, project_data: dict) -> Path | None:
     for search_dir in [DATA_DIR, TRAIN_DIR, UPLOADS_DIR]:
         if not search_dir.exists():
             continue
-        for item in search_dir.iterdir():
+        items = list(search_dir.iterdir())
+        if search_dir == UPLOADS_DIR:
+            # Content-addressed store: uploads/<digest>/<filename>.pdf
+            items = [i for i in items if i.is_file()] + sorted(search_dir.glob("*/*.pdf"))
+        for item in items:
             if item.suffix.lower() == ".pdf" or item.is_dir():
                 item_norm = re.sub(r"\([\d]+\)", "", item.stem).strip().lower()
                 # Also strip _inventory suffix from train files
@@ -508,11 +530,10 @@ async def edit_dashboard_project(dashboard_id: str, request: Request):
         raise HTTPException(status_code=404, detail="Dashboard project not found")
 
     # Load the full project JSON
-    project_json_path = DASHBOARD_DIR / f"{dashboard_id}.json"
-    if not project_json_path.exists():
+    from medina.output.result_pack import load_result
+    project_data = load_result(DASHBOARD_DIR / dashboard_id)
+    if project_data is None:
         raise HTTPException(status_code=404, detail="Dashboard project data not found")
-    with open(project_json_path) as f:
-        project_data = json.load(f)
 
     # Resolve source PDF path using multi-strategy resolver
     source_path = _resolve_source_pdf(entry, project_data)
@@ -523,7 +544,10 @@ async def edit_dashboard_project(dashboard_id: str, request: Request):
         )
 
     # Determine output_path: prefer dashboard positions file, fall back to original
-    dashboard_positions = DASHBOARD_DIR / f"{dashboard_id}_positions.json"
+    has_dashboard_positions = any(
+        (DASHBOARD_DIR / f"{dashboard_id}_positions{ext}").exists()
+        for ext in (".json", ".mdr")
+    )
     original_output = (
         entry.get("output_path")
         or project_data.get("output_path", "")
@@ -531,7 +555,7 @@ async def edit_dashboard_project(dashboard_id: str, request: Request):
 
     # Use dashboard directory as output base (positions file is here)
     output_base = str(DASHBOARD_DIR / dashboard_id)
-    if not dashboard_positions.exists() and original_output:
+    if not has_dashboard_positions and original_output:
         # Fall back to original output path if dashboard positions don't exist
         output_base = original_output
 
@@ -7,15 +7,23 @@ from typing import Any
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
 from medina.api.projects import get_project
 from medina.api.routes.dashboard import _json_to_extraction_result
-from medina.output.excel import write_excel
+from medina.output.excel import write_excel_cached
 
 router = APIRouter(prefix="/api", tags=["export"])
 
 
+def _export_cache_dir(project: Any) -> Path:
+    """Directory holding cached corrected-export workbooks for a project."""
+    if project.output_path:
+        return Path(f"{project.output_path}_exports")
+    return Path(tempfile.gettempdir()) / "medina_exports" / project.project_id
+
+
 class CorrectedExportRequest(BaseModel):
     """Frontend sends corrected fixtures/keynotes for Excel generation."""
     fixtures: list[dict[str, Any]] | None = None
@@ -80,13 +88,15 @@ async def export_corrected_excel(project_id: str, request: Request, body: Correc
             k["total"] = sum(k.get("counts_per_plan", {}).values())
 
     extraction_result = _json_to_extraction_result(corrected_data)
-    tmp = tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False)
-    tmp.close()
-    write_excel(extraction_result, tmp.name)
+    # Keyed by content, so re-downloading unchanged corrections is a file
+    # read; generation runs off the event loop on a miss.
+    xlsx_path = await run_in_threadpool(
+        write_excel_cached, extraction_result, _export_cache_dir(project),
+    )
 
     filename = f"{project.source_path.stem}_inventory.xlsx"
     return FileResponse(
-        path=tmp.name,
+        path=str(xlsx_path),
         filename=filename,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     )
@@ -11,9 +11,10 @@ from medina.api.feedback import (
     FeedbackHints,
     FixtureFeedback,
     ProjectFeedback,
-    derive_hints,
     derive_target,
     load_project_feedback,
+    load_project_hints,
+    remove_project_correction,
     save_project_feedback,
 )
 from medina.api.projects import get_project
@@ -79,7 +80,7 @@ async def remove_feedback(project_id: str, index: int, request: Request):
     if index < 0 or index >= len(feedback.corrections):
         raise HTTPException(status_code=404, detail="Correction index out of range")
 
-    removed = feedback.corrections.pop(index)
+    removed = remove_project_correction(feedback, index)
     from datetime import datetime, timezone
     feedback.updated_at = datetime.now(timezone.utc).isoformat()
     save_project_feedback(feedback)
@@ -102,7 +103,7 @@ async def reprocess_project(project_id: str, request: Request, background_tasks:
 
     # Load and derive hints
     feedback = load_project_feedback(project_id)
-    hints = derive_hints(feedback) if feedback else None
+    hints = load_project_hints(project_id) if feedback else None
     target = derive_target(feedback.corrections if feedback else [], hints)
 
     # Reset project state for reprocessing
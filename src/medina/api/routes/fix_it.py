@@ -15,6 +15,7 @@ from medina.api.feedback import (
     derive_hints,
     derive_target,
     load_project_feedback,
+    load_project_hints,
     save_project_feedback,
 )
 from medina.api.projects import get_project
@@ -98,7 +99,7 @@ async def confirm_fix(
     save_project_feedback(feedback)
 
     # Derive hints and target
-    hints = derive_hints(feedback)
+    hints = load_project_hints(project_id) or derive_hints(feedback)
     target = derive_target(feedback.corrections, hints)
 
     project.status = "running"
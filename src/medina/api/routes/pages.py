@@ -6,10 +6,23 @@ from pathlib import Path
 from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import FileResponse, Response
 
+from medina import metrics
 from medina.api.projects import get_project
 
 router = APIRouter(prefix="/api", tags=["pages"])
 
+# Page images are served at these DPIs only, so clients cannot fill the
+# raster store with one full-page raster per arbitrary ``dpi`` value.
+_PAGE_DPIS = (72, 100, 150, 200, 300)
+
+
+def _snap_dpi(dpi: int) -> int:
+    """The smallest served DPI at or above *dpi* (capped at the largest)."""
+    for served in _PAGE_DPIS:
+        if served >= dpi:
+            return served
+    return _PAGE_DPIS[-1]
+
 
 def _resolve_page_source(project, page_number: int) -> tuple[Path, int]:
     """Resolve the source file and page index for a given page number.
@@ -41,16 +54,28 @@ async def get_page_image(
     request: Request,
     dpi: int = Query(default=150, ge=72, le=600),
 ):
-    """Render a PDF page as a PNG image (fallback for non-PDF rendering)."""
-    project = get_project(project_id, tenant_id=getattr(request.state, "tenant_id", "default"))
+    """Render a PDF page as a PNG image (fallback for non-PDF rendering).
+
+    *dpi* is snapped to one of ``_PAGE_DPIS``.  Served from the raster
+    store's encoded tile when enabled, in the "tile" profile's format.
+    """
+    tenant_id = getattr(request.state, "tenant_id", "default")
+    project = get_project(project_id, tenant_id=tenant_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     try:
-        from medina.pdf.renderer import render_page_to_image
+        from medina.pdf.renderer import page_raster, render_page_to_image
 
         source, page_index = _resolve_page_source(project, page_number)
-        png_bytes = render_page_to_image(source, page_index, dpi=dpi)
+        dpi = _snap_dpi(dpi)
+        with metrics.tenant_scope(tenant_id):
+            raster = page_raster(source, page_index, dpi)
+            if raster is not None:
+                # The "tile" encoding can be overridden in vlm_image_encodings
+                payload = raster.payload("tile")
+                return Response(content=payload.data, media_type=payload.media_type)
+            png_bytes = render_page_to_image(source, page_index, dpi=dpi)
         return Response(content=png_bytes, media_type="image/png")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
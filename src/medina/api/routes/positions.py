@@ -1,7 +1,6 @@
 """Fixture and keynote position data for click-to-highlight."""
 from __future__ import annotations
 
-import json
 import logging
 from pathlib import Path
 from typing import Any
@@ -160,7 +159,8 @@ async def get_page_positions(
     """Return fixture and keynote positions for a specific page.
 
     Maps ``page_number`` to the plan's ``sheet_code`` via the project's
-    page list, then looks up positions from the ``_positions.json`` file.
+    page list, then looks up positions from the ``_positions.mdr`` pack
+    (or ``_positions.json`` for outputs written before packs existed).
     When ``sheet_code`` is provided (e.g. for sub-plan viewports that share
     a physical page), the page_number→sheet_code resolution is skipped.
 
@@ -183,24 +183,22 @@ async def get_page_positions(
     if not sheet_code:
         return {"positions": None, "reason": f"No sheet code for page {page_number}"}
 
-    # Try reading pre-computed positions file
+    # Try reading pre-computed positions (binary pack, JSON fallback);
+    # only this plan's section is decoded.
     if project.output_path:
-        positions_path = Path(str(project.output_path) + "_positions.json")
-        if positions_path.exists():
-            try:
-                with open(positions_path, "r", encoding="utf-8") as f:
-                    all_positions = json.load(f)
-                page_data = all_positions.get(sheet_code)
-                if page_data:
-                    return {
-                        "sheet_code": sheet_code,
-                        "page_width": page_data.get("page_width", 0),
-                        "page_height": page_data.get("page_height", 0),
-                        "fixture_positions": page_data.get("fixture_positions", {}),
-                        "keynote_positions": page_data.get("keynote_positions", {}),
-                    }
-            except Exception as e:
-                logger.warning("Failed to read positions file: %s", e)
+        try:
+            from medina.output.result_pack import load_plan_positions
+            page_data = load_plan_positions(project.output_path, sheet_code)
+            if page_data:
+                return {
+                    "sheet_code": sheet_code,
+                    "page_width": page_data.get("page_width", 0),
+                    "page_height": page_data.get("page_height", 0),
+                    "fixture_positions": page_data.get("fixture_positions", {}),
+                    "keynote_positions": page_data.get("keynote_positions", {}),
+                }
+        except Exception as e:
+            logger.warning("Failed to read positions file: %s", e)
 
     # No pre-computed positions — extract on demand
     page_data = _extract_positions_on_demand(project, page_number, sheet_code)
@@ -1,9 +1,6 @@
 """Routes for retrieving pipeline results."""
 from __future__ import annotations
 
-import json
-from pathlib import Path
-
 from fastapi import APIRouter, HTTPException, Request
 
 from medina.api.projects import get_project
@@ -24,10 +21,10 @@ async def get_results(project_id: str, request: Request):
 
     # Try loading from disk
     if project.output_path:
-        json_path = Path(f"{project.output_path}.json")
-        if json_path.exists():
-            with open(json_path) as f:
-                project.result_data = json.load(f)
+        from medina.output.result_pack import load_result
+        result_data = load_result(project.output_path)
+        if result_data is not None:
+            project.result_data = result_data
             return project.result_data
 
     raise HTTPException(status_code=404, detail="Results not available yet")
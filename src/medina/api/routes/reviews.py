@@ -11,12 +11,12 @@ from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
 from medina.api.projects import get_project
-from medina.api.learnings import _source_key
+from medina.api.learnings import REVIEWS_DIR, _source_key
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/projects", tags=["reviews"])
 
-_REVIEWS_DIR = Path(__file__).resolve().parents[3] / "output" / "reviews"
+_REVIEWS_DIR = REVIEWS_DIR
 
 
 class PlanReview(BaseModel):
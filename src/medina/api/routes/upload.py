@@ -1,31 +1,132 @@
-"""Routes for file upload."""
+"""Routes for file upload.
+
+Single-shot uploads (``POST /upload``) and resumable chunked uploads
+(``/uploads`` sessions) both land in the content-addressed store in
+:mod:`medina.api.uploads`, so identical files are stored and processed
+once.  The store's blocking file I/O runs in the threadpool.
+"""
 from __future__ import annotations
 
-import shutil
 from pathlib import Path
 
-from fastapi import APIRouter, File, Request, UploadFile
+from fastapi import APIRouter, File, HTTPException, Request, UploadFile
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
+from medina.api import uploads
 from medina.api.models import ProjectCreateResponse
-from medina.api.projects import create_project
+from medina.api.projects import ProjectState, create_project
 
 router = APIRouter(prefix="/api", tags=["upload"])
 
-UPLOAD_DIR = Path("uploads")
+
+class UploadSessionRequest(BaseModel):
+    filename: str
+    size: int
+
+
+def _create_upload_project(
+    path: Path,
+    digest: str,
+    deduplicated: bool,
+    tenant_id: str,
+) -> ProjectState:
+    """Create a project on stored content, reusing prior artifacts."""
+    project = create_project(path, tenant_id=tenant_id)
+    # Only the upload and this tenant's final result are shared; each
+    # project keeps its own intermediate agent results.
+    project.work_dir = uploads.work_dir_for(digest, project.project_id)
+
+    if deduplicated:
+        output_path = uploads.prior_result(digest, tenant_id)
+        if output_path:
+            from medina.output.result_pack import load_result
+            result_data = load_result(output_path)
+            if result_data is not None:
+                project.output_path = output_path
+                project.result_data = result_data
+                project.status = "completed"
+    return project
+
+
+def _response(project: ProjectState, path: Path, digest: str, deduplicated: bool) -> ProjectCreateResponse:
+    return ProjectCreateResponse(
+        project_id=project.project_id,
+        source=str(path),
+        content_hash=digest,
+        deduplicated=deduplicated,
+        has_prior_result=project.result_data is not None,
+    )
 
 
 @router.post("/upload", response_model=ProjectCreateResponse)
 async def upload_file(request: Request, file: UploadFile = File(...)):
     """Upload a PDF file and create a project."""
-    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-    dest = UPLOAD_DIR / file.filename
-    with open(dest, "wb") as f:
-        shutil.copyfileobj(file.file, f)
+    async def chunks():
+        while chunk := await file.read(uploads.CHUNK_SIZE):
+            yield chunk
+
+    try:
+        path, digest, deduplicated = await uploads.ingest_stream(chunks(), file.filename)
+    except uploads.UploadError as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
     tenant_id = getattr(request.state, "tenant_id", "default")
-    project = create_project(dest, tenant_id=tenant_id)
-    return ProjectCreateResponse(
-        project_id=project.project_id,
-        source=str(dest),
+    project = await run_in_threadpool(
+        _create_upload_project, path, digest, deduplicated, tenant_id,
+    )
+    return _response(project, path, digest, deduplicated)
+
+
+@router.post("/uploads")
+async def start_upload(request: Request, req: UploadSessionRequest):
+    """Open a resumable chunked upload session."""
+    tenant_id = getattr(request.state, "tenant_id", "default")
+    try:
+        return await run_in_threadpool(
+            uploads.start_session, req.filename, req.size, tenant_id=tenant_id,
+        )
+    except uploads.UploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/uploads/{upload_id}")
+async def get_upload(upload_id: str, request: Request):
+    """Return how many bytes of a session have been received."""
+    tenant_id = getattr(request.state, "tenant_id", "default")
+    try:
+        return await run_in_threadpool(uploads.get_session, upload_id, tenant_id=tenant_id)
+    except uploads.UploadError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.put("/uploads/{upload_id}")
+async def put_upload_chunk(upload_id: str, request: Request, offset: int = 0):
+    """Write the raw request body at ``offset`` in the session's file."""
+    tenant_id = getattr(request.state, "tenant_id", "default")
+    data = await request.body()
+    try:
+        received = await run_in_threadpool(
+            uploads.write_chunk, upload_id, offset, data, tenant_id=tenant_id,
+        )
+    except uploads.UploadError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"upload_id": upload_id, "received": received}
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=ProjectCreateResponse)
+async def complete_upload(upload_id: str, request: Request):
+    """Finish a chunked upload and create a project."""
+    tenant_id = getattr(request.state, "tenant_id", "default")
+    try:
+        path, digest, deduplicated = await run_in_threadpool(
+            uploads.finish_session, upload_id, tenant_id=tenant_id,
+        )
+    except uploads.UploadError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    project = await run_in_threadpool(
+        _create_upload_project, path, digest, deduplicated, tenant_id,
     )
+    return _response(project, path, digest, deduplicated)
@@ -0,0 +1,372 @@
+"""Content-addressed upload store.
+
+Uploads are streamed to disk while being hashed (SHA-256) and then filed
+under ``uploads/<digest[:16]>/<filename>``.  Uploading the same bytes
+again — under any name, by any user — resolves to the existing file, so
+everything keyed on the source path or content (the PDF load cache,
+learnings, the tenant's prior results) is reused instead of rebuilt.
+Intermediate agent results are not shared: each project gets its own
+team work directory (see :func:`work_dir_for`).
+
+Large drawing sets can be sent as resumable chunked uploads: a session
+is opened with :func:`start_session`, chunks are written at explicit
+offsets, and :func:`finish_session` files the result like a single-shot
+upload.  Session state lives on disk, so an interrupted client can ask
+for the received offset and continue.
+
+File writes and hashing block, so async routes run these functions in
+the threadpool; :func:`ingest_stream` does so per chunk itself.  Uploads
+are limited to ``max_upload_mb``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = Path("uploads")
+INCOMING_DIR = UPLOAD_DIR / ".incoming"
+MANIFEST_NAME = "manifest.json"
+
+CHUNK_SIZE = 1024 * 1024
+DIGEST_PREFIX_LEN = 16  # Directory name length; full digest is in the manifest
+MAX_UPLOAD_MB = 2048  # Default when config is unavailable
+
+# file_digest() memo keyed by resolved path, invalidated on (size, mtime)
+_digest_cache: dict[str, tuple[tuple[int, int], str]] = {}
+_digest_lock = threading.Lock()
+
+# In-order chunked sessions keep a running hash so completion does not
+# re-read the file; lost on restart, in which case the part is rehashed.
+_session_hashers: dict[str, tuple[int, Any]] = {}
+_session_lock = threading.Lock()
+_manifest_lock = threading.Lock()
+
+
+class UploadError(ValueError):
+    """Invalid upload request (unknown session, bad offset, size mismatch)."""
+
+
+def max_upload_bytes() -> int:
+    """Largest accepted upload, from ``max_upload_mb``."""
+    try:
+        from medina.config import get_config
+
+        return get_config().max_upload_mb * 1024 * 1024
+    except Exception:
+        return MAX_UPLOAD_MB * 1024 * 1024
+
+
+# ── Hashing ───────────────────────────────────────────────────────────
+
+
+def _stat_stamp(path: Path) -> tuple[int, int]:
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def _remember_digest(path: Path, digest: str) -> None:
+    with _digest_lock:
+        _digest_cache[str(path.resolve())] = (_stat_stamp(path), digest)
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 hex digest of a file's content, cached per (size, mtime)."""
+    key = str(path.resolve())
+    stamp = _stat_stamp(path)
+    with _digest_lock:
+        cached = _digest_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+    # Files in the store carry their digest in the manifest
+    manifest = _read_manifest(path.parent)
+    digest = manifest.get("sha256", "") if manifest else ""
+    if not digest or not digest.startswith(path.parent.name):
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+
+    with _digest_lock:
+        _digest_cache[key] = (stamp, digest)
+    return digest
+
+
+# ── Store ─────────────────────────────────────────────────────────────
+
+
+def _safe_filename(filename: str) -> str:
+    name = Path(filename or "upload.pdf").name
+    safe = "".join(c if c.isalnum() or c in "-_. " else "_" for c in name).strip()
+    return safe or "upload.pdf"
+
+
+def _content_dir(digest: str) -> Path:
+    return UPLOAD_DIR / digest[:DIGEST_PREFIX_LEN]
+
+
+def _read_manifest(content_dir: Path) -> dict | None:
+    path = content_dir / MANIFEST_NAME
+    if not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.debug("Unreadable upload manifest %s: %s", path, e)
+        return None
+
+
+def _write_manifest(content_dir: Path, manifest: dict) -> None:
+    tmp = content_dir / (MANIFEST_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, content_dir / MANIFEST_NAME)
+
+
+def lookup(digest: str) -> Path | None:
+    """Return the stored file for *digest*, if present."""
+    manifest = _read_manifest(_content_dir(digest))
+    if not manifest or manifest.get("sha256") != digest:
+        return None
+    path = _content_dir(digest) / manifest.get("filename", "")
+    return path if path.is_file() else None
+
+
+def _commit_part(part_path: Path, digest: str, size: int, filename: str) -> tuple[Path, bool]:
+    """File a fully written part under its digest.
+
+    Returns (stored path, deduplicated).  The part file is consumed.
+    """
+    with _manifest_lock:
+        existing = lookup(digest)
+        if existing is not None:
+            part_path.unlink(missing_ok=True)
+            logger.info("Upload %s matches stored %s", filename, existing)
+            return existing, True
+
+        content_dir = _content_dir(digest)
+        content_dir.mkdir(parents=True, exist_ok=True)
+        dest = content_dir / _safe_filename(filename)
+        os.replace(part_path, dest)
+        _write_manifest(content_dir, {
+            "sha256": digest,
+            "filename": dest.name,
+            "size": size,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "results": {},
+        })
+    _remember_digest(dest, digest)
+    logger.info("Stored upload %s (%d bytes) as %s", filename, size, dest)
+    return dest, False
+
+
+async def ingest_stream(
+    chunks: AsyncIterator[bytes],
+    filename: str,
+) -> tuple[Path, str, bool]:
+    """Write *chunks* to the store, hashing as they are written.
+
+    Writes, hashing and filing run in the threadpool, off the event loop.
+    Returns (stored path, sha256 digest, deduplicated).
+
+    Raises:
+        UploadError: If the upload exceeds :func:`max_upload_bytes`.
+    """
+    limit = max_upload_bytes()
+    part_path = INCOMING_DIR / f"{uuid.uuid4().hex}.part"
+    h = hashlib.sha256()
+    size = 0
+
+    def open_part():
+        INCOMING_DIR.mkdir(parents=True, exist_ok=True)
+        return open(part_path, "wb")
+
+    def write(chunk: bytes) -> None:
+        h.update(chunk)
+        f.write(chunk)
+
+    try:
+        f = await run_in_threadpool(open_part)
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > limit:
+                    raise UploadError(f"Upload exceeds {limit} bytes")
+                await run_in_threadpool(write, chunk)
+        finally:
+            await run_in_threadpool(f.close)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    digest = h.hexdigest()
+    path, deduplicated = await run_in_threadpool(
+        _commit_part, part_path, digest, size, filename,
+    )
+    return path, digest, deduplicated
+
+
+# ── Resumable chunked sessions ────────────────────────────────────────
+
+
+def _session_paths(upload_id: str) -> tuple[Path, Path]:
+    if not upload_id.isalnum():
+        raise UploadError("Invalid upload id")
+    return INCOMING_DIR / f"{upload_id}.part", INCOMING_DIR / f"{upload_id}.json"
+
+
+def start_session(filename: str, size: int, tenant_id: str = "default") -> dict:
+    """Open a chunked upload session for a file of *size* bytes."""
+    if size <= 0:
+        raise UploadError("Upload size must be positive")
+    if size > max_upload_bytes():
+        raise UploadError(f"Upload size exceeds {max_upload_bytes()} bytes")
+    INCOMING_DIR.mkdir(parents=True, exist_ok=True)
+    upload_id = uuid.uuid4().hex
+    part_path, meta_path = _session_paths(upload_id)
+    part_path.touch()
+    meta = {
+        "upload_id": upload_id,
+        "filename": filename,
+        "size": size,
+        "tenant_id": tenant_id,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    with _session_lock:
+        _session_hashers[upload_id] = (0, hashlib.sha256())
+    return {**meta, "received": 0, "chunk_size": CHUNK_SIZE}
+
+
+def get_session(upload_id: str, tenant_id: str | None = None) -> dict:
+    """Return session metadata plus the number of bytes received."""
+    part_path, meta_path = _session_paths(upload_id)
+    if not meta_path.exists():
+        raise UploadError("Unknown upload session")
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if tenant_id and meta.get("tenant_id", "default") != tenant_id:
+        raise UploadError("Unknown upload session")
+    received = part_path.stat().st_size if part_path.exists() else 0
+    return {**meta, "received": received, "chunk_size": CHUNK_SIZE}
+
+
+def write_chunk(upload_id: str, offset: int, data: bytes, tenant_id: str | None = None) -> int:
+    """Write *data* at *offset*; returns total bytes received.
+
+    Offsets must not skip ahead of what has been received, so a client
+    resumes from :func:`get_session`'s ``received``.  Re-sending an
+    already received range overwrites it.
+    """
+    session = get_session(upload_id, tenant_id)
+    received = session["received"]
+    if offset < 0 or offset > received:
+        raise UploadError(f"Offset {offset} does not match received {received}")
+    if offset + len(data) > session["size"]:
+        raise UploadError("Chunk extends past declared upload size")
+
+    part_path, _ = _session_paths(upload_id)
+    with open(part_path, "r+b") as f:
+        f.seek(offset)
+        f.write(data)
+
+    with _session_lock:
+        state = _session_hashers.get(upload_id)
+        if state is not None and state[0] == offset:
+            state[1].update(data)
+            _session_hashers[upload_id] = (offset + len(data), state[1])
+        else:
+            # Out-of-order or resumed after restart — rehash at completion
+            _session_hashers.pop(upload_id, None)
+    return max(received, offset + len(data))
+
+
+def finish_session(upload_id: str, tenant_id: str | None = None) -> tuple[Path, str, bool]:
+    """Complete a session; returns (stored path, digest, deduplicated)."""
+    session = get_session(upload_id, tenant_id)
+    if session["received"] != session["size"]:
+        raise UploadError(
+            f"Upload incomplete: {session['received']} of {session['size']} bytes"
+        )
+    part_path, meta_path = _session_paths(upload_id)
+
+    with _session_lock:
+        state = _session_hashers.pop(upload_id, None)
+    if state is not None and state[0] == session["size"]:
+        digest = state[1].hexdigest()
+    else:
+        h = hashlib.sha256()
+        with open(part_path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+
+    path, deduplicated = _commit_part(part_path, digest, session["size"], session["filename"])
+    meta_path.unlink(missing_ok=True)
+    return path, digest, deduplicated
+
+
+# ── Artifacts of prior runs ───────────────────────────────────────────
+
+
+def store_digest(source_path: Path) -> str | None:
+    """Digest of *source_path* if it lives in the upload store, else None."""
+    try:
+        if source_path.resolve().parent.parent != UPLOAD_DIR.resolve():
+            return None
+        manifest = _read_manifest(source_path.parent)
+    except OSError:
+        return None
+    if not manifest or manifest.get("filename") != source_path.name:
+        return None
+    return manifest.get("sha256")
+
+
+def work_dir_for(digest: str, project_id: str) -> str:
+    """Team work directory for one project on stored content.
+
+    Per project, not per content: intermediate agent results are shaped
+    by the tenant's correction hints and reloaded on partial reprocess,
+    so they must not be shared across tenants or raced on by two runs.
+    """
+    return f"output/team_work_{digest[:DIGEST_PREFIX_LEN]}_{project_id}"
+
+
+def record_result(source_path: Path, tenant_id: str, output_path: str) -> None:
+    """Remember *output_path* as the latest result for the stored content."""
+    digest = store_digest(source_path)
+    if not digest:
+        return
+    content_dir = _content_dir(digest)
+    with _manifest_lock:
+        manifest = _read_manifest(content_dir)
+        if not manifest:
+            return
+        manifest.setdefault("results", {})[tenant_id] = {
+            "output_path": output_path,
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+        }
+        _write_manifest(content_dir, manifest)
+
+
+def prior_result(digest: str, tenant_id: str) -> str | None:
+    """Output path of this tenant's latest completed run on *digest*."""
+    manifest = _read_manifest(_content_dir(digest))
+    if not manifest:
+        return None
+    entry = manifest.get("results", {}).get(tenant_id)
+    return entry.get("output_path") if entry else None
@@ -24,6 +24,20 @@ class MedinaConfig(BaseSettings):
     anthropic_api_key: str = ""
     vision_model: str = "claude-sonnet-4-6"
     render_dpi: int = 300
+    # Page primitive extraction (see medina.pdf.primitives): "auto" reads
+    # dense pages with PyMuPDF and the rest with pdfplumber; "fitz" or
+    # "pdfplumber" force one backend for every page
+    pdf_backend: str = "auto"
+    # Rendered page rasters are kept memory-mapped on disk and shared by
+    # every crop, encoding and re-run (see medina.pdf.raster_store).
+    # With the store on, the first request for a page rasterizes the
+    # whole page even when only a clip is wanted; later clips are cut
+    # from it.  Turn it off to render clips only, with no reuse.
+    raster_store: bool = True
+    raster_store_dir: str = "output/rasters"
+    raster_store_max_mb: int = 4096
+    # Largest accepted upload, single-shot or chunked (see medina.api.uploads)
+    max_upload_mb: int = 2048
     use_vision_counting: bool = False
     output_format: str = "both"  # "excel", "json", "both"
     qa_confidence_threshold: float = 0.95
@@ -38,6 +52,24 @@ class MedinaConfig(BaseSettings):
     gemini_vision_model: str = "gemini-2.5-flash"
     openrouter_api_key: str = ""
     openrouter_base_url: str = "https://openrouter.ai/api/v1"
+    vlm_timeout_seconds: float = 300.0  # per VLM request
+    # With a fallback provider: route by latency and duplicate slow
+    # requests to it (see medina.vlm_routing); the delay applies until
+    # p95 stats exist.  Off by default: hedges are extra paid requests
+    # and may be answered by the fallback model.
+    vlm_hedge: bool = False
+    vlm_hedge_delay_seconds: float = 45.0
+    # Per-page vision passes render and send concurrently (see
+    # medina.vlm_dispatch): render threads, in-flight requests (hedges
+    # included: with vlm_hedge on, half as many senders), and rendered
+    # pages allowed to wait for a sender.  Rendering holds the GIL, so
+    # more than one render worker rarely helps.
+    vlm_render_workers: int = 1
+    vlm_concurrency: int = 4
+    vlm_queue_depth: int = 4
+    # Per-use-case VLM image encoding overrides (see medina.vlm_payload),
+    # e.g. {"schedule": "png:RGB", "classify": "webp:L:80"}
+    vlm_image_encodings: dict[str, str] = {}
 
     @property
     def has_vlm_key(self) -> bool:
@@ -56,6 +88,17 @@ class MedinaConfig(BaseSettings):
     jwt_secret_key: str = ""  # MEDINA_JWT_SECRET_KEY (auto-generated if empty)
     jwt_expiry_hours: int = 8  # MEDINA_JWT_EXPIRY_HOURS
 
+    # Tracing (see medina.tracing)
+    trace_enabled: bool = False
+    trace_dir: str = "output/traces"
+    trace_profile: bool = False  # cProfile each stage/agent span
+
+    # /metrics carries per-tenant series, so scrapers must send
+    # "Authorization: Bearer <metrics_token>" or connect from an allowed
+    # address (the direct peer — behind a proxy, use the token)
+    metrics_token: str = ""
+    metrics_allowed_ips: list[str] = ["127.0.0.1", "::1"]
+
     schedule_include_keywords: list[str] = [
         "luminaire schedule",
         "light fixture schedule",
@@ -156,17 +156,14 @@ async def llm_verify(
     )
 
     try:
-        import anthropic
-
-        client = anthropic.AsyncAnthropic(api_key=config.anthropic_api_key)
-        response = await client.messages.create(
-            model=_VERIFY_MODEL,
-            max_tokens=_MAX_TOKENS,
-            system=_SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": prompt}],
+        from medina.vlm_client import VlmClient
+
+        client = VlmClient("anthropic", config.anthropic_api_key, _VERIFY_MODEL)
+        response = await client.avision_query(
+            [], prompt, max_tokens=_MAX_TOKENS, system=_SYSTEM_PROMPT,
         )
 
-        response_text = response.content[0].text.strip()
+        response_text = response.strip()
         llm_result = _parse_llm_response(response_text)
 
     except Exception as exc:
@@ -99,7 +99,7 @@ class CoveResult:
         if self.issues:
             try:
                 from medina.db.vector_store import (
-                    add_document,
+                    enqueue_document,
                     COVE_FINDINGS_COLLECTION,
                 )
                 doc_text = "; ".join(
@@ -107,7 +107,7 @@ class CoveResult:
                     for i in self.issues
                 )
                 doc_id = f"cove_{project_id}_{agent_name}"
-                add_document(
+                enqueue_document(
                     COVE_FINDINGS_COLLECTION,
                     doc_id=doc_id,
                     text=doc_text,
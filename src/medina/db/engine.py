@@ -1,11 +1,25 @@
-"""SQLite connection management for Medina."""
+"""SQLite connection management for Medina.
+
+Connections come from a bounded pool shared by all threads (Starlette's
+threadpool, pipeline threads).  Repository code borrows one per call via
+:func:`connection`; :func:`transaction` pins a single connection to the
+current thread so several repository calls commit together, and
+:class:`UnitOfWork` defers writes so a whole pipeline run lands in one
+short transaction.
+"""
 from __future__ import annotations
 
 import logging
+import queue
 import sqlite3
 import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any
 
+from medina import metrics
 from medina.db.schema import INDEXES, TABLES
 
 logger = logging.getLogger(__name__)
@@ -13,6 +27,15 @@ logger = logging.getLogger(__name__)
 _DB_PATH: Path | None = None
 _local = threading.local()
 
+# Pool and pragma tuning
+_POOL_MAX_SIZE = 8
+_POOL_ACQUIRE_TIMEOUT = 30.0  # Seconds to wait for a free connection
+_BUSY_TIMEOUT_MS = 5000  # Wait on a locked DB instead of failing immediately
+_MMAP_SIZE = 256 * 1024 * 1024
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
 
 def _get_db_path() -> Path:
     """Return the configured DB path, falling back to default."""
@@ -66,24 +89,247 @@ def init_db(db_path: str | Path | None = None) -> None:
         conn.close()
 
 
-def get_conn() -> sqlite3.Connection:
-    """Get a thread-local SQLite connection.
+def _open_connection(path: Path) -> sqlite3.Connection:
+    """Open a connection with Medina's pragmas applied."""
+    # check_same_thread=False: pooled connections move between threads,
+    # but the pool guarantees only one thread uses a connection at a time.
+    conn = sqlite3.connect(
+        str(path),
+        timeout=_BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    # WAL + NORMAL only fsyncs at checkpoints — durable across app crashes.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={_BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA mmap_size={_MMAP_SIZE}")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections with health checks on checkout."""
+
+    def __init__(self, path: Path, max_size: int = _POOL_MAX_SIZE) -> None:
+        self.path = path
+        self.max_size = max_size
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def acquire(self, timeout: float = _POOL_ACQUIRE_TIMEOUT) -> sqlite3.Connection:
+        """Check out a healthy connection, opening one if under max_size."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._create_or_wait(timeout)
+            if self._is_healthy(conn):
+                return conn
+            self._discard(conn)
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection; any open transaction is rolled back."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        if self._closed:
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close all idle connections; checked-out ones close on release."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": self._created,
+            "idle": self._idle.qsize(),
+            "max_size": self.max_size,
+        }
+
+    def _create_or_wait(self, timeout: float) -> sqlite3.Connection:
+        with self._lock:
+            if self._created < self.max_size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return _open_connection(self.path)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        start = time.perf_counter()
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"SQLite connection pool exhausted ({self.max_size} in use)"
+            ) from None
+        finally:
+            metrics.SQLITE_POOL_WAIT.observe(time.perf_counter() - start)
 
-    Each thread gets its own connection (SQLite is not thread-safe by
-    default).  Connections are reused within the same thread.
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+
+def _get_pool() -> ConnectionPool:
+    global _pool
+    path = _get_db_path()
+    with _pool_lock:
+        if _pool is None or _pool.path != path:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(path)
+        return _pool
+
+
+def _count_lock_error(exc: BaseException) -> None:
+    """Count writes that gave up on the SQLite lock after busy_timeout."""
+    if isinstance(exc, sqlite3.OperationalError) and "locked" in str(exc):
+        metrics.SQLITE_LOCK_ERRORS.inc()
+
+
+@contextmanager
+def connection() -> Iterator[sqlite3.Connection]:
+    """Borrow a pooled connection for one repository operation.
+
+    Commits on success and rolls back on error.  Inside :func:`transaction`
+    the thread's pinned connection is yielded and the commit is left to the
+    enclosing transaction.
     """
-    if not hasattr(_local, "conn") or _local.conn is None:
-        path = _get_db_path()
-        _local.conn = sqlite3.connect(str(path))
-        _local.conn.execute("PRAGMA journal_mode=WAL")
-        _local.conn.execute("PRAGMA foreign_keys=ON")
-        _local.conn.row_factory = sqlite3.Row
-    return _local.conn
+    pinned = getattr(_local, "tx_conn", None)
+    if pinned is not None:
+        yield pinned
+        return
+
+    pool = _get_pool()
+    conn = pool.acquire()
+    try:
+        yield conn
+        conn.commit()
+    except BaseException as exc:
+        _count_lock_error(exc)
+        conn.rollback()
+        raise
+    finally:
+        pool.release(conn)
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """Run every repository call on this thread in a single transaction.
+
+    Nested calls join the outer transaction.  Commits once on exit and
+    rolls everything back if the block raises.
+    """
+    if getattr(_local, "tx_conn", None) is not None:
+        yield _local.tx_conn
+        return
+
+    pool = _get_pool()
+    conn = pool.acquire()
+    _local.tx_conn = conn
+    _local.tx_callbacks = []
+    try:
+        yield conn
+        conn.commit()
+        callbacks = _local.tx_callbacks
+    except BaseException as exc:
+        _count_lock_error(exc)
+        conn.rollback()
+        raise
+    finally:
+        _local.tx_conn = None
+        _local.tx_callbacks = None
+        pool.release(conn)
+    for callback in callbacks:
+        callback()
+
+
+def on_commit(callback: Callable[[], None]) -> None:
+    """Run *callback* once the current write is durable.
+
+    Inside :func:`transaction` it is deferred until the outer commit (and
+    dropped on rollback); otherwise it runs immediately.
+    """
+    callbacks = getattr(_local, "tx_callbacks", None)
+    if callbacks is not None:
+        callbacks.append(callback)
+    else:
+        callback()
+
+
+class UnitOfWork:
+    """Deferred repository writes committed together in one transaction.
+
+    Long-running callers (a pipeline run) record writes with :meth:`add`
+    as they go and :meth:`commit` at the end, so the write lock is held
+    only for the final batch instead of for the whole run.
+    """
+
+    def __init__(self) -> None:
+        self._ops: list[tuple[Callable[..., Any], tuple, dict]] = []
+        self._lock = threading.Lock()
+
+    def add(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """Record a repository call to run at commit time."""
+        with self._lock:
+            self._ops.append((func, args, kwargs))
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    def commit(self) -> int:
+        """Execute all recorded calls in one transaction.  Returns the count."""
+        with self._lock:
+            ops, self._ops = self._ops, []
+        if not ops:
+            return 0
+        with transaction():
+            for func, args, kwargs in ops:
+                func(*args, **kwargs)
+        return len(ops)
+
+
+def pool_stats() -> dict[str, int]:
+    """Return size/idle/max_size of the connection pool."""
+    return _get_pool().stats()
 
 
 def close_db() -> None:
-    """Close the thread-local connection (if any)."""
-    if hasattr(_local, "conn") and _local.conn is not None:
-        _local.conn.close()
-        _local.conn = None
-        logger.info("Database connection closed")
+    """Close all pooled connections."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+            logger.info("Database connection pool closed")
@@ -11,7 +11,7 @@ import json
 import logging
 from pathlib import Path
 
-from medina.db.engine import get_conn
+from medina.db.engine import transaction
 from medina.db import repositories as repo
 
 logger = logging.getLogger(__name__)
@@ -69,18 +69,19 @@ def run_migration() -> None:
                     data = json.load(f)
                 project_id = data.get("project_id", path.stem)
                 source_path = data.get("source_path", "")
-                for correction in data.get("corrections", []):
-                    repo.add_correction(
-                        project_id=project_id,
-                        source_key="",
-                        action=correction.get("action", ""),
-                        fixture_code=correction.get("fixture_code", ""),
-                        reason=correction.get("reason", "other"),
-                        reason_detail=correction.get("reason_detail", ""),
-                        fixture_data=correction.get("fixture_data"),
-                        spec_patches=correction.get("spec_patches"),
-                        origin="migrated",
-                    )
+                with transaction():
+                    for correction in data.get("corrections", []):
+                        repo.add_correction(
+                            project_id=project_id,
+                            source_key="",
+                            action=correction.get("action", ""),
+                            fixture_code=correction.get("fixture_code", ""),
+                            reason=correction.get("reason", "other"),
+                            reason_detail=correction.get("reason_detail", ""),
+                            fixture_data=correction.get("fixture_data"),
+                            spec_patches=correction.get("spec_patches"),
+                            origin="migrated",
+                        )
                 migrated += 1
                 logger.info("Migrated feedback: %s", path.name)
             except Exception as e:
@@ -1,15 +1,20 @@
 """CRUD functions for all database domains.
 
 Grouped by domain: chat, corrections, learnings, cove, plans, params.
+
+Each function borrows a pooled connection via ``engine.connection()`` and
+commits on return; wrap calls in ``engine.transaction()`` (or queue them
+on an ``engine.UnitOfWork``) to commit several writes together.
 """
 from __future__ import annotations
 
 import json
 import logging
+import threading
 from datetime import datetime, timezone
 from typing import Any
 
-from medina.db.engine import get_conn
+from medina.db.engine import connection, on_commit
 
 logger = logging.getLogger(__name__)
 
@@ -29,27 +34,26 @@ def upsert_project(
     project_name: str = "",
     status: str = "pending",
 ) -> None:
-    conn = get_conn()
-    conn.execute(
-        """\
-        INSERT INTO projects (id, source_path, source_key, project_name, status, created_at, updated_at)
-        VALUES (?, ?, ?, ?, ?, datetime('now'), datetime('now'))
-        ON CONFLICT(id) DO UPDATE SET
-            source_path=excluded.source_path,
-            source_key=excluded.source_key,
-            project_name=excluded.project_name,
-            status=excluded.status,
-            updated_at=datetime('now')
-        """,
-        (project_id, source_path, source_key, project_name, status),
-    )
-    conn.commit()
+    with connection() as conn:
+        conn.execute(
+            """\
+            INSERT INTO projects (id, source_path, source_key, project_name, status, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, datetime('now'), datetime('now'))
+            ON CONFLICT(id) DO UPDATE SET
+                source_path=excluded.source_path,
+                source_key=excluded.source_key,
+                project_name=excluded.project_name,
+                status=excluded.status,
+                updated_at=datetime('now')
+            """,
+            (project_id, source_path, source_key, project_name, status),
+        )
 
 
 def get_project(project_id: str) -> dict | None:
-    conn = get_conn()
-    row = conn.execute("SELECT * FROM projects WHERE id=?", (project_id,)).fetchone()
-    return dict(row) if row else None
+    with connection() as conn:
+        row = conn.execute("SELECT * FROM projects WHERE id=?", (project_id,)).fetchone()
+        return dict(row) if row else None
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -64,64 +68,75 @@ def add_chat_message(
     context_snapshot: dict | None = None,
     metadata: dict | None = None,
 ) -> int:
-    conn = get_conn()
-    cur = conn.execute(
-        """\
-        INSERT INTO chat_messages (project_id, role, content, intent, context_snapshot, metadata)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """,
-        (
-            project_id,
-            role,
-            content,
-            intent,
-            json.dumps(context_snapshot) if context_snapshot else None,
-            json.dumps(metadata) if metadata else None,
-        ),
-    )
-    conn.commit()
-    return cur.lastrowid or 0
+    with connection() as conn:
+        cur = conn.execute(
+            """\
+            INSERT INTO chat_messages (project_id, role, content, intent, context_snapshot, metadata)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                project_id,
+                role,
+                content,
+                intent,
+                json.dumps(context_snapshot) if context_snapshot else None,
+                json.dumps(metadata) if metadata else None,
+            ),
+        )
+        return cur.lastrowid or 0
 
 
 def get_chat_history(project_id: str, limit: int = 50) -> list[dict]:
-    conn = get_conn()
-    rows = conn.execute(
-        """\
-        SELECT id, role, content, intent, context_snapshot, metadata, created_at
-        FROM chat_messages WHERE project_id=?
-        ORDER BY id ASC LIMIT ?
-        """,
-        (project_id, limit),
-    ).fetchall()
-    result = []
-    for row in rows:
-        d = dict(row)
-        if d.get("context_snapshot"):
-            d["context_snapshot"] = json.loads(d["context_snapshot"])
-        if d.get("metadata"):
-            d["metadata"] = json.loads(d["metadata"])
-        result.append(d)
-    return result
+    with connection() as conn:
+        rows = conn.execute(
+            """\
+            SELECT id, role, content, intent, context_snapshot, metadata, created_at
+            FROM chat_messages WHERE project_id=?
+            ORDER BY id ASC LIMIT ?
+            """,
+            (project_id, limit),
+        ).fetchall()
+        result = []
+        for row in rows:
+            d = dict(row)
+            if d.get("context_snapshot"):
+                d["context_snapshot"] = json.loads(d["context_snapshot"])
+            if d.get("metadata"):
+                d["metadata"] = json.loads(d["metadata"])
+            result.append(d)
+        return result
 
 
 def get_recent_chat(project_id: str, n: int = 10) -> list[dict]:
     """Get the most recent N chat messages for context building."""
-    conn = get_conn()
-    rows = conn.execute(
-        """\
-        SELECT role, content, intent FROM chat_messages
-        WHERE project_id=?
-        ORDER BY id DESC LIMIT ?
-        """,
-        (project_id, n),
-    ).fetchall()
-    return [dict(r) for r in reversed(rows)]
+    with connection() as conn:
+        rows = conn.execute(
+            """\
+            SELECT role, content, intent FROM chat_messages
+            WHERE project_id=?
+            ORDER BY id DESC LIMIT ?
+            """,
+            (project_id, n),
+        ).fetchall()
+        return [dict(r) for r in reversed(rows)]
 
 
 # ══════════════════════════════════════════════════════════════════════
 #  Corrections (per-project feedback)
+#
+#  The corrections table is an append-only journal: the AUTOINCREMENT id
+#  is the sequence number, rows are never updated, and per-project order
+#  is ``ORDER BY id``.
 # ══════════════════════════════════════════════════════════════════════
 
+_CORRECTION_INSERT = """\
+    INSERT INTO corrections
+        (project_id, source_key, action, fixture_code, reason, reason_detail,
+         fixture_data, spec_patches, origin)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+
 def add_correction(
     project_id: str,
     source_key: str,
@@ -133,57 +148,125 @@ def add_correction(
     spec_patches: dict | None = None,
     origin: str = "user",
 ) -> int:
-    conn = get_conn()
-    cur = conn.execute(
-        """\
-        INSERT INTO corrections
-            (project_id, source_key, action, fixture_code, reason, reason_detail,
-             fixture_data, spec_patches, origin)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            project_id,
-            source_key,
-            action,
-            fixture_code,
-            reason,
-            reason_detail,
-            json.dumps(fixture_data or {}),
-            json.dumps(spec_patches or {}),
-            origin,
-        ),
-    )
-    conn.commit()
-    return cur.lastrowid or 0
-
-
-def get_corrections(project_id: str) -> list[dict]:
-    conn = get_conn()
-    rows = conn.execute(
-        "SELECT * FROM corrections WHERE project_id=? ORDER BY id",
-        (project_id,),
-    ).fetchall()
-    result = []
-    for row in rows:
-        d = dict(row)
-        d["fixture_data"] = json.loads(d.get("fixture_data") or "{}")
-        d["spec_patches"] = json.loads(d.get("spec_patches") or "{}")
-        result.append(d)
-    return result
+    with connection() as conn:
+        cur = conn.execute(
+            _CORRECTION_INSERT,
+            (
+                project_id,
+                source_key,
+                action,
+                fixture_code,
+                reason,
+                reason_detail,
+                json.dumps(fixture_data or {}),
+                json.dumps(spec_patches or {}),
+                origin,
+            ),
+        )
+        return cur.lastrowid or 0
+
+
+def append_corrections(
+    project_id: str,
+    source_key: str,
+    corrections: list[dict],
+    origin: str = "user",
+) -> list[int]:
+    """Append corrections to the journal on one connection.
+
+    Each dict carries action, fixture_code, reason, reason_detail,
+    fixture_data and spec_patches.  Returns the new sequence numbers in
+    order.
+    """
+    seqs: list[int] = []
+    with connection() as conn:
+        for corr in corrections:
+            cur = conn.execute(
+                _CORRECTION_INSERT,
+                (
+                    project_id,
+                    source_key,
+                    corr["action"],
+                    corr["fixture_code"],
+                    corr.get("reason", "other"),
+                    corr.get("reason_detail", ""),
+                    json.dumps(corr.get("fixture_data") or {}),
+                    json.dumps(corr.get("spec_patches") or {}),
+                    origin,
+                ),
+            )
+            seqs.append(cur.lastrowid)
+    return seqs
+
+
+def get_corrections(project_id: str, after_seq: int = 0) -> list[dict]:
+    """Journal rows for a project in order, optionally only after *after_seq*."""
+    with connection() as conn:
+        rows = conn.execute(
+            "SELECT * FROM corrections WHERE project_id=? AND id>? ORDER BY id",
+            (project_id, after_seq),
+        ).fetchall()
+        result = []
+        for row in rows:
+            d = dict(row)
+            d["fixture_data"] = json.loads(d.get("fixture_data") or "{}")
+            d["spec_patches"] = json.loads(d.get("spec_patches") or "{}")
+            result.append(d)
+        return result
+
+
+def get_correction_journal_state(project_id: str) -> tuple[int, int]:
+    """Return (row count, last sequence number) of a project's journal."""
+    with connection() as conn:
+        row = conn.execute(
+            "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM corrections WHERE project_id=?",
+            (project_id,),
+        ).fetchone()
+        return row[0], row[1]
 
 
 def delete_correction(correction_id: int) -> bool:
-    conn = get_conn()
-    cur = conn.execute("DELETE FROM corrections WHERE id=?", (correction_id,))
-    conn.commit()
-    return cur.rowcount > 0
+    with connection() as conn:
+        cur = conn.execute("DELETE FROM corrections WHERE id=?", (correction_id,))
+        return cur.rowcount > 0
 
 
 def clear_corrections(project_id: str) -> int:
-    conn = get_conn()
-    cur = conn.execute("DELETE FROM corrections WHERE project_id=?", (project_id,))
-    conn.commit()
-    return cur.rowcount
+    with connection() as conn:
+        cur = conn.execute("DELETE FROM corrections WHERE project_id=?", (project_id,))
+        conn.execute("DELETE FROM feedback_hints WHERE project_id=?", (project_id,))
+        return cur.rowcount
+
+
+def get_hints_snapshot(project_id: str) -> dict | None:
+    """Materialized hints for a project: last_seq, n_corrections, hints_json."""
+    with connection() as conn:
+        row = conn.execute(
+            "SELECT last_seq, n_corrections, hints_json FROM feedback_hints WHERE project_id=?",
+            (project_id,),
+        ).fetchone()
+        return dict(row) if row else None
+
+
+def save_hints_snapshot(
+    project_id: str,
+    last_seq: int,
+    n_corrections: int,
+    hints_json: str,
+) -> None:
+    with connection() as conn:
+        conn.execute(
+            """\
+            INSERT INTO feedback_hints (project_id, last_seq, n_corrections, hints_json)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(project_id) DO UPDATE SET
+                last_seq=excluded.last_seq,
+                n_corrections=excluded.n_corrections,
+                hints_json=excluded.hints_json,
+                updated_at=datetime('now')
+            """,
+            (project_id, last_seq, n_corrections, hints_json),
+        )
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -197,56 +280,140 @@ def upsert_learning(
     corrections_json: str = "[]",
     times_applied: int = 0,
 ) -> None:
-    conn = get_conn()
-    conn.execute(
-        """\
-        INSERT INTO learnings (source_key, source_name, source_path, corrections_json, times_applied)
-        VALUES (?, ?, ?, ?, ?)
-        ON CONFLICT(source_key) DO UPDATE SET
-            source_name=excluded.source_name,
-            source_path=excluded.source_path,
-            corrections_json=excluded.corrections_json,
-            times_applied=excluded.times_applied,
-            updated_at=datetime('now')
-        """,
-        (source_key, source_name, source_path, corrections_json, times_applied),
-    )
-    conn.commit()
+    with connection() as conn:
+        conn.execute(
+            """\
+            INSERT INTO learnings (source_key, source_name, source_path, corrections_json, times_applied)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(source_key) DO UPDATE SET
+                source_name=excluded.source_name,
+                source_path=excluded.source_path,
+                corrections_json=excluded.corrections_json,
+                times_applied=excluded.times_applied,
+                updated_at=datetime('now')
+            """,
+            (source_key, source_name, source_path, corrections_json, times_applied),
+        )
 
 
 def get_learning(source_key: str) -> dict | None:
-    conn = get_conn()
-    row = conn.execute(
-        "SELECT * FROM learnings WHERE source_key=?", (source_key,),
-    ).fetchone()
-    if row is None:
-        return None
-    d = dict(row)
-    d["corrections"] = json.loads(d.pop("corrections_json", "[]"))
-    return d
+    with connection() as conn:
+        row = conn.execute(
+            "SELECT * FROM learnings WHERE source_key=?", (source_key,),
+        ).fetchone()
+        if row is None:
+            return None
+        d = dict(row)
+        d["corrections"] = json.loads(d.pop("corrections_json", "[]"))
+        return d
 
 
 def get_all_learnings() -> list[dict]:
-    conn = get_conn()
-    rows = conn.execute("SELECT * FROM learnings ORDER BY source_key").fetchall()
-    result = []
-    for row in rows:
-        d = dict(row)
-        d["corrections"] = json.loads(d.pop("corrections_json", "[]"))
-        result.append(d)
-    return result
+    with connection() as conn:
+        rows = conn.execute("SELECT * FROM learnings ORDER BY source_key").fetchall()
+        result = []
+        for row in rows:
+            d = dict(row)
+            d["corrections"] = json.loads(d.pop("corrections_json", "[]"))
+            result.append(d)
+        return result
 
 
 def increment_learning_applied(source_key: str) -> None:
-    conn = get_conn()
-    conn.execute(
-        """\
-        UPDATE learnings SET times_applied = times_applied + 1,
-        updated_at = datetime('now') WHERE source_key=?
-        """,
-        (source_key,),
-    )
-    conn.commit()
+    with connection() as conn:
+        conn.execute(
+            """\
+            UPDATE learnings SET times_applied = times_applied + 1,
+            updated_at = datetime('now') WHERE source_key=?
+            """,
+            (source_key,),
+        )
+
+
+def rekey_source(old_key: str, new_key: str) -> int:
+    """Move everything stored under source key *old_key* to *new_key*.
+
+    A learnings row merges into an existing *new_key* row (corrections
+    already there are not repeated), source-scoped params keep their
+    *new_key* value where both exist, and each pattern aggregate counts
+    the source once.  One transaction.  Returns the number of rows moved.
+    """
+    moved = 0
+    with connection() as conn:
+        old = conn.execute(
+            "SELECT corrections_json, times_applied FROM learnings WHERE source_key=?",
+            (old_key,),
+        ).fetchone()
+        if old is not None:
+            new = conn.execute(
+                "SELECT corrections_json, times_applied FROM learnings WHERE source_key=?",
+                (new_key,),
+            ).fetchone()
+            if new is None:
+                conn.execute(
+                    "UPDATE learnings SET source_key=? WHERE source_key=?",
+                    (new_key, old_key),
+                )
+            else:
+                kept = json.loads(new["corrections_json"])
+                merged = [
+                    c for c in json.loads(old["corrections_json"]) if c not in kept
+                ] + kept
+                conn.execute(
+                    """\
+                    UPDATE learnings SET corrections_json=?, times_applied=?,
+                    updated_at=datetime('now') WHERE source_key=?
+                    """,
+                    (
+                        json.dumps(merged),
+                        max(old["times_applied"], new["times_applied"]),
+                        new_key,
+                    ),
+                )
+                conn.execute("DELETE FROM learnings WHERE source_key=?", (old_key,))
+            moved += 1
+
+        params_moved = conn.execute(
+            "UPDATE OR IGNORE runtime_params SET scope_key=? "
+            "WHERE scope='source_key' AND scope_key=?",
+            (new_key, old_key),
+        ).rowcount
+        params_moved += conn.execute(
+            "DELETE FROM runtime_params WHERE scope='source_key' AND scope_key=?",
+            (old_key,),
+        ).rowcount
+        moved += params_moved
+
+        for table in ("corrections", "projects"):
+            moved += conn.execute(
+                f"UPDATE {table} SET source_key=? WHERE source_key=?", (new_key, old_key),
+            ).rowcount
+
+        seen = conn.execute(
+            "SELECT category, fixture_code FROM pattern_aggregate_sources WHERE source_key=?",
+            (old_key,),
+        ).fetchall()
+        for row in seen:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO pattern_aggregate_sources "
+                "(category, fixture_code, source_key) VALUES (?, ?, ?)",
+                (row["category"], row["fixture_code"], new_key),
+            )
+            if cur.rowcount == 0:  # Already counted under the new key
+                conn.execute(
+                    """\
+                    UPDATE pattern_aggregates SET source_count = source_count - 1,
+                    updated_at = datetime('now') WHERE category=? AND fixture_code=?
+                    """,
+                    (row["category"], row["fixture_code"]),
+                )
+        conn.execute(
+            "DELETE FROM pattern_aggregate_sources WHERE source_key=?", (old_key,),
+        )
+        moved += len(seen)
+    if params_moved:
+        on_commit(_bump_params_version)
+    return moved
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -262,45 +429,152 @@ def upsert_global_pattern(
     global_hint: dict | None = None,
     source_keys: list | None = None,
 ) -> None:
-    conn = get_conn()
-    conn.execute(
-        """\
-        INSERT INTO global_patterns
-            (pattern_type, fixture_code, description, source_count,
-             examples_json, global_hint_json, source_keys_json)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(pattern_type, fixture_code) DO UPDATE SET
-            description=excluded.description,
-            source_count=excluded.source_count,
-            examples_json=excluded.examples_json,
-            global_hint_json=excluded.global_hint_json,
-            source_keys_json=excluded.source_keys_json,
-            updated_at=datetime('now')
-        """,
-        (
-            pattern_type,
-            fixture_code,
-            description,
-            source_count,
-            json.dumps(examples or []),
-            json.dumps(global_hint or {}),
-            json.dumps(source_keys or []),
-        ),
-    )
-    conn.commit()
+    with connection() as conn:
+        conn.execute(
+            """\
+            INSERT INTO global_patterns
+                (pattern_type, fixture_code, description, source_count,
+                 examples_json, global_hint_json, source_keys_json)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(pattern_type, fixture_code) DO UPDATE SET
+                description=excluded.description,
+                source_count=excluded.source_count,
+                examples_json=excluded.examples_json,
+                global_hint_json=excluded.global_hint_json,
+                source_keys_json=excluded.source_keys_json,
+                updated_at=datetime('now')
+            """,
+            (
+                pattern_type,
+                fixture_code,
+                description,
+                source_count,
+                json.dumps(examples or []),
+                json.dumps(global_hint or {}),
+                json.dumps(source_keys or []),
+            ),
+        )
+    on_commit(_bump_global_patterns_version)
 
 
 def get_all_global_patterns() -> list[dict]:
-    conn = get_conn()
-    rows = conn.execute("SELECT * FROM global_patterns ORDER BY id").fetchall()
-    result = []
-    for row in rows:
+    with connection() as conn:
+        rows = conn.execute("SELECT * FROM global_patterns ORDER BY id").fetchall()
+        result = []
+        for row in rows:
+            d = dict(row)
+            d["examples"] = json.loads(d.pop("examples_json", "[]"))
+            d["global_hint"] = json.loads(d.pop("global_hint_json", "{}"))
+            d["source_keys"] = json.loads(d.pop("source_keys_json", "[]"))
+            result.append(d)
+        return result
+
+
+# Bumped on every global pattern write so the cached global hints
+# (api.patterns.get_global_hints) are rebuilt only when patterns change.
+_global_patterns_version = 0
+_global_patterns_version_lock = threading.Lock()
+
+
+def _bump_global_patterns_version() -> None:
+    global _global_patterns_version
+    with _global_patterns_version_lock:
+        _global_patterns_version += 1
+
+
+def get_global_patterns_version() -> int:
+    """Return the current global-pattern write version."""
+    return _global_patterns_version
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  Pattern aggregates
+# ══════════════════════════════════════════════════════════════════════
+
+def add_pattern_observations(
+    observations: list[tuple[str, str, str, dict | None]],
+    max_examples: int = 5,
+) -> dict[tuple[str, str], int]:
+    """Fold (category, fixture_code, source_key, example) rows into the aggregates.
+
+    Each distinct source counts once per (category, fixture_code); examples
+    are appended until *max_examples* is reached.  One transaction for the
+    whole batch.  Returns {(category, fixture_code): source_count} for every
+    aggregate touched.
+    """
+    with connection() as conn:
+        touched: dict[tuple[str, str], int] = {}
+        for category, fixture_code, source_key, example in observations:
+            cur = conn.execute(
+                """\
+                INSERT OR IGNORE INTO pattern_aggregate_sources (category, fixture_code, source_key)
+                VALUES (?, ?, ?)
+                """,
+                (category, fixture_code, source_key),
+            )
+            new_source = 1 if cur.rowcount > 0 else 0
+            row = conn.execute(
+                "SELECT source_count, examples_json FROM pattern_aggregates "
+                "WHERE category=? AND fixture_code=?",
+                (category, fixture_code),
+            ).fetchone()
+            examples = json.loads(row["examples_json"]) if row else []
+            if example is not None and len(examples) < max_examples:
+                examples.append(example)
+            if row is None:
+                conn.execute(
+                    """\
+                    INSERT INTO pattern_aggregates (category, fixture_code, source_count, examples_json)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (category, fixture_code, new_source, json.dumps(examples)),
+                )
+                touched[(category, fixture_code)] = new_source
+            else:
+                conn.execute(
+                    """\
+                    UPDATE pattern_aggregates SET source_count = source_count + ?,
+                    examples_json = ?, updated_at = datetime('now')
+                    WHERE category=? AND fixture_code=?
+                    """,
+                    (new_source, json.dumps(examples), category, fixture_code),
+                )
+                touched[(category, fixture_code)] = row["source_count"] + new_source
+        return touched
+
+
+def get_pattern_aggregate(category: str, fixture_code: str) -> dict | None:
+    """Return one aggregate with its examples and contributing source keys."""
+    with connection() as conn:
+        row = conn.execute(
+            "SELECT * FROM pattern_aggregates WHERE category=? AND fixture_code=?",
+            (category, fixture_code),
+        ).fetchone()
+        if row is None:
+            return None
         d = dict(row)
         d["examples"] = json.loads(d.pop("examples_json", "[]"))
-        d["global_hint"] = json.loads(d.pop("global_hint_json", "{}"))
-        d["source_keys"] = json.loads(d.pop("source_keys_json", "[]"))
-        result.append(d)
-    return result
+        d["source_keys"] = [
+            r["source_key"]
+            for r in conn.execute(
+                "SELECT source_key FROM pattern_aggregate_sources "
+                "WHERE category=? AND fixture_code=? ORDER BY source_key",
+                (category, fixture_code),
+            ).fetchall()
+        ]
+        return d
+
+
+def count_pattern_aggregates() -> int:
+    with connection() as conn:
+        row = conn.execute("SELECT COUNT(*) AS n FROM pattern_aggregates").fetchone()
+        return row["n"] if row else 0
+
+
+def clear_pattern_aggregates() -> None:
+    with connection() as conn:
+        conn.execute("DELETE FROM pattern_aggregate_sources")
+        conn.execute("DELETE FROM pattern_aggregates")
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -317,42 +591,41 @@ def save_cove_result(
     reasoning: str = "",
     retry_count: int = 0,
 ) -> int:
-    conn = get_conn()
-    cur = conn.execute(
-        """\
-        INSERT INTO cove_results
-            (project_id, agent_id, agent_name, passed, confidence,
-             issues_json, reasoning, retry_count)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            project_id,
-            agent_id,
-            agent_name,
-            int(passed),
-            confidence,
-            json.dumps(issues or []),
-            reasoning,
-            retry_count,
-        ),
-    )
-    conn.commit()
-    return cur.lastrowid or 0
+    with connection() as conn:
+        cur = conn.execute(
+            """\
+            INSERT INTO cove_results
+                (project_id, agent_id, agent_name, passed, confidence,
+                 issues_json, reasoning, retry_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                project_id,
+                agent_id,
+                agent_name,
+                int(passed),
+                confidence,
+                json.dumps(issues or []),
+                reasoning,
+                retry_count,
+            ),
+        )
+        return cur.lastrowid or 0
 
 
 def get_cove_results(project_id: str) -> list[dict]:
-    conn = get_conn()
-    rows = conn.execute(
-        "SELECT * FROM cove_results WHERE project_id=? ORDER BY id",
-        (project_id,),
-    ).fetchall()
-    result = []
-    for row in rows:
-        d = dict(row)
-        d["passed"] = bool(d["passed"])
-        d["issues"] = json.loads(d.pop("issues_json", "[]"))
-        result.append(d)
-    return result
+    with connection() as conn:
+        rows = conn.execute(
+            "SELECT * FROM cove_results WHERE project_id=? ORDER BY id",
+            (project_id,),
+        ).fetchall()
+        result = []
+        for row in rows:
+            d = dict(row)
+            d["passed"] = bool(d["passed"])
+            d["issues"] = json.loads(d.pop("issues_json", "[]"))
+            result.append(d)
+        return result
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -367,72 +640,88 @@ def save_agent_plan(
     strategy: dict | None = None,
     expected_challenges: list | None = None,
 ) -> int:
-    conn = get_conn()
-    cur = conn.execute(
-        """\
-        INSERT INTO agent_plans
-            (project_id, agent_id, agent_name, plan_text, strategy_json, expected_challenges)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """,
-        (
-            project_id,
-            agent_id,
-            agent_name,
-            plan_text,
-            json.dumps(strategy or {}),
-            json.dumps(expected_challenges or []),
-        ),
-    )
-    conn.commit()
-    return cur.lastrowid or 0
+    with connection() as conn:
+        cur = conn.execute(
+            """\
+            INSERT INTO agent_plans
+                (project_id, agent_id, agent_name, plan_text, strategy_json, expected_challenges)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                project_id,
+                agent_id,
+                agent_name,
+                plan_text,
+                json.dumps(strategy or {}),
+                json.dumps(expected_challenges or []),
+            ),
+        )
+        return cur.lastrowid or 0
 
 
 def get_agent_plans(project_id: str) -> list[dict]:
-    conn = get_conn()
-    rows = conn.execute(
-        "SELECT * FROM agent_plans WHERE project_id=? ORDER BY id",
-        (project_id,),
-    ).fetchall()
-    result = []
-    for row in rows:
-        d = dict(row)
-        d["strategy"] = json.loads(d.pop("strategy_json", "{}"))
-        d["expected_challenges"] = json.loads(d.get("expected_challenges") or "[]")
-        result.append(d)
-    return result
+    with connection() as conn:
+        rows = conn.execute(
+            "SELECT * FROM agent_plans WHERE project_id=? ORDER BY id",
+            (project_id,),
+        ).fetchall()
+        result = []
+        for row in rows:
+            d = dict(row)
+            d["strategy"] = json.loads(d.pop("strategy_json", "{}"))
+            d["expected_challenges"] = json.loads(d.get("expected_challenges") or "[]")
+            result.append(d)
+        return result
 
 
 # ══════════════════════════════════════════════════════════════════════
 #  Runtime parameters
 # ══════════════════════════════════════════════════════════════════════
 
+# Bumped on every param write so in-process caches (runtime_params) know
+# when their merged views are stale.  Monotonic for the process lifetime.
+_params_version = 0
+_params_version_lock = threading.Lock()
+
+
+def _bump_params_version() -> None:
+    global _params_version
+    with _params_version_lock:
+        _params_version += 1
+
+
+def get_params_version() -> int:
+    """Return the current runtime-param write version."""
+    return _params_version
+
+
 def set_param(
     param_key: str,
     param_value: Any,
     scope: str = "global",
     scope_key: str = "",
 ) -> None:
-    conn = get_conn()
-    conn.execute(
-        """\
-        INSERT INTO runtime_params (scope, scope_key, param_key, param_value)
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(scope, scope_key, param_key) DO UPDATE SET
-            param_value=excluded.param_value,
-            updated_at=datetime('now')
-        """,
-        (scope, scope_key, param_key, json.dumps(param_value)),
-    )
-    conn.commit()
+    with connection() as conn:
+        conn.execute(
+            """\
+            INSERT INTO runtime_params (scope, scope_key, param_key, param_value)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(scope, scope_key, param_key) DO UPDATE SET
+                param_value=excluded.param_value,
+                updated_at=datetime('now')
+            """,
+            (scope, scope_key, param_key, json.dumps(param_value)),
+        )
+    on_commit(_bump_params_version)
 
 
 def get_params(scope: str = "global", scope_key: str = "") -> dict[str, Any]:
-    conn = get_conn()
-    rows = conn.execute(
-        "SELECT param_key, param_value FROM runtime_params WHERE scope=? AND scope_key=?",
-        (scope, scope_key),
-    ).fetchall()
-    return {row["param_key"]: json.loads(row["param_value"]) for row in rows}
+    with connection() as conn:
+        rows = conn.execute(
+            "SELECT param_key, param_value FROM runtime_params WHERE scope=? AND scope_key=?",
+            (scope, scope_key),
+        ).fetchall()
+        return {row["param_key"]: json.loads(row["param_value"]) for row in rows}
 
 
 def delete_param(
@@ -440,10 +729,10 @@ def delete_param(
     scope: str = "global",
     scope_key: str = "",
 ) -> bool:
-    conn = get_conn()
-    cur = conn.execute(
-        "DELETE FROM runtime_params WHERE scope=? AND scope_key=? AND param_key=?",
-        (scope, scope_key, param_key),
-    )
-    conn.commit()
+    with connection() as conn:
+        cur = conn.execute(
+            "DELETE FROM runtime_params WHERE scope=? AND scope_key=? AND param_key=?",
+            (scope, scope_key, param_key),
+        )
+    on_commit(_bump_params_version)
     return cur.rowcount > 0
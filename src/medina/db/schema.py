@@ -64,6 +64,18 @@ TABLES: list[str] = [
         created_at    TEXT NOT NULL DEFAULT (datetime('now'))
     )""",
 
+    # ── Materialized derive_hints() output per project ────────────────
+    # last_seq / n_corrections record which journal rows are folded in;
+    # readers compare them with the corrections table to detect staleness.
+    """\
+    CREATE TABLE IF NOT EXISTS feedback_hints (
+        project_id    TEXT PRIMARY KEY,
+        last_seq      INTEGER NOT NULL DEFAULT 0,
+        n_corrections INTEGER NOT NULL DEFAULT 0,
+        hints_json    TEXT NOT NULL DEFAULT '{}',
+        updated_at    TEXT NOT NULL DEFAULT (datetime('now'))
+    )""",
+
     # ── Learnings (per source file) ───────────────────────────────────
     """\
     CREATE TABLE IF NOT EXISTS learnings (
@@ -93,6 +105,28 @@ TABLES: list[str] = [
         UNIQUE(pattern_type, fixture_code)
     )""",
 
+    # ── Pattern aggregates (incremental global-pattern counts) ────────
+    """\
+    CREATE TABLE IF NOT EXISTS pattern_aggregates (
+        id            INTEGER PRIMARY KEY AUTOINCREMENT,
+        category      TEXT NOT NULL,
+        fixture_code  TEXT NOT NULL DEFAULT '',
+        source_count  INTEGER NOT NULL DEFAULT 0,
+        examples_json TEXT NOT NULL DEFAULT '[]',
+        created_at    TEXT NOT NULL DEFAULT (datetime('now')),
+        updated_at    TEXT NOT NULL DEFAULT (datetime('now')),
+        UNIQUE(category, fixture_code)
+    )""",
+
+    # ── Sources seen per pattern aggregate (dedup for source_count) ───
+    """\
+    CREATE TABLE IF NOT EXISTS pattern_aggregate_sources (
+        category      TEXT NOT NULL,
+        fixture_code  TEXT NOT NULL DEFAULT '',
+        source_key    TEXT NOT NULL,
+        PRIMARY KEY (category, fixture_code, source_key)
+    )""",
+
     # ── COVE verification results ─────────────────────────────────────
     """\
     CREATE TABLE IF NOT EXISTS cove_results (
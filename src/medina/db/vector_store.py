@@ -1,7 +1,17 @@
-"""ChromaDB vector store for semantic search across corrections and QA."""
+"""ChromaDB vector store for semantic search across corrections and QA.
+
+Writes from the pipeline go through a write-behind queue
+(:func:`enqueue_document` / :func:`enqueue_documents`): a background thread
+drains it and upserts in batches, so embedding latency stays off the
+caller's thread.  The queue is bounded — when full, callers wait briefly and
+then fall back to a synchronous write — and is flushed on shutdown.
+"""
 from __future__ import annotations
 
 import logging
+import queue
+import threading
+import time
 from pathlib import Path
 from typing import Any
 
@@ -10,6 +20,26 @@ logger = logging.getLogger(__name__)
 _client = None
 _CHROMA_PATH: Path | None = None
 
+# Write-behind queue settings
+_WRITE_QUEUE_MAX = 1000  # Pending documents before callers are throttled
+_WRITE_BATCH_MAX = 64  # Documents per collection.upsert call
+_ENQUEUE_TIMEOUT = 2.0  # Seconds to wait on a full queue before writing inline
+
+_STOP = object()
+_write_queue: queue.Queue | None = None
+_writer: threading.Thread | None = None
+_stats_lock = threading.Lock()
+_write_stats: dict[str, int] = {
+    "enqueued": 0,
+    "written": 0,
+    "batches": 0,
+    "failed": 0,
+    "throttled": 0,
+    "inline_writes": 0,
+    "max_queue_depth": 0,
+    "max_batch": 0,
+}
+
 # Collection names
 CORRECTIONS_COLLECTION = "corrections"
 QA_INTERACTIONS_COLLECTION = "qa_interactions"
@@ -56,6 +86,7 @@ def init_vector_store(chroma_path: str | Path | None = None) -> None:
         metadata={"description": "Verification findings for pattern detection"},
     )
     logger.info("ChromaDB initialized at %s with 3 collections", path)
+    _start_writer()
 
 
 def get_collection(name: str):
@@ -76,19 +107,152 @@ def add_document(
     metadata: dict[str, Any] | None = None,
 ) -> bool:
     """Add a document to a ChromaDB collection."""
+    return add_documents(collection_name, [(doc_id, text, metadata)]) > 0
+
+
+def add_documents(
+    collection_name: str,
+    docs: list[tuple[str, str, dict[str, Any] | None]],
+) -> int:
+    """Upsert (doc_id, text, metadata) tuples in one call.  Returns count written."""
     coll = get_collection(collection_name)
-    if coll is None:
-        return False
+    if coll is None or not docs:
+        return 0
+    # Chroma rejects duplicate ids within one call — last write wins.
+    by_id = {doc_id: (text, metadata) for doc_id, text, metadata in docs}
     try:
         coll.upsert(
-            ids=[doc_id],
-            documents=[text],
-            metadatas=[metadata or {}],
+            ids=list(by_id),
+            documents=[text for text, _ in by_id.values()],
+            metadatas=[metadata or {} for _, metadata in by_id.values()],
         )
-        return True
+        return len(by_id)
     except Exception as e:
-        logger.warning("Failed to add document to %s: %s", collection_name, e)
-        return False
+        logger.warning(
+            "Failed to add %d document(s) to %s: %s", len(by_id), collection_name, e,
+        )
+        return 0
+
+
+def enqueue_document(
+    collection_name: str,
+    doc_id: str,
+    text: str,
+    metadata: dict[str, Any] | None = None,
+) -> bool:
+    """Queue a document for a background batched upsert."""
+    return enqueue_documents(collection_name, [(doc_id, text, metadata)]) > 0
+
+
+def enqueue_documents(
+    collection_name: str,
+    docs: list[tuple[str, str, dict[str, Any] | None]],
+) -> int:
+    """Queue (doc_id, text, metadata) tuples for background upsert.
+
+    Returns the number of documents accepted.  Writes inline when the
+    background writer is not running or the queue stays full for longer
+    than _ENQUEUE_TIMEOUT.
+    """
+    if _client is None or not docs:
+        return 0
+    q = _write_queue
+    if q is None or _writer is None or not _writer.is_alive():
+        return add_documents(collection_name, docs)
+
+    accepted = 0
+    inline: list[tuple[str, str, dict[str, Any] | None]] = []
+    for doc in docs:
+        item = (collection_name, doc)
+        try:
+            q.put_nowait(item)
+        except queue.Full:
+            with _stats_lock:
+                _write_stats["throttled"] += 1
+            try:
+                q.put(item, timeout=_ENQUEUE_TIMEOUT)
+            except queue.Full:
+                inline.append(doc)
+                continue
+        accepted += 1
+    with _stats_lock:
+        _write_stats["enqueued"] += accepted
+        _write_stats["max_queue_depth"] = max(
+            _write_stats["max_queue_depth"], q.qsize(),
+        )
+    if inline:
+        with _stats_lock:
+            _write_stats["inline_writes"] += len(inline)
+        accepted += add_documents(collection_name, inline)
+    return accepted
+
+
+def _start_writer() -> None:
+    """Start the background writer thread (idempotent)."""
+    global _write_queue, _writer
+    if _writer is not None and _writer.is_alive():
+        return
+    _write_queue = queue.Queue(maxsize=_WRITE_QUEUE_MAX)
+    _writer = threading.Thread(
+        target=_writer_loop, args=(_write_queue,),
+        name="medina-vector-writer", daemon=True,
+    )
+    _writer.start()
+
+
+def _writer_loop(q: queue.Queue) -> None:
+    """Drain the queue, grouping items into per-collection batches."""
+    stop = False
+    while not stop:
+        items = [q.get()]
+        while len(items) < _WRITE_BATCH_MAX:
+            try:
+                items.append(q.get_nowait())
+            except queue.Empty:
+                break
+
+        batches: dict[str, list[tuple[str, str, dict[str, Any] | None]]] = {}
+        for item in items:
+            if item is _STOP:
+                stop = True
+                continue
+            collection_name, doc = item
+            batches.setdefault(collection_name, []).append(doc)
+
+        for collection_name, docs in batches.items():
+            written = add_documents(collection_name, docs)
+            with _stats_lock:
+                _write_stats["batches"] += 1
+                _write_stats["written"] += written
+                _write_stats["failed"] += len(docs) - written
+                _write_stats["max_batch"] = max(_write_stats["max_batch"], len(docs))
+
+        for _ in items:
+            q.task_done()
+
+
+def flush_writes(timeout: float = 30.0) -> bool:
+    """Block until queued writes are written.  Returns False on timeout."""
+    q = _write_queue
+    if q is None or _writer is None or not _writer.is_alive():
+        return True
+    deadline = time.monotonic() + timeout
+    while q.unfinished_tasks:
+        if time.monotonic() >= deadline:
+            logger.warning(
+                "Vector store flush timed out with %d pending writes", q.unfinished_tasks,
+            )
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def get_write_metrics() -> dict[str, int]:
+    """Return write-behind counters plus the current queue depth."""
+    with _stats_lock:
+        metrics = dict(_write_stats)
+    metrics["queue_depth"] = _write_queue.qsize() if _write_queue is not None else 0
+    return metrics
 
 
 def query_similar(
@@ -101,41 +265,66 @@ def query_similar(
 
     Returns list of dicts with keys: id, document, metadata, distance.
     """
+    batch = query_similar_batch(collection_name, [query_text], n_results, where)
+    return batch[0] if batch else []
+
+
+def query_similar_batch(
+    collection_name: str,
+    query_texts: list[str],
+    n_results: int = 5,
+    where: dict | None = None,
+) -> list[list[dict[str, Any]]]:
+    """Query several texts against a collection in a single call.
+
+    Returns one result list per query text, in order (each shaped like
+    :func:`query_similar`).  On failure every list is empty.
+    """
+    empty: list[list[dict[str, Any]]] = [[] for _ in query_texts]
+    if not query_texts:
+        return empty
     coll = get_collection(collection_name)
     if coll is None:
-        return []
+        return empty
     try:
         kwargs: dict[str, Any] = {
-            "query_texts": [query_text],
+            "query_texts": list(query_texts),
             "n_results": n_results,
         }
         if where:
             kwargs["where"] = where
         results = coll.query(**kwargs)
 
-        docs: list[dict[str, Any]] = []
-        if results and results.get("ids"):
-            for i, doc_id in enumerate(results["ids"][0]):
+        if not results or not results.get("ids"):
+            return empty
+        documents = results.get("documents") or []
+        metadatas = results.get("metadatas") or []
+        distances = results.get("distances") or []
+        batch: list[list[dict[str, Any]]] = []
+        for q, ids in enumerate(results["ids"]):
+            docs: list[dict[str, Any]] = []
+            for i, doc_id in enumerate(ids):
                 docs.append({
                     "id": doc_id,
-                    "document": (results.get("documents") or [[]])[0][i]
-                    if results.get("documents")
-                    else "",
-                    "metadata": (results.get("metadatas") or [[]])[0][i]
-                    if results.get("metadatas")
-                    else {},
-                    "distance": (results.get("distances") or [[]])[0][i]
-                    if results.get("distances")
-                    else 0.0,
+                    "document": documents[q][i] if documents else "",
+                    "metadata": metadatas[q][i] if metadatas else {},
+                    "distance": distances[q][i] if distances else 0.0,
                 })
-        return docs
+            batch.append(docs)
+        return batch
     except Exception as e:
         logger.warning("Query failed on %s: %s", collection_name, e)
-        return []
+        return empty
 
 
 def close_vector_store() -> None:
-    """Clean up the ChromaDB client."""
-    global _client
+    """Flush pending writes, stop the writer and clean up the ChromaDB client."""
+    global _client, _writer, _write_queue
+    if _writer is not None and _writer.is_alive() and _write_queue is not None:
+        flush_writes()
+        _write_queue.put(_STOP)
+        _writer.join(timeout=5.0)
+    _writer = None
+    _write_queue = None
     _client = None
-    logger.info("ChromaDB client closed")
+    logger.info("ChromaDB client closed (writes: %s)", get_write_metrics())
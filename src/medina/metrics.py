@@ -0,0 +1,457 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms are plain dicts keyed by label values,
+updated under a per-metric lock — cheap enough to call from page loops.
+The API serves them at ``/metrics`` via :func:`render`.
+
+Most timings are not recorded here directly: :func:`install` subscribes
+to finished :mod:`medina.tracing` spans (pipeline runs, stages, team
+agents, VLM calls, page renders), so every instrumented block feeds both
+traces and metrics.  Until it is called (the CLI never does) those spans
+stay no-op.  Values that are cheaper to read at
+scrape time (queue depth, pool size, RSS) come from collectors
+registered with :func:`register_collector`.
+
+Every span-derived series carries a ``tenant`` label taken from
+:func:`tenant_scope`, which the API pipeline sets per run; the context
+variable follows work submitted through :func:`medina.tracing.wrap`.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextvars
+import logging
+import math
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from medina import tracing
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_TENANT = "unknown"
+
+# Latency buckets in seconds: sub-second page work up to multi-minute runs
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+_tenant: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "medina_metrics_tenant", default=UNKNOWN_TENANT,
+)
+
+
+# ── Metric types ──────────────────────────────────────────────────────
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.doc = doc
+        self.label_names = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def _label_str(self, key: tuple[str, ...], extra: str = "") -> str:
+        parts = [f'{n}="{_escape(v)}"' for n, v in zip(self.label_names, key)]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, doc, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{self._label_str(k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Point-in-time value per label set."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, doc: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, doc, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{self._label_str(k)} {_fmt(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Bucketed distribution per label set (cumulative on export)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        doc: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., +Inf count, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * (len(self.buckets) + 2)
+            row[idx] += 1
+            row[-1] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            row = self._values.get(self._key(labels))
+            return int(sum(row[:-1])) if row else 0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines: list[str] = []
+        for key, row in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, row):
+                cumulative += n
+                le = 'le="%s"' % _fmt(float(bound))
+                lines.append(f"{self.name}_bucket{self._label_str(key, le)} {_fmt(cumulative)}")
+            cumulative += row[len(self.buckets)]
+            inf = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{self._label_str(key, inf)} {_fmt(cumulative)}")
+            lines.append(f"{self.name}_sum{self._label_str(key)} {_fmt(row[-1])}")
+            lines.append(f"{self.name}_count{self._label_str(key)} {_fmt(cumulative)}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if value.is_integer():
+            return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+# ── Registry ──────────────────────────────────────────────────────────
+
+
+_registry: dict[str, _Metric] = {}
+_collectors: list[Callable[[], None]] = []
+_registry_lock = threading.Lock()
+
+
+def _register(metric: _Metric) -> Any:
+    with _registry_lock:
+        existing = _registry.get(metric.name)
+        if existing is not None:
+            return existing
+        _registry[metric.name] = metric
+    return metric
+
+
+def counter(name: str, doc: str, labels: tuple[str, ...] = ()) -> Counter:
+    return _register(Counter(name, doc, labels))
+
+
+def gauge(name: str, doc: str, labels: tuple[str, ...] = ()) -> Gauge:
+    return _register(Gauge(name, doc, labels))
+
+
+def histogram(
+    name: str,
+    doc: str,
+    labels: tuple[str, ...] = (),
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+) -> Histogram:
+    return _register(Histogram(name, doc, labels, buckets))
+
+
+def register_collector(collect: Callable[[], None]) -> None:
+    """Run *collect* before each scrape (to refresh scrape-time gauges)."""
+    with _registry_lock:
+        if collect not in _collectors:
+            _collectors.append(collect)
+
+
+def render() -> str:
+    """Return all metrics in the Prometheus text exposition format."""
+    with _registry_lock:
+        collectors = list(_collectors)
+        metrics = list(_registry.values())
+    for collect in collectors:
+        try:
+            collect()
+        except Exception as e:
+            logger.debug("Metrics collector %s failed: %s", collect.__name__, e)
+
+    lines: list[str] = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.doc}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+# ── Tenant context ────────────────────────────────────────────────────
+
+
+def current_tenant() -> str:
+    return _tenant.get()
+
+
+@contextmanager
+def tenant_scope(tenant_id: str) -> Iterator[None]:
+    """Label metrics recorded in this block (and wrapped workers) by tenant."""
+    token = _tenant.set(tenant_id or UNKNOWN_TENANT)
+    try:
+        yield
+    finally:
+        _tenant.reset(token)
+
+
+# ── Medina metrics ────────────────────────────────────────────────────
+
+
+PIPELINE_SECONDS = histogram(
+    "medina_pipeline_duration_seconds",
+    "End-to-end pipeline run duration.",
+    ("pipeline", "status", "tenant"),
+)
+STAGE_SECONDS = histogram(
+    "medina_stage_duration_seconds",
+    "Pipeline stage / team agent duration.",
+    ("stage", "status", "tenant"),
+)
+VLM_SECONDS = histogram(
+    "medina_vlm_request_duration_seconds",
+    "VLM vision request latency.",
+    ("provider", "model", "tenant"),
+)
+VLM_REQUESTS = counter(
+    "medina_vlm_requests_total",
+    "VLM vision requests by outcome.",
+    ("provider", "status", "tenant"),
+)
+VLM_PAYLOAD_BYTES = histogram(
+    "medina_vlm_payload_bytes",
+    "Base64 image payload size per VLM request.",
+    ("provider", "tenant"),
+    buckets=(5e4, 1e5, 2.5e5, 5e5, 1e6, 2e6, 3.5e6, 5e6, 1e7),
+)
+VLM_ROUTED = counter(
+    "medina_vlm_routed_requests_total",
+    "Routed VLM requests by winning provider and outcome.",
+    ("provider", "outcome", "tenant"),
+)
+VLM_TOKENS = counter(
+    "medina_vlm_tokens_total",
+    "VLM tokens reported by the provider.",
+    ("provider", "direction", "tenant"),
+)
+RENDER_SECONDS = histogram(
+    "medina_render_duration_seconds",
+    "PDF page render time.",
+    ("dpi", "tenant"),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+RENDER_BYTES = counter(
+    "medina_render_bytes_total",
+    "Encoded image bytes produced by page renders.",
+    ("dpi", "tenant"),
+)
+CACHE_REQUESTS = counter(
+    "medina_cache_requests_total",
+    "Cache lookups by cache and result (hit/miss).",
+    ("cache", "result", "tenant"),
+)
+SQLITE_POOL_WAIT = histogram(
+    "medina_sqlite_pool_wait_seconds",
+    "Time spent waiting for a free pooled SQLite connection.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+SQLITE_LOCK_ERRORS = counter(
+    "medina_sqlite_lock_errors_total",
+    "Operations that failed with 'database is locked' after busy_timeout.",
+)
+ACTIVE_PROJECTS = gauge(
+    "medina_active_projects",
+    "Projects by status held by the API process.",
+    ("status", "tenant"),
+)
+QUEUE_DEPTH = gauge(
+    "medina_queue_depth",
+    "Pending items in in-process queues.",
+    ("queue",),
+)
+DB_POOL = gauge(
+    "medina_sqlite_pool_connections",
+    "SQLite pool connections by state.",
+    ("state",),
+)
+PROCESS_RSS = gauge(
+    "medina_process_resident_memory_bytes",
+    "Resident set size of the API process.",
+)
+
+
+def cache_event(cache: str, hit: bool) -> None:
+    """Count a cache lookup for hit-ratio dashboards."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss", tenant=_tenant.get())
+
+
+# ── Span listeners ────────────────────────────────────────────────────
+
+
+def _seconds(sp: tracing.Span) -> float:
+    return (sp.end_ns - sp.start_ns) / 1e9
+
+
+def _status(sp: tracing.Span) -> str:
+    error = sp.attrs.get("error")
+    if error is None:
+        return "ok"
+    return "cancelled" if error == "CancelledError" else "error"
+
+
+def _on_run(sp: tracing.Span) -> None:
+    PIPELINE_SECONDS.observe(_seconds(sp), pipeline=sp.name, status=_status(sp), tenant=_tenant.get())
+
+
+def _on_stage(sp: tracing.Span) -> None:
+    STAGE_SECONDS.observe(_seconds(sp), stage=sp.name, status=_status(sp), tenant=_tenant.get())
+
+
+def _on_vlm(sp: tracing.Span) -> None:
+    tenant = _tenant.get()
+    provider = sp.attrs.get("provider", "")
+    VLM_SECONDS.observe(_seconds(sp), provider=provider, model=sp.attrs.get("model", ""), tenant=tenant)
+    VLM_REQUESTS.inc(provider=provider, status=_status(sp), tenant=tenant)
+    if "payload_bytes" in sp.attrs:
+        VLM_PAYLOAD_BYTES.observe(sp.attrs["payload_bytes"], provider=provider, tenant=tenant)
+    for attr, direction in (("input_tokens", "input"), ("output_tokens", "output")):
+        n = sp.attrs.get(attr)
+        if n:
+            VLM_TOKENS.inc(n, provider=provider, direction=direction, tenant=tenant)
+
+
+def _on_vlm_route(sp: tracing.Span) -> None:
+    VLM_ROUTED.inc(
+        provider=sp.attrs.get("winner", ""),
+        outcome=sp.attrs.get("outcome", _status(sp)),
+        tenant=_tenant.get(),
+    )
+
+
+def _on_render(sp: tracing.Span) -> None:
+    tenant = _tenant.get()
+    dpi = sp.attrs.get("dpi", "")
+    RENDER_SECONDS.observe(_seconds(sp), dpi=dpi, tenant=tenant)
+    if sp.attrs.get("bytes"):
+        RENDER_BYTES.inc(sp.attrs["bytes"], dpi=dpi, tenant=tenant)
+
+
+_installed = False
+
+
+def install() -> None:
+    """Start deriving metrics from tracing spans (idempotent)."""
+    global _installed
+    with _registry_lock:
+        if _installed:
+            return
+        _installed = True
+    tracing.add_listener(("run",), _on_run)
+    tracing.add_listener(("stage", "agent"), _on_stage)
+    tracing.add_listener(("vlm",), _on_vlm)
+    tracing.add_listener(("vlm_route",), _on_vlm_route)
+    tracing.add_listener(("render",), _on_render)
+
+
+# ── Scrape-time collectors ────────────────────────────────────────────
+
+
+def process_rss_bytes() -> int:
+    """Current RSS from /proc, falling back to peak RSS from getrusage."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return 0
+
+
+def _collect_process() -> None:
+    PROCESS_RSS.set(process_rss_bytes())
+
+
+register_collector(_collect_process)
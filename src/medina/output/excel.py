@@ -1,15 +1,33 @@
-"""Excel workbook generation with dynamic per-plan columns."""
+"""Excel workbook generation with dynamic per-plan columns.
+
+Workbooks are written with openpyxl's ``write_only`` mode so large
+takeoffs (hundreds of plan columns) stream to disk instead of holding a
+full cell graph in memory.  Each sheet layout is a generator of rows
+built straight from the :class:`ExtractionResult`; it is run once as a
+cheap pre-pass for the column widths write-only mode needs up front,
+then again to append the rows, so memory stays flat however large the
+sheet.
+"""
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
+import tempfile
+import time
+import warnings
+from collections.abc import Callable, Iterator, Sequence
 from pathlib import Path
+from typing import Any, NamedTuple
 
 from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
 from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
 
+from medina import metrics
 from medina.models import ExtractionResult, QAReport
 
 logger = logging.getLogger(__name__)
@@ -32,160 +50,196 @@ RED_FILL = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="soli
 HEADER_FONT = Font(bold=True, size=11)
 TITLE_FONT = Font(bold=True, size=14)
 
-
-def _auto_width(ws, min_width: int = 10, max_width: int = 40) -> None:
-    """Auto-size column widths based on content."""
-    for col_cells in ws.columns:
-        max_len = 0
-        col_letter = get_column_letter(col_cells[0].column)
-        for cell in col_cells:
-            if cell.value:
-                max_len = max(max_len, len(str(cell.value)))
-        width = min(max(max_len + 2, min_width), max_width)
-        ws.column_dimensions[col_letter].width = width
+# Bump when the workbook layout changes so cached exports are rebuilt
+EXCEL_LAYOUT_VERSION = 2
+_EXPORT_CACHE_MAX = 32
+# Files used this recently are never pruned: a response may still be
+# streaming them
+_EXPORT_CACHE_GRACE = 600.0  # seconds
+
+
+def _confidence_fill(score: float) -> PatternFill:
+    if score >= 0.95:
+        return GREEN_FILL
+    if score >= 0.80:
+        return YELLOW_FILL
+    return RED_FILL
+
+
+class _Styled(NamedTuple):
+    """A cell value with formatting, for a row yielded by a sheet layout."""
+
+    value: Any
+    font: Font | None = None
+    fill: PatternFill | None = None
+
+
+# A sheet layout yields (row number, cell values) with increasing 1-based
+# row numbers; skipped row numbers are written as blank rows.
+SheetRows = Iterator[tuple[int, list[Any]]]
+
+
+def _column_widths(
+    rows: SheetRows, min_width: int = 10, max_width: int = 40,
+) -> dict[int, int]:
+    """Width per used column, clamped like the old post-hoc auto-width."""
+    max_len: dict[int, int] = {}
+    for _, values in rows:
+        for col, item in enumerate(values, 1):
+            value = item.value if isinstance(item, _Styled) else item
+            length = len(str(value)) if value else 0
+            if length >= max_len.get(col, 0):
+                max_len[col] = length
+    return {
+        col: min(max(length + 2, min_width), max_width)
+        for col, length in max_len.items()
+    }
 
 
-def generate_fixture_sheet(
-    wb: Workbook,
-    result: ExtractionResult,
+def _write_sheet(
+    ws,
+    layout: Callable[[], SheetRows],
+    tables: Sequence[Table] = (),
 ) -> None:
-    """Create the Fixture Inventory sheet with dynamic plan columns."""
-    ws = wb.active
-    ws.title = "Fixture Inventory"
+    """Stream *layout*'s rows into a write-only worksheet.
+
+    *layout* is run twice: a pre-pass for column widths (write-only
+    sheets need dimensions before the first row), then the write itself,
+    so no more than one row is held at a time.
+    """
+    for col, width in _column_widths(layout()).items():
+        ws.column_dimensions[get_column_letter(col)].width = width
+
+    written = 0
+    for row_idx, values in layout():
+        while written < row_idx - 1:
+            ws.append([])
+            written += 1
+        cells: list[Any] = []
+        for item in values:
+            if not isinstance(item, _Styled):
+                cells.append(item)
+                continue
+            styled = WriteOnlyCell(ws, value=item.value)
+            if item.font is not None:
+                styled.font = item.font
+            if item.fill is not None:
+                styled.fill = item.fill
+            cells.append(styled)
+        ws.append(cells)
+        written = row_idx
+
+    with warnings.catch_warnings():
+        # openpyxl warns on every write-only add_table; our tables
+        # already carry explicit columns.
+        warnings.simplefilter("ignore", UserWarning)
+        for table in tables:
+            ws.add_table(table)
+
+
+def _inventory_table(name: str, headers: list[str], n_rows: int) -> Table:
+    table = Table(
+        displayName=name,
+        ref=f"A1:{get_column_letter(len(headers))}{n_rows + 1}",
+    )
+    # Write-only sheets can't read the header row back, so the table
+    # columns are declared explicitly.
+    table.tableColumns = [
+        TableColumn(id=idx, name=str(header)) for idx, header in enumerate(headers, 1)
+    ]
+    table.tableStyleInfo = TableStyleInfo(
+        name="TableStyleMedium9",
+        showFirstColumn=False,
+        showLastColumn=False,
+        showRowStripes=True,
+        showColumnStripes=False,
+    )
+    return table
 
-    plan_codes = result.plan_pages or []
-    headers = [label for _, label in SPEC_COLUMNS]
-    headers += plan_codes
-    headers.append("Total")
 
-    for col_idx, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
-        cell.font = HEADER_FONT
+def _headers(result: ExtractionResult, leading: list[str]) -> list[str]:
+    return leading + list(result.plan_pages or []) + ["Total"]
 
-    for row_idx, fixture in enumerate(result.fixtures, 2):
-        for col_idx, (field, _) in enumerate(SPEC_COLUMNS, 1):
-            ws.cell(
-                row=row_idx,
-                column=col_idx,
-                value=getattr(fixture, field, ""),
-            )
 
-        for plan_idx, plan_code in enumerate(plan_codes):
-            col = len(SPEC_COLUMNS) + plan_idx + 1
-            count = fixture.counts_per_plan.get(plan_code, 0)
-            ws.cell(row=row_idx, column=col, value=count)
-
-        total_col = len(SPEC_COLUMNS) + len(plan_codes) + 1
-        ws.cell(row=row_idx, column=total_col, value=fixture.total)
+def _fixture_rows(result: ExtractionResult) -> SheetRows:
+    plan_codes = result.plan_pages or []
+    headers = _headers(result, [label for _, label in SPEC_COLUMNS])
+    yield 1, [_Styled(h, HEADER_FONT) for h in headers]
 
-    if result.fixtures:
-        last_row = len(result.fixtures) + 1
-        last_col = get_column_letter(len(headers))
-        table_ref = f"A1:{last_col}{last_row}"
-        table = Table(displayName="LightingInventory", ref=table_ref)
-        style = TableStyleInfo(
-            name="TableStyleMedium9",
-            showFirstColumn=False,
-            showLastColumn=False,
-            showRowStripes=True,
-            showColumnStripes=False,
-        )
-        table.tableStyleInfo = style
-        ws.add_table(table)
+    for row_idx, fixture in enumerate(result.fixtures, 2):
+        values = [getattr(fixture, field, "") for field, _ in SPEC_COLUMNS]
+        values += [fixture.counts_per_plan.get(code, 0) for code in plan_codes]
+        values.append(fixture.total)
+        yield row_idx, values
 
     if result.keynotes:
-        summary_start = len(result.fixtures) + 4
-        ws.cell(
-            row=summary_start,
-            column=1,
-            value="Key Notes Summary",
-        ).font = TITLE_FONT
-
-        row = summary_start + 1
-        kn_headers = ["#", "Key Note Text", "Total"]
-        for col_idx, h in enumerate(kn_headers, 1):
-            ws.cell(row=row, column=col_idx, value=h).font = HEADER_FONT
-
+        row = len(result.fixtures) + 4
+        yield row, [_Styled("Key Notes Summary", TITLE_FONT)]
+        row += 1
+        yield row, [_Styled(h, HEADER_FONT) for h in ["#", "Key Note Text", "Total"]]
         for kn in result.keynotes:
             row += 1
-            ws.cell(row=row, column=1, value=str(kn.number))
-            ws.cell(row=row, column=2, value=kn.text)
-            ws.cell(row=row, column=3, value=kn.total)
+            yield row, [str(kn.number), kn.text, kn.total]
 
-    _auto_width(ws)
 
-
-def generate_keynotes_sheet(
+def generate_fixture_sheet(
     wb: Workbook,
     result: ExtractionResult,
 ) -> None:
-    """Create the Key Notes Inventory sheet."""
-    ws = wb.create_sheet("Key Notes Inventory")
-    plan_codes = result.plan_pages or []
+    """Create the Fixture Inventory sheet with dynamic plan columns."""
+    ws = wb.create_sheet("Fixture Inventory")
+    tables = []
+    if result.fixtures:
+        headers = _headers(result, [label for _, label in SPEC_COLUMNS])
+        tables.append(
+            _inventory_table("LightingInventory", headers, len(result.fixtures))
+        )
+    _write_sheet(ws, lambda: _fixture_rows(result), tables)
 
-    headers = ["Keynote #", "Keynote Text"]
-    headers += plan_codes
-    headers.append("Total")
 
-    for col_idx, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
-        cell.font = HEADER_FONT
+def _keynote_rows(result: ExtractionResult) -> SheetRows:
+    plan_codes = result.plan_pages or []
+    headers = _headers(result, ["Keynote #", "Keynote Text"])
+    yield 1, [_Styled(h, HEADER_FONT) for h in headers]
 
     for row_idx, kn in enumerate(result.keynotes, 2):
-        ws.cell(row=row_idx, column=1, value=str(kn.number))
-        ws.cell(row=row_idx, column=2, value=kn.text)
-
-        for plan_idx, plan_code in enumerate(plan_codes):
-            col = 3 + plan_idx
-            count = kn.counts_per_plan.get(plan_code, 0)
-            ws.cell(row=row_idx, column=col, value=count)
+        values = [str(kn.number), kn.text]
+        values += [kn.counts_per_plan.get(code, 0) for code in plan_codes]
+        values.append(kn.total)
+        yield row_idx, values
 
-        total_col = 3 + len(plan_codes)
-        ws.cell(row=row_idx, column=total_col, value=kn.total)
 
+def generate_keynotes_sheet(
+    wb: Workbook,
+    result: ExtractionResult,
+) -> None:
+    """Create the Key Notes Inventory sheet."""
+    ws = wb.create_sheet("Key Notes Inventory")
+    tables = []
     if result.keynotes:
-        last_row = len(result.keynotes) + 1
-        last_col = get_column_letter(len(headers))
-        table_ref = f"A1:{last_col}{last_row}"
-        table = Table(displayName="KeyNotesInventory", ref=table_ref)
-        style = TableStyleInfo(
-            name="TableStyleMedium9",
-            showFirstColumn=False,
-            showLastColumn=False,
-            showRowStripes=True,
-            showColumnStripes=False,
+        headers = _headers(result, ["Keynote #", "Keynote Text"])
+        tables.append(
+            _inventory_table("KeyNotesInventory", headers, len(result.keynotes))
         )
-        table.tableStyleInfo = style
-        ws.add_table(table)
+    _write_sheet(ws, lambda: _keynote_rows(result), tables)
 
-    _auto_width(ws)
 
-
-def generate_qa_sheet(wb: Workbook, report: QAReport) -> None:
-    """Create the QA Report sheet with color-coded confidence scores."""
-    ws = wb.create_sheet("QA Report")
-
-    ws.cell(row=1, column=1, value="MEDINA QA REPORT").font = TITLE_FONT
+def _qa_rows(report: QAReport) -> SheetRows:
+    yield 1, [_Styled("MEDINA QA REPORT", TITLE_FONT)]
 
     status = "PASSED" if report.passed else "FAILED"
-    ws.cell(row=3, column=1, value="Overall Confidence")
-    conf_cell = ws.cell(
-        row=3, column=2, value=f"{report.overall_confidence:.1%}"
-    )
-    ws.cell(row=3, column=3, value=status)
-
-    if report.overall_confidence >= 0.95:
-        conf_cell.fill = GREEN_FILL
-    elif report.overall_confidence >= 0.80:
-        conf_cell.fill = YELLOW_FILL
-    else:
-        conf_cell.fill = RED_FILL
-
-    ws.cell(row=4, column=1, value="Threshold")
-    ws.cell(row=4, column=2, value=f"{report.threshold:.0%}")
+    yield 3, [
+        "Overall Confidence",
+        _Styled(
+            f"{report.overall_confidence:.1%}",
+            fill=_confidence_fill(report.overall_confidence),
+        ),
+        status,
+    ]
+    yield 4, ["Threshold", f"{report.threshold:.0%}"]
 
     row = 6
-    ws.cell(row=row, column=1, value="Stage Scores").font = HEADER_FONT
+    yield row, [_Styled("Stage Scores", HEADER_FONT)]
     row += 1
     stage_labels = {
         "sheet_index": "Sheet Index Discovery",
@@ -195,58 +249,47 @@ def generate_qa_sheet(wb: Workbook, report: QAReport) -> None:
     }
     for key, label in stage_labels.items():
         score = report.stage_scores.get(key, 0.0)
-        ws.cell(row=row, column=1, value=label)
-        score_cell = ws.cell(row=row, column=2, value=f"{score:.1%}")
-        if score >= 0.95:
-            score_cell.fill = GREEN_FILL
-        elif score >= 0.80:
-            score_cell.fill = YELLOW_FILL
-        else:
-            score_cell.fill = RED_FILL
+        yield row, [label, _Styled(f"{score:.1%}", fill=_confidence_fill(score))]
         row += 1
 
     if report.warnings:
         row += 1
-        ws.cell(row=row, column=1, value="Warnings").font = HEADER_FONT
+        yield row, [_Styled("Warnings", HEADER_FONT)]
         for w in report.warnings:
             row += 1
-            ws.cell(row=row, column=1, value=w)
+            yield row, [w]
 
     if report.recommendations:
         row += 1
-        ws.cell(
-            row=row, column=1, value="Recommendations"
-        ).font = HEADER_FONT
+        yield row, [_Styled("Recommendations", HEADER_FONT)]
         for r in report.recommendations:
             row += 1
-            ws.cell(row=row, column=1, value=r)
+            yield row, [r]
 
     if report.fixture_results:
         row += 2
-        ws.cell(
-            row=row, column=1, value="Fixture QA Details"
-        ).font = HEADER_FONT
+        yield row, [_Styled("Fixture QA Details", HEADER_FONT)]
         row += 1
-        for h_idx, h in enumerate(
-            ["Code", "Confidence", "Flags", "Notes"], 1
-        ):
-            ws.cell(row=row, column=h_idx, value=h).font = HEADER_FONT
+        yield row, [
+            _Styled(h, HEADER_FONT) for h in ["Code", "Confidence", "Flags", "Notes"]
+        ]
 
         for item in report.fixture_results:
             row += 1
-            ws.cell(row=row, column=1, value=item.item_code)
-            c = ws.cell(row=row, column=2, value=f"{item.confidence:.0%}")
-            if item.confidence >= 0.95:
-                c.fill = GREEN_FILL
-            elif item.confidence >= 0.80:
-                c.fill = YELLOW_FILL
-            else:
-                c.fill = RED_FILL
-            flags = ", ".join(f.value for f in item.flags)
-            ws.cell(row=row, column=3, value=flags)
-            ws.cell(row=row, column=4, value=item.notes)
+            yield row, [
+                item.item_code,
+                _Styled(
+                    f"{item.confidence:.0%}", fill=_confidence_fill(item.confidence),
+                ),
+                ", ".join(f.value for f in item.flags),
+                item.notes,
+            ]
 
-    _auto_width(ws)
+
+def generate_qa_sheet(wb: Workbook, report: QAReport) -> None:
+    """Create the QA Report sheet with color-coded confidence scores."""
+    ws = wb.create_sheet("QA Report")
+    _write_sheet(ws, lambda: _qa_rows(report))
 
 
 def write_excel(
@@ -257,7 +300,7 @@ def write_excel(
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    wb = Workbook()
+    wb = Workbook(write_only=True)
     generate_fixture_sheet(wb, result)
     generate_keynotes_sheet(wb, result)
 
@@ -267,3 +310,60 @@ def write_excel(
     wb.save(str(output_path))
     logger.info("Excel workbook saved to %s", output_path)
     return output_path
+
+
+def excel_cache_key(result: ExtractionResult) -> str:
+    """Content version of *result* as rendered to Excel."""
+    digest = hashlib.sha256(result.model_dump_json().encode("utf-8"))
+    digest.update(f"layout-{EXCEL_LAYOUT_VERSION}".encode())
+    return digest.hexdigest()[:32]
+
+
+def write_excel_cached(
+    result: ExtractionResult,
+    cache_dir: str | Path,
+) -> Path:
+    """Return a workbook for *result*, generating it only on a cache miss.
+
+    Workbooks are stored as ``<cache_dir>/<content hash>.xlsx`` so repeat
+    downloads of unchanged data are served straight from disk.  The
+    directory keeps the most recently used ``_EXPORT_CACHE_MAX`` files,
+    plus any used in the last ``_EXPORT_CACHE_GRACE`` seconds.
+    """
+    cache_dir = Path(cache_dir)
+    path = cache_dir / f"{excel_cache_key(result)}.xlsx"
+    hit = path.exists()
+    metrics.cache_event("export", hit=hit)
+    if hit:
+        os.utime(path)  # Mark as recently used for pruning
+        return path
+
+    # Unique per call: concurrent exports of the same data each write
+    # their own file and the last rename wins
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=cache_dir, prefix=f"{path.stem}.", suffix=".tmp")
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        write_excel(result, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    _prune_export_cache(cache_dir)
+    return path
+
+
+def _prune_export_cache(cache_dir: Path) -> None:
+    try:
+        files = sorted(
+            cache_dir.glob("*.xlsx"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        cutoff = time.time() - _EXPORT_CACHE_GRACE
+        for stale in files[_EXPORT_CACHE_MAX:]:
+            if stale.stat().st_mtime < cutoff:
+                stale.unlink(missing_ok=True)
+    except OSError as e:
+        logger.debug("Excel export cache prune failed: %s", e)
@@ -106,11 +106,26 @@ def build_json_output(result: ExtractionResult) -> dict:
     }
 
 
+def _write_pack_alongside(writer, data: dict, json_path: Path) -> None:
+    """Write the binary result pack next to *json_path* (non-fatal)."""
+    from medina.output.result_pack import pack_path_for
+
+    try:
+        writer(data, pack_path_for(json_path))
+    except Exception as e:
+        logger.warning("Failed to write result pack for %s: %s", json_path, e)
+
+
 def write_json(
     result: ExtractionResult,
     output_path: str | Path,
+    write_pack: bool = True,
 ) -> Path:
-    """Generate the JSON output file."""
+    """Generate the JSON output file.
+
+    Also writes the compact ``.mdr`` result pack next to it (see
+    :mod:`medina.output.result_pack`) unless *write_pack* is False.
+    """
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -120,6 +135,10 @@ def write_json(
         json.dump(data, f, indent=2, ensure_ascii=False)
 
     logger.info("JSON output saved to %s", output_path)
+
+    if write_pack:
+        from medina.output.result_pack import write_result_pack
+        _write_pack_alongside(write_result_pack, data, output_path)
     return output_path
 
 
@@ -127,11 +146,14 @@ def write_positions_json(
     fixture_positions: dict,
     keynote_positions: dict,
     output_path: str | Path,
+    write_pack: bool = True,
 ) -> Path:
     """Write fixture and keynote positions to a separate JSON file.
 
     This keeps the main results JSON lightweight while storing the
     per-fixture, per-keynote coordinate data needed for click-to-highlight.
+    A ``_positions.mdr`` pack with one section per plan is written next
+    to it so the API can serve a single page without parsing the file.
 
     Args:
         fixture_positions: ``{sheet_code: {"page_width": float,
@@ -139,6 +161,7 @@ def write_positions_json(
         keynote_positions: ``{sheet_code: {"page_width": float,
             "page_height": float, "keynotes": {number: [pos, ...]}}}``.
         output_path: Path to write (should end with ``_positions.json``).
+        write_pack: Also write the binary positions pack.
 
     Returns:
         The output path.
@@ -163,4 +186,8 @@ def write_positions_json(
         json.dump(merged, f, indent=2, ensure_ascii=False)
 
     logger.info("Positions JSON saved to %s", output_path)
+
+    if write_pack:
+        from medina.output.result_pack import write_positions_pack
+        _write_pack_alongside(write_positions_pack, merged, output_path)
     return output_path
@@ -0,0 +1,315 @@
+"""Compact binary result container (``.mdr``) written alongside the JSON.
+
+The JSON files stay as the export format; the API reads results through
+this container instead so it never has to parse a whole hospital-sized
+result to answer one question.
+
+Layout::
+
+    b"MDR1" | u16 version | u16 codec        header (8 bytes)
+    section blobs, back to back
+    index blob                               {"kind", "order", "sections"}
+    u32 index length | b"MDR1"               footer (8 bytes)
+
+Every blob is encoded with the header's codec: msgpack when the optional
+``msgpack`` package is installed, compact UTF-8 JSON otherwise.  Sections
+are named ``meta``, ``fixture/<code>``, ``keynote/<number>`` for result
+packs and ``plan/<sheet_code>`` for position packs, so a reader seeks to
+just the section it needs via the footer index.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from medina.exceptions import OutputError
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+except ImportError:  # Optional — fall back to compact JSON blobs
+    msgpack = None
+
+MAGIC = b"MDR1"
+FORMAT_VERSION = 1
+PACK_SUFFIX = ".mdr"
+
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+
+_HEADER = struct.Struct("<4sHH")
+_FOOTER = struct.Struct("<I4s")
+
+# Parsed footer indexes keyed by path, invalidated on (mtime, size) change
+_INDEX_CACHE_MAX = 128
+_index_cache: OrderedDict[str, tuple[tuple[int, int], int, dict]] = OrderedDict()
+_index_lock = threading.Lock()
+
+
+# ── Codecs ────────────────────────────────────────────────────────────
+
+
+def _default_codec() -> int:
+    return CODEC_MSGPACK if msgpack is not None else CODEC_JSON
+
+
+def _encode(obj: Any, codec: int) -> bytes:
+    if codec == CODEC_MSGPACK:
+        return msgpack.packb(obj, use_bin_type=True)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _decode(data: bytes, codec: int) -> Any:
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise OutputError("Result pack is msgpack-encoded but msgpack is not installed")
+        # strict_map_key=False: keynote/plan maps may carry non-str keys
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    return json.loads(data)
+
+
+# ── Writing ───────────────────────────────────────────────────────────
+
+
+def write_pack(
+    sections: dict[str, Any],
+    output_path: str | Path,
+    kind: str,
+    order: dict[str, list[str]] | None = None,
+) -> Path:
+    """Write *sections* to a pack file atomically.
+
+    Args:
+        sections: Section name to JSON-compatible payload.
+        output_path: Destination (conventionally ending in ``.mdr``).
+        kind: ``"result"`` or ``"positions"``; stored in the index.
+        order: Named section lists whose order readers must preserve
+            (e.g. fixtures in schedule order).
+
+    Returns:
+        The output path.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    codec = _default_codec()
+
+    index: dict[str, Any] = {"kind": kind, "order": order or {}, "sections": {}}
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, codec))
+            offset = _HEADER.size
+            for name, payload in sections.items():
+                blob = _encode(payload, codec)
+                f.write(blob)
+                index["sections"][name] = [offset, len(blob)]
+                offset += len(blob)
+            index_blob = _encode(index, codec)
+            f.write(index_blob)
+            f.write(_FOOTER.pack(len(index_blob), MAGIC))
+        os.replace(tmp_path, output_path)
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        raise OutputError(f"Failed to write result pack {output_path}: {e}") from e
+
+    _forget_index(output_path)
+    return output_path
+
+
+def write_result_pack(data: dict, output_path: str | Path) -> Path:
+    """Write a result dict (as built by ``build_json_output``) as a pack."""
+    sections: dict[str, Any] = {}
+    meta = {k: v for k, v in data.items() if k not in ("fixtures", "keynotes")}
+    sections["meta"] = meta
+
+    fixture_order: list[str] = []
+    for fixture in data.get("fixtures", []):
+        name = f"fixture/{fixture.get('code', '')}"
+        # Duplicate codes keep the first entry addressable by code;
+        # later ones get a positional suffix so none are lost.
+        if name in sections:
+            name = f"{name}#{len(fixture_order)}"
+        sections[name] = fixture
+        fixture_order.append(name)
+
+    keynote_order: list[str] = []
+    for keynote in data.get("keynotes", []):
+        number = keynote.get("keynote_number", keynote.get("number", ""))
+        name = f"keynote/{number}"
+        if name in sections:
+            name = f"{name}#{len(keynote_order)}"
+        sections[name] = keynote
+        keynote_order.append(name)
+
+    path = write_pack(
+        sections, output_path, kind="result",
+        order={"fixtures": fixture_order, "keynotes": keynote_order},
+    )
+    logger.info("Result pack saved to %s", path)
+    return path
+
+
+def write_positions_pack(merged: dict[str, dict], output_path: str | Path) -> Path:
+    """Write merged per-plan positions (``write_positions_json`` shape)."""
+    sections = {f"plan/{plan}": page for plan, page in merged.items()}
+    path = write_pack(sections, output_path, kind="positions")
+    logger.info("Positions pack saved to %s", path)
+    return path
+
+
+# ── Reading ───────────────────────────────────────────────────────────
+
+
+def _forget_index(path: Path) -> None:
+    with _index_lock:
+        _index_cache.pop(str(path), None)
+
+
+def _read_index(path: Path) -> tuple[int, dict]:
+    """Return (codec, index) for *path*, from cache when unchanged."""
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    key = str(path)
+    with _index_lock:
+        cached = _index_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            _index_cache.move_to_end(key)
+            return cached[1], cached[2]
+
+    with open(path, "rb") as f:
+        magic, version, codec = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise OutputError(f"Not a result pack: {path}")
+        if version > FORMAT_VERSION:
+            raise OutputError(f"Unsupported result pack version {version}: {path}")
+        f.seek(-_FOOTER.size, os.SEEK_END)
+        index_len, tail = _FOOTER.unpack(f.read(_FOOTER.size))
+        if tail != MAGIC:
+            raise OutputError(f"Truncated result pack: {path}")
+        f.seek(-(_FOOTER.size + index_len), os.SEEK_END)
+        index = _decode(f.read(index_len), codec)
+
+    with _index_lock:
+        _index_cache[key] = (stamp, codec, index)
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > _INDEX_CACHE_MAX:
+            _index_cache.popitem(last=False)
+    return codec, index
+
+
+def read_sections(path: str | Path, names: list[str]) -> dict[str, Any]:
+    """Decode only the named sections; unknown names are omitted."""
+    path = Path(path)
+    codec, index = _read_index(path)
+    table = index["sections"]
+    out: dict[str, Any] = {}
+    with open(path, "rb") as f:
+        for name in names:
+            span = table.get(name)
+            if span is None:
+                continue
+            f.seek(span[0])
+            out[name] = _decode(f.read(span[1]), codec)
+    return out
+
+
+def read_section(path: str | Path, name: str) -> Any | None:
+    """Decode a single section, or None if the pack does not have it."""
+    return read_sections(path, [name]).get(name)
+
+
+def list_sections(path: str | Path, prefix: str = "") -> list[str]:
+    """Return section names in the pack, optionally filtered by prefix."""
+    _, index = _read_index(Path(path))
+    return [n for n in index["sections"] if n.startswith(prefix)]
+
+
+def read_result_pack(path: str | Path) -> dict:
+    """Reassemble the full result dict from a result pack."""
+    path = Path(path)
+    _, index = _read_index(path)
+    order = index.get("order", {})
+    fixture_names = order.get("fixtures", [])
+    keynote_names = order.get("keynotes", [])
+    sections = read_sections(path, ["meta", *fixture_names, *keynote_names])
+
+    data = dict(sections.get("meta", {}))
+    data["fixtures"] = [sections[n] for n in fixture_names if n in sections]
+    data["keynotes"] = [sections[n] for n in keynote_names if n in sections]
+    return data
+
+
+def read_fixture(path: str | Path, code: str) -> dict | None:
+    """Return one fixture's entry (including counts_per_plan) by code."""
+    return read_section(path, f"fixture/{code}")
+
+
+def read_plan_positions(path: str | Path, sheet_code: str) -> dict | None:
+    """Return one plan's positions from a positions pack."""
+    return read_section(path, f"plan/{sheet_code}")
+
+
+# ── Loaders with JSON fallback ────────────────────────────────────────
+
+
+def pack_path_for(json_path: str | Path) -> Path:
+    """Return the pack path that sits next to a JSON output file."""
+    return Path(json_path).with_suffix(PACK_SUFFIX)
+
+
+def _pack_is_current(pack: Path, json_path: Path) -> bool:
+    """True if *pack* exists and is not older than its JSON sibling.
+
+    Code that still rewrites only the JSON (seeding, manual edits) must
+    not be shadowed by a stale pack.
+    """
+    try:
+        pack_mtime = pack.stat().st_mtime_ns
+    except OSError:
+        return False
+    try:
+        return pack_mtime >= json_path.stat().st_mtime_ns
+    except OSError:
+        return True
+
+
+def load_result(output_base: str | Path) -> dict | None:
+    """Load ``<output_base>.mdr``, falling back to ``<output_base>.json``."""
+    pack = Path(f"{output_base}{PACK_SUFFIX}")
+    json_path = Path(f"{output_base}.json")
+    if _pack_is_current(pack, json_path):
+        try:
+            return read_result_pack(pack)
+        except Exception as e:
+            logger.debug("Result pack unreadable (%s), falling back to JSON: %s", pack, e)
+    if json_path.exists():
+        with open(json_path, encoding="utf-8") as f:
+            return json.load(f)
+    return None
+
+
+def load_plan_positions(output_base: str | Path, sheet_code: str) -> dict | None:
+    """Load one plan's positions from ``<output_base>_positions.mdr``.
+
+    Falls back to parsing ``<output_base>_positions.json`` when no pack
+    exists (older outputs, dashboard copies made before packs existed).
+    """
+    pack = Path(f"{output_base}_positions{PACK_SUFFIX}")
+    json_path = Path(f"{output_base}_positions.json")
+    if _pack_is_current(pack, json_path):
+        try:
+            return read_plan_positions(pack, sheet_code)
+        except Exception as e:
+            logger.debug("Positions pack unreadable (%s), falling back to JSON: %s", pack, e)
+    if json_path.exists():
+        with open(json_path, encoding="utf-8") as f:
+            return json.load(f).get(sheet_code)
+    return None
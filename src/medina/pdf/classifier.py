@@ -6,7 +6,9 @@ import logging
 import re
 from typing import Any
 
+from medina import tracing
 from medina.models import PageInfo, PageType, SheetIndexEntry
+from medina.pdf import fitz_session, page_cache, primitives
 
 logger = logging.getLogger(__name__)
 
@@ -132,6 +134,7 @@ _SCHEDULE_EXCLUDE = {
 }
 
 
+@tracing.traced("pdf.classify_pages", cat="pdf")
 def classify_pages(
     pages: list[PageInfo],
     pdf_pages: dict[int, Any],
@@ -160,40 +163,21 @@ def classify_pages(
 
     # Pre-identify dense pages via fitz content stream size (instant).
     # Dense pages have so many vector objects that pdfplumber's
-    # extract_text() hangs for minutes. We skip pdfplumber fallback
-    # on these pages.
-    dense_pages: set[int] = set()  # page_number set
-    try:
-        import fitz as pymupdf
-
-        # Group pages by source file to avoid re-opening PDFs
-        source_files: dict[str, list[PageInfo]] = {}
-        for p in pages:
-            key = str(p.source_path)
-            source_files.setdefault(key, []).append(p)
-
-        for src, src_pages in source_files.items():
-            try:
-                doc = pymupdf.open(src)
-                for p in src_pages:
-                    if p.pdf_page_index < len(doc):
-                        stream_sz = len(
-                            doc[p.pdf_page_index].read_contents()
-                        )
-                        if stream_sz > 10_000_000:
-                            dense_pages.add(p.page_number)
-                doc.close()
-            except Exception:
-                pass
-    except ImportError:
-        pass
+    # extract_text() hangs for minutes. We skip the text fallbacks
+    # on these pages unless the fitz primitive backend serves them.
+    # The loader's fitz sessions already hold the stream sizes.
+    dense_pages = fitz_session.dense_page_numbers(pages)
 
     for page in pages:
+        pdfp_page = pdf_pages.get(page.page_number)
         page_type = _classify_single(
             page,
-            pdf_pages.get(page.page_number),
+            pdfp_page,
             index_lookup,
-            skip_pdfplumber=(page.page_number in dense_pages),
+            skip_pdfplumber=(
+                page.page_number in dense_pages
+                and not primitives.is_bound(pdfp_page)
+            ),
         )
         page.page_type = page_type
         logger.debug(
@@ -290,7 +274,7 @@ def _classify_by_content(page: Any) -> PageType | None:
 
     # --- Pass 2: Full-page text scan ---
     try:
-        text = page.extract_text() or ""
+        text = page_cache.region_text(page)
     except Exception:
         return None
 
@@ -327,26 +311,14 @@ def _classify_title_block_fitz(
     """Fast-path title block classification using PyMuPDF (fitz).
 
     Used to avoid pdfplumber's slow extract_text on pages with
-    extreme vector density (millions of line objects).
+    extreme vector density (millions of line objects).  Reads the
+    title-block clip from the document's shared fitz session.
     """
     try:
-        import fitz as pymupdf
-        doc = pymupdf.open(str(source_path))
-        if pdf_page_index >= len(doc):
-            doc.close()
-            return None
-        fitz_page = doc[pdf_page_index]
-        rect = fitz_page.rect
-        clip = pymupdf.Rect(
-            rect.width * 0.55,
-            rect.height * 0.85,
-            rect.width,
-            rect.height,
-        )
-        raw_text = fitz_page.get_text("text", clip=clip)
-        doc.close()
+        session = fitz_session.get_session(source_path)
     except Exception:
         return None
+    raw_text = session.clip_text(pdf_page_index, fitz_session.TITLE_BLOCK_CLIP)
 
     title_text = " ".join((raw_text or "").lower().split())
     if not title_text:
@@ -396,8 +368,7 @@ def _classify_from_title_block(page: Any) -> PageType | None:
         y1,
     )
     try:
-        cropped = page.within_bbox(bbox)
-        raw_text = cropped.extract_text() or ""
+        raw_text = page_cache.region_text(page, bbox)
         # Collapse newlines to spaces so multi-line titles
         # like "ELECTRICAL SITE\nPLAN" match "site plan".
         title_text = " ".join(raw_text.lower().split())
@@ -0,0 +1,194 @@
+"""Shared per-document PyMuPDF (fitz) sessions for stages 1–3.
+
+Loading, sheet-index discovery and classification all consult fitz for
+the same cheap facts about each page: the raw content-stream size (to
+flag pages too dense for pdfplumber), the page rect and the text inside
+the title-block clip; pages served by the fitz extraction backend also
+read their bulk primitives (:mod:`medina.pdf.primitives`) from here.
+A :class:`FitzSession` opens a PDF once and computes each of those once
+per page; sessions are kept per resolved
+path for as long as the loader's cache keeps the document's pdfplumber
+pages (:func:`medina.pdf.loader.clear_load_cache` closes them).
+
+PyMuPDF documents are not thread-safe, so every access to a session's
+document is serialized on that session's lock.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+from medina import tracing
+from medina.models import PageInfo
+from medina.pdf.primitives import PagePrimitives, extract
+
+logger = logging.getLogger(__name__)
+
+# Pages with content streams larger than this are too dense for
+# pdfplumber to extract text in reasonable time.  Checked via fitz
+# (instant — reads raw byte length without parsing).
+DENSE_STREAM_BYTES = 10_000_000  # 10 MB
+
+# Title-block clips as (left, top, right, bottom) fractions of the page.
+TITLE_BLOCK_CLIP = (0.55, 0.85, 1.0, 1.0)
+SHEET_CODE_CLIP = (0.60, 0.80, 1.0, 1.0)
+
+_sessions: dict[str, FitzSession] = {}
+_sessions_lock = threading.Lock()
+
+
+class FitzSession:
+    """One open fitz document with per-page metadata computed once."""
+
+    def __init__(self, path: Path) -> None:
+        import fitz as pymupdf
+
+        self.path = path
+        self._doc = pymupdf.open(str(path))
+        self._lock = threading.RLock()
+        self._stream_sizes: dict[int, int] = {}
+        self._rects: dict[int, tuple[float, float]] = {}
+        self._clip_texts: dict[tuple[int, tuple[float, ...]], str | None] = {}
+        self._primitives: dict[int, PagePrimitives] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc)
+
+    def stream_size(self, index: int) -> int:
+        """Raw content-stream length of page *index* (0 if unreadable)."""
+        with self._lock:
+            if index not in self._stream_sizes:
+                try:
+                    size = len(self._doc[index].read_contents())
+                except Exception:
+                    size = 0
+                self._stream_sizes[index] = size
+            return self._stream_sizes[index]
+
+    def is_dense(self, index: int) -> bool:
+        """Whether page *index* is too dense for pdfplumber text ops."""
+        return self.stream_size(index) > DENSE_STREAM_BYTES
+
+    def page_size(self, index: int) -> tuple[float, float]:
+        """(width, height) of page *index* in points."""
+        with self._lock:
+            if index not in self._rects:
+                rect = self._doc[index].rect
+                self._rects[index] = (rect.width, rect.height)
+            return self._rects[index]
+
+    def clip_text(
+        self,
+        index: int,
+        clip: tuple[float, float, float, float] = TITLE_BLOCK_CLIP,
+    ) -> str | None:
+        """Text of page *index* inside *clip* (fractions of the page).
+
+        Returns None if the page is out of range or extraction fails.
+        """
+        key = (index, tuple(clip))
+        with self._lock:
+            if key in self._clip_texts:
+                return self._clip_texts[key]
+            if index >= len(self._doc):
+                return None
+            try:
+                import fitz as pymupdf
+
+                width, height = self.page_size(index)
+                left, top, right, bottom = clip
+                text = self._doc[index].get_text(
+                    "text",
+                    clip=pymupdf.Rect(
+                        width * left, height * top,
+                        width * right, height * bottom,
+                    ),
+                )
+            except Exception as exc:
+                logger.debug(
+                    "fitz clip text failed on %s page %d: %s",
+                    self.path.name, index + 1, exc,
+                )
+                text = None
+            self._clip_texts[key] = text
+            return text
+
+    def primitives(
+        self,
+        index: int,
+        origin: tuple[float, float] = (0.0, 0.0),
+    ) -> PagePrimitives:
+        """Chars, lines and rects of page *index*, extracted once.
+
+        See :mod:`medina.pdf.primitives`.  Raises whatever fitz raises;
+        failures are not cached.
+        """
+        with self._lock:
+            prims = self._primitives.get(index)
+            if prims is None:
+                with tracing.span(
+                    "pdf.primitives", cat="pdf",
+                    page=index + 1, stream_bytes=self.stream_size(index),
+                ) as sp:
+                    prims = extract(self._doc[index], origin)
+                    sp.set(chars=len(prims), bytes=prims.nbytes)
+                self._primitives[index] = prims
+            return prims
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._doc.close()
+            except Exception:
+                pass
+
+
+def get_session(path: str | Path) -> FitzSession:
+    """Return the shared session for *path*, opening the PDF on first use.
+
+    Raises whatever ``fitz.open`` raises; failed opens are not cached.
+    """
+    path = Path(path)
+    key = str(path.resolve())
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = FitzSession(path)
+            _sessions[key] = session
+        return session
+
+
+def session_for(page: PageInfo) -> FitzSession | None:
+    """The session of *page*'s source PDF, or None if it cannot be opened
+    or does not contain the page."""
+    try:
+        session = get_session(page.source_path)
+    except Exception as exc:
+        logger.debug("fitz could not open %s: %s", page.source_path, exc)
+        return None
+    if page.pdf_page_index >= len(session):
+        return None
+    return session
+
+
+def dense_page_numbers(pages: Iterable[PageInfo]) -> set[int]:
+    """Page numbers of *pages* whose content stream is too dense for
+    pdfplumber text extraction."""
+    dense: set[int] = set()
+    for page in pages:
+        session = session_for(page)
+        if session is not None and session.is_dense(page.pdf_page_index):
+            dense.add(page.page_number)
+    return dense
+
+
+def close_sessions() -> None:
+    """Close and forget every open session."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
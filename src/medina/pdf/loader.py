@@ -7,11 +7,12 @@ import re
 from pathlib import Path
 from typing import Any
 
-import fitz as pymupdf
 import pdfplumber
 
+from medina import metrics, tracing
 from medina.exceptions import PDFLoadError
 from medina.models import PageInfo, PageType
+from medina.pdf import fitz_session, primitives
 
 logger = logging.getLogger(__name__)
 
@@ -36,15 +37,11 @@ _BROAD_SHEET_CODE_RE = re.compile(
     r"\b([A-Z]{1,3}\d{3,}[-]\d{2,3})\b",
 )
 
-# Pages with content streams larger than this are too dense for
-# pdfplumber to extract text in reasonable time.  Checked via fitz
-# (instant — reads raw byte length without parsing).
-_MAX_CONTENT_STREAM_BYTES = 10_000_000  # 10 MB
-
 
 def clear_load_cache() -> None:
-    """Clear the in-memory PDF load cache."""
+    """Clear the in-memory PDF load cache and the shared fitz sessions."""
     _load_cache.clear()
+    fitz_session.close_sessions()
 
 
 def load(
@@ -55,7 +52,9 @@ def load(
     Uses PyMuPDF (fitz) for fast sheet code / title extraction on
     dense vector pages, falling back to pdfplumber for normal pages.
     Always opens pdfplumber for downstream use (table extraction,
-    char-level analysis, line geometry).
+    char-level analysis, line geometry); pages selected by the
+    ``pdf_backend`` setting are also bound to the fitz primitive
+    backend, which :mod:`medina.pdf.page_cache` then reads them from.
 
     Returns:
         Tuple of (page_infos, pdf_pages_dict) where pdf_pages_dict maps
@@ -66,21 +65,26 @@ def load(
         raise PDFLoadError(f"Source path does not exist: {source}")
 
     cache_key = str(source.resolve())
-    if cache_key in _load_cache:
-        logger.info("Returning cached load for %s", source.name)
-        return _load_cache[cache_key]
-
-    if source.is_file():
-        result = _load_single_pdf(source)
-    elif source.is_dir():
-        result = _load_folder(source)
-    else:
-        raise PDFLoadError(
-            f"Source is neither a file nor directory: {source}"
-        )
+    with tracing.span("pdf.load", cat="pdf", source=source.name) as sp:
+        if cache_key in _load_cache:
+            logger.info("Returning cached load for %s", source.name)
+            sp.set(cache_hit=True, pages=len(_load_cache[cache_key][0]))
+            metrics.cache_event("load", hit=True)
+            return _load_cache[cache_key]
+
+        metrics.cache_event("load", hit=False)
+        if source.is_file():
+            result = _load_single_pdf(source)
+        elif source.is_dir():
+            result = _load_folder(source)
+        else:
+            raise PDFLoadError(
+                f"Source is neither a file nor directory: {source}"
+            )
 
-    _load_cache[cache_key] = result
-    return result
+        _load_cache[cache_key] = result
+        sp.set(cache_hit=False, pages=len(result[0]))
+        return result
 
 
 def _load_single_pdf(
@@ -97,8 +101,9 @@ def _load_single_pdf(
     logger.info("Loading single PDF: %s", pdf_path)
 
     # --- Identify dense pages via fitz (instant check) ---
+    # The session stays open for sheet-index discovery and classification.
     try:
-        fitz_doc = pymupdf.open(str(pdf_path))
+        session = fitz_session.get_session(pdf_path)
     except Exception as exc:
         raise PDFLoadError(
             f"Failed to open PDF {pdf_path}: {exc}"
@@ -107,27 +112,20 @@ def _load_single_pdf(
     dense_pages: set[int] = set()  # 0-indexed
     fitz_codes: dict[int, tuple[str | None, str | None]] = {}
 
-    for idx in range(len(fitz_doc)):
-        fitz_page = fitz_doc[idx]
-        try:
-            stream_size = len(fitz_page.read_contents())
-        except Exception:
-            stream_size = 0
-        if stream_size > _MAX_CONTENT_STREAM_BYTES:
+    for idx in range(len(session)):
+        if session.is_dense(idx):
             dense_pages.add(idx)
             # Extract sheet code via fitz for dense pages
-            code = _fitz_extract_sheet_code(fitz_page)
-            title = _fitz_extract_sheet_title(fitz_page, code)
+            code = _fitz_extract_sheet_code(session, idx)
+            title = _fitz_extract_sheet_title(session, idx, code)
             fitz_codes[idx] = (code, title)
             logger.info(
                 "Page %d: dense (%d MB stream) — using fitz "
                 "for metadata",
                 idx + 1,
-                stream_size // 1_000_000,
+                session.stream_size(idx) // 1_000_000,
             )
 
-    fitz_doc.close()
-
     # --- Open with pdfplumber ---
     try:
         pdf = pdfplumber.open(pdf_path)
@@ -138,9 +136,12 @@ def _load_single_pdf(
 
     pages: list[PageInfo] = []
     pdf_pages: dict[int, Any] = {}
+    backend = primitives.configured_backend()
+    fitz_bound = 0
 
     for idx, page in enumerate(pdf.pages):
         page_num = idx + 1
+        fitz_bound += primitives.bind_for_backend(page, session, idx, backend)
 
         if idx in dense_pages:
             # Use fitz-extracted metadata (skip pdfplumber text ops)
@@ -162,10 +163,11 @@ def _load_single_pdf(
         pdf_pages[page_num] = page
 
     logger.info(
-        "Loaded %d pages from %s (%d dense)",
+        "Loaded %d pages from %s (%d dense, %d on the fitz backend)",
         len(pages),
         pdf_path.name,
         len(dense_pages),
+        fitz_bound,
     )
     return pages, pdf_pages
 
@@ -200,6 +202,7 @@ def _load_folder(
     raw_entries: list[
         tuple[Path, str | None, str | None, Any]
     ] = []
+    backend = primitives.configured_backend()
     for pdf_file in pdf_files:
         filename_code, sheet_title = _parse_filename(pdf_file)
 
@@ -225,13 +228,10 @@ def _load_folder(
         # Check density via fitz first
         title_block_code = None
         try:
-            fitz_doc = pymupdf.open(str(pdf_file))
-            stream_size = len(fitz_doc[0].read_contents())
-            if stream_size > _MAX_CONTENT_STREAM_BYTES:
-                title_block_code = _fitz_extract_sheet_code(
-                    fitz_doc[0]
-                )
-            fitz_doc.close()
+            session = fitz_session.get_session(pdf_file)
+            if session.is_dense(0):
+                title_block_code = _fitz_extract_sheet_code(session, 0)
+            primitives.bind_for_backend(pdfplumber_page, session, 0, backend)
         except Exception:
             pass
 
@@ -310,39 +310,22 @@ def _load_folder(
 # ── fitz-based fast extraction (for dense pages) ─────────────
 
 
-def _fitz_extract_sheet_code(page: Any) -> str | None:
+def _fitz_extract_sheet_code(
+    session: fitz_session.FitzSession,
+    index: int,
+) -> str | None:
     """Extract sheet code from title block using PyMuPDF (fitz)."""
-    rect = page.rect
-    clip = pymupdf.Rect(
-        rect.width * 0.60,
-        rect.height * 0.80,
-        rect.width,
-        rect.height,
-    )
-    try:
-        text = page.get_text("text", clip=clip)
-    except Exception:
-        return None
-
+    text = session.clip_text(index, fitz_session.SHEET_CODE_CLIP)
     return _find_sheet_code_in_text(text)
 
 
 def _fitz_extract_sheet_title(
-    page: Any,
+    session: fitz_session.FitzSession,
+    index: int,
     sheet_code: str | None,
 ) -> str | None:
     """Extract sheet title from title block using PyMuPDF (fitz)."""
-    rect = page.rect
-    clip = pymupdf.Rect(
-        rect.width * 0.55,
-        rect.height * 0.85,
-        rect.width,
-        rect.height,
-    )
-    try:
-        text = page.get_text("text", clip=clip)
-    except Exception:
-        return None
+    text = session.clip_text(index, fitz_session.TITLE_BLOCK_CLIP)
 
     if not text or not text.strip():
         return None
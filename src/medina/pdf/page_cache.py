@@ -0,0 +1,196 @@
+"""Per-page analysis cache shared by the pipeline stages.
+
+Several stages run the same expensive pdfplumber analysis on the same
+page: word extraction (viewport detection, fixture and keynote
+counting), region text extraction (the keynote legend crops, repeated
+for every viewport sibling of a page), and line-based table finding
+(the schedule extractor's combo-page scan and the fixture counter's
+schedule-area exclusion).  Results are memoized here keyed by the pdfplumber page
+object itself (weakly), so they live exactly as long as the page — in
+practice as long as the loader's ``_load_cache`` entry — and never leak
+across documents.
+
+Pages bound to the PyMuPDF backend (:mod:`medina.pdf.primitives`)
+answer chars, lines, words and text from its bulk extraction instead
+of pdfplumber; table finding always uses pdfplumber.
+
+Entries are computed outside the lock: two threads asking for the same
+missing entry may both compute it, and the first stored result wins.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from medina.pdf import primitives
+
+logger = logging.getLogger(__name__)
+
+# pdfplumber tolerances of the shared word layer (matches the counters)
+WORD_TOLERANCE = 3
+
+# Line-based table settings shared by every table-finding consumer
+LINE_TABLE_SETTINGS: dict[str, Any] = {
+    "vertical_strategy": "lines",
+    "horizontal_strategy": "lines",
+    "snap_tolerance": 5,
+    "join_tolerance": 5,
+}
+
+_entries: weakref.WeakKeyDictionary[Any, dict[str, Any]] = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def cached(pdf_page: Any, key: str, compute: Callable[[], Any]) -> Any:
+    """Return ``compute()`` memoized per (page, key)."""
+    try:
+        with _lock:
+            entry = _entries.get(pdf_page)
+            if entry is not None and key in entry:
+                return entry[key]
+    except TypeError:  # Not weak-referenceable (e.g. a test double)
+        return compute()
+
+    value = compute()
+    with _lock:
+        entry = _entries.setdefault(pdf_page, {})
+        return entry.setdefault(key, value)
+
+
+def page_chars(pdf_page: Any) -> list[dict[str, Any]]:
+    """The page's glyphs (``page.chars``)."""
+    prims = primitives.of(pdf_page)
+    return prims.chars() if prims is not None else pdf_page.chars
+
+
+def page_lines(pdf_page: Any) -> list[dict[str, Any]]:
+    """The page's straight line segments (``page.lines``)."""
+    prims = primitives.of(pdf_page)
+    return prims.lines() if prims is not None else pdf_page.lines
+
+
+def page_rects(pdf_page: Any) -> list[dict[str, Any]]:
+    """The page's rectangles (``page.rects``)."""
+    prims = primitives.of(pdf_page)
+    return prims.rects() if prims is not None else pdf_page.rects
+
+
+def page_words(pdf_page: Any) -> list[dict[str, Any]]:
+    """The page's words at the shared tolerances (``extract_words``)."""
+    def compute() -> list[dict[str, Any]]:
+        prims = primitives.of(pdf_page)
+        if prims is not None:
+            return prims.words(
+                x_tolerance=WORD_TOLERANCE, y_tolerance=WORD_TOLERANCE,
+            )
+        return pdf_page.extract_words(
+            x_tolerance=WORD_TOLERANCE,
+            y_tolerance=WORD_TOLERANCE,
+            keep_blank_chars=False,
+        )
+
+    return cached(pdf_page, "words", compute)
+
+
+def words_within(
+    words: list[dict[str, Any]],
+    bbox: tuple[float, float, float, float],
+) -> list[dict[str, Any]]:
+    """The words lying entirely inside *bbox* (page coordinates).
+
+    Stands in for ``page.within_bbox(bbox).extract_words()`` on the
+    shared word layer; only words straddling the bbox edge differ (they
+    are dropped here rather than cut).
+    """
+    x0, top, x1, bottom = bbox
+    return [
+        w for w in words
+        if w["x0"] >= x0 and w["x1"] <= x1
+        and w["top"] >= top and w["bottom"] <= bottom
+    ]
+
+
+def region_text(
+    pdf_page: Any,
+    bbox: tuple[float, float, float, float] | None = None,
+) -> str:
+    """``extract_text()`` of the page, or of ``within_bbox(bbox)``.
+
+    Raises whatever pdfplumber raises; failures are not cached.
+    """
+    if bbox is not None:
+        bbox = tuple(bbox)
+
+    def compute() -> str:
+        prims = primitives.of(pdf_page)
+        if prims is not None:
+            return prims.text(bbox)
+        if bbox is None:
+            return pdf_page.extract_text() or ""
+        return pdf_page.within_bbox(bbox).extract_text() or ""
+
+    return cached(pdf_page, "text" if bbox is None else f"text:{bbox}", compute)
+
+
+def page_text_lower(pdf_page: Any) -> str:
+    """Space-joined, lower-cased text of :func:`page_words`.
+
+    Meant for keyword tests; multi-word phrases match across line breaks.
+    """
+    return cached(
+        pdf_page,
+        "text_lower",
+        lambda: " ".join(w["text"] for w in page_words(pdf_page)).lower(),
+    )
+
+
+@dataclass(frozen=True)
+class DetectedTable:
+    """One table found by the line-based strategy."""
+
+    bbox: tuple[float, float, float, float]
+    # ``table.extract()`` rows, or None if extraction failed for this table
+    rows: list[list[str | None]] | None
+
+    @property
+    def header_row(self) -> list[str | None]:
+        return self.rows[0] if self.rows else []
+
+    def header_text(self) -> str:
+        """Lower-cased, space-joined text of the first row."""
+        return " ".join(str(cell).lower() for cell in self.header_row if cell)
+
+
+def _detect_tables(pdf_page: Any) -> list[DetectedTable]:
+    detected: list[DetectedTable] = []
+    for table in pdf_page.find_tables(table_settings=LINE_TABLE_SETTINGS):
+        try:
+            rows = table.extract()
+        except Exception as e:
+            logger.debug("Table extract failed at %s: %s", table.bbox, e)
+            rows = None
+        detected.append(DetectedTable(bbox=tuple(table.bbox), rows=rows))
+    return detected
+
+
+def page_tables(pdf_page: Any) -> list[DetectedTable]:
+    """Line-strategy tables of the page (``find_tables`` + ``extract``).
+
+    Raises whatever pdfplumber raises from ``find_tables``; failures are
+    not cached.
+    """
+    return cached(pdf_page, "tables:lines", lambda: _detect_tables(pdf_page))
+
+
+def clear(pdf_page: Any | None = None) -> None:
+    """Drop cached analysis for one page, or for all pages."""
+    with _lock:
+        if pdf_page is None:
+            _entries.clear()
+        else:
+            _entries.pop(pdf_page, None)
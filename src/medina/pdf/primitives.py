@@ -0,0 +1,345 @@
+"""PyMuPDF extraction backend: every page primitive in one bulk pass.
+
+pdfplumber interprets a page's content stream in pure Python and derives
+``chars``, ``lines``, ``rects``, words and text from it separately.  On
+dense vector pages (content streams over
+:data:`~medina.pdf.fitz_session.DENSE_STREAM_BYTES`) that takes minutes,
+which is why those pages used to be skipped by sheet-index discovery
+and the content-based classifier.  PyMuPDF interprets the stream in C:
+one ``get_texttrace()`` walk yields every glyph and one
+``get_cdrawings()`` walk every path, about ten times faster than
+pdfplumber on our plans.
+
+:class:`PagePrimitives` keeps the results in flat ``array('d')``
+columns (five floats per glyph, four per segment) and builds
+pdfplumber-shaped dicts only when asked.  Coordinates follow
+pdfplumber's convention — rotated page space offset by the page bbox
+origin — so the views are drop-in replacements for ``page.chars``,
+``page.lines``, ``page.rects``, ``extract_words()`` and
+``extract_text()``.  Table finding stays on pdfplumber.
+
+The backend is chosen per page: the loader :func:`bind`\\ s pdfplumber
+pages to their PDF according to the ``pdf_backend`` setting (``auto``:
+dense pages only), and :mod:`medina.pdf.page_cache` serves bound pages
+from here.
+"""
+
+from __future__ import annotations
+
+import logging
+import weakref
+from array import array
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+BACKEND_AUTO = "auto"
+BACKEND_FITZ = "fitz"
+BACKEND_PDFPLUMBER = "pdfplumber"
+
+Box = tuple[float, float, float, float]
+
+# pdfplumber page -> (fitz session, page index, (dx, dy) origin offset)
+_bindings: weakref.WeakKeyDictionary[Any, tuple[Any, int, tuple[float, float]]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class PagePrimitives:
+    """Glyphs, line segments and rectangles of one page as flat arrays."""
+
+    __slots__ = (
+        "width", "height", "_text", "_chars", "_upright", "_lines", "_rects", "_views",
+    )
+
+    def __init__(self, width: float, height: float) -> None:
+        self.width = width
+        self.height = height
+        self._text: list[str] = []
+        self._chars = array("d")  # x0, top, x1, bottom, size
+        self._upright = array("b")  # 1 if the glyph runs left to right
+        self._lines = array("d")  # x0, top, x1, bottom
+        self._rects = array("d")  # x0, top, x1, bottom
+        self._views: dict[Any, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._text)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the array columns."""
+        return (
+            len(self._chars) + len(self._lines) + len(self._rects)
+        ) * 8 + len(self._upright) + sum(len(t) for t in self._text)
+
+    # ── pdfplumber-shaped views ─────────────────────────────────────
+
+    def chars(self) -> list[dict[str, Any]]:
+        """Glyphs as ``page.chars``-style dicts."""
+        if "chars" not in self._views:
+            c = self._chars
+            self._views["chars"] = [
+                {
+                    "text": t,
+                    "x0": c[i], "top": c[i + 1], "x1": c[i + 2], "bottom": c[i + 3],
+                    "doctop": c[i + 1],
+                    "width": c[i + 2] - c[i], "height": c[i + 3] - c[i + 1],
+                    "size": c[i + 4],
+                    "upright": bool(up),
+                }
+                for t, i, up in zip(self._text, range(0, len(c), 5), self._upright)
+            ]
+        return self._views["chars"]
+
+    def lines(self) -> list[dict[str, Any]]:
+        """Single-segment paths as ``page.lines``-style dicts."""
+        if "lines" not in self._views:
+            self._views["lines"] = _box_dicts(self._lines)
+        return self._views["lines"]
+
+    def rects(self) -> list[dict[str, Any]]:
+        """Single-rectangle paths as ``page.rects``-style dicts."""
+        if "rects" not in self._views:
+            self._views["rects"] = _box_dicts(self._rects)
+        return self._views["rects"]
+
+    def words(
+        self,
+        bbox: Box | None = None,
+        x_tolerance: float = 3,
+        y_tolerance: float = 3,
+    ) -> list[dict[str, Any]]:
+        """``extract_words()`` over the glyphs (inside *bbox*, if given).
+
+        Glyphs are clustered into lines by ``top`` within *y_tolerance*,
+        ordered by ``x0``, and split into words at whitespace and at
+        gaps wider than *x_tolerance*.  Vertical glyphs (rotated text)
+        form columns the same way with the axes swapped.
+        """
+        key = ("words", bbox, x_tolerance, y_tolerance)
+        if key not in self._views:
+            indices = self._char_indices(bbox)
+            up = self._upright
+            words = _build_words(
+                [i for i in indices if up[i]], self._text, self._chars,
+                x_tolerance, y_tolerance, upright=True,
+            ) + _build_words(
+                [i for i in indices if not up[i]], self._text, self._chars,
+                x_tolerance, y_tolerance, upright=False,
+            )
+            words.sort(key=lambda w: (round(w["top"], 1), w["x0"]))
+            self._views[key] = words
+        return self._views[key]
+
+    def text(self, bbox: Box | None = None, y_tolerance: float = 3) -> str:
+        """``extract_text()``: words joined by spaces, lines by newlines."""
+        lines: list[list[dict[str, Any]]] = []
+        for word in sorted(self.words(bbox), key=lambda w: (w["top"], w["x0"])):
+            if lines and word["top"] - lines[-1][0]["top"] <= y_tolerance:
+                lines[-1].append(word)
+            else:
+                lines.append([word])
+        return "\n".join(
+            " ".join(w["text"] for w in sorted(line, key=lambda w: w["x0"]))
+            for line in lines
+        )
+
+    def _char_indices(self, bbox: Box | None) -> list[int]:
+        c = self._chars
+        if bbox is None:
+            return list(range(len(self._text)))
+        x0, top, x1, bottom = bbox
+        return [
+            i for i in range(len(self._text))
+            if c[5 * i] >= x0 and c[5 * i + 2] <= x1
+            and c[5 * i + 1] >= top and c[5 * i + 3] <= bottom
+        ]
+
+
+def _box_dicts(boxes: array) -> list[dict[str, Any]]:
+    return [
+        {
+            "x0": boxes[i], "top": boxes[i + 1], "x1": boxes[i + 2], "bottom": boxes[i + 3],
+            "doctop": boxes[i + 1],
+            "width": boxes[i + 2] - boxes[i], "height": boxes[i + 3] - boxes[i + 1],
+        }
+        for i in range(0, len(boxes), 4)
+    ]
+
+
+def _build_words(
+    indices: list[int],
+    text: list[str],
+    chars: array,
+    x_tolerance: float,
+    y_tolerance: float,
+    upright: bool,
+) -> list[dict[str, Any]]:
+    # Cluster glyphs into lines across the reading direction (by top for
+    # upright text, x0 for vertical), then read each line along it.
+    across, along, end = (1, 0, 2) if upright else (0, 1, 3)
+    ordered = sorted(indices, key=lambda i: chars[5 * i + across])
+    rows: list[list[int]] = []
+    last = None
+    for i in ordered:
+        pos = chars[5 * i + across]
+        if last is None or pos - last > y_tolerance:
+            rows.append([])
+        rows[-1].append(i)
+        last = pos
+
+    words: list[dict[str, Any]] = []
+    for row in rows:
+        row.sort(key=lambda i: chars[5 * i + along])
+        current: list[int] = []
+        for i in row:
+            if text[i].isspace():
+                if current:
+                    words.append(_word(current, text, chars, upright))
+                    current = []
+                continue
+            if current and chars[5 * i + along] > chars[5 * current[-1] + end] + x_tolerance:
+                words.append(_word(current, text, chars, upright))
+                current = []
+            current.append(i)
+        if current:
+            words.append(_word(current, text, chars, upright))
+    return words
+
+
+def _word(
+    indices: list[int], text: list[str], chars: array, upright: bool,
+) -> dict[str, Any]:
+    x0 = min(chars[5 * i] for i in indices)
+    top = min(chars[5 * i + 1] for i in indices)
+    x1 = max(chars[5 * i + 2] for i in indices)
+    bottom = max(chars[5 * i + 3] for i in indices)
+    return {
+        "text": "".join(text[i] for i in indices),
+        "x0": x0, "x1": x1, "top": top, "bottom": bottom, "doctop": top,
+        "width": x1 - x0, "height": bottom - top,
+        "upright": upright, "direction": "ltr" if upright else "ttb",
+    }
+
+
+# ── Extraction ──────────────────────────────────────────────────────
+
+
+def extract(fitz_page: Any, origin: tuple[float, float] = (0.0, 0.0)) -> PagePrimitives:
+    """Walk one fitz page's text and drawings into :class:`PagePrimitives`.
+
+    *origin* is the pdfplumber page's bbox origin, added to every
+    coordinate so results line up with pdfplumber's.
+    """
+    import fitz as pymupdf
+
+    rect = fitz_page.rect
+    prims = PagePrimitives(rect.width, rect.height)
+    rot = fitz_page.rotation_matrix
+    dx, dy = origin
+
+    def place(box: Any) -> tuple[float, float, float, float]:
+        r = pymupdf.Rect(box) * rot
+        return r.x0 + dx, r.y0 + dy, r.x1 + dx, r.y1 + dy
+
+    previous = None
+    for span in fitz_page.get_texttrace():
+        kind, glyphs = span.get("type"), span["chars"]
+        if kind == 3:  # Invisible (OCR layer) text
+            continue
+        # Fill+stroke text (render mode 2) is traced twice, as a fill
+        # span and an identical stroke span; pdfplumber sees one glyph.
+        if kind == 1 and previous is not None and glyphs == previous:
+            continue
+        previous = glyphs
+        size = span["size"]
+        # Reading direction on the displayed (rotated) page
+        cos, sin = span["dir"]
+        upright = abs(rot.a * cos + rot.c * sin) >= abs(rot.b * cos + rot.d * sin)
+        for unicode, _glyph, _origin, bbox in glyphs:
+            prims._text.append(chr(unicode))
+            prims._chars.extend(place(bbox))
+            prims._chars.append(size)
+            prims._upright.append(upright)
+
+    for path in fitz_page.get_cdrawings():
+        items = path["items"]
+        if len(items) != 1:
+            continue
+        kind = items[0][0]
+        if kind == "l":
+            p1, p2 = items[0][1], items[0][2]
+            box = place((min(p1[0], p2[0]), min(p1[1], p2[1]),
+                         max(p1[0], p2[0]), max(p1[1], p2[1])))
+            prims._lines.extend(box)
+        elif kind == "re":
+            prims._rects.extend(place(items[0][1]))
+
+    return prims
+
+
+# ── Per-page backend selection ──────────────────────────────────────
+
+
+def configured_backend() -> str:
+    """The ``pdf_backend`` setting (``auto`` if config is unavailable)."""
+    try:
+        from medina.config import get_config
+
+        backend = get_config().pdf_backend.lower()
+    except Exception:
+        return BACKEND_AUTO
+    if backend not in (BACKEND_AUTO, BACKEND_FITZ, BACKEND_PDFPLUMBER):
+        logger.warning("Unknown pdf_backend %r, using %r", backend, BACKEND_AUTO)
+        return BACKEND_AUTO
+    return backend
+
+
+def bind(pdf_page: Any, session: Any, index: int) -> None:
+    """Serve *pdf_page*'s primitives from page *index* of fitz *session*."""
+    try:
+        origin = (float(pdf_page.bbox[0]), float(pdf_page.bbox[1]))
+    except Exception:
+        origin = (0.0, 0.0)
+    _bindings[pdf_page] = (session, index, origin)
+
+
+def bind_for_backend(pdf_page: Any, session: Any, index: int, backend: str) -> bool:
+    """Bind *pdf_page* if *backend* selects fitz for it; returns whether bound.
+
+    ``auto`` binds dense pages only, ``fitz`` every page, ``pdfplumber``
+    none.
+    """
+    if backend == BACKEND_FITZ or (backend == BACKEND_AUTO and session.is_dense(index)):
+        bind(pdf_page, session, index)
+        return True
+    return False
+
+
+def is_bound(pdf_page: Any) -> bool:
+    try:
+        return pdf_page in _bindings
+    except TypeError:
+        return False
+
+
+def of(pdf_page: Any) -> PagePrimitives | None:
+    """The primitives of *pdf_page* if it is bound to this backend.
+
+    Extraction runs once per page (cached on the fitz session); returns
+    None for unbound pages or if extraction fails.
+    """
+    try:
+        binding = _bindings.get(pdf_page)
+    except TypeError:
+        return None
+    if binding is None:
+        return None
+    session, index, origin = binding
+    try:
+        return session.primitives(index, origin)
+    except Exception as exc:
+        logger.warning(
+            "fitz primitive extraction failed on page %d: %s", index + 1, exc,
+        )
+        return None
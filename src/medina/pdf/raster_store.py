@@ -0,0 +1,316 @@
+"""Memory-mapped on-disk store for rendered page rasters.
+
+Every VLM image, OCR pass and served page tile starts as a fitz raster
+of a whole page.  Rendering is the expensive step, and the same page is
+rasterized again and again: viewport siblings and the keynote legend and
+drawing crops each clip the same page, DPI-reduction retries re-render
+it, and every re-run of a project repeats all of it.  Holding the
+results in memory as encoded ``bytes`` is what made vision passes over
+large sets cost gigabytes.
+
+The store writes each raster once, as raw pixels, to
+``<raster_store_dir>/<key>.raw`` — keyed by the PDF's path, size and
+mtime, the page, the DPI and the colour mode — and maps it read-only:
+
+- :meth:`Raster.image` is a PIL image over the mapped pixels (no copy
+  for grayscale rasters), for OCR and any other pixel consumer;
+- :meth:`Raster.payload` crops and encodes a variant for a VLM use case
+  on first request and keeps the encoded file next to the raster, so
+  repeats are a file read;
+- :meth:`Raster.variant_path` exposes that file for serving as-is.
+
+Pixels live in the OS page cache rather than the Python heap, so
+memory stays flat however many pages a pass touches.  Every hit touches
+the file's mtime and the directory is pruned least recently used first
+to ``raster_store_max_mb``; files still being written are never pruned.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from medina import metrics
+from medina.vlm_payload import EncodingProfile, ImagePayload, encode_image, profile_for
+
+logger = logging.getLogger(__name__)
+
+# Raw raster file header: magic, width, height, channels
+_HEADER = struct.Struct("<4sIII")
+_MAGIC = b"MRS1"
+# Rasters kept mapped at once (mappings are cheap; pixels are paged in
+# by the OS on demand)
+_MAX_OPEN = 32
+
+# (x0, top, x1, bottom) in PDF points of the displayed page
+Clip = tuple[float, float, float, float]
+PixelBox = tuple[int, int, int, int]
+
+
+class Raster:
+    """One stored page raster, memory-mapped read-only."""
+
+    def __init__(self, store: RasterStore, key: str, path: Path, dpi: int) -> None:
+        self.store = store
+        self.key = key
+        self.path = path
+        self.dpi = dpi
+        with open(path, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.width, self.height, channels = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or len(self._map) != _HEADER.size + self.width * self.height * channels:
+            raise ValueError(f"Corrupt raster file {path.name}")
+        self.mode = "L" if channels == 1 else "RGB"
+
+    @property
+    def pixels(self) -> memoryview:
+        """Row-major pixel bytes (one byte per channel), zero-copy."""
+        return memoryview(self._map)[_HEADER.size:]
+
+    def image(self) -> Any:
+        """The raster as a read-only PIL image.
+
+        Grayscale images share the mapped memory; PIL copies RGB pixels
+        (it cannot share 3-byte pixels).
+        """
+        from PIL import Image
+
+        return Image.frombuffer(
+            self.mode, (self.width, self.height), self.pixels, "raw", self.mode, 0, 1,
+        )
+
+    def pixel_box(self, clip: Clip | None) -> PixelBox:
+        """The pixel rectangle covering *clip* (PDF points), as fitz
+        would rasterize it."""
+        if clip is None:
+            return (0, 0, self.width, self.height)
+        import fitz as pymupdf
+
+        zoom = self.dpi / 72.0
+        box = (pymupdf.Rect(clip) * pymupdf.Matrix(zoom, zoom)).irect
+        return (
+            max(0, box.x0), max(0, box.y0),
+            min(self.width, box.x1), min(self.height, box.y1),
+        )
+
+    def crop(self, clip: Clip | None) -> Any:
+        """PIL image of the *clip* region (the whole raster if None)."""
+        img = self.image()
+        return img if clip is None else img.crop(self.pixel_box(clip))
+
+    def variant_path(
+        self,
+        use_case: str,
+        clip: Clip | None = None,
+        profile: EncodingProfile | None = None,
+    ) -> Path:
+        """File holding the *use_case* encoding of *clip*, written on
+        first use."""
+        if profile is None:
+            profile = profile_for(use_case)
+        box = self.pixel_box(clip)
+        tag = hashlib.sha1(
+            f"{profile.format}:{profile.mode}:{profile.quality}:{box}".encode()
+        ).hexdigest()[:12]
+        path = self.path.with_name(f"{self.key}.{tag}.{profile.format}")
+        if _touch(path):
+            metrics.cache_event("raster_variant", hit=True)
+            return path
+        metrics.cache_event("raster_variant", hit=False)
+        img = self.image() if box == (0, 0, self.width, self.height) else self.image().crop(box)
+        payload = encode_image(img, use_case, profile=profile)
+        _write_atomic(path, payload.data)
+        return path
+
+    def payload(
+        self,
+        use_case: str,
+        clip: Clip | None = None,
+        profile: EncodingProfile | None = None,
+    ) -> ImagePayload:
+        """The *clip* region encoded for *use_case* (see :mod:`medina.vlm_payload`)."""
+        if profile is None:
+            profile = profile_for(use_case)
+        try:
+            data = self.variant_path(use_case, clip, profile).read_bytes()
+        except FileNotFoundError:
+            # Pruned between the lookup and the read: encode it again
+            data = self.variant_path(use_case, clip, profile).read_bytes()
+        x0, y0, x1, y1 = self.pixel_box(clip)
+        return ImagePayload(data, f"image/{profile.format}", use_case, x1 - x0, y1 - y0)
+
+
+class RasterStore:
+    """Directory of raw page rasters with a bounded total size."""
+
+    def __init__(self, root: Path | str, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._open: OrderedDict[str, Raster] = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+
+    def key(self, source_path: Path, page_index: int, dpi: int, grayscale: bool) -> str:
+        """Store key; changes whenever the PDF file is replaced or edited."""
+        source_path = Path(source_path).resolve()
+        stat = source_path.stat()
+        ident = (
+            f"{source_path}|{stat.st_size}|{stat.st_mtime_ns}|"
+            f"{page_index}|{dpi}|{'L' if grayscale else 'RGB'}"
+        )
+        return hashlib.sha1(ident.encode()).hexdigest()[:24]
+
+    def raster(
+        self,
+        source_path: Path | str,
+        page_index: int,
+        dpi: int,
+        grayscale: bool = False,
+    ) -> Raster:
+        """The full-page raster, rendered and written on first request.
+
+        Raises:
+            RuntimeError: If rendering fails.
+        """
+        key = self.key(Path(source_path), page_index, dpi, grayscale)
+        with self._lock:
+            raster = self._open.get(key)
+            if raster is not None:
+                self._open.move_to_end(key)
+        if raster is not None:
+            _touch(raster.path)
+            metrics.cache_event("raster", hit=True)
+            return raster
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # One render per key; other keys render concurrently.
+        with key_lock:
+            path = self.root / f"{key}.raw"
+            hit = _touch(path)
+            if not hit:
+                self._render(path, Path(source_path), page_index, dpi, grayscale)
+            try:
+                raster = Raster(self, key, path, dpi)
+            except ValueError:
+                logger.warning("Re-rendering corrupt raster %s", path.name)
+                self._render(path, Path(source_path), page_index, dpi, grayscale)
+                raster = Raster(self, key, path, dpi)
+                hit = False
+            metrics.cache_event("raster", hit=hit)
+
+        with self._lock:
+            self._open[key] = raster
+            self._key_locks.pop(key, None)
+            while len(self._open) > _MAX_OPEN:
+                self._open.popitem(last=False)
+        if not hit:
+            self._prune(keep=key)
+        return raster
+
+    def _render(
+        self,
+        path: Path,
+        source_path: Path,
+        page_index: int,
+        dpi: int,
+        grayscale: bool,
+    ) -> None:
+        from medina.pdf.renderer import _render_pixmap
+
+        pixmap = _render_pixmap(source_path, page_index, dpi, grayscale=grayscale)
+        header = _HEADER.pack(_MAGIC, pixmap.width, pixmap.height, pixmap.n)
+        # samples_mv is a view of fitz's buffer: written without a copy
+        _write_atomic(path, header, pixmap.samples_mv)
+
+    def _prune(self, keep: str) -> None:
+        """Delete least recently used files beyond ``max_bytes``.
+
+        In-flight ``*.tmp`` writes and *keep*'s files count towards the
+        total but are never deleted.
+        """
+        total = 0
+        files = []
+        try:
+            for entry in os.scandir(self.root):
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                total += stat.st_size
+                if not entry.name.startswith(keep) and not entry.name.endswith(".tmp"):
+                    files.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        except OSError as exc:
+            logger.debug("Raster store scan failed: %s", exc)
+            return
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                # Mapped rasters stay readable after unlink (POSIX)
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Forget open rasters and delete every stored file."""
+        with self._lock:
+            self._open.clear()
+        for path in self.root.iterdir():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def _touch(path: Path) -> bool:
+    """Mark *path* as just used (for LRU pruning); False if it is missing."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    except OSError:
+        return path.exists()
+    return True
+
+
+def _write_atomic(path: Path, *chunks: Any) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as fh:
+        for chunk in chunks:
+            fh.write(chunk)
+    os.replace(tmp, path)
+
+
+# ── Shared store ─────────────────────────────────────────────────────
+
+_store: RasterStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> RasterStore | None:
+    """The process-wide store, or None if disabled or unusable."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            try:
+                from medina.config import get_config
+
+                config = get_config()
+                if not config.raster_store:
+                    return None
+                _store = RasterStore(
+                    config.raster_store_dir, config.raster_store_max_mb * 1_000_000,
+                )
+            except Exception as exc:
+                logger.warning("Raster store unavailable: %s", exc)
+                return None
+        return _store
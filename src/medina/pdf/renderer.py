@@ -5,17 +5,30 @@ from __future__ import annotations
 import io
 import logging
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import fitz  # PyMuPDF
 from PIL import Image
 
+from medina import tracing
+from medina.vlm_payload import ImagePayload, encode_image, profile_for
+
+if TYPE_CHECKING:
+    from medina.pdf.raster_store import Raster
+
 logger = logging.getLogger(__name__)
 
 
+# (x0, top, x1, bottom) in PDF points, top-left origin of the displayed
+# (rotated) page — the space viewport bboxes and fitz ``page.rect`` use.
+Clip = tuple[float, float, float, float]
+
+
 def render_page_to_image(
     source_path: Path | str,
     page_index: int,
     dpi: int = 300,
+    clip: Clip | None = None,
 ) -> bytes:
     """Render a specific PDF page to PNG bytes at given DPI.
 
@@ -23,6 +36,8 @@ def render_page_to_image(
         source_path: Path to the PDF file.
         page_index: Zero-based page index within the PDF.
         dpi: Resolution for rendering. Defaults to 300.
+        clip: Optional region of the page in PDF points; only that
+            region is rasterized (see :func:`page_clip`).
 
     Returns:
         PNG image data as bytes.
@@ -38,6 +53,136 @@ def render_page_to_image(
         dpi,
     )
 
+    with tracing.span(
+        "render.page", cat="render", file=source_path.name, page=page_index, dpi=dpi,
+        clipped=clip is not None,
+    ) as sp:
+        png = _render_png(source_path, page_index, dpi, clip)
+        sp.set(bytes=len(png))
+        return png
+
+
+def page_clip(
+    source_path: Path | str,
+    page_index: int,
+    fractions: tuple[float, float, float, float],
+    within: Clip | None = None,
+) -> Clip:
+    """PDF-point clip covering *fractions* (left, top, right, bottom) of
+    the page — or of the *within* region (e.g. a viewport bbox) if given.
+    """
+    if within is None:
+        from medina.pdf.fitz_session import get_session
+
+        width, height = get_session(source_path).page_size(page_index)
+        within = (0.0, 0.0, width, height)
+    x0, y0, x1, y1 = within
+    left, top, right, bottom = fractions
+    return (
+        x0 + (x1 - x0) * left,
+        y0 + (y1 - y0) * top,
+        x0 + (x1 - x0) * right,
+        y0 + (y1 - y0) * bottom,
+    )
+
+
+def render_page_payload(
+    source_path: Path | str,
+    page_index: int,
+    use_case: str,
+    dpi: int = 150,
+    clip: Clip | None = None,
+) -> ImagePayload:
+    """Render a page (or a *clip* of it) encoded for a VLM request.
+
+    The encoding is picked for *use_case* (see :mod:`medina.vlm_payload`);
+    grayscale profiles are rendered in grayscale to begin with.  With
+    the raster store enabled the page is rasterized once per DPI and
+    colour mode and every clip and encoding is derived from the stored
+    raster (see :mod:`medina.pdf.raster_store`); otherwise only the clip
+    is rasterized and goes straight into the encoder.
+
+    Raises:
+        RuntimeError: If rendering fails.
+    """
+    source_path = Path(source_path)
+    profile = profile_for(use_case)
+
+    with tracing.span(
+        "render.page", cat="render", file=source_path.name, page=page_index, dpi=dpi,
+        clipped=clip is not None, use_case=use_case, format=profile.format,
+    ) as sp:
+        raster = page_raster(source_path, page_index, dpi, grayscale=profile.grayscale)
+        if raster is not None:
+            payload = raster.payload(use_case, clip, profile)
+            sp.set(bytes=len(payload), stored=True)
+            return payload
+
+        pixmap = _render_pixmap(
+            source_path, page_index, dpi, clip, grayscale=profile.grayscale,
+        )
+        if profile.format == "png" and profile.mode in ("RGB", "L"):
+            # fitz's own PNG writer is faster than a round trip via PIL.
+            payload = ImagePayload(
+                pixmap.tobytes(output="png"), "image/png", use_case,
+                pixmap.width, pixmap.height,
+            )
+        else:
+            img = Image.frombytes(
+                "L" if pixmap.n == 1 else "RGB",
+                (pixmap.width, pixmap.height),
+                pixmap.samples,
+            )
+            payload = encode_image(img, use_case, profile=profile)
+        sp.set(bytes=len(payload))
+        return payload
+
+
+def page_raster(
+    source_path: Path | str,
+    page_index: int,
+    dpi: int,
+    grayscale: bool = False,
+) -> Raster | None:
+    """The stored full-page raster, or None if the raster store is
+    disabled or cannot serve the page.
+
+    Raises:
+        RuntimeError: If rendering fails.
+    """
+    from medina.pdf.raster_store import get_store
+
+    store = get_store()
+    if store is None:
+        return None
+    try:
+        return store.raster(source_path, page_index, dpi, grayscale)
+    except RuntimeError:
+        raise
+    except Exception as exc:
+        logger.warning(
+            "Raster store failed for page %d of %s: %s",
+            page_index, Path(source_path).name, exc,
+        )
+        return None
+
+
+def _render_png(
+    source_path: Path,
+    page_index: int,
+    dpi: int,
+    clip: Clip | None = None,
+) -> bytes:
+    return _render_pixmap(source_path, page_index, dpi, clip).tobytes(output="png")
+
+
+def _render_pixmap(
+    source_path: Path,
+    page_index: int,
+    dpi: int,
+    clip: Clip | None = None,
+    grayscale: bool = False,
+) -> Any:
     try:
         doc = fitz.open(str(source_path))
     except Exception as exc:
@@ -56,9 +201,12 @@ def render_page_to_image(
         page = doc[page_index]
         zoom = dpi / 72.0
         matrix = fitz.Matrix(zoom, zoom)
-        pixmap = page.get_pixmap(matrix=matrix, alpha=False)
-
-        return pixmap.tobytes(output="png")
+        return page.get_pixmap(
+            matrix=matrix,
+            colorspace=fitz.csGRAY if grayscale else fitz.csRGB,
+            alpha=False,
+            clip=fitz.Rect(clip) if clip is not None else None,
+        )
     finally:
         doc.close()
 
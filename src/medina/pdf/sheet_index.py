@@ -6,7 +6,9 @@ import logging
 import re
 from typing import Any
 
+from medina import tracing
 from medina.models import PageInfo, PageType, SheetIndexEntry
+from medina.pdf import fitz_session, page_cache, primitives
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +64,7 @@ _REVERSE_INDEX_RE = re.compile(
 )
 
 
+@tracing.traced("pdf.discover_sheet_index", cat="pdf")
 def discover_sheet_index(
     pages: list[PageInfo],
     pdf_pages: dict[int, Any],
@@ -85,40 +88,24 @@ def discover_sheet_index(
     )
 
     # Pre-identify dense pages to skip slow pdfplumber operations.
-    dense_pages: set[int] = set()
-    try:
-        import fitz as pymupdf
-        source_files: dict[str, list[PageInfo]] = {}
-        for p in candidate_pages:
-            source_files.setdefault(str(p.source_path), []).append(p)
-        for src, src_pages in source_files.items():
-            try:
-                doc = pymupdf.open(src)
-                for p in src_pages:
-                    if p.pdf_page_index < len(doc):
-                        sz = len(doc[p.pdf_page_index].read_contents())
-                        if sz > 10_000_000:
-                            dense_pages.add(p.page_number)
-                doc.close()
-            except Exception:
-                pass
-    except ImportError:
-        pass
+    dense_pages = fitz_session.dense_page_numbers(candidate_pages)
 
     for page_info in candidate_pages:
         pdfp_page = pdf_pages.get(page_info.page_number)
         if pdfp_page is None:
             continue
 
-        # Skip expensive operations on dense pages
-        if page_info.page_number in dense_pages:
+        # Dense pages: pdfplumber table finding would take minutes, so
+        # only parse text, and only if the fitz backend serves the page.
+        dense = page_info.page_number in dense_pages
+        if dense and not primitives.is_bound(pdfp_page):
             logger.info(
                 "Skipping dense page %d for sheet index",
                 page_info.page_number,
             )
             continue
 
-        entries = _try_table_extraction(pdfp_page)
+        entries = [] if dense else _try_table_extraction(pdfp_page)
         if entries:
             logger.info(
                 "Sheet index found via table extraction on "
@@ -197,7 +184,7 @@ def _try_table_extraction(
     # very little text (image-heavy / rasterized PDFs).  extract_tables()
     # can hang for minutes on pages with thousands of vector objects.
     try:
-        quick_text = page.extract_text() or ""
+        quick_text = page_cache.region_text(page)
         if len(quick_text.strip()) < 20:
             logger.debug(
                 "Skipping table extraction — page has minimal text (%d chars)",
@@ -434,7 +421,7 @@ def _try_text_extraction(
 ) -> list[SheetIndexEntry]:
     """Attempt to parse the sheet index from raw page text."""
     try:
-        text = page.extract_text() or ""
+        text = page_cache.region_text(page)
     except Exception as exc:
         logger.debug("Text extraction failed: %s", exc)
         return []
@@ -16,6 +16,7 @@ from typing import Any
 from medina.config import MedinaConfig, get_config
 from medina.exceptions import VisionAPIError
 from medina.models import PageInfo, PageType
+from medina.vlm_payload import ImagePayload
 
 logger = logging.getLogger(__name__)
 
@@ -84,44 +85,35 @@ def classify_pages_vlm(
     if not pages:
         return {}
 
-    from medina.pdf.renderer import render_page_to_image
+    from medina.pdf.renderer import render_page_payload
 
-    # Render all candidate pages at 72 DPI (tiny thumbnails)
-    page_images: dict[int, bytes] = {}
-    for pinfo in pages:
-        label = pinfo.sheet_code or str(pinfo.page_number)
-        try:
-            img_bytes = render_page_to_image(
-                pinfo.source_path,
-                pinfo.pdf_page_index,
-                dpi=72,
-            )
-            page_images[pinfo.page_number] = img_bytes
-            logger.debug("Rendered page %s at 72 DPI for VLM classification", label)
-        except Exception as e:
-            logger.warning("Failed to render page %s for VLM classification: %s", label, e)
-
-    if not page_images:
-        return {}
-
-    # Process in batches
+    # Process in batches, rendering each batch's 72 DPI thumbnails just
+    # before its call so only one batch of images is held at a time.
     results: dict[int, list[PageType]] = {}
-    page_numbers = sorted(page_images.keys())
-
-    for batch_start in range(0, len(page_numbers), batch_size):
-        batch_nums = page_numbers[batch_start : batch_start + batch_size]
-        batch_results = _classify_batch(
-            {n: page_images[n] for n in batch_nums},
-            pages,
-            config,
-        )
-        results.update(batch_results)
+    ordered = sorted(pages, key=lambda p: p.page_number)
+
+    for batch_start in range(0, len(ordered), batch_size):
+        page_images: dict[int, ImagePayload] = {}
+        for pinfo in ordered[batch_start : batch_start + batch_size]:
+            label = pinfo.sheet_code or str(pinfo.page_number)
+            try:
+                page_images[pinfo.page_number] = render_page_payload(
+                    pinfo.source_path,
+                    pinfo.pdf_page_index,
+                    "classify",
+                    dpi=72,
+                )
+                logger.debug("Rendered page %s at 72 DPI for VLM classification", label)
+            except Exception as e:
+                logger.warning("Failed to render page %s for VLM classification: %s", label, e)
+        if page_images:
+            results.update(_classify_batch(page_images, pages, config))
 
     return results
 
 
 def _classify_batch(
-    page_images: dict[int, bytes],
+    page_images: dict[int, ImagePayload],
     pages: list[PageInfo],
     config: MedinaConfig,
 ) -> dict[int, list[PageType]]:
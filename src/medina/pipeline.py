@@ -6,6 +6,7 @@ import logging
 from pathlib import Path
 from typing import Any
 
+from medina import tracing
 from medina.config import MedinaConfig, get_config
 from medina.models import (
     ExtractionResult,
@@ -36,6 +37,18 @@ def run_pipeline(
     Returns:
         ExtractionResult with all extracted data and QA report.
     """
+    with tracing.trace_run("pipeline", source=str(source)), \
+            tracing.StageSpans("pipeline") as stages:
+        return _run_pipeline(source, config, use_vision, progress_callback, stages)
+
+
+def _run_pipeline(
+    source: str | Path,
+    config: MedinaConfig | None,
+    use_vision: bool,
+    progress_callback: Any,
+    stages: tracing.StageSpans,
+) -> ExtractionResult:
     if config is None:
         config = get_config()
 
@@ -43,6 +56,7 @@ def run_pipeline(
     project_name = source.stem if source.is_file() else source.name
 
     def report(stage: str, msg: str) -> None:
+        stages.enter(stage)
         logger.info("[%s] %s", stage, msg)
         if progress_callback:
             progress_callback(stage, msg)
@@ -152,7 +166,7 @@ def run_pipeline(
     # non-luminaire tables, and deduplication below handles overlaps.
     if plan_pages_info:
         from medina.schedule.parser import parse_all_schedules
-        combo_fixtures = parse_all_schedules(plan_pages_info, pdf_pages)
+        combo_fixtures = parse_all_schedules(plan_pages_info, pdf_pages, prefilter=True)
         if combo_fixtures:
             report(
                 "SCHEDULE",
@@ -191,7 +205,7 @@ def run_pipeline(
         from medina.schedule.vlm_extractor import (
             extract_schedule_vlm,
         )
-        from medina.pdf.renderer import render_page_to_image
+        from medina.pdf.renderer import render_page_payload
 
         for spage in vlm_sched_candidates:
             spdf = pdf_pages.get(spage.page_number)
@@ -211,31 +225,28 @@ def run_pipeline(
                 # codes like AL1 vs A1 need clear resolution.
                 # Start at 200 DPI and reduce if too large.
                 sched_dpi = min(config.render_dpi, 200)
-                img_bytes = render_page_to_image(
+                payload = render_page_payload(
                     spage.source_path,
                     spage.pdf_page_index,
+                    "schedule",
                     dpi=sched_dpi,
                 )
                 # Check base64 size and reduce DPI if needed
-                import base64
-                b64_size = len(base64.b64encode(img_bytes))
-                while b64_size > 5_000_000 and sched_dpi > 72:
+                while payload.b64_size > 5_000_000 and sched_dpi > 72:
                     sched_dpi = max(72, sched_dpi - 20)
                     logger.info(
                         "Image too large (%d bytes), "
                         "retrying at %d DPI",
-                        b64_size, sched_dpi,
+                        payload.b64_size, sched_dpi,
                     )
-                    img_bytes = render_page_to_image(
+                    payload = render_page_payload(
                         spage.source_path,
                         spage.pdf_page_index,
+                        "schedule",
                         dpi=sched_dpi,
                     )
-                    b64_size = len(
-                        base64.b64encode(img_bytes)
-                    )
                 vlm_fixtures = extract_schedule_vlm(
-                    spage, img_bytes, config,
+                    spage, payload, config,
                     plan_codes_hint=(
                         found_plan_codes if found_plan_codes
                         else None
@@ -326,7 +337,6 @@ def run_pipeline(
         if should_run_vlm:
             report("COUNT", "Running vision-based counting (VLM)...")
             try:
-                from medina.pdf.renderer import render_page_to_image
                 from medina.plans.vision_counter import (
                     count_all_plans_vision,
                 )
@@ -334,27 +344,12 @@ def run_pipeline(
                 # Use lower DPI for VLM (8000px API limit).
                 vision_dpi = min(config.render_dpi, 150)
 
-                # Render all plan pages to images
-                page_images: dict[int, bytes] = {}
-                for pinfo in plan_pages_info:
-                    code = pinfo.sheet_code or str(pinfo.page_number)
-                    try:
-                        img_bytes = render_page_to_image(
-                            pinfo.source_path,
-                            pinfo.pdf_page_index,
-                            dpi=vision_dpi,
-                        )
-                        page_images[pinfo.page_number] = img_bytes
-                        report("COUNT", f"Rendered {code} for vision")
-                    except Exception as e:
-                        logger.warning(
-                            "Render failed for %s: %s", code, e
-                        )
-
-                # Run vision counting on all plans
+                # Run vision counting on all plans (each plan is
+                # rendered clipped to its viewport while earlier
+                # plans' requests are in flight)
                 vision_counts = count_all_plans_vision(
-                    plan_pages_info, page_images,
-                    fixture_codes, config,
+                    plan_pages_info, fixture_codes, config,
+                    dpi=vision_dpi,
                 )
 
                 # Smart merge:
@@ -434,40 +429,42 @@ def run_pipeline(
                     f"{len(plans_needing_vlm)} plan(s)...",
                 )
                 try:
-                    from medina.pdf.renderer import render_page_to_image
                     from medina.plans.vision_keynote_counter import (
                         count_keynotes_vision,
+                        render_keynote_images,
                     )
+                    from medina.vlm_dispatch import render_and_send
 
                     vlm_dpi = min(config.render_dpi, 200)
 
-                    for pinfo in plans_needing_vlm:
+                    outcomes = render_and_send(
+                        plans_needing_vlm,
+                        lambda p: render_keynote_images(p, vlm_dpi),
+                        lambda p, images: count_keynotes_vision(
+                            p, keynote_numbers, config,
+                            dpi=vlm_dpi, images=images,
+                        ),
+                    )
+                    for pinfo, vlm_counts in zip(
+                        plans_needing_vlm, outcomes,
+                    ):
                         code = (
                             pinfo.sheet_code
                             or str(pinfo.page_number)
                         )
-                        try:
-                            img_bytes = render_page_to_image(
-                                pinfo.source_path,
-                                pinfo.pdf_page_index,
-                                dpi=vlm_dpi,
-                            )
-                            vlm_counts = count_keynotes_vision(
-                                pinfo, img_bytes,
-                                keynote_numbers, config,
-                            )
-                            all_keynote_counts[code] = vlm_counts
-                            report(
-                                "COUNT",
-                                f"VLM keynote counts for {code}: "
-                                f"{vlm_counts}",
-                            )
-                        except Exception as e:
+                        if isinstance(vlm_counts, Exception):
                             logger.warning(
                                 "VLM keynote counting failed "
                                 "for %s: %s",
-                                code, e,
+                                code, vlm_counts,
                             )
+                            continue
+                        all_keynote_counts[code] = vlm_counts
+                        report(
+                            "COUNT",
+                            f"VLM keynote counts for {code}: "
+                            f"{vlm_counts}",
+                        )
                 except ImportError:
                     logger.warning(
                         "VLM keynote counter not available"
@@ -4,8 +4,10 @@ Queries SQLite (learnings, global_patterns, runtime_params) and ChromaDB
 (similar corrections) to build a context dict that planners use to decide
 strategy before each agent runs.
 
-All DB access is wrapped in try/except so the planning module degrades
-gracefully when the database is unavailable.
+A pipeline run uses one :class:`RunPlanningContext`, which fetches
+everything once and hands each planner its filtered slice.  All DB access
+is wrapped in try/except so the planning module degrades gracefully when
+the database is unavailable.
 """
 from __future__ import annotations
 
@@ -16,10 +18,14 @@ from typing import Any
 logger = logging.getLogger(__name__)
 
 
+_AGENT_NAMES: tuple[str, ...] = ("search", "schedule", "count", "keynote", "qa")
+
+
 def get_planning_context(
     agent_name: str,
     source_key: str,
     project_id: str = "",
+    runtime_params: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     """Retrieve memory context relevant to an agent's pre-execution plan.
 
@@ -31,47 +37,85 @@ def get_planning_context(
     4. **SQLite runtime_params** — custom parameters scoped to this
        source/project.
 
+    For a whole pipeline run use :class:`RunPlanningContext`, which loads
+    all agents' context in one pass.
+
     Args:
         agent_name: The agent requesting context (e.g. "search", "schedule").
         source_key: Stable key derived from the source file path.
         project_id: Optional project identifier for project-scoped params.
+        runtime_params: Optional run snapshot of effective params; when
+            given, the params lookup is skipped and the snapshot is used.
 
     Returns:
         Dict with keys ``past_corrections``, ``global_patterns``,
         ``similar_corrections``, ``runtime_params``.  Each value is a
         (possibly empty) list or dict — never None.
     """
-    context: dict[str, Any] = {
-        "past_corrections": [],
-        "global_patterns": [],
-        "similar_corrections": [],
-        "runtime_params": {},
-    }
+    loader = RunPlanningContext(
+        source_key, project_id, runtime_params, agent_names=(agent_name,),
+    )
+    return loader.for_agent(agent_name)
+
 
-    # ── 1. Past corrections from learnings table ────────────────────────
-    try:
-        from medina.db import repositories as repo
+class RunPlanningContext:
+    """Run-scoped planning memory, fetched once and sliced per agent.
 
-        learning = repo.get_learning(source_key)
-        if learning and learning.get("corrections"):
-            corrections = learning["corrections"]
-            # Filter to corrections relevant to this agent
-            context["past_corrections"] = _filter_for_agent(
-                agent_name, corrections,
+    The first :meth:`for_agent` call loads the source's learnings, the
+    global patterns and the runtime params (one query each) plus one
+    multi-query ChromaDB call covering every agent's similarity query.
+    Later calls only filter the prefetched data.
+    """
+
+    def __init__(
+        self,
+        source_key: str,
+        project_id: str = "",
+        runtime_params: dict[str, Any] | None = None,
+        agent_names: tuple[str, ...] = _AGENT_NAMES,
+    ) -> None:
+        self.source_key = source_key
+        self.project_id = project_id
+        self.agent_names = agent_names
+        self._runtime_params = runtime_params
+        self._loaded = False
+        self._corrections: list[dict[str, Any]] = []
+        self._global_patterns: list[dict[str, Any]] = []
+        self._similar: dict[str, list[dict[str, Any]]] = {}
+
+    def for_agent(self, agent_name: str) -> dict[str, Any]:
+        """Return the planning context dict for one agent."""
+        if not self._loaded:
+            self._load()
+        return {
+            "past_corrections": _filter_for_agent(agent_name, self._corrections),
+            "global_patterns": [dict(gp) for gp in self._global_patterns],
+            "similar_corrections": list(self._similar.get(agent_name, [])),
+            "runtime_params": dict(self._runtime_params or {}),
+        }
+
+    def _load(self) -> None:
+        self._loaded = True
+        source_key = self.source_key
+
+        # ── 1. Past corrections from learnings table ────────────────────
+        try:
+            from medina.db import repositories as repo
+
+            learning = repo.get_learning(source_key)
+            if learning and learning.get("corrections"):
+                self._corrections = learning["corrections"]
+        except Exception as exc:
+            logger.debug(
+                "Could not load learnings (source_key=%s): %s", source_key, exc,
             )
-    except Exception as exc:
-        logger.debug(
-            "Could not load learnings for %s (source_key=%s): %s",
-            agent_name, source_key, exc,
-        )
-
-    # ── 2. Global patterns ──────────────────────────────────────────────
-    try:
-        from medina.db import repositories as repo
-
-        rows = repo.get_all_global_patterns()
-        if rows:
-            context["global_patterns"] = [
+
+        # ── 2. Global patterns ──────────────────────────────────────────
+        try:
+            from medina.db import repositories as repo
+
+            rows = repo.get_all_global_patterns()
+            self._global_patterns = [
                 {
                     "pattern_type": r.get("pattern_type", ""),
                     "fixture_code": r.get("fixture_code", ""),
@@ -81,71 +125,53 @@ def get_planning_context(
                 }
                 for r in rows
             ]
-    except Exception as exc:
-        logger.debug(
-            "Could not load global patterns for %s: %s", agent_name, exc,
-        )
-
-    # ── 3. Similar corrections via ChromaDB ─────────────────────────────
-    try:
-        from medina.db.vector_store import query_similar, CORRECTIONS_COLLECTION
-
-        # Build a query string that captures the agent's focus area
-        query_text = _build_similarity_query(agent_name, source_key)
-        if query_text:
-            results = query_similar(
-                CORRECTIONS_COLLECTION,
-                query_text,
-                n_results=5,
-            )
-            context["similar_corrections"] = [
-                {
-                    "id": r.get("id", ""),
-                    "text": r.get("document", ""),
-                    "metadata": r.get("metadata", {}),
-                    "distance": r.get("distance", 0.0),
-                }
-                for r in results
-                # Exclude corrections from the same source (already in
-                # past_corrections) to surface cross-source patterns.
-                if r.get("metadata", {}).get("source_key") != source_key
-            ]
-    except Exception as exc:
-        logger.debug(
-            "Could not query similar corrections for %s: %s",
-            agent_name, exc,
-        )
-
-    # ── 4. Runtime parameters ───────────────────────────────────────────
-    try:
-        from medina.db import repositories as repo
-
-        # Merge global params with source-scoped and project-scoped ones.
-        # More specific scopes override broader ones.
-        params: dict[str, Any] = {}
-
-        global_params = repo.get_params(scope="global", scope_key="")
-        params.update(global_params)
-
-        if source_key:
-            source_params = repo.get_params(
-                scope="source", scope_key=source_key,
-            )
-            params.update(source_params)
-
-        if project_id:
-            project_params = repo.get_params(
-                scope="project", scope_key=project_id,
-            )
-            params.update(project_params)
+        except Exception as exc:
+            logger.debug("Could not load global patterns: %s", exc)
 
-        context["runtime_params"] = params
-    except Exception as exc:
-        logger.debug(
-            "Could not load runtime params for %s: %s", agent_name, exc,
-        )
+        # ── 3. Similar corrections via ChromaDB (one multi-query call) ──
+        try:
+            from medina.db.vector_store import query_similar_batch, CORRECTIONS_COLLECTION
 
-    return context
+            # Build a query string that captures each agent's focus area
+            queries = [
+                (name, _build_similarity_query(name, source_key))
+                for name in self.agent_names
+            ]
+            queries = [(name, q) for name, q in queries if q]
+            if queries:
+                batch = query_similar_batch(
+                    CORRECTIONS_COLLECTION,
+                    [q for _, q in queries],
+                    n_results=5,
+                )
+                for (name, _), results in zip(queries, batch):
+                    self._similar[name] = [
+                        {
+                            "id": r.get("id", ""),
+                            "text": r.get("document", ""),
+                            "metadata": r.get("metadata", {}),
+                            "distance": r.get("distance", 0.0),
+                        }
+                        for r in results
+                        # Exclude corrections from the same source (already in
+                        # past_corrections) to surface cross-source patterns.
+                        if (r.get("metadata") or {}).get("source_key") != source_key
+                    ]
+        except Exception as exc:
+            logger.debug("Could not query similar corrections: %s", exc)
+
+        # ── 4. Runtime parameters ───────────────────────────────────────
+        if self._runtime_params is None:
+            try:
+                from medina.runtime_params import get_effective_params
+
+                # Defaults -> global -> source -> project (memoized lookup).
+                self._runtime_params = get_effective_params(
+                    source_key, self.project_id,
+                )
+            except Exception as exc:
+                logger.debug("Could not load runtime params: %s", exc)
+                self._runtime_params = {}
 
 
 # ── Helpers ─────────────────────────────────────────────────────────────
@@ -39,7 +39,9 @@ def _save_plan(
     agent_name: str,
     plan: dict[str, Any],
 ) -> None:
-    """Persist a plan to the DB.  Silent on failure."""
+    """Persist a plan to the DB.  Silent on failure; skipped without a project."""
+    if not project_id:
+        return
     try:
         from medina.db import repositories as repo
 
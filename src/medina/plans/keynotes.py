@@ -6,8 +6,10 @@ import logging
 import re
 from typing import Any
 
+from medina import tracing
 from medina.exceptions import KeyNoteExtractionError
 from medina.models import KeyNote, PageInfo
+from medina.pdf import page_cache
 
 logger = logging.getLogger(__name__)
 
@@ -340,7 +342,6 @@ def _count_keynote_occurrences(
     When *viewport_bbox* is set, only candidates within the viewport
     are considered (for multi-viewport page support).
     """
-    import math
     from collections import Counter
 
     counts: dict[str, int] = {n: 0 for n in keynote_numbers}
@@ -349,16 +350,12 @@ def _count_keynote_occurrences(
         return (counts, positions) if return_positions else counts
 
     try:
-        words = pdf_page.extract_words(
-            x_tolerance=3,
-            y_tolerance=3,
-            keep_blank_chars=False,
-        )
+        words = page_cache.page_words(pdf_page)
     except Exception:
         logger.warning("Failed to extract words for keynote counting")
         return (counts, positions) if return_positions else counts
 
-    lines = pdf_page.lines or []
+    lines = page_cache.page_lines(pdf_page) or []
     if not lines:
         logger.debug("No lines on page — falling back to text-only counting")
         result = _count_keynote_text_only(
@@ -433,14 +430,10 @@ def _count_keynote_occurrences(
 
     if is_dense:
         # Pre-filter to "shape-length" segments (3–20 pt) for efficiency.
-        shape_lines: list[Any] = []
-        for ln in lines:
-            seg_len = math.sqrt(
-                (ln["x1"] - ln["x0"]) ** 2
-                + (ln["bottom"] - ln["top"]) ** 2
-            )
-            if 3.0 <= seg_len <= 20.0:
-                shape_lines.append(ln)
+        # Shared by every viewport sibling of the page.
+        shape_lines = page_cache.cached(
+            pdf_page, "keynotes:shape_lines", lambda: _shape_length_lines(lines),
+        )
 
         logger.debug(
             "Dense page: %d total lines, %d shape-length lines, "
@@ -515,6 +508,21 @@ def _count_keynote_occurrences(
     return (counts, positions) if return_positions else counts
 
 
+def _shape_length_lines(lines: list[Any]) -> list[Any]:
+    """Line segments 3–20 pt long — the edges of keynote symbol shapes."""
+    import math
+
+    shape_lines: list[Any] = []
+    for ln in lines:
+        seg_len = math.sqrt(
+            (ln["x1"] - ln["x0"]) ** 2
+            + (ln["bottom"] - ln["top"]) ** 2
+        )
+        if 3.0 <= seg_len <= 20.0:
+            shape_lines.append(ln)
+    return shape_lines
+
+
 def _count_keynote_text_only(
     words: list[Any],
     keynote_numbers: list[str],
@@ -633,7 +641,8 @@ def _extract_keynotes_region_text(
     Falls back to full-page text if no cropped region yields keynotes.
 
     When *viewport_bbox* is set, all crops are relative to the viewport
-    bounding box instead of the full page.
+    bounding box instead of the full page.  Words and crop texts come
+    from the per-page cache, so viewport siblings share one extraction.
     """
     width = pdf_page.width
     height = pdf_page.height
@@ -650,21 +659,16 @@ def _extract_keynotes_region_text(
 
     # Stage 1: Header-aware tight crop
     try:
-        words = pdf_page.extract_words(x_tolerance=3, y_tolerance=3)
+        words = page_cache.page_words(pdf_page)
         # Filter words to viewport if set
         if viewport_bbox is not None:
-            words = [
-                w for w in words
-                if w["x0"] >= vx0 and w["x1"] <= vx1
-                and w["top"] >= vy0 and w["bottom"] <= vy1
-            ]
+            words = page_cache.words_within(words, viewport_bbox)
         header_x = _find_keynotes_header_x(words)
         if header_x is not None:
             crop_left = max(vx0, header_x - 30)
             bbox = (crop_left, vy0, vx1, vy0 + vh * 0.85)
             try:
-                cropped = pdf_page.within_bbox(bbox)
-                text = cropped.extract_text() or ""
+                text = page_cache.region_text(pdf_page, bbox)
                 if _has_keynote_content(text):
                     logger.debug(
                         "Keynotes found via header-aware crop "
@@ -686,8 +690,7 @@ def _extract_keynotes_region_text(
 
     for bbox in regions:
         try:
-            cropped = pdf_page.within_bbox(bbox)
-            text = cropped.extract_text() or ""
+            text = page_cache.region_text(pdf_page, bbox)
         except Exception:
             continue
 
@@ -702,16 +705,16 @@ def _extract_keynotes_region_text(
     # Fallback: use full viewport/page text
     if viewport_bbox is not None:
         try:
-            cropped = pdf_page.within_bbox(viewport_bbox)
-            return cropped.extract_text() or ""
+            return page_cache.region_text(pdf_page, viewport_bbox)
         except Exception:
             pass
     try:
-        return pdf_page.extract_text() or ""
+        return page_cache.region_text(pdf_page)
     except Exception:
         return ""
 
 
+@tracing.traced("plans.extract_keynotes", cat="pdf", attrs=tracing.page_attrs)
 def extract_keynotes_from_plan(
     page_info: PageInfo,
     pdf_page: Any,
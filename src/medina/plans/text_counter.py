@@ -15,8 +15,10 @@ import re
 from collections import Counter
 from typing import Any
 
+from medina import tracing
 from medina.exceptions import FixtureCountError
 from medina.models import PageInfo
+from medina.pdf import page_cache
 
 logger = logging.getLogger(__name__)
 
@@ -135,39 +137,52 @@ def _find_schedule_table_bbox(
     Scans all tables and picks the one with the most schedule-specific header
     keywords (MARK, LUMINAIRE, FIXTURE, etc.). Requires at least 3 matches
     to avoid false positives from notes sections that mention fixtures.
+
+    Table detection comes from the shared page cache (the schedule stage
+    has usually run it already) and the result is cached per page, so
+    counting several viewports or re-running a plan does not repeat it.
     """
+    return page_cache.cached(
+        pdf_page, "schedule_table_bbox", lambda: _detect_schedule_table_bbox(pdf_page),
+    )
+
+
+def _detect_schedule_table_bbox(
+    pdf_page: Any,
+) -> tuple[float, float, float, float] | None:
+    # No header row can reach 3 keyword matches if the whole page cannot;
+    # skips table finding on most plan pages.
     try:
-        tables = pdf_page.find_tables(table_settings={
-            "vertical_strategy": "lines",
-            "horizontal_strategy": "lines",
-            "snap_tolerance": 5,
-            "join_tolerance": 5,
-        })
+        page_text = page_cache.page_text_lower(pdf_page)
+    except Exception:
+        page_text = None
+    if page_text is not None and sum(
+        1 for kw in _SCHEDULE_TABLE_KEYWORDS if kw in page_text
+    ) < 3:
+        return None
+
+    try:
+        tables = page_cache.page_tables(pdf_page)
     except Exception:
         return None
 
     if not tables:
         return None
 
-    best_bbox = None
+    best_table = None
     best_matches = 0
 
     for table in tables:
-        try:
-            rows = table.extract()
-        except Exception:
-            continue
-        if not rows:
+        if not table.rows:
             continue
-        header_text = " ".join(
-            str(cell).lower() for cell in rows[0] if cell
-        )
+        header_text = table.header_text()
         matches = sum(1 for kw in _SCHEDULE_TABLE_KEYWORDS if kw in header_text)
         if matches > best_matches:
             best_matches = matches
-            best_bbox = table.bbox
+            best_table = table
 
-    if best_matches >= 3 and best_bbox:
+    if best_matches >= 3 and best_table:
+        best_bbox = best_table.bbox
         # Guard: reject tables whose area exceeds 50% of the page.
         # pdfplumber sometimes detects the drawing border as a single
         # "table" whose first-row cell contains ALL page text — general
@@ -189,25 +204,14 @@ def _find_schedule_table_bbox(
         # etc.) — maybe 200 chars total.  If the header text exceeds 500
         # chars it's almost certainly the full page text merged into one
         # cell (drawing border false-positive).
-        try:
-            rows = None
-            for table in tables:
-                if table.bbox == best_bbox:
-                    rows = table.extract()
-                    break
-            if rows:
-                header_text = " ".join(
-                    str(cell) for cell in rows[0] if cell
-                )
-                if len(header_text) > 500:
-                    logger.debug(
-                        "Rejecting schedule table — header too long (%d chars), "
-                        "likely drawing border false-positive",
-                        len(header_text),
-                    )
-                    return None
-        except Exception:
-            pass
+        header_text = " ".join(str(cell) for cell in best_table.header_row if cell)
+        if len(header_text) > 500:
+            logger.debug(
+                "Rejecting schedule table — header too long (%d chars), "
+                "likely drawing border false-positive",
+                len(header_text),
+            )
+            return None
 
         logger.debug(
             "Found schedule table on plan page (bbox: %s, %d keyword matches)",
@@ -496,11 +500,7 @@ def _extract_plan_words(
     page_height = pdf_page.height
     page_bbox = tuple(pdf_page.bbox)
 
-    words = pdf_page.extract_words(
-        x_tolerance=3,
-        y_tolerance=3,
-        keep_blank_chars=False,
-    )
+    words = page_cache.page_words(pdf_page)
 
     filtered: list[dict[str, Any]] = []
     for w in words:
@@ -538,6 +538,7 @@ def _build_code_pattern(code: str) -> re.Pattern[str]:
 # Public API
 # ---------------------------------------------------------------------------
 
+@tracing.traced("plans.count_fixtures", cat="pdf", attrs=tracing.page_attrs)
 def count_fixtures_on_plan(
     page_info: PageInfo,
     pdf_page: Any,
@@ -596,7 +597,7 @@ def count_fixtures_on_plan(
         return {} if not return_positions else {}
 
     try:
-        chars = pdf_page.chars
+        chars = page_cache.page_chars(pdf_page)
     except Exception as exc:
         raise FixtureCountError(
             f"Failed to extract characters from plan {sheet}: {exc}"
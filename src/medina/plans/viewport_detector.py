@@ -6,7 +6,8 @@ ENLARGED LIGHTING PLAN" side by side.  This module auto-detects viewport
 boundaries so each sub-plan gets its own fixture counts.
 
 Algorithm:
-1. Extract words from the bottom ~15% of the page (viewport titles live here).
+1. Take words in the bottom ~15% of the page (viewport titles live here)
+   from the page's shared word layer (:mod:`medina.pdf.page_cache`).
 2. Group words into title lines, check for lighting keywords.
 3. Filter out non-lighting viewports (power, systems, demolition).
 4. Derive short label from title ("Level 1" → "L1", "Mezzanine" → "MEZ").
@@ -20,7 +21,9 @@ import logging
 import re
 from typing import Any
 
+from medina import tracing
 from medina.models import PageInfo, PageType, Viewport
+from medina.pdf import page_cache
 
 logger = logging.getLogger(__name__)
 
@@ -141,17 +144,16 @@ def _split_line_by_x_gap(
 
 
 def _scan_region_for_titles(
-    pdf_page: Any,
+    page_words: list[dict[str, Any]],
     region_bbox: tuple[float, float, float, float],
     page_width: float,
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
-    """Scan a region for viewport titles, returning lighting and non-lighting lists."""
-    try:
-        cropped = pdf_page.within_bbox(region_bbox)
-        words = cropped.extract_words(x_tolerance=3, y_tolerance=3)
-    except Exception:
-        return [], []
+    """Scan a region for viewport titles, returning lighting and non-lighting lists.
 
+    *page_words* is the full page's word layer; the region is filtered
+    out of it.
+    """
+    words = page_cache.words_within(page_words, region_bbox)
     if not words:
         return [], []
 
@@ -197,6 +199,7 @@ def _scan_region_for_titles(
     return lighting_titles, non_lighting_titles
 
 
+@tracing.traced("plans.detect_viewports", cat="pdf", attrs=tracing.page_attrs)
 def detect_viewports(
     pdf_page: Any,
     page_info: PageInfo,
@@ -218,6 +221,12 @@ def detect_viewports(
     width = pdf_page.width
     height = pdf_page.height
 
+    # One word extraction serves both the bottom-strip and full-page scans.
+    try:
+        words = page_cache.page_words(pdf_page)
+    except Exception:
+        words = []
+
     # Viewport titles typically appear in the bottom 15% of the page,
     # above the title block (which is in the rightmost ~25%).
     # Exclude the rightmost 25% (title block area) to avoid false positives
@@ -226,7 +235,7 @@ def detect_viewports(
     title_region_bbox = (0, height * 0.82, title_block_x, height * 0.97)
 
     lighting_titles, non_lighting_titles = _scan_region_for_titles(
-        pdf_page, title_region_bbox, width,
+        words, title_region_bbox, width,
     )
 
     # Fallback: scan the full page (excluding title block column AND
@@ -238,7 +247,7 @@ def detect_viewports(
         notes_cutoff_x = width * 0.65
         full_region = (0, 0, notes_cutoff_x, height)
         full_lighting, full_non_lighting = _scan_region_for_titles(
-            pdf_page, full_region, width,
+            words, full_region, width,
         )
         # Extra filter: in full-page mode, require viewport titles to have
         # a structured format — they must contain a qualifier like
@@ -349,6 +358,28 @@ def detect_viewports(
     return viewports
 
 
+def detect_all_viewports(
+    pages: list[tuple[PageInfo, Any]],
+    viewport_separation_threshold: float | None = None,
+) -> list[list[Viewport]]:
+    """Run :func:`detect_viewports` over many plan pages.
+
+    Pages run serially: detection is GIL-bound Python over each page's
+    shared word layer, so threads would only add contention.
+
+    Args:
+        pages: ``(page_info, pdf_page)`` pairs.
+        viewport_separation_threshold: Passed to :func:`detect_viewports`.
+
+    Returns:
+        One viewport list per input pair, in input order.
+    """
+    return [
+        detect_viewports(pdf_page, page_info, viewport_separation_threshold)
+        for page_info, pdf_page in pages
+    ]
+
+
 def _build_grid_viewports(
     lighting_titles: list[dict[str, Any]],
     non_lighting_titles: list[dict[str, Any]],
@@ -2,47 +2,43 @@
 
 from __future__ import annotations
 
-import io
 import json
 import logging
 import re
 from typing import Any
 
-from PIL import Image
-
 from medina.config import MedinaConfig, get_config
 from medina.exceptions import VisionAPIError
 from medina.models import PageInfo
+from medina.vlm_payload import ImagePayload
 
 logger = logging.getLogger(__name__)
 
 
-def _crop_to_viewport(
-    image_bytes: bytes,
-    viewport_bbox: tuple[float, float, float, float],
-    pdf_width: float,
-    pdf_height: float,
-) -> bytes:
-    """Crop a rendered page image to just the viewport area.
+def _render_plan_image(page_info: PageInfo, dpi: int) -> ImagePayload:
+    """Render the plan page for vision counting.
+
+    Sub-plans on a multi-viewport page are rendered clipped to their
+    viewport bbox (PDF points), so only that area is rasterized.
 
-    Converts PDF-point coordinates to pixel coordinates based on the
-    image dimensions, then crops.
+    Raises:
+        VisionAPIError: If rendering fails.
     """
-    img = Image.open(io.BytesIO(image_bytes))
-    iw, ih = img.size
-    x_scale = iw / pdf_width
-    y_scale = ih / pdf_height
-    x0, y0, x1, y1 = viewport_bbox
-    crop_box = (
-        int(x0 * x_scale),
-        int(y0 * y_scale),
-        int(x1 * x_scale),
-        int(y1 * y_scale),
-    )
-    cropped = img.crop(crop_box)
-    buf = io.BytesIO()
-    cropped.save(buf, format="PNG")
-    return buf.getvalue()
+    from medina.pdf.renderer import render_page_payload
+
+    try:
+        return render_page_payload(
+            page_info.source_path,
+            page_info.pdf_page_index,
+            "fixture_count",
+            dpi=dpi,
+            clip=page_info.viewport_bbox,
+        )
+    except Exception as exc:
+        sheet = page_info.sheet_code or f"page_{page_info.page_number}"
+        raise VisionAPIError(
+            f"Render failed for plan {sheet}: {exc}"
+        ) from exc
 
 
 def _build_prompt(fixture_codes: list[str], sheet_code: str) -> str:
@@ -126,18 +122,21 @@ def _parse_vision_response(
 
 def count_fixtures_vision(
     page_info: PageInfo,
-    image_bytes: bytes,
     fixture_codes: list[str],
     config: MedinaConfig | None = None,
+    dpi: int = 150,
+    image: ImagePayload | None = None,
 ) -> dict[str, int]:
     """Count fixtures on a plan page using the Claude Vision API.
 
     Args:
         page_info: Page metadata.
-        image_bytes: PNG image bytes of the rendered page.
         fixture_codes: Fixture codes to look for.
         config: Configuration with API key and model settings.
             If ``None``, loads from environment.
+        dpi: Render resolution for the plan image.
+        image: The plan image, if already rendered (see
+            :func:`_render_plan_image`).
 
     Returns:
         Dict mapping fixture_code to count.
@@ -164,31 +163,7 @@ def count_fixtures_vision(
 
     prompt = _build_prompt(fixture_codes, sheet)
 
-    # Crop to viewport if this is a sub-plan on a multi-viewport page.
-    img_to_send = image_bytes
-    if page_info.viewport_bbox is not None:
-        try:
-            from medina.pdf.renderer import render_page_to_pil
-            # Need original PDF dimensions for coordinate mapping.
-            # Estimate from image + DPI, or use a standard approach.
-            img = Image.open(io.BytesIO(image_bytes))
-            iw, ih = img.size
-            # We don't know the exact PDF dimensions here, but viewport_bbox
-            # is in PDF points. Estimate PDF size from the image assuming
-            # the DPI used for rendering.
-            # Common approach: assume 150 DPI (the max used for vision).
-            est_dpi = 150
-            pdf_w = iw * 72 / est_dpi
-            pdf_h = ih * 72 / est_dpi
-            img_to_send = _crop_to_viewport(
-                image_bytes, page_info.viewport_bbox, pdf_w, pdf_h,
-            )
-            logger.debug(
-                "Cropped vision image to viewport %s for %s",
-                page_info.viewport_bbox, sheet,
-            )
-        except Exception as e:
-            logger.warning("Viewport crop failed for %s: %s", sheet, e)
+    img_to_send = image if image is not None else _render_plan_image(page_info, dpi)
 
     from medina.vlm_client import get_vlm_client
     vlm = get_vlm_client(config)
@@ -221,17 +196,20 @@ def count_fixtures_vision(
 
 def count_all_plans_vision(
     plan_pages: list[PageInfo],
-    page_images: dict[int, bytes],
     fixture_codes: list[str],
     config: MedinaConfig | None = None,
+    dpi: int = 150,
 ) -> dict[str, dict[str, int]]:
     """Count fixtures on all plan pages using the Vision API.
 
+    Plans are rendered and sent concurrently (see
+    :mod:`medina.vlm_dispatch`); results keep the order of *plan_pages*.
+
     Args:
         plan_pages: List of page metadata for lighting plan pages.
-        page_images: Mapping of page_number to PNG image bytes.
         fixture_codes: Fixture type codes to search for.
         config: Configuration with API key and model settings.
+        dpi: Render resolution for the plan images.
 
     Returns:
         ``{sheet_code: {fixture_code: count}}`` for every plan page.
@@ -239,26 +217,33 @@ def count_all_plans_vision(
     if config is None:
         config = get_config()
 
+    from medina.vlm_dispatch import render_and_send
+
+    def render(page_info: PageInfo) -> ImagePayload | None:
+        # count_fixtures_vision returns or raises before using the image
+        if not fixture_codes or not config.has_vlm_key:
+            return None
+        return _render_plan_image(page_info, dpi)
+
+    outcomes = render_and_send(
+        plan_pages,
+        render,
+        lambda page_info, image: count_fixtures_vision(
+            page_info, fixture_codes, config, dpi=dpi, image=image,
+        ),
+    )
+
     results: dict[str, dict[str, int]] = {}
 
-    for page_info in plan_pages:
+    for page_info, counts in zip(plan_pages, outcomes):
         sheet = page_info.sheet_code or f"page_{page_info.page_number}"
-        image_bytes = page_images.get(page_info.page_number)
-        if image_bytes is None:
-            logger.warning(
-                "No rendered image for plan %s (page %d), skipping",
-                sheet, page_info.page_number,
-            )
-            results[sheet] = {code: 0 for code in fixture_codes}
-            continue
-
-        try:
-            counts = count_fixtures_vision(
-                page_info, image_bytes, fixture_codes, config
+        if isinstance(counts, VisionAPIError):
+            logger.error(
+                "Vision counting failed for plan %s", sheet, exc_info=counts,
             )
-        except VisionAPIError:
-            logger.exception("Vision counting failed for plan %s", sheet)
             counts = {code: 0 for code in fixture_codes}
+        elif isinstance(counts, Exception):
+            raise counts
 
         results[sheet] = counts
 
@@ -10,17 +10,15 @@ garbled/image-based PDFs where text extraction fails entirely.
 
 from __future__ import annotations
 
-import io
 import json
 import logging
 import re
 from typing import Any
 
-from PIL import Image
-
 from medina.config import MedinaConfig, get_config
 from medina.exceptions import VisionAPIError
 from medina.models import KeyNote, PageInfo
+from medina.vlm_payload import ImagePayload
 
 logger = logging.getLogger(__name__)
 
@@ -127,45 +125,76 @@ def _parse_response(
     return counts
 
 
-def _crop_legend_area(image_bytes: bytes) -> bytes:
-    """Crop the KEY NOTES legend area from the right side of the page.
+# Crop regions as (left, top, right, bottom) fractions.
+# The keynotes legend is typically in the right ~30% of the page,
+# in the upper ~80% (above the title block).
+_LEGEND_REGION = (0.70, 0.0, 1.0, 0.80)
+# The floor plan: left ~72% and top ~85%, where keynote symbols are
+# placed, excluding the legend and title.
+_DRAWING_REGION = (0.0, 0.0, 0.72, 0.85)
 
-    The keynotes legend is typically in the right ~30% of the page,
-    in the upper ~80% (above the title block).
-    """
-    img = Image.open(io.BytesIO(image_bytes))
-    w, h = img.size
 
-    crop_box = (int(w * 0.70), 0, w, int(h * 0.80))
-    cropped = img.crop(crop_box)
+def _render_legend_area(page_info: PageInfo, dpi: int) -> ImagePayload:
+    """Render only the KEY NOTES legend area of the page.
 
-    buf = io.BytesIO()
-    cropped.save(buf, format="PNG")
-    return buf.getvalue()
+    Always taken from the full page: for viewport sub-plans the shared
+    legend sits outside the viewport bbox.
+    """
+    from medina.pdf.renderer import page_clip, render_page_payload
 
+    clip = page_clip(
+        page_info.source_path, page_info.pdf_page_index, _LEGEND_REGION,
+    )
+    return render_page_payload(
+        page_info.source_path, page_info.pdf_page_index, "keynote_legend", dpi=dpi, clip=clip,
+    )
 
-def _crop_drawing_area(image_bytes: bytes) -> bytes:
-    """Crop the floor plan drawing area.
 
-    Returns the left ~72% and top ~85% to focus on the floor plan
-    where keynote symbols are placed, excluding the legend and title.
+def _render_drawing_area(
+    page_info: PageInfo,
+    dpi: int,
+    use_viewport: bool = True,
+) -> ImagePayload:
+    """Render only the floor plan drawing area.
+
+    For viewport sub-plans (with *use_viewport*) the region is taken
+    relative to the viewport bbox, so only this sub-plan's area is
+    rasterized.
     """
-    img = Image.open(io.BytesIO(image_bytes))
-    w, h = img.size
+    from medina.pdf.renderer import page_clip, render_page_payload
+
+    clip = page_clip(
+        page_info.source_path, page_info.pdf_page_index, _DRAWING_REGION,
+        within=page_info.viewport_bbox if use_viewport else None,
+    )
+    return render_page_payload(
+        page_info.source_path, page_info.pdf_page_index, "keynote_drawing", dpi=dpi, clip=clip,
+    )
 
-    crop_box = (0, 0, int(w * 0.72), int(h * 0.85))
-    cropped = img.crop(crop_box)
 
-    buf = io.BytesIO()
-    cropped.save(buf, format="PNG")
-    return buf.getvalue()
+def render_keynote_images(
+    page_info: PageInfo,
+    dpi: int = 200,
+    use_viewport: bool = True,
+) -> tuple[ImagePayload, ImagePayload]:
+    """Render the (legend, drawing) image pair sent for a plan.
+
+    Lets callers render ahead of the VLM call (see
+    :mod:`medina.vlm_dispatch`); *use_viewport* is False for
+    :func:`extract_and_count_keynotes_vlm`.
+    """
+    return (
+        _render_legend_area(page_info, dpi),
+        _render_drawing_area(page_info, dpi, use_viewport=use_viewport),
+    )
 
 
 def count_keynotes_vision(
     page_info: PageInfo,
-    image_bytes: bytes,
     keynote_numbers: list[str],
     config: MedinaConfig | None = None,
+    dpi: int = 200,
+    images: tuple[ImagePayload, ImagePayload] | None = None,
 ) -> dict[str, int]:
     """Count keynote symbols on a plan page using Claude Vision.
 
@@ -177,9 +206,11 @@ def count_keynotes_vision(
 
     Args:
         page_info: Page metadata.
-        image_bytes: PNG image bytes of the rendered plan page.
         keynote_numbers: List of keynote numbers to search for.
         config: Configuration with API key and model settings.
+        dpi: Render resolution for both images.
+        images: The (legend, drawing) pair, if already rendered (see
+            :func:`render_keynote_images`).
 
     Returns:
         Dict mapping keynote_number (str) to count.
@@ -201,44 +232,9 @@ def count_keynotes_vision(
             "No VLM API key configured for keynote counting."
         )
 
-    # For viewport sub-plans, the shared KEYED NOTES legend sits outside
-    # the viewport bbox (e.g., at the far right of the full page).  We
-    # keep the full-page image for the legend crop and use the viewport-
-    # cropped image for the drawing crop.
-    full_page_image = image_bytes
-    viewport_image = image_bytes
-    if page_info.viewport_bbox is not None:
-        try:
-            img = Image.open(io.BytesIO(image_bytes))
-            iw, ih = img.size
-            # Estimate PDF dimensions from image size (assume 200 DPI for keynotes)
-            est_dpi = 200
-            pdf_w = iw * 72 / est_dpi
-            pdf_h = ih * 72 / est_dpi
-            x0, y0, x1, y1 = page_info.viewport_bbox
-            x_scale = iw / pdf_w
-            y_scale = ih / pdf_h
-            crop_box = (
-                int(x0 * x_scale),
-                int(y0 * y_scale),
-                int(x1 * x_scale),
-                int(y1 * y_scale),
-            )
-            cropped = img.crop(crop_box)
-            buf = io.BytesIO()
-            cropped.save(buf, format="PNG")
-            viewport_image = buf.getvalue()
-            logger.debug(
-                "Cropped keynote VLM image to viewport %s for %s",
-                page_info.viewport_bbox, sheet,
-            )
-        except Exception as e:
-            logger.warning("Viewport crop failed for keynote VLM %s: %s", sheet, e)
-
-    # Legend crop from full page (shared notes panel visible).
-    # Drawing crop from viewport image (only this sub-plan's area).
-    legend_bytes = _crop_legend_area(full_page_image)
-    drawing_bytes = _crop_drawing_area(viewport_image)
+    # Legend from the full page (shared notes panel visible).
+    # Drawing from the viewport bbox (only this sub-plan's area).
+    legend_bytes, drawing_bytes = images or render_keynote_images(page_info, dpi)
 
     prompt = _build_prompt(keynote_numbers, sheet)
 
@@ -353,8 +349,9 @@ def _extract_json_from_response(text: str) -> dict | None:
 
 def extract_and_count_keynotes_vlm(
     page_info: PageInfo,
-    image_bytes: bytes,
     config: MedinaConfig | None = None,
+    dpi: int = 200,
+    images: tuple[ImagePayload, ImagePayload] | None = None,
 ) -> tuple[list[KeyNote], dict[str, int]]:
     """Extract keynote definitions AND count symbols using VLM.
 
@@ -363,8 +360,10 @@ def extract_and_count_keynotes_vlm(
 
     Args:
         page_info: Page metadata.
-        image_bytes: PNG image bytes of the rendered plan page.
         config: Configuration with API key and model settings.
+        dpi: Render resolution for the legend and drawing images.
+        images: The (legend, drawing) pair, if already rendered with
+            ``render_keynote_images(page_info, dpi, use_viewport=False)``.
 
     Returns:
         Tuple of (list of KeyNote objects, dict of {keynote_num: count}).
@@ -378,9 +377,10 @@ def extract_and_count_keynotes_vlm(
     if not config.has_vlm_key:
         return [], {}
 
-    # Crop legend and drawing areas
-    legend_bytes = _crop_legend_area(image_bytes)
-    drawing_bytes = _crop_drawing_area(image_bytes)
+    # Render legend and drawing areas
+    legend_bytes, drawing_bytes = images or render_keynote_images(
+        page_info, dpi, use_viewport=False,
+    )
 
     prompt = _EXTRACT_KEYNOTES_PROMPT.format(sheet_code=sheet)
 
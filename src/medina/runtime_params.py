@@ -1,8 +1,8 @@
 """Runtime parameter registry and lookup."""
 from __future__ import annotations
 
-import json
 import logging
+import threading
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -130,47 +130,101 @@ PARAM_REGISTRY: dict[str, dict[str, Any]] = {
 }
 
 
+# In-process cache of merged params: (source_key, project_id) ->
+# (params_version, params).  Entries are valid while the version matches
+# repositories.get_params_version(); any set_param/delete_param bumps it.
+_CACHE_MAX_ENTRIES = 256
+_cache: dict[tuple[str, str], tuple[int, dict[str, Any]]] = {}
+_cache_lock = threading.Lock()
+
+
+def _load_effective_params(source_key: str, project_id: str) -> dict[str, Any]:
+    """Query the DB override layers and merge them over the defaults."""
+    from medina.db import repositories as repo
+
+    params = {k: v["default"] for k, v in PARAM_REGISTRY.items()}
+
+    # Global overrides
+    global_params = repo.get_params(scope="global")
+    params.update(global_params)
+
+    # Source-level overrides
+    if source_key:
+        source_params = repo.get_params(scope="source_key", scope_key=source_key)
+        params.update(source_params)
+
+    # Project-level overrides
+    if project_id:
+        project_params = repo.get_params(scope="project_id", scope_key=project_id)
+        params.update(project_params)
+
+    return params
+
+
 def get_effective_params(
     source_key: str = "",
     project_id: str = "",
 ) -> dict[str, Any]:
     """Get merged parameters: defaults -> global -> source_key -> project_id.
 
-    Each layer overrides the previous.
+    Each layer overrides the previous.  Results are memoized per
+    (source_key, project_id) and invalidated whenever a parameter is
+    written through ``repositories.set_param`` / ``delete_param``.
+    Returns a fresh dict the caller may mutate.
     """
-    # Start with defaults
-    params = {k: v["default"] for k, v in PARAM_REGISTRY.items()}
-
-    # Try DB overrides
+    key = (source_key, project_id)
     try:
         from medina.db import repositories as repo
 
-        # Global overrides
-        global_params = repo.get_params(scope="global")
-        params.update(global_params)
+        version = repo.get_params_version()
+        with _cache_lock:
+            cached = _cache.get(key)
+        if cached is not None and cached[0] == version:
+            return dict(cached[1])
 
-        # Source-level overrides
-        if source_key:
-            source_params = repo.get_params(scope="source_key", scope_key=source_key)
-            params.update(source_params)
-
-        # Project-level overrides
-        if project_id:
-            project_params = repo.get_params(scope="project_id", scope_key=project_id)
-            params.update(project_params)
+        params = _load_effective_params(source_key, project_id)
     except Exception as e:
         logger.debug("DB param lookup failed (using defaults): %s", e)
+        return {k: v["default"] for k, v in PARAM_REGISTRY.items()}
 
-    return params
+    with _cache_lock:
+        if len(_cache) >= _CACHE_MAX_ENTRIES:
+            _cache.clear()
+        _cache[key] = (version, params)
+    return dict(params)
+
+
+def snapshot_params(
+    source_key: str = "",
+    project_id: str = "",
+) -> dict[str, Any]:
+    """Take a frozen copy of the effective params for one pipeline run.
+
+    The orchestrator takes a single snapshot at pipeline start and hands
+    it to every agent and planner, so all stages see the same values even
+    if a parameter is edited mid-run.
+    """
+    return get_effective_params(source_key, project_id)
+
+
+def clear_params_cache() -> None:
+    """Drop all memoized parameter views."""
+    with _cache_lock:
+        _cache.clear()
 
 
 def get_param(
     key: str,
     source_key: str = "",
     project_id: str = "",
+    params: dict[str, Any] | None = None,
 ) -> Any:
-    """Get a single parameter value with full override chain."""
-    params = get_effective_params(source_key, project_id)
+    """Get a single parameter value with full override chain.
+
+    When *params* (a run snapshot) is given it is used instead of a lookup.
+    """
+    if params is None:
+        params = get_effective_params(source_key, project_id)
     if key in params:
         return params[key]
     # Fall back to registry default
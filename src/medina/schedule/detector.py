@@ -5,8 +5,10 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+from medina import tracing
 from medina.config import MedinaConfig, get_config
 from medina.models import PageInfo, PageType
+from medina.pdf.page_cache import region_text
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +71,7 @@ def _page_has_luminaire_schedule(
     return True
 
 
+@tracing.traced("schedule.detect_pages", cat="pdf")
 def detect_schedule_pages(
     pages: list[PageInfo],
     pdf_pages: dict[int, Any],
@@ -112,7 +115,7 @@ def detect_schedule_pages(
         is_candidate = page.page_type == PageType.SCHEDULE
 
         try:
-            text = pdf_page.extract_text() or ""
+            text = region_text(pdf_page)
         except Exception:
             logger.warning(
                 "Failed to extract text from page %d (%s)",
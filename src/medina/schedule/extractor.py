@@ -3,20 +3,19 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import Executor, Future
 from typing import Any
 
+from medina import tracing
 from medina.exceptions import ScheduleExtractionError
 from medina.models import PageInfo
+from medina.pdf.page_cache import LINE_TABLE_SETTINGS, page_tables
 
 logger = logging.getLogger(__name__)
 
-# pdfplumber table-extraction settings — line-based (primary).
-_LINES_SETTINGS: dict[str, Any] = {
-    "vertical_strategy": "lines",
-    "horizontal_strategy": "lines",
-    "snap_tolerance": 5,
-    "join_tolerance": 5,
-}
+# pdfplumber table-extraction settings — line-based (primary).  Results
+# come from the shared page cache, which the fixture counter also reads.
+_LINES_SETTINGS: dict[str, Any] = LINE_TABLE_SETTINGS
 
 # Fallback: text-based detection for pages without ruled lines.
 _TEXT_SETTINGS: dict[str, Any] = {
@@ -52,9 +51,43 @@ def _is_empty_table(table: list[list[str]]) -> bool:
     return True
 
 
+def _extracted_rows(table: Any) -> list[list[Any]]:
+    if table.rows is None:
+        raise ValueError(f"table at {table.bbox} could not be extracted")
+    return table.rows
+
+
+def _extract_with(
+    pdf_page: Any,
+    settings: dict[str, Any],
+    strategy: str,
+    sheet_label: str,
+) -> list[list[list[str]]]:
+    """Run one pdfplumber table strategy and return the non-empty tables."""
+    try:
+        if settings is _LINES_SETTINGS:
+            raw_tables = [_extracted_rows(t) for t in page_tables(pdf_page)]
+        else:
+            raw_tables = pdf_page.extract_tables(table_settings=settings)
+    except Exception as exc:
+        raise ScheduleExtractionError(
+            f"{strategy.capitalize()}-based table extraction failed on "
+            f"{sheet_label}: {exc}"
+        ) from exc
+
+    tables: list[list[list[str]]] = []
+    for raw in raw_tables or []:
+        cleaned = _clean_table(raw)
+        if not _is_empty_table(cleaned):
+            tables.append(cleaned)
+    return tables
+
+
+@tracing.traced("schedule.extract_tables", cat="pdf", attrs=tracing.page_attrs)
 def extract_schedule_tables(
     page_info: PageInfo,
     pdf_page: Any,
+    executor: Executor | None = None,
 ) -> list[list[list[str]]]:
     """Extract all tables from a schedule page.
 
@@ -64,6 +97,10 @@ def extract_schedule_tables(
     Args:
         page_info: Metadata for the page being processed.
         pdf_page: A pdfplumber page object.
+        executor: If given, the text-based strategy is started on it
+            alongside the line-based one instead of after it, for pages
+            where the fallback is likely to be needed.  Line-based tables
+            still win whenever there are any.
 
     Returns:
         List of tables.  Each table is a list of rows; each row is a list
@@ -74,22 +111,22 @@ def extract_schedule_tables(
     """
     sheet_label = page_info.sheet_code or f"page {page_info.page_number}"
 
-    try:
-        raw_tables = pdf_page.extract_tables(table_settings=_LINES_SETTINGS)
-    except Exception as exc:
-        raise ScheduleExtractionError(
-            f"Line-based table extraction failed on {sheet_label}: {exc}"
-        ) from exc
-
-    tables: list[list[list[str]]] = []
+    text_future: Future | None = None
+    if executor is not None:
+        text_future = executor.submit(
+            tracing.wrap(_extract_with), pdf_page, _TEXT_SETTINGS, "text", sheet_label,
+        )
 
-    if raw_tables:
-        for raw in raw_tables:
-            cleaned = _clean_table(raw)
-            if not _is_empty_table(cleaned):
-                tables.append(cleaned)
+    try:
+        tables = _extract_with(pdf_page, _LINES_SETTINGS, "line", sheet_label)
+    except ScheduleExtractionError:
+        if text_future is not None:
+            text_future.cancel()
+        raise
 
     if tables:
+        if text_future is not None:
+            text_future.cancel()
         logger.info(
             "Extracted %d table(s) from %s using line-based strategy",
             len(tables),
@@ -103,18 +140,12 @@ def extract_schedule_tables(
         sheet_label,
     )
 
-    try:
-        raw_tables = pdf_page.extract_tables(table_settings=_TEXT_SETTINGS)
-    except Exception as exc:
-        raise ScheduleExtractionError(
-            f"Text-based table extraction failed on {sheet_label}: {exc}"
-        ) from exc
-
-    if raw_tables:
-        for raw in raw_tables:
-            cleaned = _clean_table(raw)
-            if not _is_empty_table(cleaned):
-                tables.append(cleaned)
+    # A racing text future that has not started yet is run inline, so a
+    # saturated executor can never leave this page waiting on itself.
+    if text_future is not None and not text_future.cancel():
+        tables = text_future.result()
+    else:
+        tables = _extract_with(pdf_page, _TEXT_SETTINGS, "text", sheet_label)
 
     if tables:
         logger.info(
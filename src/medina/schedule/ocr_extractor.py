@@ -9,16 +9,28 @@ so pdfplumber can extract grid lines but not cell text.  OCR reads the
 fixture codes more accurately than VLM on these pages.
 
 This is the preferred fallback before VLM for schedule extraction.
+
+Each (crop, PSM) pass is one ``image_to_data`` call; passes run
+concurrently, single-threaded each, and are cached by image hash, crop
+and PSM.
 """
 from __future__ import annotations
 
+import hashlib
 import io
 import logging
+import os
 import re
-from typing import Any
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
 from medina.models import FixtureRecord, PageInfo
 
+if TYPE_CHECKING:
+    from medina.pdf.raster_store import Raster
+
 logger = logging.getLogger(__name__)
 
 # ── Fixture-code pattern ────────────────────────────────────────────
@@ -75,10 +87,104 @@ _SCHEDULE_RIGHT_FRAC = 0.78
 _SCHEDULE_TOP_FRAC = 0.03
 _SCHEDULE_BOT_FRAC = 0.90
 
+# ── OCR engine ──────────────────────────────────────────────────────
+# Concurrent tesseract processes per page.  Each runs with
+# OMP_THREAD_LIMIT=1 so the passes, not OpenMP, share out the cores:
+# pytesseract starts tesseract with os.environ and takes no env of its
+# own, so the limit is set once here, at import, unless already given.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+_MAX_OCR_WORKERS = 4
+# Cached OCR passes, keyed by (image sha1, crop box, psm config).
+_OCR_CACHE_MAX = 256
+_ocr_cache: OrderedDict[tuple[str, tuple[int, int, int, int], str], list[str]] = OrderedDict()
+_ocr_cache_lock = threading.Lock()
+
+
+def clear_ocr_cache() -> None:
+    """Drop all cached OCR passes."""
+    with _ocr_cache_lock:
+        _ocr_cache.clear()
+
+
+def _data_to_lines(data: dict[str, list[Any]]) -> list[str]:
+    """Rebuild ``image_to_string``-style lines from ``image_to_data`` output.
+
+    Words are joined per (block, paragraph, line), each paragraph is
+    followed by a blank line and the page by one more (its form-feed
+    separator), which is exactly what ``image_to_string(...).split("\n")``
+    with each line right-stripped gave — the parsers rely on the blank
+    lines.
+    """
+    lines: list[str] = []
+    words: list[str] = []
+    line_key: tuple[int, ...] | None = None
+    par_key: tuple[int, ...] | None = None
+
+    for i, level in enumerate(data["level"]):
+        text = str(data["text"][i]).strip()
+        if int(level) != 5 or not text:
+            continue
+        par = (int(data["page_num"][i]), int(data["block_num"][i]), int(data["par_num"][i]))
+        key = par + (int(data["line_num"][i]),)
+        if key != line_key:
+            if words:
+                lines.append(" ".join(words))
+                words = []
+            if par_key is not None and par != par_key:
+                lines.append("")
+            line_key, par_key = key, par
+        words.append(text)
+
+    if words:
+        lines.append(" ".join(words))
+        lines.append("")
+    lines.append("")
+    return lines
+
+
+def _ocr_lines(
+    img: Any,
+    image_key: str,
+    box: tuple[int, int, int, int],
+    psm_config: str,
+) -> list[str]:
+    """OCR one crop of *img* with one PSM mode, memoized.
+
+    A single ``image_to_data`` pass yields both the text lines and the
+    layout they are rebuilt from.  Results are cached by (image hash,
+    crop box, psm) so re-processing the same page skips tesseract.
+    """
+    from medina import metrics, tracing
+
+    key = (image_key, box, psm_config)
+    with _ocr_cache_lock:
+        cached = _ocr_cache.get(key)
+        if cached is not None:
+            _ocr_cache.move_to_end(key)
+    metrics.cache_event("ocr", cached is not None)
+    if cached is not None:
+        return list(cached)
+
+    import pytesseract
+
+    with tracing.span("ocr.pass", cat="ocr", box=list(box), psm=psm_config):
+        data = pytesseract.image_to_data(
+            img.crop(box),
+            config=psm_config,
+            output_type=pytesseract.Output.DICT,
+        )
+    lines = _data_to_lines(data)
+
+    with _ocr_cache_lock:
+        _ocr_cache[key] = lines
+        while len(_ocr_cache) > _OCR_CACHE_MAX:
+            _ocr_cache.popitem(last=False)
+    return list(lines)
+
 
 def extract_schedule_ocr(
     page_info: PageInfo,
-    image_bytes: bytes,
+    image_bytes: bytes | Raster,
 ) -> list[FixtureRecord]:
     """Extract fixture schedule from a page image using OCR.
 
@@ -89,26 +195,40 @@ def extract_schedule_ocr(
        standard table layouts where code + description are on one row.
 
     For each strategy, multiple crop regions are tried to locate the
-    schedule table regardless of its position on the page.
+    schedule table regardless of its position on the page.  Passes run
+    on a worker pool (each is its own tesseract process), started in the
+    order above and at most one pool's width ahead of the pass being
+    judged, so passes made unnecessary by an early exit are mostly never
+    started.
 
     Args:
         page_info: Page metadata.
-        image_bytes: PNG image bytes of the rendered page.
+        image_bytes: PNG image bytes of the rendered page, or its stored
+            raster (read in place, without decoding).
 
     Returns:
         List of FixtureRecord objects extracted via OCR.
     """
     try:
-        import pytesseract
+        import pytesseract  # noqa: F401
         from PIL import Image
     except ImportError as exc:
         logger.warning("pytesseract or Pillow not installed: %s", exc)
         return []
 
+    from medina import tracing
+
     sheet = page_info.sheet_code or f"page_{page_info.page_number}"
     logger.info("OCR schedule extraction on %s", sheet)
 
-    img = Image.open(io.BytesIO(image_bytes))
+    if isinstance(image_bytes, (bytes, bytearray)):
+        img = Image.open(io.BytesIO(image_bytes))
+        # Decode once up front; worker threads only crop the loaded image.
+        img.load()
+        image_key = hashlib.sha1(image_bytes).hexdigest()
+    else:
+        img = image_bytes.image()
+        image_key = image_bytes.key
     w, h = img.size
     logger.info("OCR image size: %dx%d", w, h)
 
@@ -130,78 +250,105 @@ def extract_schedule_ocr(
         ("psm6", "--psm 6", _parse_table_rows),
     ]
 
+    boxes: dict[str, tuple[int, int, int, int]] = {
+        crop_name: (
+            int(w * left_frac), int(h * top_frac),
+            int(w * right_frac), int(h * bot_frac),
+        )
+        for crop_name, left_frac, right_frac, top_frac, bot_frac in crop_strategies
+    }
+
+    # Passes in preference order.  Waiting on pass i starts passes up to
+    # i + _MAX_OCR_WORKERS - 1, so the pool stays busy without running
+    # far past an early exit.
+    passes = [(mode_name, crop_name) for mode_name, _, _ in ocr_modes for crop_name in boxes]
+    psm_configs = {mode_name: psm_config for mode_name, psm_config, _ in ocr_modes}
+    pool = ThreadPoolExecutor(max_workers=_MAX_OCR_WORKERS, thread_name_prefix="ocr")
+    futures: dict[tuple[str, str], Future] = {}
+    skipped: set[tuple[str, str]] = set()
+
+    def start_through(index: int) -> None:
+        for name in passes[:index + _MAX_OCR_WORKERS]:
+            if name not in futures and name not in skipped:
+                futures[name] = pool.submit(
+                    tracing.wrap(_ocr_lines), img, image_key,
+                    boxes[name[1]], psm_configs[name[0]],
+                )
+
     best_fixtures: list[FixtureRecord] = []
     best_label = ""
 
-    for mode_name, psm_config, parser_fn in ocr_modes:
-        mode_best: list[FixtureRecord] = []
-        mode_label = ""
-
-        for crop_name, left_frac, right_frac, top_frac, bot_frac in crop_strategies:
-            left = int(w * left_frac)
-            right = int(w * right_frac)
-            top = int(h * top_frac)
-            bot = int(h * bot_frac)
-            schedule_img = img.crop((left, top, right, bot))
-            label = f"{mode_name}/{crop_name}"
-            logger.info(
-                "OCR [%s]: (%d,%d)-(%d,%d) = %dx%d",
-                label, left, top, right, bot,
-                schedule_img.width, schedule_img.height,
-            )
-
-            try:
-                text = pytesseract.image_to_string(
-                    schedule_img, config=psm_config,
+    try:
+        for mode_name, _, parser_fn in ocr_modes:
+            mode_best: list[FixtureRecord] = []
+            mode_label = ""
+
+            for crop_name, (left, top, right, bot) in boxes.items():
+                label = f"{mode_name}/{crop_name}"
+                logger.info(
+                    "OCR [%s]: (%d,%d)-(%d,%d) = %dx%d",
+                    label, left, top, right, bot, right - left, bot - top,
                 )
-            except Exception as exc:
-                logger.warning("OCR failed on %s [%s]: %s", sheet, label, exc)
-                continue
 
-            lines = [l.rstrip() for l in text.split("\n")]
-            logger.info(
-                "OCR [%s] produced %d lines on %s",
-                label, len(lines), sheet,
-            )
+                start_through(passes.index((mode_name, crop_name)))
+                try:
+                    lines = futures[(mode_name, crop_name)].result()
+                except Exception as exc:
+                    logger.warning("OCR failed on %s [%s]: %s", sheet, label, exc)
+                    continue
 
-            fixtures = parser_fn(lines, sheet)
-            logger.info(
-                "OCR [%s] found %d fixtures on %s",
-                label, len(fixtures), sheet,
-            )
+                logger.info(
+                    "OCR [%s] produced %d lines on %s",
+                    label, len(lines), sheet,
+                )
 
-            if len(fixtures) > len(mode_best):
-                mode_best = fixtures
-                mode_label = label
+                fixtures = parser_fn(lines, sheet)
+                logger.info(
+                    "OCR [%s] found %d fixtures on %s",
+                    label, len(fixtures), sheet,
+                )
 
-            # Early exit within this mode for solid results.
-            if len(mode_best) >= 2:
-                break
+                if len(fixtures) > len(mode_best):
+                    mode_best = fixtures
+                    mode_label = label
 
-        # Update overall best from this mode.
-        # Prefer PSM 6 over PSM 3 at equal counts because PSM 6 reads
-        # the TYPE column inline with descriptions (better code quality),
-        # while PSM 3 may pick up codes from MODEL/CATALOG columns.
-        if len(mode_best) > len(best_fixtures) or (
-            len(mode_best) == len(best_fixtures) > 0
-            and mode_name == "psm6"
-        ):
-            best_fixtures = mode_best
-            best_label = mode_label
-            logger.info(
-                "OCR [%s] now best with %d fixtures",
-                best_label, len(best_fixtures),
-            )
-
-        # If a mode produced a strong result (≥5 fixtures), no need
-        # to try the other mode.  For small results (2-4), continue
-        # trying in case the other mode finds more.
-        if len(best_fixtures) >= 5:
-            logger.info(
-                "OCR [%s] has %d fixtures — strong result, skipping other modes",
-                best_label, len(best_fixtures),
-            )
-            break
+                # Early exit within this mode for solid results.
+                if len(mode_best) >= 2:
+                    for name in boxes:
+                        skipped.add((mode_name, name))
+                        if (mode_name, name) in futures:
+                            futures[(mode_name, name)].cancel()
+                    break
+
+            # Update overall best from this mode.
+            # Prefer PSM 6 over PSM 3 at equal counts because PSM 6 reads
+            # the TYPE column inline with descriptions (better code quality),
+            # while PSM 3 may pick up codes from MODEL/CATALOG columns.
+            if len(mode_best) > len(best_fixtures) or (
+                len(mode_best) == len(best_fixtures) > 0
+                and mode_name == "psm6"
+            ):
+                best_fixtures = mode_best
+                best_label = mode_label
+                logger.info(
+                    "OCR [%s] now best with %d fixtures",
+                    best_label, len(best_fixtures),
+                )
+
+            # If a mode produced a strong result (≥5 fixtures), no need
+            # to try the other mode.  For small results (2-4), continue
+            # trying in case the other mode finds more.
+            if len(best_fixtures) >= 5:
+                logger.info(
+                    "OCR [%s] has %d fixtures — strong result, skipping other modes",
+                    best_label, len(best_fixtures),
+                )
+                break
+    finally:
+        # Queued passes are dropped; the few already running (at most
+        # the pool's width) finish and populate the cache before we
+        # return, so no tesseract outlives the call.
+        pool.shutdown(wait=True, cancel_futures=True)
 
     if best_fixtures:
         logger.info(
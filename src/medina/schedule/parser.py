@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+from medina import tracing
 from medina.exceptions import ScheduleExtractionError
 from medina.models import FixtureRecord, PageInfo
 from medina.schedule.extractor import extract_schedule_tables
@@ -754,24 +756,138 @@ def parse_schedule_table(
     return fixtures
 
 
+# ---------------------------------------------------------------------------
+# Page pre-filter for combo-page scans
+# ---------------------------------------------------------------------------
+
+PREFILTER_SKIP = "skip"
+PREFILTER_LIKELY = "likely"
+PREFILTER_AMBIGUOUS = "ambiguous"
+
+# Header words that only show up together on a fixture schedule.  Short
+# code-column names ("type", "mark", "id") are too common on plans to help.
+_PREFILTER_HEADER_TERMS: dict[str, tuple[str, ...]] = {
+    "description": ("description",),
+    "voltage": ("voltage", "volts"),
+    "mounting": ("mounting",),
+    "lumens": ("lumen",),
+    "cct": ("color temp", "cct", "kelvin"),
+    "dimming": ("dimming", "driver", "ballast"),
+    "max_va": ("wattage", "watts", "input watts"),
+    "catalog": ("catalog", "manufacturer"),
+}
+_PREFILTER_MIN_HEADER_FIELDS = 3
+
+# Below this many ruling lines/rects a page cannot hold a ruled table, so
+# the line-based strategy will come up empty and the text-based one is
+# worth starting right away.  Pages above it run lines first as usual:
+# racing there only burns CPU (both strategies are GIL-bound Python).
+_MIN_RULED_EDGES = 12
+
+# Default worker count for multi-page extraction.  pdfplumber work is
+# GIL-bound Python, and a pool of 4 measured no faster than serial
+# (slower on small sets), so pages run serially unless a caller asks.
+_MAX_SCHEDULE_WORKERS = 1
+
+
+def prefilter_schedule_page(pdf_page: Any) -> str:
+    """Cheaply decide whether a page can hold a luminaire schedule table.
+
+    Uses the cached word layer only (no table finding):
+
+    - ``likely``: a schedule title ("LUMINAIRE SCHEDULE", ...) is present.
+    - ``skip``: no "schedule" and fewer than three distinct schedule
+      header fields — table extraction could not produce a usable table.
+    - ``ambiguous``: anything in between.
+
+    Pages already classified as schedules should not be pre-filtered.
+    """
+    from medina.pdf.page_cache import page_text_lower
+
+    try:
+        text = page_text_lower(pdf_page)
+    except Exception:
+        logger.debug("Pre-filter could not read words; treating page as ambiguous")
+        return PREFILTER_AMBIGUOUS
+
+    if any(keyword in text for keyword in _LUMINAIRE_TABLE_KEYWORDS):
+        return PREFILTER_LIKELY
+
+    header_fields = sum(
+        1 for terms in _PREFILTER_HEADER_TERMS.values()
+        if any(term in text for term in terms)
+    )
+    if "schedule" not in text and header_fields < _PREFILTER_MIN_HEADER_FIELDS:
+        return PREFILTER_SKIP
+    return PREFILTER_AMBIGUOUS
+
+
+def _sparse_ruling(pdf_page: Any) -> bool:
+    """True if the page has too few lines/rects for a ruled table."""
+    try:
+        from medina.pdf.page_cache import page_lines, page_rects
+
+        return len(page_lines(pdf_page)) + len(page_rects(pdf_page)) < _MIN_RULED_EDGES
+    except Exception:
+        return False
+
+
+def _parse_page(
+    page_info: PageInfo,
+    pdf_page: Any,
+    executor: ThreadPoolExecutor | None,
+) -> list[FixtureRecord]:
+    """Extract and parse one page; errors are logged and yield nothing."""
+    try:
+        tables = extract_schedule_tables(page_info, pdf_page, executor=executor)
+    except ScheduleExtractionError:
+        logger.warning(
+            "Table extraction failed on %s",
+            page_info.sheet_code,
+            exc_info=True,
+        )
+        return []
+
+    source = page_info.sheet_code or str(page_info.page_number)
+    page_fixtures: list[FixtureRecord] = []
+    for table in tables:
+        fixtures = parse_schedule_table(table, source_page=source)
+        for f in fixtures:
+            f.schedule_page = source
+        page_fixtures.extend(fixtures)
+    return page_fixtures
+
+
 def parse_all_schedules(
     schedule_pages: list[PageInfo],
     pdf_pages: dict[int, Any],
+    prefilter: bool = False,
+    max_workers: int | None = None,
 ) -> list[FixtureRecord]:
     """Extract and parse fixtures from all schedule pages.
 
     Calls the extractor and parser for each page, then deduplicates by
     fixture code (keeping the record with the most populated fields).
+    Pages are processed serially unless *max_workers* asks for a thread
+    pool; results are combined in page order either way.
 
     Args:
         schedule_pages: Pages identified as containing luminaire schedules.
         pdf_pages: Mapping of page_number to pdfplumber page object.
+        prefilter: Screen pages with :func:`prefilter_schedule_page`
+            first.  Used for the combo-page scan over plan pages, where
+            most pages carry no schedule: ``skip`` pages are not
+            table-scanned at all.  With a pool, ``ambiguous`` pages
+            without ruled geometry also race the line- and text-based
+            strategies.
+        max_workers: Pool size; defaults to ``_MAX_SCHEDULE_WORKERS``
+            (serial).
 
     Returns:
         Deduplicated list of FixtureRecord objects.
     """
-    all_fixtures: list[FixtureRecord] = []
-
+    work: list[tuple[PageInfo, Any, bool]] = []
+    skipped = 0
     for page_info in schedule_pages:
         pdf_page = pdf_pages.get(page_info.page_number)
         if pdf_page is None:
@@ -782,22 +898,37 @@ def parse_all_schedules(
             )
             continue
 
-        try:
-            tables = extract_schedule_tables(page_info, pdf_page)
-        except ScheduleExtractionError:
-            logger.warning(
-                "Table extraction failed on %s",
-                page_info.sheet_code,
-                exc_info=True,
-            )
-            continue
+        race = False
+        if prefilter:
+            verdict = prefilter_schedule_page(pdf_page)
+            if verdict == PREFILTER_SKIP:
+                skipped += 1
+                continue
+            race = verdict == PREFILTER_AMBIGUOUS and _sparse_ruling(pdf_page)
+        work.append((page_info, pdf_page, race))
+
+    if skipped:
+        logger.info(
+            "Schedule pre-filter skipped %d of %d page(s)",
+            skipped, len(schedule_pages),
+        )
 
-        source = page_info.sheet_code or str(page_info.page_number)
-        for table in tables:
-            fixtures = parse_schedule_table(table, source_page=source)
-            for f in fixtures:
-                f.schedule_page = source
-            all_fixtures.extend(fixtures)
+    workers = min(max_workers or _MAX_SCHEDULE_WORKERS, len(work))
+    per_page: list[list[FixtureRecord]]
+    if workers <= 1:
+        per_page = [_parse_page(page_info, pdf_page, None) for page_info, pdf_page, _ in work]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    tracing.wrap(_parse_page),
+                    page_info, pdf_page, executor if race else None,
+                )
+                for page_info, pdf_page, race in work
+            ]
+            per_page = [f.result() for f in futures]
+
+    all_fixtures = [f for fixtures in per_page for f in fixtures]
 
     # Deduplicate by fixture code, keeping the most complete record.
     deduped = _deduplicate_fixtures(all_fixtures)
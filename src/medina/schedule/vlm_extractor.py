@@ -10,6 +10,8 @@ from typing import Any
 from medina.config import MedinaConfig, get_config
 from medina.exceptions import ScheduleExtractionError, VisionAPIError
 from medina.models import FixtureRecord, PageInfo
+from medina.pdf.page_cache import region_text
+from medina.vlm_payload import ImagePayload
 
 logger = logging.getLogger(__name__)
 
@@ -180,7 +182,7 @@ Reply with ONLY the single category word, nothing else.
 
 def check_schedule_type_vlm(
     page_info: PageInfo,
-    image_bytes: bytes,
+    image_bytes: bytes | ImagePayload,
     config: MedinaConfig | None = None,
 ) -> str:
     """Quick VLM check to determine what type of schedule a page contains.
@@ -219,7 +221,7 @@ def check_schedule_type_vlm(
 
 def extract_schedule_vlm(
     page_info: PageInfo,
-    image_bytes: bytes,
+    image_bytes: bytes | ImagePayload,
     config: MedinaConfig | None = None,
     plan_codes_hint: set[str] | None = None,
 ) -> list[FixtureRecord]:
@@ -230,7 +232,7 @@ def extract_schedule_vlm(
 
     Args:
         page_info: Page metadata.
-        image_bytes: PNG image bytes of the rendered page.
+        image_bytes: The rendered page (PNG bytes or an encoded payload).
         config: Configuration with API key and model settings.
         plan_codes_hint: Optional set of fixture codes found on plan pages,
             used to guide the VLM to read codes correctly.
@@ -357,7 +359,7 @@ def has_minimal_text(pdf_page: Any, min_words: int = 50) -> bool:
     Pages with rasterized content will have minimal text (only title block).
     """
     try:
-        text = pdf_page.extract_text() or ""
+        text = region_text(pdf_page)
     except Exception:
         return True
 
@@ -385,7 +387,7 @@ def extract_plan_fixture_codes(pdf_pages: dict[int, Any]) -> set[str]:
 
     for page_num, pdf_page in pdf_pages.items():
         try:
-            text = pdf_page.extract_text() or ""
+            text = region_text(pdf_page)
         except Exception:
             continue
         matches = code_pattern.findall(text)
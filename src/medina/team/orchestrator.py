@@ -22,6 +22,8 @@ import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+from medina import tracing
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
@@ -30,6 +32,7 @@ logging.basicConfig(
 logger = logging.getLogger("medina.team.orchestrator")
 
 
+@tracing.trace_run("team")
 def run_team(
     source: str,
     output_path: str = "output/inventory",
@@ -121,8 +124,10 @@ def run_team(
     keynote_result = None
 
     with ThreadPoolExecutor(max_workers=2) as executor:
-        count_future = executor.submit(run_count, source, work_dir, use_vision, hints)
-        keynote_future = executor.submit(run_keynote, source, work_dir)
+        count_future = executor.submit(
+            tracing.wrap(run_count), source, work_dir, use_vision, hints,
+        )
+        keynote_future = executor.submit(tracing.wrap(run_keynote), source, work_dir)
 
         for future in as_completed([count_future, keynote_future]):
             try:
@@ -14,6 +14,8 @@ import logging
 import sys
 from pathlib import Path
 
+from medina import tracing
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
@@ -22,9 +24,15 @@ logging.basicConfig(
 logger = logging.getLogger("medina.team.count")
 
 
+@tracing.traced("team.count", cat="agent", profile=True)
 def run(source: str, work_dir: str, use_vision: bool = False, hints=None,
-        source_key: str = "", project_id: str = "") -> dict:
-    """Run stage 5a: FIXTURE COUNTING per plan page."""
+        source_key: str = "", project_id: str = "",
+        params: dict | None = None) -> dict:
+    """Run stage 5a: FIXTURE COUNTING per plan page.
+
+    *params* is the orchestrator's runtime-param snapshot; when omitted the
+    effective params are looked up for (source_key, project_id).
+    """
     from medina.pdf.loader import load
     from medina.plans.text_counter import count_all_plans
     from medina.models import PageInfo, PageType
@@ -67,12 +75,13 @@ def run(source: str, work_dir: str, use_vision: bool = False, hints=None,
     )
 
     # --- Load runtime params ---
-    rt_params = None
-    try:
-        from medina.runtime_params import get_effective_params
-        rt_params = get_effective_params(source_key=source_key, project_id=project_id)
-    except Exception:
-        pass  # Defaults used when DB not available
+    rt_params = params
+    if rt_params is None:
+        try:
+            from medina.runtime_params import get_effective_params
+            rt_params = get_effective_params(source_key=source_key, project_id=project_id)
+        except Exception:
+            pass  # Defaults used when DB not available
 
     # --- Text-based counting ---
     all_plan_counts: dict[str, dict[str, int]] = {}
@@ -120,24 +129,11 @@ def run(source: str, work_dir: str, use_vision: bool = False, hints=None,
     if should_run_vlm:
         logger.info("[COUNT] Running vision-based counting...")
         try:
-            from medina.pdf.renderer import render_page_to_image
             from medina.plans.vision_counter import count_all_plans_vision
 
             vision_dpi = min(config.render_dpi, rt_params.get("vision_count_dpi", 150) if rt_params else 150)
-            page_images: dict[int, bytes] = {}
-            for pinfo in plan_pages:
-                try:
-                    img_bytes = render_page_to_image(
-                        pinfo.source_path, pinfo.pdf_page_index,
-                        dpi=vision_dpi,
-                    )
-                    page_images[pinfo.page_number] = img_bytes
-                except Exception as e:
-                    logger.warning("Render failed for %s: %s",
-                                   pinfo.sheet_code, e)
-
             vision_counts = count_all_plans_vision(
-                plan_pages, page_images, fixture_codes, config,
+                plan_pages, fixture_codes, config, dpi=vision_dpi,
             )
 
             # Smart merge strategy:
@@ -14,6 +14,8 @@ import logging
 import sys
 from pathlib import Path
 
+from medina import tracing
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
@@ -25,8 +27,14 @@ logger = logging.getLogger("medina.team.keynote")
 _MAX_PLAUSIBLE_KEYNOTE_COUNT = 10  # Single keynote rarely appears >10 times per plan
 
 
-def run(source: str, work_dir: str, source_key: str = "", project_id: str = "", hints=None) -> dict:
-    """Run stage 5b: KEYNOTE EXTRACTION AND COUNTING."""
+@tracing.traced("team.keynote", cat="agent", profile=True)
+def run(source: str, work_dir: str, source_key: str = "", project_id: str = "", hints=None,
+        params: dict | None = None) -> dict:
+    """Run stage 5b: KEYNOTE EXTRACTION AND COUNTING.
+
+    *params* is the orchestrator's runtime-param snapshot; when omitted the
+    effective params are looked up for (source_key, project_id).
+    """
     from medina.pdf.loader import load
     from medina.plans.keynotes import extract_all_keynotes
     from medina.models import PageInfo, PageType
@@ -47,8 +55,10 @@ def run(source: str, work_dir: str, source_key: str = "", project_id: str = "",
     max_plausible = _MAX_PLAUSIBLE_KEYNOTE_COUNT
     keynote_max_num = 20
     try:
-        from medina.runtime_params import get_effective_params
-        rt_params = get_effective_params(source_key=source_key, project_id=project_id)
+        rt_params = params
+        if rt_params is None:
+            from medina.runtime_params import get_effective_params
+            rt_params = get_effective_params(source_key=source_key, project_id=project_id)
         max_plausible = rt_params.get("max_plausible_keynote_count", max_plausible)
         keynote_max_num = rt_params.get("keynote_max_number", keynote_max_num)
     except Exception:
@@ -98,33 +108,36 @@ def run(source: str, work_dir: str, source_key: str = "", project_id: str = "",
             len(plan_pages),
         )
         try:
-            from medina.pdf.renderer import render_page_to_image
             from medina.plans.vision_keynote_counter import (
                 extract_and_count_keynotes_vlm,
+                render_keynote_images,
             )
+            from medina.vlm_dispatch import render_and_send
 
             vlm_dpi = min(config.render_dpi, 200)
-            for pinfo in plan_pages:
+            # Render the next plans while earlier requests are in flight
+            outcomes = render_and_send(
+                plan_pages,
+                lambda p: render_keynote_images(p, vlm_dpi, use_viewport=False),
+                lambda p, images: extract_and_count_keynotes_vlm(
+                    p, config, dpi=vlm_dpi, images=images,
+                ),
+            )
+            for pinfo, outcome in zip(plan_pages, outcomes):
                 code = pinfo.sheet_code or str(pinfo.page_number)
-                try:
-                    img_bytes = render_page_to_image(
-                        pinfo.source_path, pinfo.pdf_page_index,
-                        dpi=vlm_dpi,
-                    )
-                    vlm_keynotes, vlm_counts = extract_and_count_keynotes_vlm(
-                        pinfo, img_bytes, config,
-                    )
-                    if vlm_keynotes:
-                        all_keynotes.extend(vlm_keynotes)
-                        all_keynote_counts[code] = vlm_counts
-                        logger.info(
-                            "[KEYNOTE] VLM found %d keynotes on %s",
-                            len(vlm_keynotes), code,
-                        )
-                except Exception as e:
+                if isinstance(outcome, Exception):
                     logger.warning(
                         "[KEYNOTE] VLM full extraction failed for %s: %s",
-                        code, e,
+                        code, outcome,
+                    )
+                    continue
+                vlm_keynotes, vlm_counts = outcome
+                if vlm_keynotes:
+                    all_keynotes.extend(vlm_keynotes)
+                    all_keynote_counts[code] = vlm_counts
+                    logger.info(
+                        "[KEYNOTE] VLM found %d keynotes on %s",
+                        len(vlm_keynotes), code,
                     )
         except ImportError:
             logger.warning("[KEYNOTE] VLM keynote extractor not available")
@@ -223,48 +236,49 @@ def run(source: str, work_dir: str, source_key: str = "", project_id: str = "",
                 len(plans_needing_vlm),
             )
             try:
-                from medina.pdf.renderer import render_page_to_image
                 from medina.plans.vision_keynote_counter import (
                     count_keynotes_vision,
+                    render_keynote_images,
                 )
+                from medina.vlm_dispatch import render_and_send
 
                 vlm_dpi = min(config.render_dpi, 200)
-                for pinfo in plans_needing_vlm:
+                outcomes = render_and_send(
+                    plans_needing_vlm,
+                    lambda p: render_keynote_images(p, vlm_dpi),
+                    lambda p, images: count_keynotes_vision(
+                        p, keynote_numbers, config, dpi=vlm_dpi, images=images,
+                    ),
+                )
+                for pinfo, vlm_counts in zip(plans_needing_vlm, outcomes):
                     code = pinfo.sheet_code or str(pinfo.page_number)
-                    try:
-                        img_bytes = render_page_to_image(
-                            pinfo.source_path, pinfo.pdf_page_index,
-                            dpi=vlm_dpi,
-                        )
-                        vlm_counts = count_keynotes_vision(
-                            pinfo, img_bytes, keynote_numbers, config,
-                        )
-                        # Merge VLM counts with geometric counts:
-                        # - If geometric detection found a positive count
-                        #   AND positions, keep it (geometric is more reliable).
-                        # - Only use VLM count when geometric found 0 for
-                        #   that keynote on this plan.
-                        # This prevents VLM hallucinations from overriding
-                        # correct geometric results.
-                        geo_counts = all_keynote_counts.get(code, {})
-                        merged_counts = {}
-                        for kn_num in set(list(geo_counts.keys()) + list(vlm_counts.keys())):
-                            geo_val = geo_counts.get(kn_num, 0)
-                            vlm_val = vlm_counts.get(kn_num, 0)
-                            if geo_val > 0:
-                                # Trust geometric detection — it has positions
-                                merged_counts[kn_num] = geo_val
-                            else:
-                                merged_counts[kn_num] = vlm_val
-                        all_keynote_counts[code] = merged_counts
-                        logger.info(
-                            "[KEYNOTE] VLM counts for %s: %s (merged with geo: %s)",
-                            code, vlm_counts, geo_counts,
-                        )
-                    except Exception as e:
+                    if isinstance(vlm_counts, Exception):
                         logger.warning(
-                            "[KEYNOTE] VLM failed for %s: %s", code, e,
+                            "[KEYNOTE] VLM failed for %s: %s", code, vlm_counts,
                         )
+                        continue
+                    # Merge VLM counts with geometric counts:
+                    # - If geometric detection found a positive count
+                    #   AND positions, keep it (geometric is more reliable).
+                    # - Only use VLM count when geometric found 0 for
+                    #   that keynote on this plan.
+                    # This prevents VLM hallucinations from overriding
+                    # correct geometric results.
+                    geo_counts = all_keynote_counts.get(code, {})
+                    merged_counts = {}
+                    for kn_num in set(list(geo_counts.keys()) + list(vlm_counts.keys())):
+                        geo_val = geo_counts.get(kn_num, 0)
+                        vlm_val = vlm_counts.get(kn_num, 0)
+                        if geo_val > 0:
+                            # Trust geometric detection — it has positions
+                            merged_counts[kn_num] = geo_val
+                        else:
+                            merged_counts[kn_num] = vlm_val
+                    all_keynote_counts[code] = merged_counts
+                    logger.info(
+                        "[KEYNOTE] VLM counts for %s: %s (merged with geo: %s)",
+                        code, vlm_counts, geo_counts,
+                    )
             except ImportError:
                 logger.warning("[KEYNOTE] VLM keynote counter not available")
 
@@ -14,6 +14,8 @@ import logging
 import sys
 from pathlib import Path
 
+from medina import tracing
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
@@ -22,6 +24,7 @@ logging.basicConfig(
 logger = logging.getLogger("medina.team.qa")
 
 
+@tracing.traced("team.qa", cat="agent", profile=True)
 def run(
     source: str,
     work_dir: str,
@@ -13,13 +13,17 @@ Usage:
 
 from __future__ import annotations
 
-import base64
-import io
 import json
 import logging
 import re
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from medina import tracing
+
+if TYPE_CHECKING:
+    from medina.vlm_payload import ImagePayload
 
 logging.basicConfig(
     level=logging.INFO,
@@ -61,37 +65,34 @@ def _render_for_vlm(
     config,
     source_key: str = "",
     project_id: str = "",
-) -> tuple[bytes, int]:
+    params: dict | None = None,
+) -> tuple[ImagePayload, int]:
     """Render a page image sized for VLM API limits.
 
-    Returns (image_bytes, actual_dpi).
+    Returns (image_payload, actual_dpi).
     """
-    from medina.pdf.renderer import render_page_to_image
-    from PIL import Image
+    from medina.pdf.renderer import render_page_payload
 
     sched_render_dpi = 200
     try:
         from medina.runtime_params import get_param
         sched_render_dpi = get_param(
             "schedule_render_dpi", source_key=source_key, project_id=project_id,
+            params=params,
         )
     except Exception:
         pass
     dpi = min(config.render_dpi, sched_render_dpi)
 
-    img_bytes = render_page_to_image(source_path, pdf_page_index, dpi=dpi)
-    b64_size = len(base64.b64encode(img_bytes))
-    img = Image.open(io.BytesIO(img_bytes))
-    max_dim = max(img.size)
+    payload = render_page_payload(source_path, pdf_page_index, "schedule", dpi=dpi)
 
-    while (b64_size > 5_000_000 or max_dim > _MAX_VLM_PIXEL) and dpi > 72:
+    while (
+        payload.b64_size > 5_000_000 or payload.max_dim > _MAX_VLM_PIXEL
+    ) and dpi > 72:
         dpi = max(72, dpi - 20)
-        img_bytes = render_page_to_image(source_path, pdf_page_index, dpi=dpi)
-        b64_size = len(base64.b64encode(img_bytes))
-        img = Image.open(io.BytesIO(img_bytes))
-        max_dim = max(img.size)
+        payload = render_page_payload(source_path, pdf_page_index, "schedule", dpi=dpi)
 
-    return img_bytes, dpi
+    return payload, dpi
 
 
 def _try_vlm_extraction(
@@ -101,8 +102,14 @@ def _try_vlm_extraction(
     found_plan_codes: set[str],
     source_key: str = "",
     project_id: str = "",
+    params: dict | None = None,
+    rendered: tuple | None = None,
 ) -> list:
-    """Try VLM extraction on a single page. Returns list of fixtures or []."""
+    """Try VLM extraction on a single page. Returns list of fixtures or [].
+
+    *rendered* is the page's ``_render_for_vlm`` result if already
+    rendered.
+    """
     from medina.schedule.vlm_extractor import extract_schedule_vlm
 
     spdf = pdf_pages.get(page.page_number)
@@ -111,20 +118,17 @@ def _try_vlm_extraction(
 
     label = page.sheet_code or str(page.page_number)
     try:
-        img_bytes, actual_dpi = _render_for_vlm(
+        payload, actual_dpi = rendered or _render_for_vlm(
             page.source_path, page.pdf_page_index,
-            config, source_key, project_id,
+            config, source_key, project_id, params,
         )
-        from PIL import Image
-        img = Image.open(io.BytesIO(img_bytes))
-        b64_size = len(base64.b64encode(img_bytes))
         logger.info(
             "[SCHEDULE] VLM render: %s at %d DPI, %dx%d px, %.1f MB",
-            label, actual_dpi, img.size[0], img.size[1],
-            b64_size / 1_000_000,
+            label, actual_dpi, payload.width, payload.height,
+            payload.b64_size / 1_000_000,
         )
         vlm_fixtures = extract_schedule_vlm(
-            page, img_bytes, config,
+            page, payload, config,
             plan_codes_hint=(
                 found_plan_codes if found_plan_codes else None
             ),
@@ -141,8 +145,14 @@ def _try_vlm_extraction(
         return []
 
 
-def run(source: str, work_dir: str, hints=None, source_key: str = "", project_id: str = "") -> dict:
-    """Run stage 4: SCHEDULE EXTRACTION."""
+@tracing.traced("team.schedule", cat="agent", profile=True)
+def run(source: str, work_dir: str, hints=None, source_key: str = "", project_id: str = "",
+        params: dict | None = None) -> dict:
+    """Run stage 4: SCHEDULE EXTRACTION.
+
+    *params* is the orchestrator's runtime-param snapshot; when omitted the
+    effective params are looked up for (source_key, project_id).
+    """
     from medina.pdf.loader import load
     from medina.schedule.parser import parse_all_schedules
     from medina.models import PageInfo, PageType, SheetIndexEntry
@@ -219,7 +229,7 @@ def run(source: str, work_dir: str, hints=None, source_key: str = "", project_id
 
     # Combo page: also check plan pages for embedded schedule tables
     if plan_pages:
-        combo_fixtures = parse_all_schedules(plan_pages, pdf_pages)
+        combo_fixtures = parse_all_schedules(plan_pages, pdf_pages, prefilter=True)
         if combo_fixtures:
             logger.info(
                 "[SCHEDULE] Found %d fixture type(s) on plan page(s) "
@@ -251,45 +261,70 @@ def run(source: str, work_dir: str, hints=None, source_key: str = "", project_id
         # Pre-screen when multiple schedule pages exist
         if len(vlm_candidate_pages) > 1:
             from medina.schedule.vlm_extractor import check_schedule_type_vlm
-            from medina.pdf.renderer import render_page_to_image
-
+            from medina.pdf.renderer import render_page_payload
+            from medina.vlm_dispatch import render_and_send
+
+            to_screen = [
+                spage for spage in vlm_candidate_pages
+                if pdf_pages.get(spage.page_number) is not None
+            ]
+            outcomes = render_and_send(
+                to_screen,
+                lambda spage: render_page_payload(
+                    spage.source_path, spage.pdf_page_index, "schedule", dpi=100,
+                ),
+                lambda spage, screen_img: check_schedule_type_vlm(spage, screen_img, config),
+            )
             screened: list = []
-            for spage in vlm_candidate_pages:
-                spdf = pdf_pages.get(spage.page_number)
-                if spdf is None:
-                    continue
+            for spage, stype in zip(to_screen, outcomes):
                 label = spage.sheet_code or str(spage.page_number)
-                try:
-                    screen_img = render_page_to_image(
-                        spage.source_path, spage.pdf_page_index, dpi=100,
-                    )
-                    stype = check_schedule_type_vlm(spage, screen_img, config)
-                    if stype in ("luminaire", "mixed", "unknown"):
-                        screened.append(spage)
-                    else:
-                        logger.info(
-                            "[SCHEDULE] Skipping %s — VLM identified as %s schedule",
-                            label, stype,
-                        )
-                except Exception as e:
+                if isinstance(stype, Exception):
                     logger.warning(
                         "[SCHEDULE] Pre-screen failed for %s: %s — keeping it",
-                        label, e,
+                        label, stype,
                     )
                     screened.append(spage)
+                elif stype in ("luminaire", "mixed", "unknown"):
+                    screened.append(spage)
+                else:
+                    logger.info(
+                        "[SCHEDULE] Skipping %s — VLM identified as %s schedule",
+                        label, stype,
+                    )
             if screened:
                 luminaire_candidates = screened
 
-        # Try VLM on each candidate
-        for spage in luminaire_candidates:
-            label = spage.sheet_code or str(spage.page_number)
+        # Try VLM on each candidate, rendering the next candidates
+        # while earlier requests are in flight
+        from medina.vlm_dispatch import render_and_send
+
+        to_extract = [
+            spage for spage in luminaire_candidates
+            if pdf_pages.get(spage.page_number) is not None
+        ]
+        for spage in to_extract:
             logger.info(
-                "[SCHEDULE] pdfplumber found 0 — trying VLM on %s", label,
+                "[SCHEDULE] pdfplumber found 0 — trying VLM on %s",
+                spage.sheet_code or str(spage.page_number),
             )
-            vlm_fixtures = _try_vlm_extraction(
+        outcomes = render_and_send(
+            to_extract,
+            lambda spage: _render_for_vlm(
+                spage.source_path, spage.pdf_page_index,
+                config, source_key, project_id, params,
+            ),
+            lambda spage, rendered: _try_vlm_extraction(
                 spage, pdf_pages, config, found_plan_codes,
-                source_key, project_id,
-            )
+                source_key, project_id, params, rendered=rendered,
+            ),
+        )
+        for spage, vlm_fixtures in zip(to_extract, outcomes):
+            if isinstance(vlm_fixtures, Exception):
+                logger.warning(
+                    "[SCHEDULE] VLM failed for %s: %s",
+                    spage.sheet_code or str(spage.page_number), vlm_fixtures,
+                )
+                continue
             fixtures.extend(vlm_fixtures)
 
     # ── Step 5: Cross-reference against plan page codes ──
@@ -15,6 +15,8 @@ import logging
 import sys
 from pathlib import Path
 
+from medina import tracing
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
@@ -23,6 +25,7 @@ logging.basicConfig(
 logger = logging.getLogger("medina.team.search")
 
 
+@tracing.traced("team.search", cat="agent", profile=True)
 def run(source: str, work_dir: str, hints=None) -> dict:
     """Run stages 1-3: LOAD, DISCOVER, CLASSIFY.
 
@@ -87,52 +90,59 @@ def run(source: str, work_dir: str, hints=None) -> dict:
     if hints and hasattr(hints, "viewport_splits"):
         viewport_splits = hints.viewport_splits or {}
 
-    from medina.plans.viewport_detector import detect_viewports, split_page_into_viewports
+    from medina.plans.viewport_detector import (
+        detect_all_viewports,
+        split_page_into_viewports,
+    )
+
+    # Pages whose viewports are fully given by the user, and pages to
+    # auto-detect with detect_all_viewports.
+    user_viewports: dict[int, list] = {}
+    to_detect: list[tuple] = []
+    for p in pages:
+        if p.page_type != PageType.LIGHTING_PLAN:
+            continue
+        # Check user-provided splits first
+        p_key = p.sheet_code or str(p.page_number)
+        user_split_data = viewport_splits.get(p_key)
+        if user_split_data is not None and len(user_split_data) > 0:
+            # User/LLM provided viewport hints.  If they include a
+            # bbox they are fully defined; otherwise treat them as
+            # label-only hints and fall through to auto-detect.
+            from medina.models import Viewport
+            all_have_bbox = all(
+                isinstance(vp, dict) and "bbox" in vp
+                for vp in user_split_data
+            )
+            if all_have_bbox:
+                user_viewports[id(p)] = [
+                    Viewport.model_validate(vp)
+                    for vp in user_split_data
+                ]
+                continue
+            # Labels without bbox — auto-detect to get real boxes
+            logger.info(
+                "Viewport hints for %s lack bbox — falling back "
+                "to auto-detect",
+                p_key,
+            )
+        # Auto-detect viewports (triggered for all lighting plans,
+        # or when user sent empty list = "auto-detect" sentinel)
+        pdf_page = pdf_pages.get(p.page_number)
+        if pdf_page is not None:
+            to_detect.append((p, pdf_page))
+
+    detected = {
+        id(p): vps
+        for (p, _), vps in zip(to_detect, detect_all_viewports(to_detect))
+    }
 
     expanded_pages: list = []
     viewport_map: dict[str, int] = {}  # composite_code -> physical page_number
     for p in pages:
         if p.page_type == PageType.LIGHTING_PLAN:
-            # Check user-provided splits first
-            p_key = p.sheet_code or str(p.page_number)
-            user_split_data = viewport_splits.get(p_key)
-            if user_split_data is not None and len(user_split_data) > 0:
-                # User/LLM provided viewport hints.  If they include a
-                # bbox they are fully defined; otherwise treat them as
-                # label-only hints and fall through to auto-detect.
-                from medina.models import Viewport
-                all_have_bbox = all(
-                    isinstance(vp, dict) and "bbox" in vp
-                    for vp in user_split_data
-                )
-                if all_have_bbox:
-                    user_vps = [
-                        Viewport.model_validate(vp)
-                        for vp in user_split_data
-                    ]
-                    virtual = split_page_into_viewports(p, user_vps)
-                else:
-                    # Labels without bbox — auto-detect to get real boxes
-                    logger.info(
-                        "Viewport hints for %s lack bbox — falling back "
-                        "to auto-detect",
-                        p_key,
-                    )
-                    pdf_page = pdf_pages.get(p.page_number)
-                    if pdf_page is not None:
-                        vps = detect_viewports(pdf_page, p)
-                        virtual = split_page_into_viewports(p, vps)
-                    else:
-                        virtual = [p]
-            else:
-                # Auto-detect viewports (triggered for all lighting plans,
-                # or when user sent empty list = "auto-detect" sentinel)
-                pdf_page = pdf_pages.get(p.page_number)
-                if pdf_page is not None:
-                    vps = detect_viewports(pdf_page, p)
-                    virtual = split_page_into_viewports(p, vps)
-                else:
-                    virtual = [p]
+            vps = user_viewports.get(id(p), detected.get(id(p)))
+            virtual = split_page_into_viewports(p, vps) if vps is not None else [p]
             for vp in virtual:
                 expanded_pages.append(vp)
                 if vp.parent_sheet_code:
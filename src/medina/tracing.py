@@ -0,0 +1,486 @@
+"""Lightweight tracing for pipeline runs.
+
+Spans nest through a :mod:`contextvars` stack, so a span opened inside a
+stage is parented to it without passing anything around; work handed to
+a thread pool keeps its parent when submitted through :func:`wrap`.
+
+Tracing is off unless ``CDS_TRACE_ENABLED`` is set (or
+:func:`start_session` is called directly).  When off, :func:`span`
+returns a shared no-op span and costs a context-variable lookup.
+
+A session is opened by the outermost :func:`trace_run` (the CLI
+pipeline, the team orchestrator, the API pipeline).  Sessions are also
+context-local, so concurrent API runs trace into separate files.  Each
+is written on exit
+to ``CDS_TRACE_DIR`` as a Chrome trace (load it in ``chrome://tracing``
+or Perfetto).  :func:`export_otlp_json` writes the same spans in OTLP
+JSON form.  With ``CDS_TRACE_PROFILE`` set, spans opened with
+``profile=True`` (the team agents and pipeline stages) also capture a
+cProfile ``.prof`` file next to the trace.
+
+Independently of sessions, :func:`add_listener` subscribes a callback to
+finished spans of given categories; :mod:`medina.metrics` uses this to
+turn stage, VLM and render spans into histograms.  Categories without a
+listener stay no-op while no session is active.
+
+Span attributes used across the codebase: ``page`` / ``sheet_code``
+(page ids), ``bytes`` (rendered image bytes), ``input_tokens`` /
+``output_tokens`` (VLM usage), ``cache_hit``.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import functools
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_MAX_SPANS = 200_000  # Bound memory for pathological runs
+
+_current: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "medina_span", default=None,
+)
+_session: contextvars.ContextVar[Session | None] = contextvars.ContextVar(
+    "medina_trace_session", default=None,
+)
+_ids = itertools.count(1)
+
+# Finished-span callbacks by category; copy-on-write, read without a lock
+_listeners: dict[str, tuple[Callable[[Span], None], ...]] = {}
+_listeners_lock = threading.Lock()
+
+
+class Span:
+    """A timed operation with attributes; finished spans go to the session
+    and to any listeners for its category."""
+
+    __slots__ = (
+        "name", "cat", "span_id", "parent_id", "start_ns", "end_ns",
+        "thread_id", "attrs", "profile",
+    )
+
+    def __init__(self, name: str, cat: str, parent: Span | None, attrs: dict) -> None:
+        self.name = name
+        self.cat = cat
+        self.span_id = next(_ids)
+        self.parent_id = parent.span_id if parent else 0
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = 0
+        self.thread_id = threading.get_ident()
+        self.attrs = attrs
+        self.profile: cProfile.Profile | None = None
+
+    def set(self, **attrs: Any) -> None:
+        """Set attributes (page ids, cache_hit, token counts...)."""
+        self.attrs.update(attrs)
+
+    def add(self, key: str, amount: int | float = 1) -> None:
+        """Increment a numeric attribute (bytes rendered, cache hits...)."""
+        self.attrs[key] = self.attrs.get(key, 0) + amount
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns or time.perf_counter_ns()
+        return (end - self.start_ns) / 1e6
+
+
+class _NoopSpan:
+    """Stand-in returned when tracing is off."""
+
+    __slots__ = ()
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def add(self, key: str, amount: int | float = 1) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Session:
+    """Collected spans for one traced run."""
+
+    def __init__(self, name: str, trace_dir: Path, profile: bool = False) -> None:
+        self.name = name
+        self.trace_dir = trace_dir
+        self.profile = profile
+        self.trace_id = os.urandom(16).hex()
+        self.started_at = datetime.now()
+        # perf_counter has no epoch; anchor it so exports carry wall time
+        self.epoch_offset_ns = time.time_ns() - time.perf_counter_ns()
+        self.spans: list[Span] = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._profiling_threads: set[int] = set()
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            if len(self.spans) < _MAX_SPANS:
+                self.spans.append(span)
+            else:
+                self.dropped += 1
+
+    @property
+    def file_stem(self) -> str:
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.name)[:80]
+        return f"{safe}_{self.started_at:%Y%m%d_%H%M%S}"
+
+
+# ── Span API ──────────────────────────────────────────────────────────
+
+
+def enabled() -> bool:
+    return _session.get() is not None
+
+
+def _active(cat: str) -> bool:
+    return _session.get() is not None or cat in _listeners
+
+
+def add_listener(cats: tuple[str, ...] | list[str], callback: Callable[[Span], None]) -> None:
+    """Call *callback* with every finished span in the given categories.
+
+    Callbacks run on the thread that closed the span and must be cheap;
+    exceptions are logged and swallowed.
+    """
+    global _listeners
+    with _listeners_lock:
+        listeners = dict(_listeners)
+        for cat in cats:
+            listeners[cat] = (*listeners.get(cat, ()), callback)
+        _listeners = listeners
+
+
+def current_span() -> Span | _NoopSpan:
+    """The innermost open span in this context (no-op when none is open)."""
+    return _current.get() or NOOP_SPAN
+
+
+@contextmanager
+def span(
+    name: str,
+    cat: str = "",
+    profile: bool = False,
+    **attrs: Any,
+) -> Iterator[Span | _NoopSpan]:
+    """Time a block as a child of the current span.
+
+    ``profile=True`` additionally captures a cProfile for the block when
+    the session was started with profiling (one capture per thread at a
+    time; nested profiled spans are folded into the outer one).
+    """
+    session = _session.get()
+    listeners = _listeners.get(cat)
+    if session is None and not listeners:
+        yield NOOP_SPAN
+        return
+
+    sp = Span(name, cat, _current.get(), attrs)
+    token = _current.set(sp)
+    if profile and session is not None and session.profile:
+        _start_profile(session, sp)
+    try:
+        yield sp
+    except BaseException as exc:
+        sp.attrs["error"] = type(exc).__name__
+        raise
+    finally:
+        sp.end_ns = time.perf_counter_ns()
+        _current.reset(token)
+        if sp.profile is not None:
+            _stop_profile(session, sp)
+        if session is not None:
+            session.record(sp)
+        if listeners:
+            _notify(listeners, sp)
+
+
+def _notify(listeners: tuple[Callable[[Span], None], ...], sp: Span) -> None:
+    for callback in listeners:
+        try:
+            callback(sp)
+        except Exception as e:
+            logger.debug("Span listener failed for %s: %s", sp.name, e)
+
+
+def page_attrs(*args: Any, **kwargs: Any) -> dict[str, Any]:
+    """Span attributes for the first ``PageInfo``-like argument of a call."""
+    for value in (*args, *kwargs.values()):
+        if hasattr(value, "page_number") and hasattr(value, "sheet_code"):
+            return {"page": value.page_number, "sheet_code": value.sheet_code or ""}
+    return {}
+
+
+def traced(
+    name: str | None = None,
+    cat: str = "",
+    profile: bool = False,
+    attrs: Callable[..., dict[str, Any]] | None = None,
+) -> Callable[[F], F]:
+    """Decorator form of :func:`span`; defaults to the function's qualname.
+
+    *attrs*, if given, is called with the function's arguments and
+    returns initial span attributes (see :func:`page_attrs`).
+    """
+
+    def decorator(func: F) -> F:
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _active(cat):
+                return func(*args, **kwargs)
+            initial = attrs(*args, **kwargs) if attrs is not None else {}
+            with span(span_name, cat=cat, profile=profile, **initial):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def wrap(func: F) -> F:
+    """Bind *func* to the current span context for use in another thread.
+
+    ``executor.submit(tracing.wrap(fn), ...)`` parents spans opened in
+    the worker to the submitting span and records them in its session.
+    """
+    ctx = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return ctx.run(func, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+class StageSpans:
+    """Sequential stage spans driven by stage-name changes.
+
+    For linear code that already announces its stages (``report(stage,
+    msg)``): :meth:`enter` closes the previous stage span when the name
+    changes and opens the next one.  Use as a context manager so the
+    last stage is closed even when the run fails.
+    """
+
+    def __init__(self, prefix: str, profile: bool = True) -> None:
+        self.prefix = prefix
+        self.profile = profile
+        self._stage: str | None = None
+        self._cm: Any = None
+
+    def enter(self, stage: str) -> None:
+        if stage == self._stage or not _active("stage"):
+            return
+        self.close()
+        self._stage = stage
+        self._cm = span(f"{self.prefix}.{stage.lower()}", cat="stage", profile=self.profile)
+        self._cm.__enter__()
+
+    def close(self, exc: BaseException | None = None) -> None:
+        if self._cm is not None:
+            cm, self._cm = self._cm, None
+            if exc is None:
+                cm.__exit__(None, None, None)
+            else:
+                cm.__exit__(type(exc), exc, exc.__traceback__)
+        self._stage = None
+
+    def __enter__(self) -> StageSpans:
+        return self
+
+    def __exit__(self, exc_type: Any, exc: BaseException | None, tb: Any) -> None:
+        self.close(exc)
+
+
+# ── Profiling ─────────────────────────────────────────────────────────
+
+
+def _start_profile(session: Session, sp: Span) -> None:
+    with session._lock:
+        if sp.thread_id in session._profiling_threads:
+            return
+        session._profiling_threads.add(sp.thread_id)
+    prof = cProfile.Profile()
+    try:
+        prof.enable()
+    except ValueError:  # Another profiler is active on this thread
+        with session._lock:
+            session._profiling_threads.discard(sp.thread_id)
+        return
+    sp.profile = prof
+
+
+def _stop_profile(session: Session, sp: Span) -> None:
+    prof, sp.profile = sp.profile, None
+    prof.disable()
+    with session._lock:
+        session._profiling_threads.discard(sp.thread_id)
+    try:
+        session.trace_dir.mkdir(parents=True, exist_ok=True)
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", sp.name)
+        path = session.trace_dir / f"{session.file_stem}.{safe}.{sp.span_id}.prof"
+        prof.dump_stats(str(path))
+        sp.attrs["profile"] = path.name
+    except Exception as e:
+        logger.debug("Failed to write profile for %s: %s", sp.name, e)
+
+
+# ── Sessions ──────────────────────────────────────────────────────────
+
+
+def start_session(
+    name: str,
+    trace_dir: str | Path = "output/traces",
+    profile: bool = False,
+) -> Session | None:
+    """Start collecting spans in the current context.
+
+    Returns None if this context already has a session.
+    """
+    if _session.get() is not None:
+        return None
+    session = Session(name, Path(trace_dir), profile=profile)
+    _session.set(session)
+    return session
+
+
+def end_session(session: Session) -> Path | None:
+    """Stop *session* and write its Chrome trace; returns the file path."""
+    if _session.get() is session:
+        _session.set(None)
+    try:
+        return export_chrome_trace(session)
+    except Exception as e:
+        logger.warning("Failed to write trace for %s: %s", session.name, e)
+        return None
+
+
+@contextmanager
+def trace_run(name: str, **attrs: Any) -> Iterator[Span | _NoopSpan]:
+    """Root span for a run; opens and writes a session if tracing is enabled.
+
+    Nested inside an active session it is an ordinary span, so the API
+    pipeline and the team agents it calls end up in one trace.
+    """
+    session = None
+    if _session.get() is None:
+        from medina.config import get_config
+        config = get_config()
+        if config.trace_enabled:
+            session = start_session(name, config.trace_dir, profile=config.trace_profile)
+
+    try:
+        with span(name, cat="run", **attrs) as sp:
+            yield sp
+    finally:
+        if session is not None:
+            path = end_session(session)
+            if path:
+                logger.info("Trace written to %s", path)
+
+
+# ── Export ────────────────────────────────────────────────────────────
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def export_chrome_trace(session: Session, path: str | Path | None = None) -> Path:
+    """Write spans as Chrome trace-event JSON (complete ``X`` events)."""
+    if path is None:
+        path = session.trace_dir / f"{session.file_stem}.trace.json"
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    pid = os.getpid()
+    with session._lock:
+        spans = list(session.spans)
+    events: list[dict] = [
+        {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": session.name}},
+    ]
+    for sp in spans:
+        args = {k: _jsonable(v) for k, v in sp.attrs.items()}
+        args["span_id"] = sp.span_id
+        if sp.parent_id:
+            args["parent_id"] = sp.parent_id
+        events.append({
+            "name": sp.name,
+            "cat": sp.cat or "span",
+            "ph": "X",
+            "ts": (sp.start_ns + session.epoch_offset_ns) / 1000,
+            "dur": max(sp.end_ns - sp.start_ns, 0) / 1000,
+            "pid": pid,
+            "tid": sp.thread_id,
+            "args": args,
+        })
+    data = {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {"trace_id": session.trace_id, "dropped_spans": session.dropped},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    return path
+
+
+def export_otlp_json(session: Session, path: str | Path | None = None) -> Path:
+    """Write spans as OTLP/JSON ``resourceSpans`` (for OTLP-aware tooling)."""
+    if path is None:
+        path = session.trace_dir / f"{session.file_stem}.otlp.json"
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    def attr(key: str, value: Any) -> dict:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    with session._lock:
+        spans = list(session.spans)
+    otlp_spans = []
+    for sp in spans:
+        otlp_span = {
+            "traceId": session.trace_id,
+            "spanId": f"{sp.span_id:016x}",
+            "name": sp.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(sp.start_ns + session.epoch_offset_ns),
+            "endTimeUnixNano": str(sp.end_ns + session.epoch_offset_ns),
+            "attributes": [attr(k, v) for k, v in sp.attrs.items()],
+        }
+        if sp.parent_id:
+            otlp_span["parentSpanId"] = f"{sp.parent_id:016x}"
+        otlp_spans.append(otlp_span)
+
+    data = {"resourceSpans": [{
+        "resource": {"attributes": [attr("service.name", "medina")]},
+        "scopeSpans": [{"scope": {"name": "medina.tracing"}, "spans": otlp_spans}],
+    }]}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    return path
@@ -1,16 +1,175 @@
-"""Unified VLM client — dispatches to Anthropic, Google Gemini, or OpenRouter."""
+"""Unified VLM client — dispatches to Anthropic, Google Gemini, or OpenRouter.
+
+Async-first: every provider call is a coroutine on the async SDK client
+(``AsyncAnthropic``, ``genai.Client().aio``, ``AsyncOpenAI``).  SDK
+clients are created once per (provider, key, base URL) and reused, so
+HTTP keep-alive connections and TLS sessions survive across calls.
+
+All provider I/O runs on one background event loop owned by this
+module, which is what lets the async clients (bound to the loop that
+first uses them) be shared by everybody:
+
+- async code (API routes, chat, fix-it) awaits :meth:`VlmClient.avision_query`;
+- sync code (team agents, worker threads) calls :meth:`VlmClient.vision_query`,
+  which blocks the calling thread only.
+
+Each request has a timeout (``vlm_timeout_seconds``); cancelling the
+awaiting task, or a sync caller timing out, cancels the request.
+"""
 
 from __future__ import annotations
 
-import base64
+import asyncio
+import concurrent.futures
 import logging
 import os
+import threading
+import time
+from collections.abc import Coroutine, Sequence
+from typing import TYPE_CHECKING, Any
 
+from medina import tracing
 from medina.config import MedinaConfig, get_config
 from medina.exceptions import VisionAPIError
+from medina.vlm_payload import ImagePayload, as_payload
+
+if TYPE_CHECKING:
+    from medina.vlm_routing import VlmRouter
 
 logger = logging.getLogger(__name__)
 
+# Default per-request timeout when the config cannot be read.
+_DEFAULT_TIMEOUT = 300.0
+
+
+# ── Shared event loop + SDK clients ──────────────────────────────────
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_thread: threading.Thread | None = None
+_loop_lock = threading.Lock()
+
+# (provider, api_key, base_url) -> async SDK client.  Only touched from
+# the loop thread.
+_sdk_clients: dict[tuple[str, str, str | None], Any] = {}
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """The module's background event loop, started on first use."""
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="vlm-io", daemon=True,
+            )
+            thread.start()
+            _loop, _loop_thread = loop, thread
+        return _loop
+
+
+def _submit(coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+    loop = _get_loop()
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError("sync VLM call made from the VLM I/O loop")
+    return asyncio.run_coroutine_threadsafe(coro, loop)
+
+
+def run_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run *coro* on the I/O loop, blocking the calling thread."""
+    future = _submit(coro)
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
+
+
+async def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Await *coro* on the I/O loop; cancelling the caller cancels it."""
+    if asyncio.get_running_loop() is _loop:
+        return await coro
+    future = _submit(coro)
+    try:
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+
+
+def _sdk_client(provider: str, api_key: str, base_url: str | None) -> Any:
+    key = (provider, api_key, base_url)
+    client = _sdk_clients.get(key)
+    if client is not None:
+        return client
+
+    if provider == "gemini":
+        try:
+            from google import genai
+        except ImportError as exc:
+            raise VisionAPIError(
+                "google-genai package not installed. "
+                "Run: pip install google-genai"
+            ) from exc
+        client = genai.Client(api_key=api_key)
+    elif provider == "openrouter":
+        try:
+            from openai import AsyncOpenAI
+        except ImportError as exc:
+            raise VisionAPIError(
+                "openai package not installed. Run: pip install openai"
+            ) from exc
+        client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+    else:
+        try:
+            from anthropic import AsyncAnthropic
+        except ImportError as exc:
+            raise VisionAPIError(
+                "anthropic package not installed. Run: pip install anthropic"
+            ) from exc
+        client = AsyncAnthropic(api_key=api_key)
+
+    _sdk_clients[key] = client
+    return client
+
+
+async def _close_sdk_clients() -> None:
+    clients = list(_sdk_clients.values())
+    _sdk_clients.clear()
+    for client in clients:
+        close = getattr(client, "close", None) or getattr(
+            getattr(client, "aio", None), "aclose", None,
+        )
+        if close is None:
+            continue
+        try:
+            result = close()
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as exc:
+            logger.debug("Closing VLM SDK client failed: %s", exc)
+
+
+def close_vlm_clients() -> None:
+    """Close pooled SDK clients and stop the background loop."""
+    global _loop, _loop_thread
+    with _loop_lock:
+        loop, thread = _loop, _loop_thread
+        _loop = _loop_thread = None
+    if loop is None or loop.is_closed():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close_sdk_clients(), loop).result(timeout=10)
+    except Exception as exc:
+        logger.debug("VLM client shutdown: %s", exc)
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout=10)
+    loop.close()
+
+
+# ── Client ───────────────────────────────────────────────────────────
+
 
 class VlmClient:
     """Provider-agnostic VLM client for vision queries."""
@@ -21,51 +180,138 @@ class VlmClient:
         api_key: str,
         model: str,
         base_url: str | None = None,
+        timeout: float | None = None,
     ) -> None:
         self.provider = provider
         self.api_key = api_key
         self.model = model
         self.base_url = base_url
+        if timeout is None:
+            try:
+                timeout = get_config().vlm_timeout_seconds
+            except Exception:
+                timeout = _DEFAULT_TIMEOUT
+        self.timeout = timeout
 
     def vision_query(
         self,
-        images: list[bytes],
+        images: Sequence[bytes | ImagePayload],
         prompt: str,
         max_tokens: int = 4000,
         temperature: float | None = None,
+        system: str | None = None,
+        timeout: float | None = None,
     ) -> str:
-        """Send images + prompt to the VLM provider, return response text."""
-        if self.provider == "gemini":
-            return self._query_gemini(images, prompt, max_tokens, temperature)
-        if self.provider == "openrouter":
-            return self._query_openai_compat(
-                images, prompt, max_tokens, temperature,
-            )
-        return self._query_anthropic(images, prompt, max_tokens, temperature)
+        """Send images + prompt to the VLM provider, return response text.
+
+        Sync facade over :meth:`avision_query` for threads; blocks only
+        the calling thread.  Images are raw PNG/JPEG/WebP bytes or
+        pre-encoded :class:`~medina.vlm_payload.ImagePayload` objects.
+        """
+        payloads = [as_payload(i) for i in images]
+        return run_sync(self.request(
+            payloads, prompt, max_tokens, temperature, system, timeout,
+        ))
+
+    async def avision_query(
+        self,
+        images: Sequence[bytes | ImagePayload],
+        prompt: str,
+        max_tokens: int = 4000,
+        temperature: float | None = None,
+        system: str | None = None,
+        timeout: float | None = None,
+    ) -> str:
+        """Async :meth:`vision_query`; cancelling the caller cancels the request.
 
-    def _query_anthropic(
+        *images* may be empty for text-only prompts.
+        """
+        payloads = [as_payload(i) for i in images]
+        return await run_async(self.request(
+            payloads, prompt, max_tokens, temperature, system, timeout,
+        ))
+
+    async def request(
         self,
-        images: list[bytes],
+        images: list[ImagePayload],
+        prompt: str,
+        max_tokens: int = 4000,
+        temperature: float | None = None,
+        system: str | None = None,
+        timeout: float | None = None,
+    ) -> str:
+        """One provider call; must run on the I/O loop.
+
+        Traced as a ``vlm`` span, bounded by the request timeout, and fed
+        into the per-provider latency stats of :mod:`medina.vlm_routing`.
+        """
+        from medina.vlm_routing import record_cancelled, record_outcome, request_class
+
+        if self.provider == "gemini":
+            call = self._query_gemini
+        elif self.provider == "openrouter":
+            call = self._query_openai_compat
+        else:
+            call = self._query_anthropic
+        timeout = self.timeout if timeout is None else timeout
+        cls = request_class(images)
+
+        payload_bytes = sum(i.b64_size for i in images)
+        logger.debug(
+            "VLM %s request: %d image(s), %d payload bytes (%s)",
+            self.provider, len(images), payload_bytes,
+            ", ".join(sorted({i.media_type for i in images})) or "no images",
+        )
+        with tracing.span(
+            "vlm.vision_query", cat="vlm",
+            provider=self.provider, model=self.model,
+            images=len(images), image_bytes=sum(len(i) for i in images),
+            payload_bytes=payload_bytes, prompt_chars=len(prompt),
+        ) as sp:
+            start = time.perf_counter()
+            try:
+                text, usage = await asyncio.wait_for(
+                    call(images, prompt, max_tokens, temperature, system),
+                    timeout,
+                )
+            except asyncio.TimeoutError as exc:
+                record_outcome(
+                    self.provider, self.model, time.perf_counter() - start, False, cls,
+                )
+                raise VisionAPIError(
+                    f"{self.provider} VLM call timed out after {timeout:g}s"
+                ) from exc
+            except VisionAPIError:
+                record_outcome(
+                    self.provider, self.model, time.perf_counter() - start, False, cls,
+                )
+                raise
+            except asyncio.CancelledError:
+                # A hedge loser: it would have taken at least this long
+                record_cancelled(self.provider, self.model, time.perf_counter() - start, cls)
+                raise
+            record_outcome(self.provider, self.model, time.perf_counter() - start, True, cls)
+            sp.set(**usage)
+            return text
+
+    async def _query_anthropic(
+        self,
+        images: list[ImagePayload],
         prompt: str,
         max_tokens: int,
         temperature: float | None,
-    ) -> str:
-        try:
-            from anthropic import Anthropic
-        except ImportError as exc:
-            raise VisionAPIError(
-                "anthropic package not installed. Run: pip install anthropic"
-            ) from exc
+        system: str | None,
+    ) -> tuple[str, dict[str, int]]:
+        client = _sdk_client("anthropic", self.api_key, None)
 
         content: list[dict] = []
         for img in images:
-            encoded = base64.b64encode(img).decode()
             content.append({
                 "type": "image",
                 "source": {
                     "type": "base64",
-                    "media_type": "image/png",
-                    "data": encoded,
+                    "media_type": img.media_type,
+                    "data": img.b64,
                 },
             })
         content.append({"type": "text", "text": prompt})
@@ -77,50 +323,54 @@ class VlmClient:
         }
         if temperature is not None:
             kwargs["temperature"] = temperature
+        if system:
+            kwargs["system"] = system
 
         try:
-            client = Anthropic(api_key=self.api_key)
-            message = client.messages.create(**kwargs)
+            message = await client.messages.create(**kwargs)
         except Exception as exc:
             raise VisionAPIError(f"Anthropic VLM call failed: {exc}") from exc
 
+        usage: dict[str, int] = {}
+        if getattr(message, "usage", None) is not None:
+            usage = {
+                "input_tokens": getattr(message.usage, "input_tokens", 0) or 0,
+                "output_tokens": getattr(message.usage, "output_tokens", 0) or 0,
+            }
+
         response_text = ""
         for block in message.content:
             if hasattr(block, "text"):
                 response_text += block.text
-        return response_text
+        return response_text, usage
 
-    def _query_gemini(
+    async def _query_gemini(
         self,
-        images: list[bytes],
+        images: list[ImagePayload],
         prompt: str,
         max_tokens: int,
         temperature: float | None,
-    ) -> str:
-        try:
-            from google import genai
-            from google.genai import types
-        except ImportError as exc:
-            raise VisionAPIError(
-                "google-genai package not installed. "
-                "Run: pip install google-genai"
-            ) from exc
+        system: str | None,
+    ) -> tuple[str, dict[str, int]]:
+        client = _sdk_client("gemini", self.api_key, None)
+        from google.genai import types
 
         contents: list = []
         for img in images:
             contents.append(
-                types.Part.from_bytes(data=img, mime_type="image/png")
+                types.Part.from_bytes(data=img.data, mime_type=img.media_type)
             )
         contents.append(prompt)
 
         gen_kwargs: dict = {"max_output_tokens": max_tokens}
         if temperature is not None:
             gen_kwargs["temperature"] = temperature
+        if system:
+            gen_kwargs["system_instruction"] = system
         gen_config = types.GenerateContentConfig(**gen_kwargs)
 
         try:
-            client = genai.Client(api_key=self.api_key)
-            response = client.models.generate_content(
+            response = await client.aio.models.generate_content(
                 model=self.model,
                 contents=contents,
                 config=gen_config,
@@ -128,57 +378,68 @@ class VlmClient:
         except Exception as exc:
             raise VisionAPIError(f"Gemini VLM call failed: {exc}") from exc
 
-        return response.text or ""
+        usage: dict[str, int] = {}
+        if getattr(response, "usage_metadata", None) is not None:
+            meta = response.usage_metadata
+            usage = {
+                "input_tokens": getattr(meta, "prompt_token_count", 0) or 0,
+                "output_tokens": getattr(meta, "candidates_token_count", 0) or 0,
+            }
+
+        return response.text or "", usage
 
-    def _query_openai_compat(
+    async def _query_openai_compat(
         self,
-        images: list[bytes],
+        images: list[ImagePayload],
         prompt: str,
         max_tokens: int,
         temperature: float | None,
-    ) -> str:
+        system: str | None,
+    ) -> tuple[str, dict[str, int]]:
         """Query an OpenAI-compatible API (OpenRouter, vLLM, etc.)."""
-        try:
-            from openai import OpenAI
-        except ImportError as exc:
-            raise VisionAPIError(
-                "openai package not installed. Run: pip install openai"
-            ) from exc
+        client = _sdk_client("openrouter", self.api_key, self.base_url)
 
         content: list[dict] = []
         for img in images:
-            encoded = base64.b64encode(img).decode()
             content.append({
                 "type": "image_url",
                 "image_url": {
-                    "url": f"data:image/png;base64,{encoded}",
+                    "url": f"data:{img.media_type};base64,{img.b64}",
                 },
             })
         content.append({"type": "text", "text": prompt})
 
+        messages: list[dict] = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": content})
+
         kwargs: dict = {
             "model": self.model,
             "max_tokens": max_tokens,
-            "messages": [{"role": "user", "content": content}],
+            "messages": messages,
         }
         if temperature is not None:
             kwargs["temperature"] = temperature
 
         try:
-            client = OpenAI(
-                api_key=self.api_key,
-                base_url=self.base_url,
-            )
-            response = client.chat.completions.create(**kwargs)
+            response = await client.chat.completions.create(**kwargs)
         except Exception as exc:
             raise VisionAPIError(
                 f"OpenRouter VLM call failed: {exc}"
             ) from exc
 
+        usage: dict[str, int] = {}
+        if getattr(response, "usage", None) is not None:
+            usage = {
+                "input_tokens": getattr(response.usage, "prompt_tokens", 0) or 0,
+                "output_tokens": getattr(response.usage, "completion_tokens", 0) or 0,
+            }
+
         choice = response.choices[0] if response.choices else None
         if choice and choice.message and choice.message.content:
-            return choice.message.content
-        return ""
+            return choice.message.content, usage
+        return "", usage
 
 
 def _build_client(provider: str, config: MedinaConfig) -> VlmClient:
@@ -193,6 +454,7 @@ def _build_client(provider: str, config: MedinaConfig) -> VlmClient:
             provider="gemini",
             api_key=config.gemini_api_key,
             model=config.gemini_vision_model,
+            timeout=config.vlm_timeout_seconds,
         )
 
     if provider == "openrouter":
@@ -214,6 +476,7 @@ def _build_client(provider: str, config: MedinaConfig) -> VlmClient:
             api_key=api_key,
             model=config.vision_model,
             base_url=base_url,
+            timeout=config.vlm_timeout_seconds,
         )
 
     # Default: Anthropic
@@ -226,14 +489,33 @@ def _build_client(provider: str, config: MedinaConfig) -> VlmClient:
         provider="anthropic",
         api_key=config.anthropic_api_key,
         model=config.vision_model,
+        timeout=config.vlm_timeout_seconds,
     )
 
 
-def get_vlm_client(config: MedinaConfig | None = None) -> VlmClient:
-    """Create the primary VlmClient from configuration."""
+def get_vlm_client(config: MedinaConfig | None = None) -> VlmClient | VlmRouter:
+    """Create the VLM client from configuration.
+
+    With a usable fallback provider configured this is a
+    :class:`~medina.vlm_routing.VlmRouter` over both: fail-over always,
+    latency routing and hedging only if ``vlm_hedge`` is set.  Otherwise
+    the primary :class:`VlmClient`.
+    """
     if config is None:
         config = get_config()
-    return _build_client(config.vlm_provider.lower(), config)
+    primary = _build_client(config.vlm_provider.lower(), config)
+    fallback = get_fallback_vlm_client(config)
+    if fallback is None:
+        return primary
+
+    from medina.vlm_routing import VlmRouter
+
+    return VlmRouter(
+        [primary, fallback],
+        hedge=config.vlm_hedge,
+        hedge_delay=config.vlm_hedge_delay_seconds,
+        route=config.vlm_hedge,
+    )
 
 
 def get_fallback_vlm_client(config: MedinaConfig | None = None) -> VlmClient | None:
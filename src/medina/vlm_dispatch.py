@@ -0,0 +1,133 @@
+"""Overlapped render → VLM dispatch for per-page vision passes.
+
+Vision passes used to alternate between rasterizing a page (CPU) and
+waiting on its VLM request (network), so a pass took the sum of both.
+:func:`render_and_send` runs them as a producer/consumer pipeline: a
+pool of render workers fills a bounded queue that concurrent senders
+drain, so rasterization overlaps with request latency and a pass takes
+roughly the longer of the two.
+
+Rendering holds the GIL, so extra render workers do not render in
+parallel; one worker is the default and is enough to keep ahead of the
+network.  ``vlm_concurrency`` bounds in-flight VLM requests: with
+``vlm_hedge`` on each request may add a hedge, so the default sender
+count is halved to keep requests plus hedges within it.
+
+At most ``render_workers + depth + senders`` rendered images exist at
+any time: a render worker whose result finds the queue full waits for
+a sender before starting the next page.
+
+Defaults come from ``vlm_render_workers``, ``vlm_concurrency`` and
+``vlm_queue_depth``.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from medina import tracing
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+P = TypeVar("P")
+R = TypeVar("R")
+
+# Defaults when config is unavailable
+RENDER_WORKERS = 1
+SENDERS = 4
+QUEUE_DEPTH = 4
+
+_DONE = object()
+
+
+def _defaults() -> tuple[int, int, int]:
+    try:
+        from medina.config import get_config
+
+        config = get_config()
+        senders = config.vlm_concurrency
+        if config.vlm_hedge:
+            # A sender can have its request and one hedge in flight
+            senders = max(1, senders // 2)
+        return config.vlm_render_workers, senders, config.vlm_queue_depth
+    except Exception:
+        return RENDER_WORKERS, SENDERS, QUEUE_DEPTH
+
+
+def render_and_send(
+    items: Sequence[T],
+    render: Callable[[T], P],
+    send: Callable[[T, P], R],
+    render_workers: int | None = None,
+    senders: int | None = None,
+    depth: int | None = None,
+) -> list[R | Exception]:
+    """``send(item, render(item))`` for every item, overlapped.
+
+    Renders start in item order.  Returns one entry per item, in item
+    order: the result of ``send``, or the exception raised by its
+    ``render`` or ``send`` (nothing is raised here, so callers keep
+    their per-page error handling).
+    """
+    items = list(items)
+    if not items:
+        return []
+    default_workers, default_senders, default_depth = _defaults()
+    render_workers = max(1, min(render_workers or default_workers, len(items)))
+    senders = max(1, min(senders or default_senders, len(items)))
+    depth = max(1, depth or default_depth)
+
+    results: list[Any] = [None] * len(items)
+    ready: queue.Queue = queue.Queue(maxsize=depth)
+
+    def produce(index: int) -> None:
+        try:
+            image = render(items[index])
+        except Exception as exc:
+            results[index] = exc
+            return
+        ready.put((index, image))
+
+    def consume() -> None:
+        while True:
+            entry = ready.get()
+            if entry is _DONE:
+                return
+            index, image = entry
+            try:
+                results[index] = send(items[index], image)
+            except Exception as exc:
+                results[index] = exc
+            del image, entry
+
+    with tracing.span(
+        "vlm.dispatch", cat="vlm_dispatch",
+        items=len(items), render_workers=render_workers, senders=senders, depth=depth,
+    ) as sp:
+        threads = [
+            threading.Thread(
+                target=tracing.wrap(consume), name=f"vlm-send-{n}", daemon=True,
+            )
+            for n in range(senders)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            with ThreadPoolExecutor(
+                max_workers=render_workers, thread_name_prefix="vlm-render",
+            ) as pool:
+                for index in range(len(items)):
+                    pool.submit(tracing.wrap(produce), index)
+        finally:
+            for _ in threads:
+                ready.put(_DONE)
+            for thread in threads:
+                thread.join()
+        sp.set(failed=sum(isinstance(r, Exception) for r in results))
+    return results
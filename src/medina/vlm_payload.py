@@ -0,0 +1,183 @@
+"""Image encoding for VLM request payloads.
+
+Every VLM input used to be a full-colour lossless PNG.  Construction
+drawings are line art: grayscale PNG is about half the size and
+bilevel PNG under a tenth, so each use case picks its own
+:class:`EncodingProfile` (format, colour mode, quality).  Smaller
+payloads upload faster and trip the providers' 5 MB image cap — and
+with it the render-at-lower-DPI retry loops — less often.
+
+Profiles can be overridden per use case with the
+``vlm_image_encodings`` setting, e.g. ``{"schedule": "png:RGB"}``.
+Specs are ``format[:mode[:quality]]``.
+
+An :class:`ImagePayload` carries the encoded bytes with their media
+type and computes the base64 form at most once, however many size
+checks and provider requests look at it.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from medina.config import MedinaConfig, get_config
+
+logger = logging.getLogger(__name__)
+
+_MEDIA_TYPES = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+}
+
+# Pixel value at or above which a bilevel ("1") image is white.
+_BILEVEL_THRESHOLD = 160
+
+
+@dataclass(frozen=True)
+class EncodingProfile:
+    """How to encode one VLM image."""
+
+    format: str = "png"  # "png", "jpeg", "webp"
+    mode: str = "RGB"  # "RGB", "L" (grayscale), "1" (bilevel)
+    quality: int = 85  # lossy formats only
+
+    @classmethod
+    def parse(cls, spec: str) -> EncodingProfile:
+        """Parse ``format[:mode[:quality]]`` (e.g. ``"webp:L:80"``)."""
+        parts = [p.strip() for p in spec.split(":")]
+        fmt = parts[0].lower() or "png"
+        if fmt == "jpg":
+            fmt = "jpeg"
+        if fmt not in _MEDIA_TYPES:
+            raise ValueError(f"Unsupported VLM image format: {spec!r}")
+        mode = parts[1].upper() if len(parts) > 1 and parts[1] else "RGB"
+        if mode not in ("RGB", "L", "1"):
+            raise ValueError(f"Unsupported VLM image mode: {spec!r}")
+        quality = int(parts[2]) if len(parts) > 2 and parts[2] else 85
+        return cls(fmt, mode, quality)
+
+    @property
+    def grayscale(self) -> bool:
+        return self.mode in ("L", "1")
+
+
+# Per-use-case defaults.  Lossless grayscale keeps thin strokes and
+# small schedule text exact; JPEG is larger than PNG on line art.
+PROFILES: dict[str, EncodingProfile] = {
+    "schedule": EncodingProfile("png", "L"),
+    "fixture_count": EncodingProfile("png", "L"),
+    "keynote_legend": EncodingProfile("png", "L"),
+    "keynote_drawing": EncodingProfile("png", "L"),
+    "classify": EncodingProfile("png", "L"),
+    "chat": EncodingProfile("png", "RGB"),
+    "tile": EncodingProfile("png", "RGB"),  # Page images served to the UI
+}
+_DEFAULT_PROFILE = EncodingProfile("png", "RGB")
+
+
+class ImagePayload:
+    """Encoded image bytes plus their media type and cached base64 form."""
+
+    __slots__ = ("data", "media_type", "use_case", "width", "height", "_b64")
+
+    def __init__(
+        self,
+        data: bytes,
+        media_type: str = "image/png",
+        use_case: str = "",
+        width: int = 0,
+        height: int = 0,
+    ) -> None:
+        self.data = data
+        self.media_type = media_type
+        self.use_case = use_case
+        self.width = width
+        self.height = height
+        self._b64: str | None = None
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def b64(self) -> str:
+        """Base64 text of :attr:`data`, encoded on first access."""
+        if self._b64 is None:
+            self._b64 = base64.b64encode(self.data).decode()
+        return self._b64
+
+    @property
+    def b64_size(self) -> int:
+        """Length of the base64 form (what provider size caps count)."""
+        return 4 * ((len(self.data) + 2) // 3)
+
+    @property
+    def max_dim(self) -> int:
+        return max(self.width, self.height)
+
+
+def profile_for(use_case: str, config: MedinaConfig | None = None) -> EncodingProfile:
+    """The encoding profile for *use_case*, honouring config overrides."""
+    if config is None:
+        try:
+            config = get_config()
+        except Exception:
+            config = None
+    override = (config.vlm_image_encodings if config else {}).get(use_case)
+    if override:
+        try:
+            return EncodingProfile.parse(override)
+        except ValueError as exc:
+            logger.warning("Ignoring VLM encoding override for %s: %s", use_case, exc)
+    return PROFILES.get(use_case, _DEFAULT_PROFILE)
+
+
+def encode_image(
+    img: Any,
+    use_case: str,
+    config: MedinaConfig | None = None,
+    profile: EncodingProfile | None = None,
+) -> ImagePayload:
+    """Encode a PIL image for *use_case*."""
+    if profile is None:
+        profile = profile_for(use_case, config)
+
+    if profile.mode == "1":
+        img = img.convert("L").point(
+            lambda v: 255 if v >= _BILEVEL_THRESHOLD else 0, mode="1",
+        )
+    elif img.mode != profile.mode:
+        img = img.convert(profile.mode)
+
+    buf = io.BytesIO()
+    if profile.format == "png":
+        img.save(buf, format="PNG")
+    else:
+        if img.mode == "1":
+            img = img.convert("L")
+        img.save(buf, format=profile.format.upper(), quality=profile.quality)
+
+    return ImagePayload(
+        buf.getvalue(),
+        _MEDIA_TYPES[profile.format],
+        use_case,
+        img.width,
+        img.height,
+    )
+
+
+def as_payload(image: bytes | ImagePayload) -> ImagePayload:
+    """Wrap raw encoded bytes (sniffing the format) as a payload."""
+    if isinstance(image, ImagePayload):
+        return image
+    if image[:3] == b"\xff\xd8\xff":
+        media_type = "image/jpeg"
+    elif image[:4] == b"RIFF" and image[8:12] == b"WEBP":
+        media_type = "image/webp"
+    else:
+        media_type = "image/png"
+    return ImagePayload(image, media_type)
@@ -0,0 +1,339 @@
+"""Latency-aware routing and hedged requests across VLM providers.
+
+Every provider call made through :meth:`medina.vlm_client.VlmClient.request`
+reports its latency and outcome here, into a rolling window per
+(provider, model, request class).  The request class is the payload's
+use case (``classify``, ``schedule``, ...; ``text`` for text-only
+prompts), so thumbnail classifications and 4000-token schedule reads
+never share a p95.  A call cancelled as a hedge loser is recorded as
+*censored*: it took at least its elapsed time.  Percentiles are
+Kaplan–Meier estimates, so the slow calls that lose hedges keep
+weighing on the tail instead of silently dropping out of it.
+
+:class:`VlmRouter` uses those windows to:
+
+- **route** (opt-in) — try the provider with the lowest expected
+  latency first (median latency inflated by its error rate), once
+  every provider has enough samples; otherwise the configured order
+  is kept;
+- **hedge** — when the first provider has not answered by its own
+  rolling p95, send a duplicate request to the next provider, take
+  whichever good answer arrives first and cancel the other;
+- **fail over** — a provider that errors hands the request to the next
+  one immediately instead of waiting for the hedge delay.
+
+Hedging spends a second request on the slowest ~5% of calls to cut
+the tail that dominates pipeline p99; it sends duplicate paid requests
+and may answer from the fallback model, so it is off unless
+``vlm_hedge`` is set.  ``bench_vlm_hedging.py`` at
+the repository root measures the effect against fake providers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+
+from medina import tracing
+from medina.vlm_payload import ImagePayload, as_payload
+
+if TYPE_CHECKING:
+    from medina.vlm_client import VlmClient
+
+logger = logging.getLogger(__name__)
+
+# Calls remembered per (provider, model, request class)
+WINDOW = 200
+# Samples needed before percentiles are trusted for hedging/routing
+MIN_SAMPLES = 20
+# Never hedge sooner than this, whatever the p95 says
+MIN_HEDGE_DELAY = 1.0
+# Percentile of the first provider's latency that triggers a hedge
+HEDGE_PERCENTILE = 95
+
+
+# ── Rolling provider stats ───────────────────────────────────────────
+
+
+def request_class(images: Sequence[ImagePayload]) -> str:
+    """Latency class of a request: its payload use case, or ``text``."""
+    for image in images:
+        if image.use_case:
+            return image.use_case
+    return "image" if images else "text"
+
+
+def _km_percentile(samples: list[tuple[float, bool]], q: float) -> float:
+    """Kaplan–Meier *q*-th percentile of sorted (seconds, censored) samples.
+
+    A censored sample leaves the risk set without counting as an event.
+    If the estimate never reaches *q* (the tail is all censored), the
+    largest elapsed time is returned as a lower bound.
+    """
+    target = q / 100 - 1e-9
+    at_risk = len(samples)
+    survival = 1.0
+    for seconds, censored in samples:
+        if not censored:
+            survival *= 1 - 1 / at_risk
+            if 1 - survival >= target:
+                return seconds
+        at_risk -= 1
+    return samples[-1][0]
+
+
+class ProviderStats:
+    """Rolling latency and error window for one (provider, model, class)."""
+
+    def __init__(self, window: int = WINDOW) -> None:
+        # (seconds, censored): censored calls were cancelled after seconds
+        self._latencies: deque[tuple[float, bool]] = deque(maxlen=window)
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._outcomes.append(ok)
+            if ok:
+                self._latencies.append((seconds, False))
+
+    def record_cancelled(self, seconds: float) -> None:
+        """A call cancelled after *seconds* — its latency is at least that."""
+        with self._lock:
+            self._latencies.append((seconds, True))
+
+    def percentile(self, q: float) -> float | None:
+        """Latency percentile (censoring-aware), or None if too few samples."""
+        with self._lock:
+            if len(self._latencies) < MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        return _km_percentile(ordered, q)
+
+    def error_rate(self) -> float | None:
+        with self._lock:
+            if len(self._outcomes) < MIN_SAMPLES:
+                return None
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def expected_latency(self) -> float | None:
+        """Median latency scaled by the expected number of attempts."""
+        p50 = self.percentile(50)
+        errors = self.error_rate()
+        if p50 is None or errors is None:
+            return None
+        return p50 / max(1.0 - errors, 0.05)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            calls = len(self._outcomes)
+            cancelled = sum(censored for _, censored in self._latencies)
+        return {
+            "calls": calls,
+            "cancelled": cancelled,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "error_rate": self.error_rate(),
+        }
+
+
+_stats: dict[tuple[str, str, str], ProviderStats] = {}
+_stats_lock = threading.Lock()
+
+
+def stats_for(provider: str, model: str, cls: str = "") -> ProviderStats:
+    key = (provider, model, cls)
+    with _stats_lock:
+        stats = _stats.get(key)
+        if stats is None:
+            stats = _stats[key] = ProviderStats()
+        return stats
+
+
+def record_outcome(
+    provider: str, model: str, seconds: float, ok: bool, cls: str = "",
+) -> None:
+    """Record one finished provider call of request class *cls*."""
+    stats_for(provider, model, cls).record(seconds, ok)
+
+
+def record_cancelled(provider: str, model: str, seconds: float, cls: str = "") -> None:
+    """Record a call cancelled after *seconds* (e.g. a hedge loser)."""
+    stats_for(provider, model, cls).record_cancelled(seconds)
+
+
+def stats_snapshot() -> dict[str, dict[str, Any]]:
+    """Current stats per ``provider/model/class``."""
+    with _stats_lock:
+        items = list(_stats.items())
+    return {"/".join(k for k in key if k): s.snapshot() for key, s in items}
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+# ── Router ───────────────────────────────────────────────────────────
+
+
+class VlmRouter:
+    """A :class:`~medina.vlm_client.VlmClient` look-alike over several providers.
+
+    *clients* are in configured preference order.  ``hedge_delay`` is the
+    hedge trigger used while the first provider has too few samples for
+    a p95, and ``min_hedge_delay`` a floor under the p95 trigger.
+    ``route=False`` keeps the configured order; with ``hedge=False`` as
+    well, only fail-over remains.
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[VlmClient],
+        hedge: bool = True,
+        hedge_delay: float = 45.0,
+        min_hedge_delay: float = MIN_HEDGE_DELAY,
+        route: bool = True,
+    ) -> None:
+        if not clients:
+            raise ValueError("VlmRouter needs at least one client")
+        self.clients = list(clients)
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.route = route
+
+    @property
+    def provider(self) -> str:
+        return self.ranked()[0].provider
+
+    @property
+    def model(self) -> str:
+        return self.ranked()[0].model
+
+    def ranked(self, cls: str = "") -> list[VlmClient]:
+        """Clients in the order they should be tried for class *cls*."""
+        if not self.route:
+            return list(self.clients)
+        expected = [
+            stats_for(c.provider, c.model, cls).expected_latency() for c in self.clients
+        ]
+        if any(e is None for e in expected):
+            return list(self.clients)
+        order = sorted(range(len(self.clients)), key=lambda i: (expected[i], i))
+        return [self.clients[i] for i in order]
+
+    def hedge_after(self, client: VlmClient, cls: str = "") -> float:
+        """Seconds to wait on *client* before hedging a class-*cls* request."""
+        p95 = stats_for(client.provider, client.model, cls).percentile(HEDGE_PERCENTILE)
+        return max(p95 if p95 is not None else self.hedge_delay, self.min_hedge_delay)
+
+    def vision_query(
+        self,
+        images: Sequence[bytes | ImagePayload],
+        prompt: str,
+        max_tokens: int = 4000,
+        temperature: float | None = None,
+        system: str | None = None,
+        timeout: float | None = None,
+    ) -> str:
+        """Same contract as :meth:`VlmClient.vision_query`."""
+        from medina.vlm_client import run_sync
+
+        payloads = [as_payload(i) for i in images]
+        return run_sync(self.request(
+            payloads, prompt, max_tokens, temperature, system, timeout,
+        ))
+
+    async def avision_query(
+        self,
+        images: Sequence[bytes | ImagePayload],
+        prompt: str,
+        max_tokens: int = 4000,
+        temperature: float | None = None,
+        system: str | None = None,
+        timeout: float | None = None,
+    ) -> str:
+        """Same contract as :meth:`VlmClient.avision_query`."""
+        from medina.vlm_client import run_async
+
+        payloads = [as_payload(i) for i in images]
+        return await run_async(self.request(
+            payloads, prompt, max_tokens, temperature, system, timeout,
+        ))
+
+    async def request(
+        self,
+        images: list[ImagePayload],
+        prompt: str,
+        max_tokens: int = 4000,
+        temperature: float | None = None,
+        system: str | None = None,
+        timeout: float | None = None,
+    ) -> str:
+        """Routed, hedged call; must run on the VLM I/O loop."""
+        cls = request_class(images)
+        order = self.ranked(cls)
+        launched: dict[asyncio.Task, VlmClient] = {}
+        errors: list[BaseException] = []
+
+        def launch(client: VlmClient) -> None:
+            task = asyncio.ensure_future(client.request(
+                images, prompt, max_tokens, temperature, system, timeout,
+            ))
+            launched[task] = client
+
+        with tracing.span(
+            "vlm.route", cat="vlm_route",
+            route=",".join(c.provider for c in order),
+        ) as sp:
+            launch(order[0])
+            pending = set(launched)
+            hedged = False
+            try:
+                while True:
+                    can_launch = len(launched) < len(order)
+                    wait_for = (
+                        self.hedge_after(order[0], cls)
+                        if can_launch and self.hedge and len(launched) == 1
+                        else None
+                    )
+                    done, pending = await asyncio.wait(
+                        pending, timeout=wait_for,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    for task in done:
+                        if task.exception() is None:
+                            winner = launched[task]
+                            if hedged:
+                                outcome = "hedge_won" if winner is not order[0] else "hedge_lost"
+                            else:
+                                outcome = "failover" if winner is not order[0] else "primary"
+                            sp.set(winner=winner.provider, attempts=len(launched), outcome=outcome)
+                            return task.result()
+                        errors.append(task.exception())
+                        logger.warning(
+                            "VLM %s failed%s: %s", launched[task].provider,
+                            ", trying next provider" if can_launch else "",
+                            task.exception(),
+                        )
+                    if can_launch and (not done or not pending):
+                        nxt = order[len(launched)]
+                        if not done:
+                            hedged = True
+                            logger.info(
+                                "VLM %s slower than %.1fs — hedging to %s",
+                                order[0].provider, wait_for, nxt.provider,
+                            )
+                        launch(nxt)
+                        pending = {t for t in launched if not t.done()}
+                    elif not pending:
+                        sp.set(attempts=len(launched), outcome="error")
+                        raise errors[-1]
+            finally:
+                for task in pending:
+                    task.cancel()
@@ -0,0 +1,26 @@
+"""Shared fixtures: an isolated SQLite database and output directories."""
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh database for the test, with the connection pool reset."""
+    from medina.db import engine
+
+    engine.close_db()
+    monkeypatch.setattr(engine, "_DB_PATH", None)
+    engine.init_db(tmp_path / "medina.db")
+    yield tmp_path / "medina.db"
+    engine.close_db()
+
+
+@pytest.fixture
+def feedback_dir(tmp_path, monkeypatch):
+    """Redirect the feedback file fallback into the test's directory."""
+    from medina.api import feedback
+
+    path = tmp_path / "feedback"
+    monkeypatch.setattr(feedback, "FEEDBACK_DIR", path)
+    return path
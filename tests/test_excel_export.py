@@ -0,0 +1,33 @@
+"""Streaming Excel export: layout and column widths."""
+from __future__ import annotations
+
+from openpyxl import load_workbook
+
+from medina.models import ExtractionResult, FixtureRecord, KeyNote
+from medina.output.excel import write_excel
+
+
+def test_fixture_sheet_layout(tmp_path):
+    result = ExtractionResult(
+        source="x.pdf",
+        plan_pages=["E1.1", "E2"],
+        fixtures=[
+            FixtureRecord(code="A1", description="x" * 60, counts_per_plan={"E2": 3}, total=3),
+            FixtureRecord(code="B", total=0),
+        ],
+        keynotes=[KeyNote(number=1, text="Mount at 8'", total=2)],
+    )
+    path = write_excel(result, tmp_path / "out.xlsx")
+    ws = load_workbook(path)["Fixture Inventory"]
+
+    rows = [[c.value for c in row] for row in ws.iter_rows()]
+    assert rows[0][:2] == ["Type", "Description"] and rows[0][-3:] == ["E1.1", "E2", "Total"]
+    assert rows[1][-3:] == [0, 3, 3]
+    assert all(v is None for v in rows[3] + rows[4])  # Blank rows before the summary
+    assert rows[5][0] == "Key Notes Summary" and ws["A6"].font.b
+    assert rows[7][:3] == ["1", "Mount at 8'", 2]
+
+    assert ws.column_dimensions["B"].width == 40  # Clamped to the maximum
+    assert ws.column_dimensions["D"].width == 10  # Empty column keeps the minimum
+    assert list(ws.tables) == ["LightingInventory"]
+    assert ws.tables["LightingInventory"].ref == "A1:L3"
@@ -0,0 +1,85 @@
+"""Correction journal: removals made while the database is unavailable."""
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+
+import pytest
+
+from medina.api.feedback import (
+    FixtureFeedback,
+    ProjectFeedback,
+    load_project_feedback,
+    load_project_hints,
+    remove_project_correction,
+    save_project_feedback,
+)
+from medina.db import engine
+from medina.db import repositories as repo
+
+
+@contextmanager
+def _db_down(monkeypatch):
+    def fail(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    with monkeypatch.context() as m:
+        m.setattr(engine, "transaction", fail)
+        m.setattr(repo, "get_corrections", fail)
+        yield
+
+
+def _journal_codes(project_id: str) -> list[str]:
+    return [r["fixture_code"] for r in repo.get_corrections(project_id)]
+
+
+@pytest.fixture
+def saved(db, feedback_dir):
+    feedback = ProjectFeedback(project_id="p1", corrections=[
+        FixtureFeedback(action="remove", fixture_code=code) for code in ("A", "B", "C")
+    ])
+    save_project_feedback(feedback)
+    return load_project_feedback("p1")
+
+
+def test_remove_while_db_down_then_recover(saved, feedback_dir, monkeypatch):
+    with _db_down(monkeypatch):
+        removed = remove_project_correction(saved, 1)
+        save_project_feedback(saved)
+    assert removed.fixture_code == "B"
+    assert (feedback_dir / "p1.json").exists()
+    assert _journal_codes("p1") == ["A", "B", "C"]  # Delete not applied yet
+
+    # The same object saving again after recovery appends nothing twice
+    saved.corrections.append(FixtureFeedback(action="remove", fixture_code="D"))
+    save_project_feedback(saved)
+    assert _journal_codes("p1") == ["A", "C", "D"]
+    assert not (feedback_dir / "p1.json").exists()
+    assert load_project_hints("p1").removed_codes == ["A", "C", "D"]
+
+
+def test_outage_file_replayed_on_next_load(saved, feedback_dir, monkeypatch):
+    with _db_down(monkeypatch):
+        remove_project_correction(saved, 0)
+        save_project_feedback(saved)
+
+    reloaded = load_project_feedback("p1")
+    assert [c.fixture_code for c in reloaded.corrections] == ["B", "C"]
+    assert _journal_codes("p1") == ["B", "C"]
+    assert not (feedback_dir / "p1.json").exists()
+
+    # Further saves from the replayed copy stay duplicate-free
+    reloaded.corrections.append(FixtureFeedback(action="remove", fixture_code="E"))
+    save_project_feedback(reloaded)
+    assert _journal_codes("p1") == ["B", "C", "E"]
+    assert load_project_hints("p1").removed_codes == ["B", "C", "E"]
+
+
+def test_file_without_journal_state_keeps_db_first(saved, feedback_dir):
+    # A pre-journal leftover file must not shadow the journal
+    feedback_dir.mkdir(parents=True, exist_ok=True)
+    (feedback_dir / "p1.json").write_text(
+        ProjectFeedback(project_id="p1").model_dump_json(), encoding="utf-8",
+    )
+    loaded = load_project_feedback("p1")
+    assert [c.fixture_code for c in loaded.corrections] == ["A", "B", "C"]
@@ -0,0 +1,89 @@
+"""Learnings stored under the old path-hash source key."""
+from __future__ import annotations
+
+import hashlib
+import json
+
+import pytest
+
+from medina.api import learnings
+from medina.api.feedback import FixtureFeedback
+from medina.api.learnings import _legacy_source_key, _source_key, load_learnings, save_learnings
+from medina.db import repositories as repo
+
+
+def _correction(code: str) -> dict:
+    return FixtureFeedback(action="remove", fixture_code=code).model_dump(mode="json")
+
+
+@pytest.fixture
+def pdf(tmp_path, db, monkeypatch):
+    monkeypatch.setattr(learnings, "LEARNINGS_DIR", tmp_path / "learnings")
+    monkeypatch.setattr(learnings, "REVIEWS_DIR", tmp_path / "reviews")
+    monkeypatch.setattr(learnings, "_migrated", set())
+    path = tmp_path / "E1.pdf"
+    path.write_bytes(b"%PDF-1.4 drawing set")
+    return path
+
+
+def test_learnings_saved_under_old_key_load(pdf):
+    legacy = _legacy_source_key(pdf)
+    repo.upsert_learning(
+        legacy, "E1", str(pdf), json.dumps([_correction("X1")]), times_applied=2,
+    )
+    repo.set_param("vision_dpi", 150, scope="source_key", scope_key=legacy)
+
+    entry = load_learnings(pdf)
+    key = _source_key(pdf)
+    assert [c.fixture_code for c in entry.corrections] == ["X1"]
+    assert entry.source_key == key
+    assert entry.times_applied == 2
+    assert repo.get_learning(legacy) is None
+    assert repo.get_params(scope="source_key", scope_key=key) == {"vision_dpi": 150}
+    assert repo.get_params(scope="source_key", scope_key=legacy) == {}
+
+
+def test_duplicate_rows_merge_and_count_once(pdf):
+    legacy = _legacy_source_key(pdf)
+    # An earlier save copied the legacy corrections under the content key
+    # and left the legacy row behind; both were counted as sources.
+    content_key = f"E1_{hashlib.sha256(pdf.read_bytes()).hexdigest()[:12]}"
+    repo.upsert_learning(legacy, "E1", str(pdf), json.dumps([_correction("X1")]))
+    repo.upsert_learning(
+        content_key, "E1", str(pdf), json.dumps([_correction("X1"), _correction("X2")]),
+    )
+    repo.add_pattern_observations([
+        ("phantom_fixture_type", "X1", legacy, None),
+        ("phantom_fixture_type", "X1", content_key, None),
+    ])
+    assert repo.get_pattern_aggregate("phantom_fixture_type", "X1")["source_count"] == 2
+
+    save_learnings(pdf, [FixtureFeedback(action="remove", fixture_code="X3")])
+
+    assert _source_key(pdf) == content_key
+    assert [r["source_key"] for r in repo.get_all_learnings()] == [content_key]
+    codes = [c["fixture_code"] for c in repo.get_learning(content_key)["corrections"]]
+    assert codes == ["X1", "X2", "X3"]
+    agg = repo.get_pattern_aggregate("phantom_fixture_type", "X1")
+    assert agg["source_count"] == 1
+    assert agg["source_keys"] == [content_key]
+
+
+def test_reviews_and_learning_files_move(pdf):
+    legacy = _legacy_source_key(pdf)
+    learnings.REVIEWS_DIR.mkdir(parents=True)
+    (learnings.REVIEWS_DIR / f"{legacy}.json").write_text(
+        json.dumps({"E1.1": {"status": "reviewed"}}), encoding="utf-8",
+    )
+    learnings.LEARNINGS_DIR.mkdir(parents=True)
+    (learnings.LEARNINGS_DIR / f"{legacy}.json").write_text(
+        json.dumps({"source_key": legacy, "corrections": [_correction("X1")]}),
+        encoding="utf-8",
+    )
+
+    key = _source_key(pdf)
+    assert not (learnings.REVIEWS_DIR / f"{legacy}.json").exists()
+    reviews = json.loads((learnings.REVIEWS_DIR / f"{key}.json").read_text(encoding="utf-8"))
+    assert reviews == {"E1.1": {"status": "reviewed"}}
+    moved = json.loads((learnings.LEARNINGS_DIR / f"{key}.json").read_text(encoding="utf-8"))
+    assert moved["source_key"] == key
@@ -0,0 +1,34 @@
+"""Access control on the Prometheus /metrics endpoint."""
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+from medina.api.main import app
+
+
+@pytest.fixture
+def client():
+    # No context manager: startup (DB init, seeding) is not needed here
+    return TestClient(app)
+
+
+def test_anonymous_remote_scrape_is_refused(client, monkeypatch):
+    monkeypatch.setenv("CDS_METRICS_TOKEN", "s3cret")
+    response = client.get("/metrics")
+    assert response.status_code == 403
+    assert "tenant=" not in response.text
+
+
+def test_bearer_token_scrape(client, monkeypatch):
+    monkeypatch.setenv("CDS_METRICS_TOKEN", "s3cret")
+    assert client.get("/metrics", headers={"Authorization": "Bearer nope"}).status_code == 403
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+
+
+def test_allowed_address_scrape(client, monkeypatch):
+    monkeypatch.setenv("CDS_METRICS_ALLOWED_IPS", '["testclient"]')
+    assert client.get("/metrics").status_code == 200
@@ -0,0 +1,125 @@
+"""OCR schedule passes: line grouping and pass scheduling."""
+from __future__ import annotations
+
+import io
+import shutil
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+from medina.models import PageInfo
+from medina.schedule import ocr_extractor
+from medina.schedule.ocr_extractor import _data_to_lines
+
+
+def _tsv(paragraphs: list[list[list[str]]]) -> dict[str, list]:
+    """``image_to_data`` dict for blocks of one paragraph each.
+
+    Includes the non-word levels and empty word boxes tesseract reports.
+    """
+    data: dict[str, list] = {
+        k: [] for k in ("level", "page_num", "block_num", "par_num", "line_num", "text")
+    }
+
+    def row(level: int, block: int, par: int, line: int, text: str) -> None:
+        for k, v in zip(data, (level, 1, block, par, line, text)):
+            data[k].append(v)
+
+    row(1, 0, 0, 0, "")
+    for block, lines in enumerate(paragraphs, start=1):
+        row(2, block, 0, 0, "")
+        row(3, block, 1, 0, "")
+        for line_num, words in enumerate(lines, start=1):
+            row(4, block, 1, line_num, "")
+            for word in words:
+                row(5, block, 1, line_num, word)
+    return data
+
+
+def _image_to_string_lines(paragraphs: list[list[list[str]]]) -> list[str]:
+    """What the old ``image_to_string`` path produced for *paragraphs*.
+
+    Tesseract's text renderer ends every line with a newline, every
+    paragraph with one more, and the page with a form feed.
+    """
+    text = ""
+    for lines in paragraphs:
+        words_per_line = [[w for w in words if w.strip()] for words in lines]
+        if not any(words_per_line):
+            continue
+        for words in words_per_line:
+            if words:
+                text += " ".join(words) + "\n"
+        text += "\n"
+    text += "\f"
+    return [line.rstrip() for line in text.split("\n")]
+
+
+@pytest.mark.parametrize("paragraphs", [
+    [[["A", "2X4", "LED", "TROFFER"], ["120V", "4000K"]]],
+    [[["TYPE", "DESCRIPTION"]], [["A1", "DOWNLIGHT"], ["B", "STRIP", ""]], [["EX", "EXIT"]]],
+    [[["", " "]], [["C", "WALL", "PACK"]]],
+    [],
+])
+def test_data_to_lines_matches_image_to_string(paragraphs):
+    assert _data_to_lines(_tsv(paragraphs)) == _image_to_string_lines(paragraphs)
+
+
+@pytest.mark.skipif(shutil.which("tesseract") is None, reason="tesseract not installed")
+def test_data_to_lines_matches_tesseract():
+    pytesseract = pytest.importorskip("pytesseract")
+    from PIL import Image, ImageDraw
+
+    img = Image.new("L", (900, 300), 255)
+    draw = ImageDraw.Draw(img)
+    for i, text in enumerate(["TYPE DESCRIPTION", "A 2X4 LED TROFFER", "", "B DOWNLIGHT"]):
+        draw.text((20, 20 + 50 * i), text, fill=0)
+    img = img.resize((2700, 900))
+    for psm in ("--psm 3", "--psm 6"):
+        text = pytesseract.image_to_string(img, config=psm)
+        data = pytesseract.image_to_data(img, config=psm, output_type=pytesseract.Output.DICT)
+        assert _data_to_lines(data) == [line.rstrip() for line in text.split("\n")]
+
+
+def test_passes_start_lazily_and_finish_before_return(monkeypatch):
+    from PIL import Image
+
+    monkeypatch.setitem(sys.modules, "pytesseract", types.ModuleType("pytesseract"))
+    ocr_extractor.clear_ocr_cache()
+    started: list[tuple] = []
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_ocr(img, image_key, box, psm_config):
+        nonlocal running, peak
+        with lock:
+            started.append((box, psm_config))
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return ["row"]
+
+    monkeypatch.setattr(ocr_extractor, "_ocr_lines", fake_ocr)
+    # The first pass is a strong result: every later pass is unnecessary
+    monkeypatch.setattr(
+        ocr_extractor, "_parse_fixture_blocks", lambda lines, sheet: [object()] * 5,
+    )
+
+    buf = io.BytesIO()
+    Image.new("L", (100, 100), 255).save(buf, format="PNG")
+    page = PageInfo(page_number=1, sheet_code="E601", source_path=Path("x.pdf"))
+    fixtures = ocr_extractor.extract_schedule_ocr(page, buf.getvalue())
+
+    assert len(fixtures) == 5
+    assert running == 0  # Nothing left running in the background
+    assert peak <= ocr_extractor._MAX_OCR_WORKERS
+    # Only the first pool-width of passes was ever started, none of PSM 6
+    assert len(started) <= ocr_extractor._MAX_OCR_WORKERS
+    assert all(psm == "--psm 3" for _, psm in started)
@@ -0,0 +1,67 @@
+"""Raster store pruning and the page image route's DPI snapping."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from medina.api.routes.pages import _snap_dpi
+from medina.pdf.raster_store import RasterStore
+
+SAMPLE = Path(__file__).resolve().parents[1] / "sample" / "HCMC" / "24031_15_Elec.pdf"
+
+
+def _file(path: Path, size: int, age: float) -> Path:
+    path.write_bytes(b"\0" * size)
+    stamp = path.stat().st_mtime - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_prune_spares_tmp_files_and_keep(tmp_path):
+    store = RasterStore(tmp_path, max_bytes=150)
+    old = _file(tmp_path / "aaa.raw", 100, age=300)
+    tmp = _file(tmp_path / "bbb.raw.1.2.tmp", 100, age=600)
+    kept = _file(tmp_path / "ccc.raw", 100, age=900)
+
+    store._prune("ccc")
+
+    assert not old.exists()
+    assert tmp.exists() and kept.exists()
+
+
+def test_prune_is_least_recently_used(tmp_path):
+    pytest.importorskip("fitz")
+    if not SAMPLE.exists():
+        pytest.skip("sample PDF not available")
+    store = RasterStore(tmp_path, max_bytes=1 << 40)
+    first = store.raster(SAMPLE, 0, 20)
+    second = store.raster(SAMPLE, 1, 20)
+    for raster, age in ((first, 600), (second, 300)):
+        stamp = raster.path.stat().st_mtime - age
+        os.utime(raster.path, (stamp, stamp))
+
+    store.raster(SAMPLE, 0, 20)  # hit refreshes the older raster
+    store.max_bytes = first.path.stat().st_size
+    store._prune("none")
+
+    assert first.path.exists()
+    assert not second.path.exists()
+
+
+@pytest.mark.parametrize(
+    ("requested", "served"), [(72, 72), (90, 100), (150, 150), (151, 200), (600, 300)],
+)
+def test_snap_dpi(requested, served):
+    assert _snap_dpi(requested) == served
+
+
+def test_tile_override_changes_media_type(tmp_path, monkeypatch):
+    pytest.importorskip("fitz")
+    if not SAMPLE.exists():
+        pytest.skip("sample PDF not available")
+    monkeypatch.setenv("CDS_VLM_IMAGE_ENCODINGS", '{"tile": "jpeg:RGB:80"}')
+    payload = RasterStore(tmp_path, max_bytes=1 << 40).raster(SAMPLE, 0, 20).payload("tile")
+    assert payload.media_type == "image/jpeg"
+    assert payload.data[:2] == b"\xff\xd8"
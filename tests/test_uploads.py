@@ -0,0 +1,40 @@
+"""Content-addressed upload store: limits and per-project work dirs."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from medina.api import uploads
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "UPLOAD_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(uploads, "INCOMING_DIR", tmp_path / "uploads" / ".incoming")
+    monkeypatch.setenv("CDS_MAX_UPLOAD_MB", "1")
+    return tmp_path
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def test_ingest_dedupes_identical_content(store):
+    first = asyncio.run(uploads.ingest_stream(_chunks(b"%PDF", b"-1.7"), "a.pdf"))
+    second = asyncio.run(uploads.ingest_stream(_chunks(b"%PDF-1.7"), "b.pdf"))
+    assert second == (first[0], first[1], True)
+
+
+def test_oversized_uploads_are_refused(store):
+    with pytest.raises(uploads.UploadError):
+        uploads.start_session("big.pdf", 1024 * 1024 + 1)
+    with pytest.raises(uploads.UploadError):
+        asyncio.run(uploads.ingest_stream(_chunks(b"\0" * (1024 * 1024 + 1)), "big.pdf"))
+    assert not list(uploads.INCOMING_DIR.iterdir())
+
+
+def test_work_dir_is_per_project():
+    digest = "ab" * 32
+    assert uploads.work_dir_for(digest, "p1") != uploads.work_dir_for(digest, "p2")
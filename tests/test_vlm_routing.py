@@ -0,0 +1,126 @@
+"""Rolling VLM latency windows and hedged-request accounting."""
+from __future__ import annotations
+
+import asyncio
+import types
+
+import pytest
+
+from medina import vlm_client, vlm_routing
+from medina.vlm_client import VlmClient
+from medina.vlm_payload import ImagePayload
+from medina.vlm_routing import MIN_SAMPLES, ProviderStats, VlmRouter, stats_for
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    vlm_routing.reset_stats()
+    yield
+    vlm_routing.reset_stats()
+
+
+def test_p95_of_window():
+    stats = ProviderStats(window=100)
+    for i in range(1, MIN_SAMPLES):
+        stats.record(float(i), ok=True)
+    assert stats.percentile(95) is None  # Too few samples
+
+    for i in range(MIN_SAMPLES, 101):
+        stats.record(float(i), ok=True)
+    assert stats.percentile(95) == 95.0
+    assert stats.percentile(50) == 50.0
+
+    # The window rolls: old fast samples age out
+    for _ in range(100):
+        stats.record(10.0, ok=True)
+    assert stats.percentile(95) == 10.0
+
+
+def test_errors_count_toward_rate_not_latency():
+    stats = ProviderStats()
+    for _ in range(MIN_SAMPLES):
+        stats.record(1.0, ok=True)
+        stats.record(99.0, ok=False)
+    assert stats.percentile(95) == 1.0
+    assert stats.error_rate() == 0.5
+
+
+def test_cancelled_calls_keep_the_tail():
+    stats = ProviderStats()
+    for _ in range(90):
+        stats.record(1.0, ok=True)
+    for _ in range(10):
+        stats.record_cancelled(5.0)
+    # Dropping the losers would report a p95 of 1.0s
+    assert stats.percentile(95) == 5.0
+    assert stats.percentile(50) == 1.0
+    assert stats.error_rate() == 0.0
+    assert stats.snapshot()["cancelled"] == 10
+
+
+def test_windows_are_per_request_class():
+    slow = stats_for("anthropic", "m", "schedule")
+    for _ in range(MIN_SAMPLES):
+        slow.record(60.0, ok=True)
+        stats_for("anthropic", "m", "classify").record(0.5, ok=True)
+    client = types.SimpleNamespace(provider="anthropic", model="m")
+    router = VlmRouter([client], hedge_delay=45.0, min_hedge_delay=0.0)
+    assert router.hedge_after(client, "classify") == 0.5
+    assert router.hedge_after(client, "schedule") == 60.0
+    assert router.hedge_after(client, "text") == 45.0  # No stats yet
+
+
+def _fake_sdk(delay: float, text: str):
+    async def create(**kwargs):
+        await asyncio.sleep(delay)
+        message = types.SimpleNamespace(content=text)
+        return types.SimpleNamespace(
+            usage=types.SimpleNamespace(prompt_tokens=1, completion_tokens=1),
+            choices=[types.SimpleNamespace(message=message)],
+        )
+    return types.SimpleNamespace(chat=types.SimpleNamespace(
+        completions=types.SimpleNamespace(create=create),
+    ))
+
+
+def test_hedge_winner_and_loser_accounting(monkeypatch):
+    monkeypatch.setitem(
+        vlm_client._sdk_clients, ("openrouter", "k", "slow://"), _fake_sdk(1.0, "slow"),
+    )
+    monkeypatch.setitem(
+        vlm_client._sdk_clients, ("openrouter", "k", "fast://"), _fake_sdk(0.01, "fast"),
+    )
+    primary = VlmClient("openrouter", "k", "model-a", base_url="slow://", timeout=10)
+    backup = VlmClient("openrouter", "k", "model-b", base_url="fast://", timeout=10)
+    router = VlmRouter([primary, backup], hedge=True, hedge_delay=0.05, min_hedge_delay=0.0)
+
+    image = ImagePayload(b"\x89PNG", "image/png", "schedule")
+    assert router.vision_query([image], "count") == "fast"
+
+    async def settle():
+        await asyncio.sleep(0.05)  # Let the loser's cancellation run
+    vlm_client.run_sync(settle())
+
+    loser = stats_for("openrouter", "model-a", "schedule").snapshot()
+    winner = stats_for("openrouter", "model-b", "schedule").snapshot()
+    assert loser["calls"] == 0 and loser["cancelled"] == 1
+    assert winner["calls"] == 1 and winner["cancelled"] == 0
+    assert winner["error_rate"] is None  # Still below MIN_SAMPLES
+    assert stats_for("openrouter", "model-a", "text").snapshot()["cancelled"] == 0
+
+
+def test_routing_and_hedging_are_off_by_default(monkeypatch):
+    from medina.config import MedinaConfig
+
+    monkeypatch.delenv("CDS_VLM_HEDGE", raising=False)
+    config = MedinaConfig(
+        vlm_provider="openrouter", openrouter_api_key="k",
+        vlm_fallback_provider="anthropic", anthropic_api_key="k",
+    )
+    client = vlm_client.get_vlm_client(config)
+    assert isinstance(client, VlmRouter)
+    assert client.hedge is False and client.route is False
+    for _ in range(MIN_SAMPLES):
+        stats_for(client.clients[1].provider, client.clients[1].model).record(0.1, ok=True)
+        stats_for(client.clients[0].provider, client.clients[0].model).record(9.0, ok=True)
+    assert client.ranked()[0] is client.clients[0]